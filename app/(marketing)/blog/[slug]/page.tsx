@@ -9,6 +9,7 @@ import { getBlogPostBySlugServer } from '@/lib/api/blog'
 import ReactMarkdown from 'react-markdown'
 import { TopBar } from '@/components/ui/top-bar'
 import { JalousieMenu } from '@/components/ui/jalousie-menu'
+import { ViewTracker } from '@/components/features/ViewTracker'
 
 export const dynamic = 'force-dynamic'
 
@@ -26,6 +27,7 @@ export default async function BlogPostPage({ params }: { params: Promise<{ slug:
     <main className="min-h-screen bg-background">
       <TopBar />
       <JalousieMenu />
+      {post.is_published && <ViewTracker type="blog" id={post.id} />}
 
       <section className="pt-32 pb-16 px-4">
         <div className="container mx-auto max-w-3xl">
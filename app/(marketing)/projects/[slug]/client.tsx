@@ -16,6 +16,7 @@ import { ArrowRight } from 'lucide-react'
 import ReactMarkdown from 'react-markdown'
 import { ProjectsJalousieFooter } from '@/components/sections/ProjectsJalousieFooter'
 import type { Project } from '@/features/projects/api'
+import { ViewTracker } from '@/components/features/ViewTracker'
 
 interface ProjectDetailClientProps {
   project: Project
@@ -55,6 +56,7 @@ export function ProjectDetailClient({ project, nextProject }: ProjectDetailClien
       <div className="min-h-screen bg-[#000000]">
         <TopBar />
         <JalousieMenu />
+        <ViewTracker type="project" id={project.id} />
 
         {/* Hero Video/Image - полноэкранное или почти */}
         <div
@@ -325,6 +327,7 @@ export function ProjectDetailClient({ project, nextProject }: ProjectDetailClien
         isOpen={isVideoOpen}
         onClose={() => setIsVideoOpen(false)}
         videoUrl={project.video_url ?? undefined}
+        hlsUrl={project.video_hls_url ?? undefined}
         playbackId={playbackId ?? undefined}
         title={project.title}
       />
@@ -10,6 +10,8 @@ import { resolveSafeChildPath } from '@/lib/path-utils'
 
 const UPLOAD_DIR = process.env.UPLOAD_DIR || path.join(process.cwd(), 'backend', 'uploads')
 const UPLOAD_DIR_RESOLVED = path.resolve(UPLOAD_DIR)
+// Видео могут быть уроками курсов — их отдаёт backend (проверка доступа, подписанные ссылки)
+const BACKEND_ONLY_DIRS = new Set(['videos', 'hls'])
 
 export async function GET(
   _request: NextRequest,
@@ -17,6 +19,10 @@ export async function GET(
 ) {
   try {
     const { path: pathArray } = await params
+    // Видео — только через backend; временные файлы незавершённой записи (.имя.*) — не часть хранилища
+    if (BACKEND_ONLY_DIRS.has(pathArray[0]) || pathArray.some(part => part.startsWith('.'))) {
+      return new NextResponse('File not found', { status: 404 })
+    }
     const filePath = resolveSafeChildPath(UPLOAD_DIR_RESOLVED, pathArray)
 
     // Защита от path traversal
@@ -59,6 +65,8 @@ function getContentType(ext: string): string {
     mp4: 'video/mp4',
     mov: 'video/quicktime',
     avi: 'video/x-msvideo',
+    m3u8: 'application/vnd.apple.mpegurl',
+    ts: 'video/mp2t',
     pdf: 'application/pdf',
   }
   return types[ext] || 'application/octet-stream'
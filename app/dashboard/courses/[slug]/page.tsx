@@ -3,7 +3,7 @@
  */
 import { notFound, redirect } from 'next/navigation'
 import { getCurrentUserServer } from '@/lib/api/auth'
-import { getCourseBySlugServer } from '@/features/courses/api'
+import { getCourseBySlugServer, getLessonMediaLinkServer } from '@/features/courses/api'
 import { getEnrollmentByCourseServer } from '@/lib/api/enrollments'
 import { VideoPlayer } from '@/features/projects/components/VideoPlayer'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
@@ -53,6 +53,17 @@ export default async function DashboardCoursePage({ params }: { params: { slug:
   // Модули уже загружены вместе с курсом
   const modulesWithLessons = course.modules || []
 
+  // Видео урока — по подписанной ссылке с ограниченным сроком действия
+  let firstLessonVideoUrl: string | null = null
+  const firstLessonWithVideo = modulesWithLessons[0]?.lessons?.[0]
+  if (firstLessonWithVideo?.has_video) {
+    try {
+      firstLessonVideoUrl = (await getLessonMediaLinkServer(firstLessonWithVideo.id, cookieStore)).url
+    } catch (error) {
+      console.warn('Ошибка получения ссылки на видео:', error)
+    }
+  }
+
   // Извлекаем playback ID из Mux URL
   const getPlaybackId = (url: string | null) => {
     if (!url) return null
@@ -79,10 +90,10 @@ export default async function DashboardCoursePage({ params }: { params: { slug:
             <Card>
               <CardContent className="p-0">
                 <div className="aspect-video bg-muted">
-                  {modulesWithLessons && modulesWithLessons[0]?.lessons?.[0]?.video_url ? (
+                  {firstLessonWithVideo && firstLessonVideoUrl ? (
                     (() => {
-                      const firstLesson = modulesWithLessons[0].lessons[0]
-                      const videoUrl = firstLesson.video_url
+                      const firstLesson = firstLessonWithVideo
+                      const videoUrl = firstLessonVideoUrl
                       if (!videoUrl) {
                         return (
                           <div className="w-full h-full flex items-center justify-center">
@@ -91,9 +102,12 @@ export default async function DashboardCoursePage({ params }: { params: { slug:
                         )
                       }
                       const playbackId = getPlaybackId(videoUrl)
-                      return playbackId ? (
+                      // HLS-плейлист (перекодированное видео) играет плеер Mux по src
+                      const isHls = videoUrl.split('?')[0].endsWith('.m3u8')
+                      return playbackId || isHls ? (
                         <VideoPlayer
-                          playbackId={playbackId}
+                          playbackId={playbackId ?? undefined}
+                          src={isHls ? videoUrl : undefined}
                           title={firstLesson.title}
                           controls
                           className="w-full h-full"
@@ -2,7 +2,7 @@
  * Dashboard студента
  */
 import { getCurrentUserServer } from '@/lib/api/auth'
-import { getEnrollmentsServer } from '@/lib/api/enrollments'
+import { getMyCoursesServer, type MyCourse } from '@/lib/api/enrollments'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
 import { Progress } from '@/components/ui/progress'
 import { Button } from '@/components/ui/button'
@@ -21,22 +21,11 @@ export default async function DashboardPage() {
     redirect('/')
   }
 
-  // Загружаем записи на курсы
-  let enrollments: Array<{
-    id: string
-    course_id: string
-    progress: number
-    courseTitle?: string
-    courseSlug?: string
-  }> = []
+  // Загружаем записи на курсы вместе с карточками курсов (один запрос)
+  let enrollments: MyCourse[] = []
 
   try {
-    const enrollmentsData = await getEnrollmentsServer(cookieStore)
-    enrollments = enrollmentsData.map(enrollment => ({
-      ...enrollment,
-      courseTitle: 'Загрузка...',
-      courseSlug: '',
-    }))
+    enrollments = await getMyCoursesServer(cookieStore)
   } catch (error) {
     console.warn('Ошибка загрузки записей на курсы:', error)
   }
@@ -56,25 +45,21 @@ export default async function DashboardPage() {
           {enrollments && enrollments.length > 0 ? (
             <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
               {enrollments.map(enrollment => {
-                // TODO: API должен возвращать полную информацию о курсе вместе с enrollment
                 return (
                   <Card key={enrollment.id}>
                     <CardHeader>
                       <CardTitle className="line-clamp-2">
-                        {enrollment.courseTitle || `Курс #${enrollment.course_id.slice(0, 8)}`}
+                        {enrollment.title}
                       </CardTitle>
-                      <CardDescription>Прогресс: {enrollment.progress}%</CardDescription>
+                      <CardDescription>
+                        Прогресс: {enrollment.progress}%
+                        {enrollment.lessons_count > 0 && ` · уроков: ${enrollment.lessons_count}`}
+                      </CardDescription>
                     </CardHeader>
                     <CardContent>
                       <Progress value={enrollment.progress} className="mb-4" />
-                      <Link
-                        href={
-                          enrollment.courseSlug
-                            ? `/dashboard/courses/${enrollment.courseSlug}`
-                            : '#'
-                        }
-                      >
-                        <Button className="w-full" disabled={!enrollment.courseSlug}>
+                      <Link href={`/dashboard/courses/${enrollment.slug}`}>
+                        <Button className="w-full">
                           <Play className="mr-2 w-4 h-4" />
                           Продолжить обучение
                         </Button>
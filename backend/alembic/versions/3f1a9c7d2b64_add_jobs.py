@@ -0,0 +1,49 @@
+"""add_jobs
+
+Revision ID: 3f1a9c7d2b64
+Revises: cd6da14f9b7e
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '3f1a9c7d2b64'
+down_revision = 'cd6da14f9b7e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE jobs (
+          id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+          task TEXT NOT NULL,
+          payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+          priority INTEGER NOT NULL DEFAULT 0,
+          status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'done', 'dead')),
+          attempts INTEGER NOT NULL DEFAULT 0,
+          max_attempts INTEGER NOT NULL DEFAULT 5,
+          timeout_seconds INTEGER NOT NULL DEFAULT 300,
+          run_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+          locked_at TIMESTAMPTZ,
+          locked_until TIMESTAMPTZ,
+          locked_by TEXT,
+          last_error TEXT,
+          created_at TIMESTAMPTZ DEFAULT NOW(),
+          finished_at TIMESTAMPTZ
+        );
+        """
+    )
+    # Частичные индексы: выборка готовых задач и поиск зависших не сканируют историю
+    op.execute(
+        "CREATE INDEX idx_jobs_queued ON jobs(priority DESC, run_at) WHERE status = 'queued';"
+    )
+    op.execute(
+        "CREATE INDEX idx_jobs_running ON jobs(locked_until) WHERE status = 'running';"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS jobs;")
@@ -0,0 +1,44 @@
+"""add_lesson_progress_bitset
+
+Revision ID: 5c7e9a1b3d26
+Revises: 8b2e4d6f1a93
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '5c7e9a1b3d26'
+down_revision = '8b2e4d6f1a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE lessons ADD COLUMN ordinal INTEGER;")
+    # Существующие уроки нумеруются в порядке дерева курса: модуль, затем урок
+    op.execute(
+        """
+        UPDATE lessons AS l
+        SET ordinal = numbered.ordinal
+        FROM (
+          SELECT l2.id,
+                 ROW_NUMBER() OVER (
+                   PARTITION BY m.course_id
+                   ORDER BY m."order", l2."order", l2.created_at, l2.id
+                 ) - 1 AS ordinal
+          FROM lessons AS l2
+          JOIN course_modules AS m ON m.id = l2.module_id
+        ) AS numbered
+        WHERE l.id = numbered.id;
+        """
+    )
+    op.execute("ALTER TABLE lessons ALTER COLUMN ordinal SET NOT NULL;")
+    op.execute(
+        "ALTER TABLE enrollments ADD COLUMN lessons_completed BYTEA NOT NULL DEFAULT '\\x'::bytea;"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE enrollments DROP COLUMN IF EXISTS lessons_completed;")
+    op.execute("ALTER TABLE lessons DROP COLUMN IF EXISTS ordinal;")
@@ -0,0 +1,24 @@
+"""add_video_hls_url
+
+Revision ID: 7d3f5b9e2c48
+Revises: 5c7e9a1b3d26
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '7d3f5b9e2c48'
+down_revision = '5c7e9a1b3d26'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE lessons ADD COLUMN IF NOT EXISTS video_hls_url TEXT;")
+    op.execute("ALTER TABLE projects ADD COLUMN IF NOT EXISTS video_hls_url TEXT;")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE projects DROP COLUMN IF EXISTS video_hls_url;")
+    op.execute("ALTER TABLE lessons DROP COLUMN IF EXISTS video_hls_url;")
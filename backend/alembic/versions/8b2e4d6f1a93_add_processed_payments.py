@@ -0,0 +1,36 @@
+"""add_processed_payments
+
+Revision ID: 8b2e4d6f1a93
+Revises: 3f1a9c7d2b64
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4d6f1a93'
+down_revision = '3f1a9c7d2b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE processed_payments (
+          payment_id TEXT PRIMARY KEY,
+          event TEXT NOT NULL,
+          status TEXT NOT NULL DEFAULT 'received'
+            CHECK (status IN ('received', 'enrolled', 'ignored', 'rejected')),
+          user_id UUID,
+          course_id UUID,
+          last_error TEXT,
+          received_at TIMESTAMPTZ DEFAULT NOW(),
+          processed_at TIMESTAMPTZ
+        );
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS processed_payments;")
@@ -0,0 +1,55 @@
+"""add_search_vectors
+
+Revision ID: a4c8e2f6b1d0
+Revises: 7d3f5b9e2c48
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'a4c8e2f6b1d0'
+down_revision = '7d3f5b9e2c48'
+branch_labels = None
+depends_on = None
+
+# Конфигурация russian стеммит и латиницу (asciiword -> english_stem), поэтому
+# общие поля индексируются ей, а *_en — конфигурацией english. Вес: A — заголовок,
+# B — описание/анонс, C — остальное.
+PROJECTS_VECTOR = """
+  setweight(to_tsvector('russian', coalesce(title_ru, '') || ' ' || coalesce(title, '')), 'A') ||
+  setweight(to_tsvector('english', coalesce(title_en, '')), 'A') ||
+  setweight(to_tsvector('russian', coalesce(description_ru, '') || ' ' || coalesce(description, '')), 'B') ||
+  setweight(to_tsvector('english', coalesce(description_en, '')), 'B') ||
+  setweight(to_tsvector('simple', coalesce(client, '')), 'C')
+"""
+
+COURSES_VECTOR = """
+  setweight(to_tsvector('russian', coalesce(title, '')), 'A') ||
+  setweight(to_tsvector('russian', coalesce(description, '')), 'B')
+"""
+
+BLOG_POSTS_VECTOR = """
+  setweight(to_tsvector('russian', coalesce(title, '')), 'A') ||
+  setweight(to_tsvector('russian', coalesce(excerpt, '')), 'B') ||
+  setweight(to_tsvector('russian', coalesce(content, '')), 'C')
+"""
+
+
+def upgrade() -> None:
+    for table, expression in (
+        ("projects", PROJECTS_VECTOR),
+        ("courses", COURSES_VECTOR),
+        ("blog_posts", BLOG_POSTS_VECTOR),
+    ):
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({expression}) STORED;"
+        )
+        op.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_search ON {table} USING GIN (search_vector);")
+
+
+def downgrade() -> None:
+    for table in ("blog_posts", "courses", "projects"):
+        op.execute(f"DROP INDEX IF EXISTS idx_{table}_search;")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector;")
@@ -0,0 +1,35 @@
+"""add_media_meta
+
+Revision ID: a7c3e9f1d5b2
+Revises: f4a8c2e6b1d7
+Create Date: 2026-10-21 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e9f1d5b2'
+down_revision = 'f4a8c2e6b1d7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Размеры и плейсхолдеры изображений: списки проектов и клиентов подтягивают их
+    # подзапросом по первичному ключу в том же SELECT
+    op.execute(
+        """
+        CREATE TABLE media_meta (
+          url TEXT PRIMARY KEY,
+          width INTEGER NOT NULL,
+          height INTEGER NOT NULL,
+          dominant_color VARCHAR(7) NOT NULL,
+          placeholder TEXT NOT NULL,
+          updated_at TIMESTAMPTZ DEFAULT now()
+        );
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS media_meta;")
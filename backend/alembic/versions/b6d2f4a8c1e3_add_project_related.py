@@ -0,0 +1,35 @@
+"""add_project_related
+
+Revision ID: b6d2f4a8c1e3
+Revises: a4c8e2f6b1d0
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b6d2f4a8c1e3'
+down_revision = 'a4c8e2f6b1d0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Готовые top-K похожих проектов: страница проекта читает их по первичному ключу
+    op.execute(
+        """
+        CREATE TABLE project_related (
+          project_id UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+          position SMALLINT NOT NULL,
+          related_id UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+          score REAL NOT NULL,
+          PRIMARY KEY (project_id, position)
+        );
+        """
+    )
+    # Каскадное удаление и поиск списков, где встречается изменённый проект
+    op.execute("CREATE INDEX idx_project_related_related ON project_related(related_id);")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS project_related;")
@@ -0,0 +1,60 @@
+"""add_lesson_ordinal_unique_check
+
+Revision ID: b8d2f6a4c1e9
+Revises: a7c3e9f1d5b2
+Create Date: 2026-10-22 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b8d2f6a4c1e9'
+down_revision = 'a7c3e9f1d5b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Lesson.ordinal — номер бита в enrollments.lessons_completed, уникален в пределах курса.
+    # Курс урока известен только через модуль, поэтому UNIQUE-индекс невозможен: проверка —
+    # отложенный триггер (дерево курса можно переписать в одной транзакции, как при импорте
+    # каталога). Advisory-блокировка по курсу не даёт двум транзакциям занять один номер.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION lessons_check_ordinal_unique() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+          lesson_course UUID;
+        BEGIN
+          SELECT course_id INTO lesson_course FROM course_modules WHERE id = NEW.module_id;
+          IF lesson_course IS NULL THEN
+            RETURN NULL;
+          END IF;
+          PERFORM pg_advisory_xact_lock(hashtext('lessons.ordinal'), hashtext(lesson_course::text));
+          IF EXISTS (
+            SELECT 1
+            FROM lessons l
+            JOIN course_modules m ON m.id = l.module_id
+            WHERE m.course_id = lesson_course AND l.ordinal = NEW.ordinal AND l.id <> NEW.id
+          ) THEN
+            RAISE EXCEPTION 'lesson ordinal % is already used in course %', NEW.ordinal, lesson_course
+              USING ERRCODE = 'unique_violation';
+          END IF;
+          RETURN NULL;
+        END
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE CONSTRAINT TRIGGER lessons_ordinal_unique
+        AFTER INSERT OR UPDATE OF ordinal, module_id ON lessons
+        DEFERRABLE INITIALLY DEFERRED
+        FOR EACH ROW EXECUTE FUNCTION lessons_check_ordinal_unique();
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS lessons_ordinal_unique ON lessons;")
+    op.execute("DROP FUNCTION IF EXISTS lessons_check_ordinal_unique();")
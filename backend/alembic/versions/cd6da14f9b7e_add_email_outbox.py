@@ -0,0 +1,40 @@
+"""add_email_outbox
+
+Revision ID: cd6da14f9b7e
+Revises: fee7b891b1e1
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'cd6da14f9b7e'
+down_revision = 'fee7b891b1e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE email_outbox (
+          id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+          template TEXT NOT NULL,
+          payload JSONB NOT NULL,
+          status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'sent', 'failed')),
+          attempts INTEGER NOT NULL DEFAULT 0,
+          next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+          last_error TEXT,
+          created_at TIMESTAMPTZ DEFAULT NOW(),
+          sent_at TIMESTAMPTZ
+        );
+        """
+    )
+    # Частичный индекс: диспетчер смотрит только на неотправленные письма
+    op.execute(
+        "CREATE INDEX idx_email_outbox_pending ON email_outbox(next_attempt_at) WHERE status = 'pending';"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS email_outbox;")
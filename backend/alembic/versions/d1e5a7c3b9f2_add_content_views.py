@@ -0,0 +1,53 @@
+"""add_content_views
+
+Revision ID: d1e5a7c3b9f2
+Revises: b6d2f4a8c1e3
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'd1e5a7c3b9f2'
+down_revision = 'b6d2f4a8c1e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Объединение HyperLogLog-скетчей: побайтовый максимум регистров (NULL — пустой скетч)
+    op.execute(
+        """
+        CREATE FUNCTION hll_union(a BYTEA, b BYTEA) RETURNS BYTEA
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+          SELECT CASE
+            WHEN a IS NULL THEN b
+            WHEN b IS NULL OR length(a) <> length(b) THEN a
+            ELSE (
+              SELECT string_agg(set_byte('\\x00'::bytea, 0, greatest(get_byte(a, i), get_byte(b, i))), ''::bytea ORDER BY i)
+              FROM generate_series(0, length(a) - 1) AS i
+            )
+          END
+        $$;
+        """
+    )
+    # Дневные агрегаты просмотров: одна строка на материал и день, сколько бы ни было просмотров
+    op.execute(
+        """
+        CREATE TABLE content_views (
+          content_type TEXT NOT NULL CHECK (content_type IN ('project', 'blog')),
+          content_id UUID NOT NULL,
+          day DATE NOT NULL,
+          views BIGINT NOT NULL DEFAULT 0,
+          visitors BYTEA,
+          PRIMARY KEY (content_type, content_id, day)
+        );
+        """
+    )
+    # «Популярное за период»: index-only scan по типу и дням
+    op.execute("CREATE INDEX idx_content_views_type_day ON content_views(content_type, day) INCLUDE (content_id, views);")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS content_views;")
+    op.execute("DROP FUNCTION IF EXISTS hll_union(BYTEA, BYTEA);")
@@ -0,0 +1,187 @@
+"""add_stats_rollups
+
+Revision ID: e3f7b9d1c5a4
+Revises: d1e5a7c3b9f2
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e3f7b9d1c5a4'
+down_revision = 'd1e5a7c3b9f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Сумма подтверждённого платежа (из API YooKassa) — источник выручки
+    op.execute("ALTER TABLE processed_payments ADD COLUMN amount NUMERIC(12,2);")
+
+    # Агрегаты для админ-панели: дни и недели по UTC. Без внешних ключей —
+    # история выручки остаётся и после удаления курса
+    op.execute(
+        """
+        CREATE TABLE stats_enrollments_daily (
+          course_id UUID NOT NULL,
+          day DATE NOT NULL,
+          enrollments INTEGER NOT NULL DEFAULT 0,
+          PRIMARY KEY (course_id, day)
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE stats_contacts_weekly (
+          week DATE PRIMARY KEY,
+          submissions INTEGER NOT NULL DEFAULT 0,
+          budget_total BIGINT NOT NULL DEFAULT 0
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE stats_revenue_daily (
+          course_id UUID NOT NULL,
+          day DATE NOT NULL,
+          payments INTEGER NOT NULL DEFAULT 0,
+          revenue NUMERIC(14,2) NOT NULL DEFAULT 0,
+          PRIMARY KEY (course_id, day)
+        );
+        """
+    )
+    # Выборки по периоду без учёта курса
+    op.execute("CREATE INDEX idx_stats_enrollments_daily_day ON stats_enrollments_daily(day);")
+    op.execute("CREATE INDEX idx_stats_revenue_daily_day ON stats_revenue_daily(day);")
+
+    # BRIN по времени: пересчёт агрегатов (python -m app.application.services.stats_rollups)
+    # читает сырые таблицы диапазонами по неделям, индекс занимает килобайты.
+    # У contact_submissions уже есть btree по created_at
+    op.execute("CREATE INDEX idx_enrollments_enrolled_at_brin ON enrollments USING brin(enrolled_at);")
+    op.execute("CREATE INDEX idx_processed_payments_processed_at_brin ON processed_payments USING brin(processed_at);")
+
+    # Триггеры уровня оператора с transition tables: пакетная вставка — один upsert на группу.
+    # enrolled_at и course_id после вставки не меняются, поэтому UPDATE enrollments
+    # (частые записи прогресса) триггеров не вызывает
+    op.execute(
+        """
+        CREATE FUNCTION stats_enrollments_insert() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+          INSERT INTO stats_enrollments_daily AS s (course_id, day, enrollments)
+          SELECT course_id, (coalesce(enrolled_at, now()) AT TIME ZONE 'UTC')::date, count(*)
+          FROM new_rows GROUP BY 1, 2
+          ON CONFLICT (course_id, day) DO UPDATE SET enrollments = s.enrollments + EXCLUDED.enrollments;
+          RETURN NULL;
+        END $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION stats_enrollments_delete() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+          UPDATE stats_enrollments_daily AS s SET enrollments = s.enrollments - d.n
+          FROM (
+            SELECT course_id, (coalesce(enrolled_at, now()) AT TIME ZONE 'UTC')::date AS day, count(*) AS n
+            FROM old_rows GROUP BY 1, 2
+          ) AS d
+          WHERE s.course_id = d.course_id AND s.day = d.day;
+          RETURN NULL;
+        END $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER enrollments_stats_insert AFTER INSERT ON enrollments
+          REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION stats_enrollments_insert();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER enrollments_stats_delete AFTER DELETE ON enrollments
+          REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION stats_enrollments_delete();
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION stats_contacts_insert() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+          INSERT INTO stats_contacts_weekly AS s (week, submissions, budget_total)
+          SELECT date_trunc('week', coalesce(created_at, now()) AT TIME ZONE 'UTC')::date, count(*), coalesce(sum(budget), 0)
+          FROM new_rows GROUP BY 1
+          ON CONFLICT (week) DO UPDATE SET
+            submissions = s.submissions + EXCLUDED.submissions,
+            budget_total = s.budget_total + EXCLUDED.budget_total;
+          RETURN NULL;
+        END $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION stats_contacts_delete() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+          UPDATE stats_contacts_weekly AS s SET
+            submissions = s.submissions - d.n,
+            budget_total = s.budget_total - d.budget
+          FROM (
+            SELECT date_trunc('week', coalesce(created_at, now()) AT TIME ZONE 'UTC')::date AS week,
+                   count(*) AS n, coalesce(sum(budget), 0) AS budget
+            FROM old_rows GROUP BY 1
+          ) AS d
+          WHERE s.week = d.week;
+          RETURN NULL;
+        END $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER contact_submissions_stats_insert AFTER INSERT ON contact_submissions
+          REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION stats_contacts_insert();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER contact_submissions_stats_delete AFTER DELETE ON contact_submissions
+          REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION stats_contacts_delete();
+        """
+    )
+    # Выручка — при переходе события платежа в статус enrolled (повторная отметка не считается)
+    op.execute(
+        """
+        CREATE FUNCTION stats_revenue_enrolled() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+          INSERT INTO stats_revenue_daily AS s (course_id, day, payments, revenue)
+          VALUES (NEW.course_id, (coalesce(NEW.processed_at, now()) AT TIME ZONE 'UTC')::date, 1, coalesce(NEW.amount, 0))
+          ON CONFLICT (course_id, day) DO UPDATE SET
+            payments = s.payments + 1,
+            revenue = s.revenue + EXCLUDED.revenue;
+          RETURN NULL;
+        END $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER processed_payments_stats_revenue AFTER UPDATE OF status ON processed_payments
+          FOR EACH ROW
+          WHEN (NEW.status = 'enrolled' AND OLD.status IS DISTINCT FROM 'enrolled' AND NEW.course_id IS NOT NULL)
+          EXECUTE FUNCTION stats_revenue_enrolled();
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS processed_payments_stats_revenue ON processed_payments;")
+    op.execute("DROP TRIGGER IF EXISTS contact_submissions_stats_delete ON contact_submissions;")
+    op.execute("DROP TRIGGER IF EXISTS contact_submissions_stats_insert ON contact_submissions;")
+    op.execute("DROP TRIGGER IF EXISTS enrollments_stats_delete ON enrollments;")
+    op.execute("DROP TRIGGER IF EXISTS enrollments_stats_insert ON enrollments;")
+    op.execute("DROP FUNCTION IF EXISTS stats_revenue_enrolled();")
+    op.execute("DROP FUNCTION IF EXISTS stats_contacts_delete();")
+    op.execute("DROP FUNCTION IF EXISTS stats_contacts_insert();")
+    op.execute("DROP FUNCTION IF EXISTS stats_enrollments_delete();")
+    op.execute("DROP FUNCTION IF EXISTS stats_enrollments_insert();")
+    op.execute("DROP INDEX IF EXISTS idx_processed_payments_processed_at_brin;")
+    op.execute("DROP INDEX IF EXISTS idx_enrollments_enrolled_at_brin;")
+    op.execute("DROP TABLE IF EXISTS stats_revenue_daily;")
+    op.execute("DROP TABLE IF EXISTS stats_contacts_weekly;")
+    op.execute("DROP TABLE IF EXISTS stats_enrollments_daily;")
+    op.execute("ALTER TABLE processed_payments DROP COLUMN IF EXISTS amount;")
@@ -0,0 +1,27 @@
+"""add_enrollments_enrolled_at_index
+
+Revision ID: f4a8c2e6b1d7
+Revises: e3f7b9d1c5a4
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'f4a8c2e6b1d7'
+down_revision = 'e3f7b9d1c5a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Выгрузка записей (/api/exports/enrollments) идёт по enrolled_at в порядке индекса —
+    # курсор отдаёт первые строки без сортировки всей таблицы. btree заменяет BRIN:
+    # пересчёт агрегатов по диапазонам дат тоже читает его
+    op.execute("CREATE INDEX idx_enrollments_enrolled_at ON enrollments(enrolled_at);")
+    op.execute("DROP INDEX IF EXISTS idx_enrollments_enrolled_at_brin;")
+
+
+def downgrade() -> None:
+    op.execute("CREATE INDEX idx_enrollments_enrolled_at_brin ON enrollments USING brin(enrolled_at);")
+    op.execute("DROP INDEX IF EXISTS idx_enrollments_enrolled_at;")
@@ -0,0 +1,27 @@
+"""add_user_token_version
+
+Revision ID: fee7b891b1e1
+Revises: c9151b3120aa
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'fee7b891b1e1'
+down_revision = 'c9151b3120aa'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
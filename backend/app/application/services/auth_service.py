@@ -1,12 +1,25 @@
 """
 Сервис аутентификации: JWT токены
 """
+import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from uuid import UUID
 from jose import JWTError, jwt
 from app.config import settings
 from app.interfaces.schemas.user import TokenData
+from app.utils.cache import TTLCache
+
+
+def token_claims(user) -> dict:
+    """Claims пользователя для access/refresh токенов"""
+    return {
+        "sub": str(user.id),
+        "email": user.email,
+        "role": user.role,
+        "ver": user.token_version or 0,
+    }
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -31,21 +44,67 @@ def create_refresh_token(data: dict) -> str:
     return encoded_jwt
 
 
-def verify_token(token: str, token_type: str = "access") -> Optional[TokenData]:
-    """Проверяет и декодирует JWT token"""
+def decode_token(token: str, token_type: str = "access") -> Tuple[Optional[TokenData], float]:
+    """
+    Полная проверка JWT: подпись, срок действия, тип.
+    Возвращает TokenData и unix-время истечения токена.
+    """
     try:
         payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
         
         # Проверяем тип токена
         if payload.get("type") != token_type:
-            return None
+            return None, 0.0
         
         user_id: str = payload.get("sub")
         email: str = payload.get("email")
         
         if user_id is None:
-            return None
+            return None, 0.0
         
-        return TokenData(user_id=UUID(user_id), email=email)
-    except JWTError:
+        token_data = TokenData(
+            user_id=UUID(user_id),
+            email=email,
+            role=payload.get("role"),
+            token_version=int(payload.get("ver") or 0),
+        )
+        return token_data, float(payload.get("exp") or 0)
+    except (JWTError, ValueError):
+        return None, 0.0
+
+
+# Кеш проверенных токенов: один и тот же bearer приходит много раз подряд
+# (админка, плеер курса). Ключ — дайджест токена, сам токен в памяти не храним.
+_verified_tokens: TTLCache[Tuple[str, bytes], TokenData] = TTLCache(
+    "verified_tokens",
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+_rejected_tokens: TTLCache[Tuple[str, bytes], bool] = TTLCache(
+    "rejected_tokens",
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.TOKEN_NEGATIVE_CACHE_TTL_SECONDS,
+)
+
+
+def _token_key(token: str, token_type: str) -> Tuple[str, bytes]:
+    return token_type, hashlib.blake2b(token.encode("utf-8"), digest_size=20).digest()
+
+
+def verify_token(token: str, token_type: str = "access") -> Optional[TokenData]:
+    """Проверяет и декодирует JWT token"""
+    key = _token_key(token, token_type)
+    cached = _verified_tokens.get(key)
+    if cached is not None:
+        return cached
+    if _rejected_tokens.get(key):
         return None
+
+    token_data, expires_at = decode_token(token, token_type)
+    if token_data is None:
+        _rejected_tokens.set(key, True)
+        return None
+
+    # Храним не дольше срока действия токена — после exp запись сама исчезнет
+    _verified_tokens.set(key, token_data, ttl=expires_at - time.time())
+    return token_data
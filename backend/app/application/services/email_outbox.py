@@ -0,0 +1,168 @@
+"""
+Transactional outbox для писем: запись в той же транзакции, что и бизнес-данные,
+и фоновый диспетчер, который отправляет письма вне запроса пользователя.
+"""
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.infrastructure.db.models.email_outbox import EmailOutbox
+from app.infrastructure.db.repositories.email_outbox import SqlAlchemyEmailOutboxRepository
+from app.infrastructure.db.session import AsyncSessionLocal
+from app.infrastructure.integrations.email_service import (
+    send_contact_form_notification,
+    send_course_enrollment_confirmation,
+)
+from app.utils.metrics import (
+    EMAIL_OUTBOX_DELIVERY_LAG,
+    EMAIL_OUTBOX_DISPATCH_ERRORS,
+    EMAIL_OUTBOX_RESULTS,
+)
+
+CONTACT_FORM_NOTIFICATION = "contact_form_notification"
+COURSE_ENROLLMENT_CONFIRMATION = "course_enrollment_confirmation"
+
+Sender = Callable[[dict, str], Awaitable[bool]]
+
+TEMPLATES: Dict[str, Sender] = {
+    CONTACT_FORM_NOTIFICATION: lambda payload, key: send_contact_form_notification(
+        payload["admin_email"], payload["submission"], idempotency_key=key
+    ),
+    COURSE_ENROLLMENT_CONFIRMATION: lambda payload, key: send_course_enrollment_confirmation(
+        payload["user_email"], payload["course_title"], idempotency_key=key
+    ),
+}
+
+
+def enqueue_email(db: AsyncSession, template: str, payload: dict) -> EmailOutbox:
+    """Кладёт письмо в outbox текущей транзакции; уйдёт после commit"""
+    if template not in TEMPLATES:
+        raise ValueError(f"Неизвестный шаблон письма: {template}")
+    return SqlAlchemyEmailOutboxRepository(db).enqueue(template, payload)
+
+
+class EmailOutboxDispatcher:
+    """
+    Фоновая задача, разбирающая outbox пачками.
+
+    Каждый воркер uvicorn запускает свой диспетчер: пачки забираются через
+    SKIP LOCKED, поэтому одно письмо не уходит двум воркерам одновременно.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        concurrency: int,
+        poll_interval: float,
+        max_attempts: int,
+        lease_seconds: int,
+    ) -> None:
+        self._batch_size = batch_size
+        self._concurrency = max(1, concurrency)
+        self._poll_interval = poll_interval
+        self._max_attempts = max_attempts
+        self._lease_seconds = lease_seconds
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run(), name="email-outbox-dispatcher")
+
+    async def stop(self) -> None:
+        self._stopping = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    def wake(self) -> None:
+        """Будит диспетчер сразу после commit, не дожидаясь интервала опроса"""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                processed = await self.dispatch_once()
+            except Exception as exc:
+                EMAIL_OUTBOX_DISPATCH_ERRORS.labels(type(exc).__name__).inc()
+                processed = 0
+
+            # Полная пачка — вероятно, есть ещё; иначе ждём сигнала или интервала
+            if processed >= self._batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def dispatch_once(self) -> int:
+        """Отправляет одну пачку писем; возвращает число обработанных"""
+        async with AsyncSessionLocal() as db:
+            messages = await SqlAlchemyEmailOutboxRepository(db).claim_batch(
+                self._batch_size, self._lease_seconds
+            )
+        if not messages:
+            return 0
+
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def deliver(message: EmailOutbox) -> Tuple[EmailOutbox, Optional[str]]:
+            async with semaphore:
+                return message, await self._deliver(message)
+
+        results = await asyncio.gather(*(deliver(message) for message in messages))
+
+        sent: List[UUID] = []
+        async with AsyncSessionLocal() as db:
+            repo = SqlAlchemyEmailOutboxRepository(db)
+            for message, error in results:
+                if error is None:
+                    sent.append(message.id)
+                    EMAIL_OUTBOX_RESULTS.labels(message.template, "sent").inc()
+                    if message.created_at is not None:
+                        lag = (datetime.now(timezone.utc) - message.created_at).total_seconds()
+                        EMAIL_OUTBOX_DELIVERY_LAG.labels(message.template).observe(lag)
+                    continue
+
+                retry_at = self._retry_at(message.attempts)
+                EMAIL_OUTBOX_RESULTS.labels(message.template, "retry" if retry_at else "failed").inc()
+                await repo.mark_failed(message.id, error, retry_at)
+            await repo.mark_sent(sent)
+        return len(messages)
+
+    async def _deliver(self, message: EmailOutbox) -> Optional[str]:
+        sender = TEMPLATES.get(message.template)
+        if sender is None:
+            return f"Неизвестный шаблон: {message.template}"
+        try:
+            # id письма — ключ идемпотентности: повтор после сбоя не продублирует письмо
+            ok = await sender(message.payload, str(message.id))
+        except Exception as exc:
+            return f"{type(exc).__name__}: {exc}"
+        return None if ok else "Провайдер не принял письмо"
+
+    def _retry_at(self, attempts: int) -> Optional[datetime]:
+        """Экспоненциальная задержка с джиттером; None — попытки исчерпаны"""
+        if attempts >= self._max_attempts:
+            return None
+        delay = min(settings.EMAIL_OUTBOX_MAX_BACKOFF_SECONDS, 5 * (2 ** (attempts - 1)))
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        return datetime.now(timezone.utc) + timedelta(seconds=delay)
+
+
+email_dispatcher = EmailOutboxDispatcher(
+    batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+    concurrency=settings.EMAIL_OUTBOX_CONCURRENCY,
+    poll_interval=settings.EMAIL_OUTBOX_POLL_SECONDS,
+    max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    lease_seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS,
+)
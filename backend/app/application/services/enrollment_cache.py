@@ -0,0 +1,36 @@
+"""
+Кеш множества курсов, на которые записан пользователь.
+
+Используется в пакетной проверке доступа и выдаче ссылок на видео уроков.
+Кешу верим только в положительном: если курса в множестве нет, оно
+перечитывается из БД — запись, созданная в другом процессе (оплата в
+обработчике задач, другой воркер uvicorn), видна сразу, а не через TTL.
+"""
+from typing import FrozenSet, Iterable, List
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.infrastructure.db.repositories.enrollments import SqlAlchemyEnrollmentsRepository
+from app.utils.cache import TTLCache
+
+enrollment_cache: TTLCache[UUID, FrozenSet[UUID]] = TTLCache(
+    "enrollments",
+    maxsize=settings.ENROLLMENT_CACHE_SIZE,
+    ttl=settings.ENROLLMENT_CACHE_TTL_SECONDS,
+)
+
+
+async def filter_enrolled(db: AsyncSession, user_id: UUID, course_ids: Iterable[UUID]) -> List[UUID]:
+    """Курсы из course_ids (без повторов, в том же порядке), на которые записан пользователь"""
+    wanted = list(dict.fromkeys(course_ids))
+    enrolled = enrollment_cache.get(user_id)
+    if enrolled is None or not enrolled.issuperset(wanted):
+        enrolled = frozenset(await SqlAlchemyEnrollmentsRepository(db).course_ids_by_user(user_id))
+        enrollment_cache.set(user_id, enrolled)
+    return [course_id for course_id in wanted if course_id in enrolled]
+
+
+def invalidate_enrollments(user_id: UUID) -> None:
+    enrollment_cache.pop(user_id)
@@ -0,0 +1,269 @@
+"""
+Упаковка загруженных видео в HLS (несколько качеств + master-плейлист).
+
+Перекодирование — локальный ffmpeg в фоновой задаче. Одновременно работает
+не больше процессов ffmpeg, чем ядер (HLS_TRANSCODE_CONCURRENCY), а потоки
+кодека делятся между ними, чтобы процессы не конкурировали за CPU.
+Все качества кодируются за один проход: исходник декодируется один раз.
+С хранилищем S3 исходник скачивается во временный каталог, а результат
+загружается обратно параллельно (плейлисты — после сегментов).
+"""
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import List, Optional
+
+from app.config import settings
+from app.infrastructure.storage import storage
+from app.utils.metrics import HLS_TRANSCODE_SECONDS, HLS_TRANSCODE_SPEED
+
+HLS_DIR = "hls"
+MASTER_PLAYLIST = "master.m3u8"
+SOURCE_PREFIX = "/uploads/videos/"
+
+
+@dataclass(frozen=True)
+class Rendition:
+    height: int
+    video_bitrate_k: int
+    audio_bitrate_k: int
+
+
+# Лестница качеств: берутся ступени не выше исходника (минимум одна)
+LADDER = (
+    Rendition(1080, 5000, 160),
+    Rendition(720, 2800, 128),
+    Rendition(480, 1400, 96),
+    Rendition(360, 800, 64),
+)
+
+
+@dataclass
+class ProbeResult:
+    duration: float
+    height: int
+    has_audio: bool
+
+
+@dataclass
+class TranscodeResult:
+    master_url: str
+    renditions: List[Rendition]
+    media_seconds: float
+    wall_seconds: float
+
+    @property
+    def speed(self) -> float:
+        """Скорость относительно реального времени (x1 — секунда видео за секунду)"""
+        return self.media_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+
+class TranscodeError(RuntimeError):
+    def __init__(self, message: str, permanent: bool = False) -> None:
+        super().__init__(message)
+        # Повтор не поможет: нет ffmpeg или файл не читается как видео
+        self.permanent = permanent
+
+
+def _cores() -> int:
+    return os.cpu_count() or 1
+
+
+def transcode_concurrency() -> int:
+    configured = settings.HLS_TRANSCODE_CONCURRENCY or _cores()
+    return max(1, min(configured, _cores()))
+
+
+_slots: Optional[asyncio.Semaphore] = None
+
+
+def _get_slots() -> asyncio.Semaphore:
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(transcode_concurrency())
+    return _slots
+
+
+def output_prefix_for(source: str) -> str:
+    """hls/<имя исходника без расширения> — ключ каталога в хранилище"""
+    return f"{HLS_DIR}/{Path(source).stem}"
+
+
+async def hls_url_for(video_url: Optional[str]) -> Optional[str]:
+    """URL готового master-плейлиста для загруженного видео (None — ещё не упакован)"""
+    if not video_url or not video_url.startswith(SOURCE_PREFIX):
+        return None
+    key = f"{output_prefix_for(video_url[len(SOURCE_PREFIX):])}/{MASTER_PLAYLIST}"
+    if not await storage.exists(key):
+        return None
+    return f"/uploads/{key}"
+
+
+async def _run(*args: str) -> bytes:
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+    except FileNotFoundError as exc:
+        raise TranscodeError(
+            f"Не найден {args[0]}: установите ffmpeg или задайте FFMPEG_BINARY", permanent=True
+        ) from exc
+    try:
+        stdout, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        # Таймаут задачи — не оставляем ffmpeg работать в фоне
+        process.kill()
+        await process.wait()
+        raise
+    if process.returncode != 0:
+        raise TranscodeError(f"{os.path.basename(args[0])}: {stderr.decode(errors='replace')[-1000:]}")
+    return stdout
+
+
+async def probe(path: Path) -> ProbeResult:
+    try:
+        raw = await _run(
+            settings.FFPROBE_BINARY, "-v", "error", "-print_format", "json",
+            "-show_format", "-show_streams", str(path),
+        )
+    except TranscodeError as exc:
+        raise TranscodeError(str(exc), permanent=True) from exc
+    info = json.loads(raw)
+    streams = info.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    if video is None:
+        raise TranscodeError("В файле нет видеодорожки", permanent=True)
+    duration = float(info.get("format", {}).get("duration") or video.get("duration") or 0)
+    return ProbeResult(
+        duration=duration,
+        height=int(video.get("height") or 0),
+        has_audio=any(s.get("codec_type") == "audio" for s in streams),
+    )
+
+
+def select_ladder(source_height: int) -> List[Rendition]:
+    ladder = [r for r in LADDER if r.height <= source_height]
+    return ladder or [LADDER[-1]]
+
+
+def build_command(source: Path, output: Path, ladder: List[Rendition], has_audio: bool, threads: int) -> List[str]:
+    segment = settings.HLS_SEGMENT_SECONDS
+    # yuv420p: профиль main и плееры не поддерживают 4:2:2/4:4:4 (ProRes, запись с камер)
+    split = f"[0:v]format=yuv420p,split={len(ladder)}" + "".join(f"[v{i}]" for i in range(len(ladder)))
+    scales = [f"[v{i}]scale=-2:{r.height}[v{i}out]" for i, r in enumerate(ladder)]
+
+    command = [
+        settings.FFMPEG_BINARY, "-hide_banner", "-nostdin", "-y", "-i", str(source),
+        "-filter_complex", ";".join([split, *scales]),
+        "-threads", str(threads),
+    ]
+    for i, rendition in enumerate(ladder):
+        command += [
+            "-map", f"[v{i}out]",
+            f"-c:v:{i}", "libx264", "-preset", "veryfast", "-profile:v", "main",
+            f"-b:v:{i}", f"{rendition.video_bitrate_k}k",
+            f"-maxrate:v:{i}", f"{int(rendition.video_bitrate_k * 1.07)}k",
+            f"-bufsize:v:{i}", f"{rendition.video_bitrate_k * 3 // 2}k",
+        ]
+        if has_audio:
+            command += ["-map", "0:a:0", f"-c:a:{i}", "aac", f"-b:a:{i}", f"{rendition.audio_bitrate_k}k", "-ac", "2"]
+
+    stream_map = " ".join(
+        f"v:{i},a:{i},name:{r.height}p" if has_audio else f"v:{i},name:{r.height}p"
+        for i, r in enumerate(ladder)
+    )
+    command += [
+        # Ключевые кадры на границах сегментов — переключение качеств без артефактов
+        "-force_key_frames", f"expr:gte(t,n_forced*{segment})",
+        "-sc_threshold", "0",
+        "-f", "hls",
+        "-hls_time", str(segment),
+        "-hls_playlist_type", "vod",
+        "-hls_flags", "independent_segments",
+        "-hls_segment_filename", str(output / "%v" / "seg_%05d.ts"),
+        "-master_pl_name", MASTER_PLAYLIST,
+        "-var_stream_map", stream_map,
+        str(output / "%v" / "index.m3u8"),
+    ]
+    return command
+
+
+async def transcode_to_hls(source: str) -> TranscodeResult:
+    """
+    Перекодирует uploads/videos/<source> в uploads/hls/<stem>/.
+    Результат собирается во временном каталоге и подменяет готовый целиком.
+    """
+    source_key = f"videos/{source}"
+    prefix = output_prefix_for(source)
+    output = storage.local_path(prefix)
+
+    with tempfile.TemporaryDirectory(prefix="hls-") as work:
+        source_path = storage.local_path(source_key)
+        if source_path is None:
+            if not await storage.exists(source_key):
+                raise FileNotFoundError(f"Исходное видео не найдено: {source_key}")
+            source_path = Path(work) / source
+            await storage.download_file(source_key, source_path)
+        elif not source_path.is_file():
+            raise FileNotFoundError(f"Исходное видео не найдено: {source_path}")
+
+        # Локально — рядом с результатом (rename без копирования), иначе — во временном каталоге
+        staging = output.with_name(f".{output.name}.tmp") if output is not None else Path(work) / "hls"
+
+        async with _get_slots():
+            info = await probe(source_path)
+            ladder = select_ladder(info.height)
+            shutil.rmtree(staging, ignore_errors=True)
+            for rendition in ladder:
+                (staging / f"{rendition.height}p").mkdir(parents=True)
+
+            threads = max(1, _cores() // transcode_concurrency())
+            started = perf_counter()
+            try:
+                await _run(*build_command(source_path, staging, ladder, info.has_audio, threads))
+            except BaseException:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+            wall_seconds = perf_counter() - started
+
+        if output is not None:
+            shutil.rmtree(output, ignore_errors=True)
+            os.replace(staging, output)
+        else:
+            await _upload_output(staging, prefix)
+
+    result = TranscodeResult(
+        master_url=f"/uploads/{prefix}/{MASTER_PLAYLIST}",
+        renditions=ladder,
+        media_seconds=info.duration,
+        wall_seconds=wall_seconds,
+    )
+    HLS_TRANSCODE_SECONDS.observe(wall_seconds)
+    HLS_TRANSCODE_SPEED.observe(result.speed)
+    return result
+
+
+async def _upload_output(staging: Path, prefix: str) -> None:
+    """Сегменты, затем плейлисты качеств, затем master: плеер не увидит плейлист без сегментов"""
+    files = sorted(path.relative_to(staging).as_posix() for path in staging.rglob("*") if path.is_file())
+    stages = (
+        [name for name in files if not name.endswith(".m3u8")],
+        [name for name in files if name.endswith(".m3u8") and name != MASTER_PLAYLIST],
+        [MASTER_PLAYLIST],
+    )
+    slots = asyncio.Semaphore(settings.S3_CONCURRENCY * 2)
+
+    async def upload(name: str) -> None:
+        async with slots:
+            await storage.save_file(f"{prefix}/{name}", staging / name)
+
+    for stage in stages:
+        await asyncio.gather(*(upload(name) for name in stage))
+    # Сегменты прошлой упаковки, которых нет в новой (меньше качеств или короче видео)
+    stale = [info.key async for info in storage.list(prefix + "/") if info.key[len(prefix) + 1:] not in files]
+    await asyncio.gather(*(storage.delete(key) for key in stale))
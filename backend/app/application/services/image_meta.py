@@ -0,0 +1,115 @@
+"""
+Метаданные загруженных изображений для плейсхолдеров: размеры, доминирующий
+цвет и крошечное превью (LQIP — data: URI WebP, которое next/image принимает
+как blurDataURL).
+
+Декодирование — работа для CPU, поэтому она идёт в пуле процессов
+(IMAGE_META_WORKERS), а не в event loop. JPEG декодируется сразу в уменьшенном
+масштабе (draft): полное разрешение не нужно ни цвету, ни превью, а размеры
+берутся из заголовка.
+"""
+import asyncio
+import base64
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import Optional
+
+import numpy as np
+
+from app.config import settings
+from app.infrastructure.storage import key_for_url, storage
+from app.utils.metrics import IMAGE_META_SECONDS
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+# EXIF Orientation: значения, при которых кадр повёрнут на 90°
+_ROTATED = (5, 6, 7, 8)
+# Сетка для доминирующего цвета: 4 бита на канал
+_COLOR_BITS = 4
+
+
+class ImageMetaError(ValueError):
+    """Файл не читается как изображение — повтор не поможет"""
+
+
+def image_meta_workers() -> int:
+    return max(1, settings.IMAGE_META_WORKERS or os.cpu_count() or 1)
+
+
+def _dominant_color(pixels: np.ndarray) -> str:
+    """Самая населённая ячейка цветовой сетки; цвет — среднее её пикселей"""
+    shift = 8 - _COLOR_BITS
+    bins = pixels >> shift
+    index = (bins[:, 0].astype(np.int32) << (2 * _COLOR_BITS)) | (bins[:, 1].astype(np.int32) << _COLOR_BITS) | bins[:, 2]
+    top = np.bincount(index).argmax()
+    red, green, blue = pixels[index == top].mean(axis=0).round().astype(int)
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def analyze_image(data: bytes, placeholder_size: int) -> dict:
+    """Размеры, цвет и LQIP; выполняется в процессе пула"""
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            width, height = source.size
+            if source.getexif().get(0x0112) in _ROTATED:
+                width, height = height, width
+            # Для JPEG декодер сразу уменьшает в 2–8 раз; на других форматах не действует
+            source.draft("RGB", (placeholder_size * 8, placeholder_size * 8))
+            oriented = ImageOps.exif_transpose(source)
+            has_alpha = oriented.mode in ("RGBA", "LA") or "transparency" in oriented.info
+            image: Image.Image = oriented.convert("RGBA" if has_alpha else "RGB")
+    except (OSError, ValueError, Image.DecompressionBombError) as exc:
+        raise ImageMetaError(f"Не удалось прочитать изображение: {exc}") from exc
+
+    sample = image.copy()
+    sample.thumbnail((64, 64), Image.Resampling.BILINEAR)
+    pixels = np.asarray(sample).reshape(-1, len(sample.getbands()))
+    if has_alpha:
+        # У логотипов на прозрачном фоне цвет — по видимым пикселям
+        opaque = pixels[pixels[:, 3] >= 128]
+        pixels = opaque if len(opaque) else pixels
+    color = _dominant_color(pixels[:, :3])
+
+    image.thumbnail((placeholder_size, placeholder_size), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, "WEBP", quality=30, method=6)
+    placeholder = "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+    return {"width": width, "height": height, "dominant_color": color, "placeholder": placeholder}
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # forkserver: дочерние процессы не наследуют потоки и соединения event loop
+        _executor = ProcessPoolExecutor(
+            max_workers=image_meta_workers(), mp_context=multiprocessing.get_context("forkserver")
+        )
+    return _executor
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def describe_image(url: str) -> dict:
+    """Читает /uploads/images/... из хранилища и считает метаданные в пуле процессов"""
+    key = key_for_url(url)
+    if key is None:
+        raise ImageMetaError(f"Не загруженный файл: {url}")
+    data = b"".join([chunk async for chunk in storage.open(key)])
+    started = perf_counter()
+    loop = asyncio.get_running_loop()
+    meta = await loop.run_in_executor(_get_executor(), analyze_image, data, settings.IMAGE_PLACEHOLDER_SIZE)
+    IMAGE_META_SECONDS.observe(perf_counter() - started)
+    return {"url": url, **meta}
@@ -0,0 +1,226 @@
+"""
+Фоновые задачи на PostgreSQL: реестр обработчиков, постановка в очередь и воркер.
+
+Задача ставится в той же транзакции, что и бизнес-данные (enqueue_job без commit),
+и выполняется процессом `python -m app.worker`. Отдельный брокер не нужен:
+конкурентный разбор — через FOR UPDATE SKIP LOCKED.
+"""
+import asyncio
+import os
+import random
+import socket
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.infrastructure.db.models.job import Job
+from app.infrastructure.db.repositories.jobs import SqlAlchemyJobRepository
+from app.infrastructure.db.session import AsyncSessionLocal
+from app.utils.metrics import (
+    JOB_DURATION,
+    JOB_QUEUE_LAG,
+    JOB_WORKER_ERRORS,
+    JOBS_IN_PROGRESS,
+    JOBS_PROCESSED,
+)
+
+Handler = Callable[[dict], Awaitable[None]]
+
+
+class PermanentJobError(Exception):
+    """Ошибка, при которой повтор бессмыслен: задача сразу уходит в dead letter"""
+
+
+@dataclass(frozen=True)
+class JobTask:
+    name: str
+    handler: Handler
+    max_attempts: int
+    timeout: float
+    priority: int = 0
+
+
+TASKS: Dict[str, JobTask] = {}
+
+
+def task(
+    name: str,
+    *,
+    max_attempts: Optional[int] = None,
+    timeout: Optional[float] = None,
+    priority: int = 0,
+) -> Callable[[Handler], Handler]:
+    """Регистрирует async-обработчик задачи: `@task("payments.process")`"""
+
+    def decorator(handler: Handler) -> Handler:
+        if name in TASKS:
+            raise ValueError(f"Задача уже зарегистрирована: {name}")
+        TASKS[name] = JobTask(
+            name=name,
+            handler=handler,
+            max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+            timeout=timeout or settings.JOB_TIMEOUT_SECONDS,
+            priority=priority,
+        )
+        return handler
+
+    return decorator
+
+
+def enqueue_job(
+    db: AsyncSession,
+    name: str,
+    payload: dict,
+    *,
+    priority: Optional[int] = None,
+    run_at: Optional[datetime] = None,
+    delay: Optional[float] = None,
+) -> Job:
+    """Кладёт задачу в очередь текущей транзакции; станет видна воркерам после commit"""
+    registered = TASKS.get(name)
+    if registered is None:
+        raise ValueError(f"Неизвестная задача: {name}")
+    if delay is not None:
+        run_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+    return SqlAlchemyJobRepository(db).enqueue(
+        name,
+        payload,
+        priority=registered.priority if priority is None else priority,
+        run_at=run_at,
+        max_attempts=registered.max_attempts,
+        timeout_seconds=int(registered.timeout),
+    )
+
+
+def retry_at(attempts: int, max_attempts: int) -> Optional[datetime]:
+    """Экспоненциальная задержка с джиттером; None — попытки исчерпаны"""
+    if attempts >= max_attempts:
+        return None
+    delay = min(settings.JOB_MAX_BACKOFF_SECONDS, settings.JOB_BACKOFF_BASE_SECONDS * (2 ** (attempts - 1)))
+    delay = delay / 2 + random.uniform(0, delay / 2)
+    return datetime.now(timezone.utc) + timedelta(seconds=delay)
+
+
+class JobWorker:
+    """
+    N независимых потребителей в одном event loop.
+
+    Каждый потребитель забирает по одной задаче, выполняет её и фиксирует
+    результат. Задачи упавших процессов возвращаются в очередь по истечении
+    аренды (таймаут задачи + JOB_LEASE_GRACE_SECONDS) — обработчики должны
+    быть идемпотентными.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        poll_interval: float,
+        lease_grace_seconds: int,
+        maintenance_interval: float = 60.0,
+    ) -> None:
+        self._concurrency = max(1, concurrency)
+        self._poll_interval = poll_interval
+        self._lease_grace_seconds = lease_grace_seconds
+        self._maintenance_interval = maintenance_interval
+        self._worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Прекращает забирать новые задачи; начатые доводятся до конца"""
+        self._stopping.set()
+
+    async def run(self) -> None:
+        consumers = [
+            asyncio.create_task(self._consume(index), name=f"job-consumer-{index}")
+            for index in range(self._concurrency)
+        ]
+        maintenance = asyncio.create_task(self._maintain(), name="job-maintenance")
+        try:
+            await asyncio.gather(*consumers)
+        finally:
+            maintenance.cancel()
+            await asyncio.gather(maintenance, return_exceptions=True)
+
+    async def _consume(self, index: int) -> None:
+        worker_id = f"{self._worker_id}:{index}"
+        while not self._stopping.is_set():
+            try:
+                processed = await self.process_one(worker_id)
+            except Exception:
+                JOB_WORKER_ERRORS.labels("consumer").inc()
+                processed = False
+            if processed:
+                continue
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def process_one(self, worker_id: str) -> bool:
+        """Выполняет одну задачу; False — очередь пуста"""
+        async with AsyncSessionLocal() as db:
+            jobs = await SqlAlchemyJobRepository(db).claim(1, worker_id, self._lease_grace_seconds)
+        if not jobs:
+            return False
+
+        job = jobs[0]
+        error = await self._execute(job)
+
+        async with AsyncSessionLocal() as db:
+            repo = SqlAlchemyJobRepository(db)
+            if error is None:
+                JOBS_PROCESSED.labels(job.task, "done").inc()
+                await repo.complete(job.id, worker_id)
+                return True
+
+            permanent, message = error
+            next_run = None if permanent else retry_at(job.attempts, job.max_attempts)
+            JOBS_PROCESSED.labels(job.task, "retry" if next_run else "dead").inc()
+            print(f"⚠️ jobs: {job.task} ({job.id}) попытка {job.attempts}: {message}")
+            await repo.fail(job.id, worker_id, message, next_run)
+        return True
+
+    async def _execute(self, job: Job) -> Optional[tuple[bool, str]]:
+        """Запускает обработчик; возвращает (окончательная ли ошибка, текст) или None"""
+        registered = TASKS.get(job.task)
+        if registered is None:
+            return True, f"Неизвестная задача: {job.task}"
+
+        if job.run_at is not None:
+            JOB_QUEUE_LAG.labels(job.task).observe(
+                max((datetime.now(timezone.utc) - job.run_at).total_seconds(), 0.0)
+            )
+        started = perf_counter()
+        JOBS_IN_PROGRESS.inc()
+        try:
+            await asyncio.wait_for(registered.handler(job.payload), timeout=registered.timeout)
+        except PermanentJobError as exc:
+            return True, f"{type(exc).__name__}: {exc}"
+        except asyncio.TimeoutError:
+            return False, f"Таймаут {registered.timeout:.0f} с"
+        except Exception as exc:
+            return False, f"{type(exc).__name__}: {exc}"
+        finally:
+            JOBS_IN_PROGRESS.dec()
+            JOB_DURATION.labels(job.task).observe(perf_counter() - started)
+        return None
+
+    async def _maintain(self) -> None:
+        """Периодически возвращает зависшие задачи и чистит выполненные"""
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    repo = SqlAlchemyJobRepository(db)
+                    recovered = await repo.recover_stale()
+                    purged = await repo.purge_finished(settings.JOB_RETENTION_DAYS)
+                if recovered:
+                    print(f"⚠️ jobs: возвращено в очередь зависших задач: {recovered}")
+                if purged:
+                    print(f"jobs: удалено выполненных задач: {purged}")
+            except Exception:
+                JOB_WORKER_ERRORS.labels("maintenance").inc()
+            await asyncio.sleep(self._maintenance_interval)
@@ -0,0 +1,65 @@
+"""
+Какие загрузки — видео уроков.
+
+Такие файлы (исходник videos/<файл> и каталог HLS hls/<имя>/) отдаются
+только по подписанной ссылке /media; публичная раздача /uploads их не
+отдаёт. Кешируется только положительный ответ — по «группе» файлов одного
+видео, чтобы сегменты HLS не проверялись по БД каждый; отрицательный всегда
+сверяется с БД (видео могли привязать к уроку в другом процессе).
+"""
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.services.hls import HLS_DIR, SOURCE_PREFIX
+from app.config import settings
+from app.infrastructure.db.repositories.courses import SqlAlchemyCoursesRepository
+from app.infrastructure.storage.base import UPLOADS_URL_PREFIX
+from app.utils.cache import TTLCache
+
+VIDEOS_DIR = SOURCE_PREFIX[len(UPLOADS_URL_PREFIX):].strip("/")
+
+lesson_media_cache: TTLCache[str, bool] = TTLCache(
+    "lesson_media",
+    maxsize=settings.LESSON_MEDIA_CACHE_SIZE,
+    ttl=settings.LESSON_MEDIA_CACHE_TTL_SECONDS,
+)
+
+
+def video_group(key: str) -> Optional[str]:
+    """videos/<файл> или hls/<имя> — файлы одного видео; None — ключ не из видео"""
+    parts = key.split("/")
+    if parts[0] == VIDEOS_DIR and len(parts) == 2:
+        return key
+    if parts[0] == HLS_DIR and len(parts) >= 3:
+        return f"{HLS_DIR}/{parts[1]}"
+    return None
+
+
+async def _lookup(db: AsyncSession, group: str) -> bool:
+    repo = SqlAlchemyCoursesRepository(db)
+    if group.startswith(f"{HLS_DIR}/"):
+        # Каталог hls/<имя> собран из videos/<имя>.<расширение>
+        name = group[len(HLS_DIR) + 1:]
+        return await repo.has_lesson_video(
+            video_url_prefix=f"{SOURCE_PREFIX}{name}.",
+            hls_url_prefix=f"{UPLOADS_URL_PREFIX}{group}/",
+        )
+    return await repo.has_lesson_video(video_url=f"{UPLOADS_URL_PREFIX}{group}")
+
+
+async def is_lesson_media(db: AsyncSession, key: str) -> bool:
+    group = video_group(key)
+    if group is None:
+        return False
+    if lesson_media_cache.get(group):
+        return True
+    found = await _lookup(db, group)
+    if found:
+        lesson_media_cache.set(group, True)
+    return found
+
+
+def forget_lesson_media() -> None:
+    """Сбросить кеш после сохранения уроков (в других процессах — не дольше TTL)"""
+    lesson_media_cache.clear()
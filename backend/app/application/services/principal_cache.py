@@ -0,0 +1,40 @@
+"""
+Кеш аутентифицированных пользователей для get_current_user.
+
+Ключ — (user_id, token_version): смена роли или пароля увеличивает
+token_version, и старые токены перестают попадать в кеш.
+"""
+from typing import Optional, Tuple
+from uuid import UUID
+
+from app.config import settings
+from app.infrastructure.db.models.user import User
+from app.utils.cache import TTLCache
+
+PrincipalKey = Tuple[UUID, int]
+
+principal_cache: TTLCache[PrincipalKey, User] = TTLCache(
+    "principals",
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def snapshot_user(user: User) -> User:
+    """Отвязанная от сессии копия пользователя для кеша"""
+    return User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+
+
+def get_principal(user_id: UUID, token_version: int) -> Optional[User]:
+    return principal_cache.get((user_id, token_version))
+
+
+def remember_principal(user: User) -> User:
+    principal = snapshot_user(user)
+    principal_cache.set((principal.id, principal.token_version), principal)
+    return principal
+
+
+def invalidate_principal(user_id: UUID) -> None:
+    """Сбрасывает все закешированные версии пользователя в этом процессе"""
+    principal_cache.discard_where(lambda key: key[0] == user_id)
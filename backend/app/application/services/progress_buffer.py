@@ -0,0 +1,192 @@
+"""
+Буфер прогресса обучения: объединяет частые обновления от плеера в пакетные записи.
+
+Обновления копятся в памяти процесса (по одному значению на enrollment) и
+сбрасываются одним `UPDATE ... FROM (VALUES ...)` по таймеру или при
+заполнении буфера, а также при остановке приложения. Прогресс только растёт
+(GREATEST), поэтому буферы разных воркеров uvicorn не перетирают друг друга.
+
+Отчёты плеера — прогресс только курсов без уроков. Если уроки есть, прогресс
+считается из отмеченных уроков (POST /lessons, битовая карта), и буфер его
+не трогает: иначе пересчёт и GREATEST из буфера спорили бы за одно поле.
+"""
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import DateTime, Integer, cast, column, func, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from app.config import settings
+from app.infrastructure.db.models.enrollment import Enrollment
+from app.infrastructure.db.session import AsyncSessionLocal
+from app.utils.metrics import (
+    PROGRESS_BUFFER_PENDING,
+    PROGRESS_FLUSH_DURATION,
+    PROGRESS_FLUSH_FAILURES,
+    PROGRESS_FLUSH_ROWS,
+    PROGRESS_UPDATES,
+)
+
+# Ограничение на число строк в одном VALUES (размер запроса и параметров asyncpg)
+FLUSH_CHUNK_SIZE = 1000
+
+
+# (enrollment_id, user_id): владелец — часть ключа, чужой id не вытеснит чужое обновление
+PendingKey = Tuple[UUID, UUID]
+
+
+@dataclass
+class PendingProgress:
+    progress: int
+    completed_at: Optional[datetime] = None
+
+    def merge(self, progress: int, completed_at: Optional[datetime]) -> None:
+        self.progress = max(self.progress, progress)
+        if completed_at is not None and (self.completed_at is None or completed_at < self.completed_at):
+            self.completed_at = completed_at
+
+
+class ProgressBuffer:
+    def __init__(self, flush_interval: float, max_pending: int) -> None:
+        self._flush_interval = flush_interval
+        self._max_pending = max(1, max_pending)
+        self._pending: Dict[PendingKey, PendingProgress] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._flush_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run(), name="progress-buffer")
+
+    async def stop(self) -> None:
+        """Останавливает фоновый сброс и записывает всё накопленное"""
+        self._stopping = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush("shutdown")
+
+    def record(
+        self,
+        enrollment_id: UUID,
+        user_id: UUID,
+        progress: int,
+        completed_at: Optional[datetime] = None,
+    ) -> None:
+        """
+        Принимает обновление без обращения к БД.
+
+        Принадлежность enrollment пользователю проверяется при сбросе
+        (условие user_id в UPDATE): чужие id просто не обновятся.
+        """
+        key = (enrollment_id, user_id)
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = PendingProgress(progress, completed_at)
+            PROGRESS_BUFFER_PENDING.set(len(self._pending))
+        else:
+            pending.merge(progress, completed_at)
+        PROGRESS_UPDATES.inc()
+
+        if len(self._pending) >= self._max_pending:
+            self._wakeup.set()
+
+    def pending_progress(self, enrollment_id: UUID, user_id: UUID) -> Optional[PendingProgress]:
+        """Ещё не записанное значение — чтобы GET сразу видел свои обновления"""
+        return self._pending.get((enrollment_id, user_id))
+
+    def overlay(self, enrollment: Enrollment) -> Enrollment:
+        """Накладывает несброшенный прогресс на загруженную запись (без изменения БД)"""
+        pending = self.pending_progress(enrollment.id, enrollment.user_id)
+        if pending is not None and not enrollment.tracks_lessons:
+            enrollment.progress = max(enrollment.progress or 0, pending.progress)
+            if enrollment.completed_at is None:
+                enrollment.completed_at = pending.completed_at
+        return enrollment
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval)
+                trigger = "size"
+            except asyncio.TimeoutError:
+                trigger = "interval"
+            self._wakeup.clear()
+            if self._stopping:
+                break
+            try:
+                await self.flush(trigger)
+            except Exception:
+                # Пачка уже возвращена в буфер — учтено в PROGRESS_FLUSH_FAILURES
+                pass
+
+    async def flush(self, trigger: str = "manual") -> int:
+        """Записывает накопленные обновления; возвращает число строк в пачке"""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            PROGRESS_BUFFER_PENDING.set(0)
+
+            started = perf_counter()
+            items = list(batch.items())
+            try:
+                async with AsyncSessionLocal() as db:
+                    for offset in range(0, len(items), FLUSH_CHUNK_SIZE):
+                        await db.execute(_bulk_update(items[offset:offset + FLUSH_CHUNK_SIZE]))
+                    await db.commit()
+            except Exception:
+                PROGRESS_FLUSH_FAILURES.labels(trigger).inc()
+                # Возвращаем пачку в буфер (с объединением более свежих значений) — повторим позже
+                for key, pending in items:
+                    current = self._pending.get(key)
+                    if current is None:
+                        self._pending[key] = pending
+                    else:
+                        current.merge(pending.progress, pending.completed_at)
+                PROGRESS_BUFFER_PENDING.set(len(self._pending))
+                raise
+
+            PROGRESS_FLUSH_DURATION.labels(trigger).observe(perf_counter() - started)
+            PROGRESS_FLUSH_ROWS.observe(len(items))
+            return len(items)
+
+
+def _bulk_update(items: List[Tuple[PendingKey, PendingProgress]]):
+    """UPDATE enrollments ... FROM (VALUES ...) с монотонным прогрессом и проверкой владельца;
+    записи курсов с уроками пропускаются — их прогресс ведут отметки уроков"""
+    rows = values(
+        column("id", PG_UUID(as_uuid=True)),
+        column("user_id", PG_UUID(as_uuid=True)),
+        column("progress", Integer),
+        column("completed_at", DateTime(timezone=True)),
+        name="v",
+    ).data([(enrollment_id, user_id, p.progress, p.completed_at) for (enrollment_id, user_id), p in items])
+
+    return (
+        update(Enrollment)
+        .where(Enrollment.id == rows.c.id, Enrollment.user_id == rows.c.user_id, ~Enrollment.tracks_lessons)
+        .values(
+            progress=func.greatest(Enrollment.progress, rows.c.progress),
+            # NULL в VALUES без типа — PostgreSQL считает его text
+            completed_at=func.coalesce(Enrollment.completed_at, cast(rows.c.completed_at, DateTime(timezone=True))),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+progress_buffer = ProgressBuffer(
+    flush_interval=settings.PROGRESS_FLUSH_SECONDS,
+    max_pending=settings.PROGRESS_FLUSH_MAX_PENDING,
+)
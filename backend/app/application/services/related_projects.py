@@ -0,0 +1,250 @@
+"""
+Похожие проекты: векторизация атрибутов и пакетный top-K на NumPy.
+
+Сходство двух проектов = Σ вес_блока · косинус_блока ∈ [0, 1] по блокам:
+
+- категория и клиент — one-hot;
+- инструменты — multi-hot с весами IDF (редкий инструмент сближает сильнее);
+- год — «размытый» one-hot (соседние годы с весом 0.5): близкие годы похожи.
+
+Результат пишется в project_related; страница проекта читает готовый список.
+При изменении проекта пересчитываются только затронутые списки (задача
+projects.refresh_related). Полный пересчёт (первичное заполнение):
+
+    python -m app.application.services.related_projects
+"""
+import asyncio
+from time import perf_counter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from app.config import settings
+from app.infrastructure.db.repositories.related_projects import (
+    Neighbour,
+    ProjectFeatures,
+    SqlAlchemyRelatedProjectsRepository,
+)
+from app.infrastructure.db.session import AsyncSessionLocal, engine
+
+# Веса блоков (сумма = 1 — оценка сходства лежит в [0, 1])
+CATEGORY_WEIGHT = 0.3
+TOOLS_WEIGHT = 0.35
+CLIENT_WEIGHT = 0.2
+YEAR_WEIGHT = 0.15
+YEAR_SPREAD = ((-1, 0.5), (0, 1.0), (1, 0.5))
+# Ниже этого сходства проекты не считаются похожими
+MIN_SCORE = 0.05
+# Строк матрицы сходства за раз: batch × N float32 (~16 МБ)
+BATCH_CELLS = 4_000_000
+# При равном сходстве выше новые проекты (меньше шага между значениями score)
+RECENCY_EPSILON = 1e-4
+
+
+def _key(value: Optional[str]) -> Optional[str]:
+    value = (value or "").strip().lower()
+    return value or None
+
+
+def _codes(values: Iterable[Optional[str]]) -> np.ndarray:
+    """Код значения (одинаковые строки — одинаковый код); -1 — пусто"""
+    index: Dict[str, int] = {}
+    return np.array(
+        [index.setdefault(key, len(index)) if key else -1 for key in map(_key, values)],
+        dtype=np.int32,
+    )
+
+
+def _normalize_rows(block: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(block, axis=1, keepdims=True)
+    return np.asarray(np.divide(block, norms, out=np.zeros_like(block), where=norms > 0))
+
+
+class ProjectVectors:
+    """
+    Признаки проектов в порядке списка projects.
+
+    Категория и клиент — one-hot, их косинус равен 1 при совпадении, поэтому
+    они хранятся кодами и сравниваются на равенство: с сотнями клиентов
+    плотный блок раздул бы матричное умножение на порядок. Плотная часть
+    (инструменты и год) уже умножена на √веса.
+    """
+
+    def __init__(self, projects: Sequence[ProjectFeatures]) -> None:
+        n = len(projects)
+        self.categories = _codes(p.category for p in projects)
+        self.clients = _codes(p.client for p in projects)
+
+        tools = sorted({t for p in projects for t in (_key(x) for x in p.tools) if t})
+        tool_index = {t: i for i, t in enumerate(tools)}
+        years = [p.year for p in projects if p.year]
+        first_year = min(years) - 1 if years else 0
+        year_span = (max(years) - first_year + 2) if years else 0
+
+        tools_block = np.zeros((n, len(tools)), dtype=np.float32)
+        year_block = np.zeros((n, year_span), dtype=np.float32)
+        for row, project in enumerate(projects):
+            for tool in {t for t in (_key(x) for x in project.tools) if t}:
+                tools_block[row, tool_index[tool]] = 1.0
+            if project.year:
+                for delta, weight in YEAR_SPREAD:
+                    year_block[row, project.year - first_year + delta] = weight
+
+        if tools:
+            # IDF: инструмент из каждого проекта почти ничего не говорит о сходстве
+            document_frequency = tools_block.sum(axis=0)
+            tools_block *= np.log((1 + n) / (1 + document_frequency)) + 1
+
+        self.dense = np.hstack([
+            _normalize_rows(tools_block) * np.float32(np.sqrt(TOOLS_WEIGHT)),
+            _normalize_rows(year_block) * np.float32(np.sqrt(YEAR_WEIGHT)),
+        ])
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def scores(self, rows: np.ndarray) -> np.ndarray:
+        """Сходство строк rows со всеми проектами: len(rows) × N"""
+        scores = np.asarray(self.dense[rows] @ self.dense.T)
+        for codes, weight in ((self.categories, CATEGORY_WEIGHT), (self.clients, CLIENT_WEIGHT)):
+            same = (codes[rows, None] == codes[None, :]) & (codes[None, :] >= 0)
+            scores += same * np.float32(weight)
+        return scores
+
+
+def _recency(projects: Sequence[ProjectFeatures]) -> np.ndarray:
+    """Ранг по дате создания в [0, 1]: 1 — самый новый"""
+    stamps = np.array(
+        [p.created_at.timestamp() if p.created_at else 0.0 for p in projects],
+        dtype=np.float64,
+    )
+    if len(stamps) < 2:
+        return np.zeros(len(stamps), dtype=np.float32)
+    ranks = stamps.argsort(kind="stable").argsort(kind="stable")
+    return (ranks / (len(stamps) - 1)).astype(np.float32)
+
+
+def top_k(
+    vectors: ProjectVectors,
+    rows: Sequence[int],
+    k: int,
+    recency: Optional[np.ndarray] = None,
+) -> Iterator[Tuple[int, List[Tuple[int, float]]]]:
+    """Для каждой строки из rows — до k ближайших проектов (индекс, сходство)"""
+    n = len(vectors)
+    k = min(k, n - 1)
+    if k <= 0:
+        for row in rows:
+            yield row, []
+        return
+
+    batch = max(1, BATCH_CELLS // max(n, 1))
+    indices = np.asarray(rows, dtype=np.int64)
+    for start in range(0, len(indices), batch):
+        chunk = indices[start:start + batch]
+        scores = vectors.scores(chunk)
+        ranking = scores if recency is None else scores + recency[None, :] * RECENCY_EPSILON
+        ranking[np.arange(len(chunk)), chunk] = -np.inf
+        # argpartition — O(N) на строку; сортируются только k кандидатов
+        candidates = np.argpartition(-ranking, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(ranking, candidates, axis=1), axis=1, kind="stable")
+        best = np.take_along_axis(candidates, order, axis=1)
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        for row, neighbours, values in zip(chunk, best, best_scores, strict=True):
+            yield int(row), [(int(j), float(s)) for j, s in zip(neighbours, values, strict=True) if s >= MIN_SCORE]
+
+
+def compute_all(projects: Sequence[ProjectFeatures], k: int) -> Dict[UUID, List[Neighbour]]:
+    """Полный пересчёт: top-K для каждого проекта"""
+    return compute_rows(projects, range(len(projects)), k)
+
+
+def compute_rows(
+    projects: Sequence[ProjectFeatures],
+    rows: Iterable[int],
+    k: int,
+    vectors: Optional[ProjectVectors] = None,
+) -> Dict[UUID, List[Neighbour]]:
+    if not projects:
+        return {}
+    if vectors is None:
+        vectors = ProjectVectors(projects)
+    recency = _recency(projects)
+    return {
+        projects[row].id: [Neighbour(projects[j].id, score) for j, score in neighbours]
+        for row, neighbours in top_k(vectors, list(rows), k, recency)
+    }
+
+
+def affected_rows(
+    projects: Sequence[ProjectFeatures],
+    vectors: ProjectVectors,
+    changed_id: UUID,
+    current: Dict[UUID, List[Neighbour]],
+    k: int,
+) -> Set[int]:
+    """
+    Списки, которые может изменить правка (или удаление) проекта changed_id:
+    сам проект; списки, где он уже есть; неполные списки; списки, чей
+    худший сосед хуже нового сходства с ним.
+    """
+    changed_row = next((row for row, p in enumerate(projects) if p.id == changed_id), None)
+    similarity = vectors.scores(np.array([changed_row]))[0] if changed_row is not None else None
+
+    rows: Set[int] = set()
+    if changed_row is not None:
+        rows.add(changed_row)
+    full = min(k, len(projects) - 1)
+    for row, project in enumerate(projects):
+        if row == changed_row:
+            continue
+        neighbours = current.get(project.id, [])
+        if len(neighbours) < full or any(n.related_id == changed_id for n in neighbours):
+            rows.add(row)
+        elif similarity is not None and similarity[row] > neighbours[-1].score:
+            rows.add(row)
+    return rows
+
+
+async def rebuild_related(project_id: Optional[UUID] = None) -> None:
+    """
+    Пересчёт после изменения проекта project_id; без него (или при пустой
+    таблице) — полный. Всё в одной транзакции под advisory-блокировкой.
+    """
+    started = perf_counter()
+    k = settings.RELATED_PROJECTS_K
+    async with AsyncSessionLocal() as db:
+        repo = SqlAlchemyRelatedProjectsRepository(db)
+        await repo.lock()
+        projects = await repo.load_features()
+        full = project_id is None or not await repo.count()
+        if project_id is None or full:
+            lists = await asyncio.to_thread(compute_all, projects, k)
+        else:
+            current = await repo.load_current()
+
+            def compute() -> Dict[UUID, List[Neighbour]]:
+                vectors = ProjectVectors(projects)
+                return compute_rows(projects, affected_rows(projects, vectors, project_id, current, k), k, vectors)
+
+            lists = await asyncio.to_thread(compute)
+        written = await repo.replace(lists, clear_all=full)
+        await db.commit()
+
+    scope = "полный" if full else f"после {project_id}"
+    print(
+        f"✅ Похожие проекты ({scope}): {len(lists)} из {len(projects)} списков, "
+        f"{written} строк за {perf_counter() - started:.2f}s"
+    )
+
+
+async def _main() -> None:
+    try:
+        await rebuild_related()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,85 @@
+"""
+Пересчёт агрегатов админ-панели (stats_*) из сырых таблиц.
+
+В обычной работе агрегаты ведут триггеры БД; пересчёт нужен после миграции
+(первичное заполнение) и для исправления расхождений. Диапазон делится на куски
+по CHUNK_WEEKS недель, прошлые куски пересчитываются параллельно в отдельных
+сессиях: новые записи всегда попадают в текущий день, поэтому прошлое без
+блокировок не меняется (кроме удалений, идущих одновременно с пересчётом).
+Текущая неделя пересчитывается последней под SHARE-блокировкой сырых таблиц,
+чтобы вставка не попала между DELETE и INSERT ... SELECT.
+
+    python -m app.application.services.stats_rollups --workers 4
+"""
+import argparse
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from time import perf_counter
+from typing import List, Tuple
+
+from app.infrastructure.db.repositories.stats import SqlAlchemyStatsRepository
+from app.infrastructure.db.session import AsyncSessionLocal, engine
+
+CHUNK_WEEKS = 8
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def split_range(first: date, until: date, weeks: int = CHUNK_WEEKS) -> List[Tuple[date, date]]:
+    """Полуинтервалы [start, end) с границами по понедельникам, от first до until"""
+    chunks = []
+    start = week_start(first)
+    while start < until:
+        end = min(start + timedelta(weeks=weeks), until)
+        chunks.append((start, end))
+        start = end
+    return chunks
+
+
+async def _rebuild_chunk(start: date, end: date, lock: bool = False) -> int:
+    async with AsyncSessionLocal() as db:
+        repo = SqlAlchemyStatsRepository(db)
+        if lock:
+            await repo.lock_raw_tables()
+        rows = await repo.rebuild(start, end)
+        await db.commit()
+    return rows
+
+
+async def backfill(workers: int = 4) -> int:
+    """Пересчитывает все агрегаты; возвращает число прочитанных сырых строк"""
+    started = perf_counter()
+    async with AsyncSessionLocal() as db:
+        first = await SqlAlchemyStatsRepository(db).first_event_day()
+    current = week_start(datetime.now(timezone.utc).date())
+    chunks = split_range(first, current) if first else []
+
+    semaphore = asyncio.Semaphore(max(1, workers))
+
+    async def run(start: date, end: date) -> int:
+        async with semaphore:
+            return await _rebuild_chunk(start, end)
+
+    rows = sum(await asyncio.gather(*(run(start, end) for start, end in chunks)))
+    rows += await _rebuild_chunk(current, current + timedelta(weeks=1), lock=True)
+
+    print(
+        f"✅ Агрегаты пересчитаны: {len(chunks) + 1} кусков, {rows} строк "
+        f"за {perf_counter() - started:.2f}s ({workers} воркеров)"
+    )
+    return rows
+
+
+async def _main(workers: int) -> None:
+    try:
+        await backfill(workers)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Пересчёт агрегатов админ-панели")
+    parser.add_argument("--workers", type=int, default=4, help="параллельных кусков (соединений с БД)")
+    asyncio.run(_main(parser.parse_args().workers))
@@ -0,0 +1,411 @@
+"""
+Индекс подсказок (автодополнение) по названиям проектов, курсов, статей и клиентов.
+
+Живёт в памяти процесса: строится при старте, обновляется при записи через
+API этого процесса и перестраивается каждые SUGGEST_REBUILD_SECONDS — так
+подтягиваются изменения из других воркеров uvicorn.
+
+Названия приводятся к латинице (транслитерация + свёртка вариантов написания),
+поэтому «клип», «klip» и «КЛИП» находят одно и то же. Поиск идёт по ступеням,
+пока не набрано `limit` подсказок:
+
+1. начало названия — bisect по отсортированному списку названий;
+2. начала слов в любом месте названия — bisect по списку (слово, запись);
+3. опечатки — похожие слова словаря по триграммам, затем шаг 2 с ними.
+
+Списки просматриваются с ранним выходом, поэтому время поиска зависит от
+`limit`, а не от размера индекса. Триграммы строятся по словарю (уникальные
+слова), а не по записям — память растёт со словарём, а не с числом названий.
+"""
+import asyncio
+import re
+import sys
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from dataclasses import dataclass
+from itertools import islice, product
+from time import perf_counter
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+from uuid import UUID
+
+from app.config import settings
+from app.infrastructure.db.repositories.search import SqlAlchemySearchRepository, SuggestSource
+from app.infrastructure.db.session import AsyncSessionLocal
+from app.utils.metrics import (
+    SUGGEST_INDEX_BUILD_FAILURES,
+    SUGGEST_INDEX_BUILD_SECONDS,
+    SUGGEST_INDEX_BYTES,
+    SUGGEST_INDEX_SIZE,
+    SUGGEST_LOOKUP_SECONDS,
+)
+
+EntryKey = Tuple[str, UUID]
+
+# Длинные названия индексируются по началу — память на запись ограничена
+MAX_TITLE_LENGTH = 200
+# Сколько строк списка просматривается для одного префикса (короткий префикс совпадает с тысячами)
+MAX_PREFIX_SCAN = 2000
+# Сколько похожих слов проверяется для слова запроса с опечаткой
+MAX_CORRECTIONS = 3
+
+_TRANSLIT = str.maketrans({
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "e", "ж": "zh",
+    "з": "z", "и": "i", "й": "i", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o",
+    "п": "p", "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f", "х": "h", "ц": "ts",
+    "ч": "ch", "ш": "sh", "щ": "sch", "ъ": "", "ы": "y", "ь": "", "э": "e", "ю": "yu",
+    "я": "ya",
+})
+# Разные латинские записи одного русского слова сводятся к одной (для индекса и запроса)
+_LATIN_FOLDS = (
+    ("shch", "sch"), ("kh", "h"), ("ja", "ya"), ("ju", "yu"),
+    ("w", "v"), ("y", "i"), ("j", "i"),
+)
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Нижний регистр, без диакритики, кириллица → латиница"""
+    # NFKD без диакритики: «ё» → «е», «й» → «и», «café» → «cafe»
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.translate(_TRANSLIT)
+    for source, target in _LATIN_FOLDS:
+        text = text.replace(source, target)
+    return text
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD.findall(normalize(text))
+
+
+def trigrams(word: str) -> FrozenSet[str]:
+    """Триграммы слова как в pg_trgm: два пробела в начале и один в конце"""
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    type: str
+    id: UUID
+    slug: Optional[str]
+    title: str
+
+
+@dataclass(frozen=True)
+class _Entry:
+    suggestion: Suggestion
+    public: bool
+    # Варианты названия после нормализации: слова через один пробел
+    titles: Tuple[str, ...]
+    words: Tuple[str, ...]
+
+
+def _make_entry(source: SuggestSource) -> _Entry:
+    variants = [tokenize(variant[:MAX_TITLE_LENGTH]) for variant in source.variants]
+    return _Entry(
+        suggestion=Suggestion(source.type, source.id, source.slug, source.title[:MAX_TITLE_LENGTH]),
+        public=source.public,
+        titles=tuple(dict.fromkeys(" ".join(words) for words in variants if words)),
+        words=tuple(dict.fromkeys(word for words in variants for word in words)),
+    )
+
+
+def _prefix_range(items: List[Tuple[str, EntryKey]], prefix: str) -> Tuple[int, int]:
+    """Границы строк с prefix в отсортированном списке — два bisect"""
+    return bisect_left(items, (prefix,)), bisect_left(items, (prefix + "\uffff",))
+
+
+def _scan(items: List[Tuple[str, EntryKey]], prefix: str) -> Iterator[Tuple[str, EntryKey]]:
+    """Строки отсортированного списка, начинающиеся с prefix (не больше MAX_PREFIX_SCAN)"""
+    start, end = _prefix_range(items, prefix)
+    for position in range(start, min(end, start + MAX_PREFIX_SCAN)):
+        yield items[position]
+
+
+class _Index:
+    """Структуры индекса; меняются только из event loop (или до публикации)"""
+
+    def __init__(self) -> None:
+        self.entries: Dict[EntryKey, _Entry] = {}
+        # (текст, ключ) по возрастанию — префикс ищется bisect'ом
+        self.titles: List[Tuple[str, EntryKey]] = []
+        self.words: List[Tuple[str, EntryKey]] = []
+        # Словарь: слово → число записей с ним; триграмма → слова словаря
+        self.vocabulary: Dict[str, int] = {}
+        self.postings: Dict[str, Set[str]] = {}
+
+    @classmethod
+    def build(cls, sources: Iterable[SuggestSource], max_entries: int) -> "_Index":
+        index = cls()
+        for source in sources:
+            if len(index.entries) >= max_entries:
+                break
+            key = (source.type, source.id)
+            entry = _make_entry(source)
+            index.entries[key] = entry
+            index.titles.extend((title, key) for title in entry.titles)
+            index.words.extend((word, key) for word in entry.words)
+            for word in entry.words:
+                index._count_word(word)
+        index.titles.sort()
+        index.words.sort()
+        return index
+
+    def _count_word(self, word: str) -> None:
+        count = self.vocabulary.get(word, 0)
+        self.vocabulary[word] = count + 1
+        if count == 0:
+            for gram in trigrams(word):
+                self.postings.setdefault(gram, set()).add(word)
+
+    def _uncount_word(self, word: str) -> None:
+        count = self.vocabulary.pop(word, 0) - 1
+        if count > 0:
+            self.vocabulary[word] = count
+            return
+        for gram in trigrams(word):
+            words = self.postings.get(gram)
+            if words is not None:
+                words.discard(word)
+                if not words:
+                    del self.postings[gram]
+
+    def add(self, key: EntryKey, entry: _Entry) -> None:
+        self.entries[key] = entry
+        for title in entry.titles:
+            insort(self.titles, (title, key))
+        for word in entry.words:
+            insort(self.words, (word, key))
+            self._count_word(word)
+
+    def remove(self, key: EntryKey) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for items, texts in ((self.titles, entry.titles), (self.words, entry.words)):
+            for text in texts:
+                position = bisect_left(items, (text, key))
+                if position < len(items) and items[position] == (text, key):
+                    del items[position]
+        for word in entry.words:
+            self._uncount_word(word)
+
+    def similar_words(self, token: str, min_similarity: float) -> List[str]:
+        """Слова словаря, содержащие не меньше min_similarity триграмм token (word_similarity pg_trgm)"""
+        grams = trigrams(token)
+        overlap: Counter = Counter()
+        for gram in grams:
+            overlap.update(self.postings.get(gram, ()))
+        threshold = min_similarity * len(grams)
+        ranked = sorted(
+            (word for word, shared in overlap.items() if shared >= threshold),
+            key=lambda word: (-overlap[word], abs(len(word) - len(token)), word),
+        )
+        return ranked[:MAX_CORRECTIONS]
+
+    def approx_bytes(self) -> int:
+        """Грубая оценка памяти: строки, кортежи списков, словарь и триграммы"""
+        tuple_size = sys.getsizeof(("", ("", None)))
+        total = sum(
+            sys.getsizeof(items)
+            for items in (self.entries, self.titles, self.words, self.vocabulary, self.postings)
+        )
+        total += len(self.titles) * tuple_size + sum(sys.getsizeof(title) for title, _ in self.titles)
+        total += len(self.words) * tuple_size + sum(sys.getsizeof(word) for word in self.vocabulary)
+        total += sum(sys.getsizeof(gram) + sys.getsizeof(words) for gram, words in self.postings.items())
+        total += sum(
+            sys.getsizeof(entry.suggestion.title) + sys.getsizeof(entry.words) + 300
+            for entry in self.entries.values()
+        )
+        return total
+
+
+class SuggestIndex:
+    def __init__(self, max_entries: int, rebuild_interval: float, min_similarity: float) -> None:
+        self._max_entries = max(1, max_entries)
+        self._rebuild_interval = rebuild_interval
+        self._min_similarity = min_similarity
+        self._index = _Index()
+        self._ready = False
+        self._task: Optional[asyncio.Task] = None
+        # Изменения, пришедшие во время перестроения, применяются к новому индексу
+        self._journal: Optional[List[Tuple[EntryKey, Optional[SuggestSource]]]] = None
+        self._warned_full = False
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._index.entries)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="suggest-index")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.rebuild()
+            except Exception:
+                SUGGEST_INDEX_BUILD_FAILURES.inc()
+            if self._rebuild_interval <= 0:
+                return
+            await asyncio.sleep(self._rebuild_interval)
+
+    async def rebuild(self) -> None:
+        """Строит индекс заново из БД и атомарно подменяет текущий"""
+        started = perf_counter()
+        self._journal = []
+        try:
+            async with AsyncSessionLocal() as db:
+                sources = await SqlAlchemySearchRepository(db).suggest_sources()
+            # Сборка — чистый Python; в потоке, чтобы не держать event loop
+            index = await asyncio.to_thread(_Index.build, sources, self._max_entries)
+            journal, self._journal = self._journal, None
+        except BaseException:
+            self._journal = None
+            raise
+        if len(sources) > self._max_entries:
+            print(f"⚠️ suggest index: {len(sources)} названий, в индекс вошло {self._max_entries} (SUGGEST_MAX_ENTRIES)")
+        self._publish(index, journal)
+
+        elapsed = perf_counter() - started
+        SUGGEST_INDEX_BUILD_SECONDS.observe(elapsed)
+        print(f"✅ suggest index: {len(index.entries)} записей за {elapsed * 1000:.0f} мс")
+
+    def load(self, sources: Iterable[SuggestSource]) -> None:
+        """Синхронная сборка из готового списка (бенчмарки, утилиты)"""
+        self._publish(_Index.build(sources, self._max_entries), [])
+
+    def _publish(self, index: _Index, journal: List[Tuple[EntryKey, Optional[SuggestSource]]]) -> None:
+        self._index = index
+        for key, source in journal:
+            self._apply(key, source)
+        self._ready = True
+        SUGGEST_INDEX_BYTES.set(index.approx_bytes())
+        self._refresh_size()
+
+    def upsert(self, source: SuggestSource) -> None:
+        key = (source.type, source.id)
+        if self._journal is not None:
+            self._journal.append((key, source))
+        self._apply(key, source)
+        self._refresh_size()
+
+    def remove(self, type_: str, id_: UUID) -> None:
+        key = (type_, id_)
+        if self._journal is not None:
+            self._journal.append((key, None))
+        self._apply(key, None)
+        self._refresh_size()
+
+    def _apply(self, key: EntryKey, source: Optional[SuggestSource]) -> None:
+        self._index.remove(key)
+        if source is None:
+            return
+        if len(self._index.entries) >= self._max_entries:
+            if not self._warned_full:
+                print(f"⚠️ suggest index: достигнут предел SUGGEST_MAX_ENTRIES={self._max_entries}")
+                self._warned_full = True
+            return
+        self._index.add(key, _make_entry(source))
+
+    def stats(self) -> Dict[str, int]:
+        """Записи, слова словаря и триграммы"""
+        return {
+            "entries": len(self._index.entries),
+            "words": len(self._index.vocabulary),
+            "trigrams": len(self._index.postings),
+        }
+
+    def memory_bytes(self) -> int:
+        return self._index.approx_bytes()
+
+    def _refresh_size(self) -> None:
+        for structure, size in self.stats().items():
+            SUGGEST_INDEX_SIZE.labels(structure).set(size)
+
+    def suggest(
+        self,
+        text: str,
+        limit: int = 8,
+        types: Optional[Iterable[str]] = None,
+        include_hidden: bool = False,
+    ) -> List[Suggestion]:
+        started = perf_counter()
+        try:
+            return self._suggest(text, limit, set(types) if types else None, include_hidden)
+        finally:
+            SUGGEST_LOOKUP_SECONDS.observe(perf_counter() - started)
+
+    def _suggest(self, text: str, limit: int, types: Optional[Set[str]], include_hidden: bool) -> List[Suggestion]:
+        tokens = tokenize(text)
+        if not tokens:
+            return []
+        index = self._index
+        found: Dict[EntryKey, None] = {}
+
+        def take(key: EntryKey) -> bool:
+            """Добавляет запись, если она подходит; True — набрано limit"""
+            if key not in found and (types is None or key[0] in types):
+                if include_hidden or index.entries[key].public:
+                    found[key] = None
+            return len(found) >= limit
+
+        def by_words(words: List[str]) -> bool:
+            # Идём по самому редкому префиксу, остальные проверяем у записи
+            ranges = {word: _prefix_range(index.words, word) for word in words}
+            anchor = min(ranges, key=lambda word: ranges[word][1] - ranges[word][0])
+            rest = [word for word in ranges if word != anchor]
+            for _, key in _scan(index.words, anchor):
+                if key in found:
+                    continue
+                entry_words = index.entries[key].words
+                if all(any(w.startswith(word) for w in entry_words) for word in rest) and take(key):
+                    return True
+            return False
+
+        # 1. Начало названия
+        for _, key in _scan(index.titles, " ".join(tokens)):
+            if take(key):
+                return self._result(found)
+
+        # 2. Начала слов в любом месте названия
+        if by_words(tokens):
+            return self._result(found)
+
+        # 3. Опечатки: слова, с которых не начинается ни одно слово словаря, заменяются похожими
+        alternatives = []
+        for token in tokens:
+            start, end = _prefix_range(index.words, token)
+            if start < end:
+                alternatives.append([token])
+            else:
+                alternatives.append(index.similar_words(token, self._min_similarity))
+        if all(alternatives) and any(a != [t] for a, t in zip(alternatives, tokens, strict=True)):
+            for words in islice(product(*alternatives), MAX_CORRECTIONS ** 2):
+                if by_words(list(words)):
+                    break
+        return self._result(found)
+
+    def _result(self, found: Dict[EntryKey, None]) -> List[Suggestion]:
+        return [self._index.entries[key].suggestion for key in found]
+
+
+suggest_index = SuggestIndex(
+    max_entries=settings.SUGGEST_MAX_ENTRIES,
+    rebuild_interval=settings.SUGGEST_REBUILD_SECONDS,
+    min_similarity=settings.SUGGEST_MIN_SIMILARITY,
+)
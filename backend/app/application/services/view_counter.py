@@ -0,0 +1,153 @@
+"""
+Буфер просмотров проектов и статей: счётчики в памяти, пакетная запись в content_views.
+
+Просмотр только увеличивает счётчик и добавляет посетителя в HyperLogLog-скетч
+(материал, день) — без обращения к БД. Буфер сбрасывается одним
+`INSERT ... ON CONFLICT DO UPDATE` по таймеру, при заполнении и при остановке:
+число записей зависит от числа просмотренных материалов, а не от трафика.
+Сложение просмотров и объединение скетчей (hll_union) коммутативны, поэтому
+буферы разных воркеров uvicorn не мешают друг другу.
+"""
+import asyncio
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from app.config import settings
+from app.infrastructure.db.repositories.content_views import SqlAlchemyContentViewsRepository
+from app.infrastructure.db.session import AsyncSessionLocal
+from app.utils.hll import HyperLogLog
+from app.utils.metrics import (
+    CONTENT_VIEWS,
+    VIEWS_BUFFER_PENDING,
+    VIEWS_DROPPED,
+    VIEWS_FLUSH_DURATION,
+    VIEWS_FLUSH_FAILURES,
+    VIEWS_FLUSH_ROWS,
+)
+
+# Строк в одном INSERT: каждая несёт скетч в 2 КБ
+FLUSH_CHUNK_SIZE = 500
+
+# (content_type, content_id, день UTC)
+PendingKey = Tuple[str, UUID, date]
+
+
+@dataclass
+class PendingViews:
+    views: int = 0
+    visitors: HyperLogLog = field(default_factory=HyperLogLog)
+    failed_flushes: int = 0  # неудачных записей, в которых уже были эти просмотры
+
+    def merge(self, other: "PendingViews") -> None:
+        self.views += other.views
+        self.visitors.merge(other.visitors)
+        self.failed_flushes = max(self.failed_flushes, other.failed_flushes)
+
+
+class ViewBuffer:
+    def __init__(self, flush_interval: float, max_pending: int, max_attempts: int) -> None:
+        self._flush_interval = flush_interval
+        self._max_pending = max(1, max_pending)
+        self._max_attempts = max(1, max_attempts)
+        self._pending: Dict[PendingKey, PendingViews] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._flush_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run(), name="view-buffer")
+
+    async def stop(self) -> None:
+        """Останавливает фоновый сброс и записывает всё накопленное"""
+        self._stopping = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush("shutdown")
+
+    def record(self, content_type: str, content_id: UUID, visitor: str) -> None:
+        """Учитывает просмотр; существование материала проверяется при сбросе"""
+        key = (content_type, content_id, datetime.now(timezone.utc).date())
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = PendingViews()
+            VIEWS_BUFFER_PENDING.set(len(self._pending))
+        pending.views += 1
+        pending.visitors.add(visitor)
+        CONTENT_VIEWS.labels(content_type).inc()
+
+        if len(self._pending) >= self._max_pending:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval)
+                trigger = "size"
+            except asyncio.TimeoutError:
+                trigger = "interval"
+            self._wakeup.clear()
+            if self._stopping:
+                break
+            try:
+                await self.flush(trigger)
+            except Exception:
+                # Пачка уже возвращена в буфер (или отброшена) — учтено в метриках
+                VIEWS_FLUSH_FAILURES.labels(trigger).inc()
+
+    async def flush(self, trigger: str = "manual") -> int:
+        """Записывает накопленные просмотры; возвращает число строк в пачке"""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            VIEWS_BUFFER_PENDING.set(0)
+
+            started = perf_counter()
+            items = list(batch.items())
+            rows: List[tuple] = [
+                (content_type, content_id, day, pending.views, pending.visitors.to_bytes())
+                for (content_type, content_id, day), pending in items
+            ]
+            try:
+                async with AsyncSessionLocal() as db:
+                    repo = SqlAlchemyContentViewsRepository(db)
+                    for offset in range(0, len(rows), FLUSH_CHUNK_SIZE):
+                        await repo.upsert(rows[offset:offset + FLUSH_CHUNK_SIZE])
+                    await db.commit()
+            except Exception:
+                # Возвращаем пачку в буфер (вместе с новыми просмотрами) — повторим позже;
+                # после max_attempts неудач подряд просмотры отбрасываются, чтобы буфер не рос
+                for key, pending in items:
+                    pending.failed_flushes += 1
+                    if pending.failed_flushes >= self._max_attempts:
+                        VIEWS_DROPPED.labels(key[0]).inc(pending.views)
+                        continue
+                    current = self._pending.get(key)
+                    if current is None:
+                        self._pending[key] = pending
+                    else:
+                        current.merge(pending)
+                VIEWS_BUFFER_PENDING.set(len(self._pending))
+                raise
+
+            VIEWS_FLUSH_DURATION.labels(trigger).observe(perf_counter() - started)
+            VIEWS_FLUSH_ROWS.observe(len(rows))
+            return len(rows)
+
+
+view_buffer = ViewBuffer(
+    flush_interval=settings.VIEWS_FLUSH_SECONDS,
+    max_pending=settings.VIEWS_FLUSH_MAX_PENDING,
+    max_attempts=settings.VIEWS_FLUSH_MAX_ATTEMPTS,
+)
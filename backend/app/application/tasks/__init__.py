@@ -0,0 +1,12 @@
+"""
+Обработчики фоновых задач.
+
+Модули пакета регистрируют задачи декоратором `@task` при импорте;
+воркер (`python -m app.worker`) импортирует пакет целиком.
+"""
+
+from app.application.tasks import (
+    media,  # noqa: F401
+    payments,  # noqa: F401
+    projects,  # noqa: F401
+)
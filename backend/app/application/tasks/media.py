@@ -0,0 +1,63 @@
+"""
+Фоновая обработка загрузок: упаковка видео в HLS и плейсхолдеры изображений.
+
+После перекодирования master-плейлист записывается в video_hls_url уроков и
+проектов, у которых video_url указывает на исходный файл. Исходный MP4 остаётся:
+он нужен превью и браузерам без HLS. Метаданные изображений ложатся в
+media_meta по URL файла — списки подхватывают их без правки проектов.
+"""
+from sqlalchemy import update
+
+from app.application.services.hls import SOURCE_PREFIX, TranscodeError, transcode_to_hls
+from app.application.services.image_meta import ImageMetaError, describe_image
+from app.application.services.jobs import PermanentJobError, task
+from app.config import settings
+from app.infrastructure.db.models.course import Lesson
+from app.infrastructure.db.models.project import Project
+from app.infrastructure.db.repositories.media_meta import SqlAlchemyMediaMetaRepository
+from app.infrastructure.db.session import AsyncSessionLocal
+
+TRANSCODE_HLS = "media.transcode_hls"
+IMAGE_META = "media.image_meta"
+
+
+@task(TRANSCODE_HLS, max_attempts=3, timeout=settings.HLS_TRANSCODE_TIMEOUT_SECONDS, priority=-10)
+async def transcode_hls(payload: dict) -> None:
+    source = payload["source"]
+    try:
+        result = await transcode_to_hls(source)
+    except FileNotFoundError as exc:
+        raise PermanentJobError(str(exc)) from exc
+    except TranscodeError as exc:
+        if exc.permanent:
+            raise PermanentJobError(str(exc)) from exc
+        raise
+
+    source_url = f"{SOURCE_PREFIX}{source}"
+    async with AsyncSessionLocal() as db:
+        lessons = await db.execute(
+            update(Lesson).where(Lesson.video_url == source_url).values(video_hls_url=result.master_url)
+        )
+        projects = await db.execute(
+            update(Project).where(Project.video_url == source_url).values(video_hls_url=result.master_url)
+        )
+        await db.commit()
+
+    qualities = ", ".join(f"{r.height}p" for r in result.renditions)
+    print(
+        f"✅ HLS: {source} → {result.master_url} ({qualities}); "
+        f"{result.media_seconds:.1f} с видео за {result.wall_seconds:.1f} с — x{result.speed:.2f} к реальному времени; "
+        f"уроков: {lessons.rowcount}, проектов: {projects.rowcount}"
+    )
+
+
+@task(IMAGE_META, max_attempts=3, timeout=120)
+async def image_meta(payload: dict) -> None:
+    try:
+        meta = await describe_image(payload["url"])
+    except (FileNotFoundError, ImageMetaError) as exc:
+        raise PermanentJobError(str(exc)) from exc
+
+    async with AsyncSessionLocal() as db:
+        await SqlAlchemyMediaMetaRepository(db).upsert_many([meta])
+        await db.commit()
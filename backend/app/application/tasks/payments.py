@@ -0,0 +1,137 @@
+"""
+Обработка оплаченных заказов YooKassa в фоне.
+
+Webhook только регистрирует событие и ставит задачу; здесь — подтверждение
+статуса через API, запись на курс и письмо. Задача идемпотентна: повтор после
+сбоя не создаст второй enrollment и второе письмо.
+"""
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from time import perf_counter
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.exc import IntegrityError
+
+from app.application.services.email_outbox import COURSE_ENROLLMENT_CONFIRMATION, enqueue_email
+from app.application.services.enrollment_cache import invalidate_enrollments
+from app.application.services.jobs import PermanentJobError, task
+from app.infrastructure.db.repositories.courses import SqlAlchemyCoursesRepository
+from app.infrastructure.db.repositories.enrollments import SqlAlchemyEnrollmentsRepository
+from app.infrastructure.db.repositories.processed_payments import (
+    SqlAlchemyProcessedPaymentsRepository,
+)
+from app.infrastructure.db.session import AsyncSessionLocal
+from app.infrastructure.integrations.yookassa import YooKassaError, get_payment
+from app.utils.metrics import PAYMENT_WEBHOOK_STAGE_DURATION
+
+PROCESS_YOOKASSA_PAYMENT = "payments.process_yookassa"
+
+# Платёж ещё не в финальном статусе — проверим позже
+PENDING_STATUSES = frozenset({"pending", "waiting_for_capture"})
+# Итоговые статусы processed_payments; 'received' — обработка ещё не завершена
+FINAL_STATUSES = frozenset({"enrolled", "ignored", "rejected"})
+
+
+async def _finish(payment_id: str, status: str, error: Optional[str] = None) -> None:
+    async with AsyncSessionLocal() as db:
+        await SqlAlchemyProcessedPaymentsRepository(db).mark(payment_id, status, error=error)
+        await db.commit()
+
+
+def _parse_metadata(payment: Dict[str, Any]) -> Tuple[UUID, UUID, Optional[str]]:
+    metadata: Dict[str, Any] = payment.get("metadata") or {}
+    course_id_raw = metadata.get("courseId")
+    user_id_raw = metadata.get("userId")
+    if not course_id_raw or not user_id_raw:
+        raise ValueError("Missing metadata: courseId/userId")
+    try:
+        return UUID(str(course_id_raw)), UUID(str(user_id_raw)), metadata.get("userEmail")
+    except ValueError:
+        raise ValueError("Invalid metadata UUIDs") from None
+
+
+def _parse_amount(payment: Dict[str, Any]) -> Optional[Decimal]:
+    """Сумма платежа ({"amount": {"value": "1990.00", "currency": "RUB"}}); None — не распознана"""
+    try:
+        return Decimal(str((payment.get("amount") or {})["value"]))
+    except (KeyError, TypeError, InvalidOperation):
+        return None
+
+
+@task(PROCESS_YOOKASSA_PAYMENT, max_attempts=10, timeout=60, priority=10)
+async def process_yookassa_payment(payload: dict) -> None:
+    payment_id = payload["payment_id"]
+
+    started = perf_counter()
+    try:
+        payment = await get_payment(payment_id)
+    except YooKassaError as exc:
+        if exc.status_code in (400, 404):
+            # Платежа нет в магазине — поддельное или чужое событие
+            await _finish(payment_id, "rejected", str(exc))
+            raise PermanentJobError(str(exc)) from exc
+        raise
+    finally:
+        PAYMENT_WEBHOOK_STAGE_DURATION.labels("verify").observe(perf_counter() - started)
+
+    status = payment.get("status")
+    if status in PENDING_STATUSES:
+        raise RuntimeError(f"Платёж {payment_id} ещё в статусе {status}")
+    if status != "succeeded":
+        # Не подтверждено через API — считаем неуспешным
+        await _finish(payment_id, "ignored", f"status={status}")
+        return
+
+    try:
+        course_id, user_id, user_email = _parse_metadata(payment)
+    except ValueError as exc:
+        await _finish(payment_id, "rejected", str(exc))
+        raise PermanentJobError(str(exc)) from exc
+
+    started = perf_counter()
+    async with AsyncSessionLocal() as db:
+        processed_repo = SqlAlchemyProcessedPaymentsRepository(db)
+        course = await SqlAlchemyCoursesRepository(db).get_by_id(course_id)
+        if not course:
+            await processed_repo.mark(payment_id, "rejected", error="Course not found")
+            await db.commit()
+            raise PermanentJobError(f"Course not found: {course_id}")
+
+        enrollment_repo = SqlAlchemyEnrollmentsRepository(db)
+        amount = _parse_amount(payment)
+        await processed_repo.mark(payment_id, "enrolled", user_id=user_id, course_id=course_id, amount=amount)
+
+        existing = await enrollment_repo.get_by_user_and_course(user_id, course_id)
+        if existing:
+            await db.commit()
+        else:
+            # Статус события, письмо и enrollment — одна транзакция
+            if user_email:
+                enqueue_email(
+                    db,
+                    COURSE_ENROLLMENT_CONFIRMATION,
+                    {"user_email": user_email, "course_title": course.title},
+                )
+            try:
+                await enrollment_repo.create(user_id=user_id, course_id=course_id, progress=0)
+            except IntegrityError as exc:
+                await db.rollback()
+                if not await enrollment_repo.get_by_user_and_course(user_id, course_id):
+                    # Не дубликат, а нарушение FK (пользователь удалён)
+                    await processed_repo.mark(payment_id, "rejected", error=str(exc.orig))
+                    await db.commit()
+                    raise PermanentJobError(f"Enrollment not created: {exc.orig}") from exc
+                # Запись уже создана параллельно — письмо не дублируем
+                await processed_repo.mark(
+                    payment_id, "enrolled", user_id=user_id, course_id=course_id, amount=amount
+                )
+                await db.commit()
+    # Кеш этого процесса; API-процессы проверяют отсутствующий в кеше курс по БД
+    invalidate_enrollments(user_id)
+    PAYMENT_WEBHOOK_STAGE_DURATION.labels("enroll").observe(perf_counter() - started)
+
+    received_at = payload.get("received_at")
+    if received_at:
+        lag = datetime.now(timezone.utc) - datetime.fromisoformat(received_at)
+        PAYMENT_WEBHOOK_STAGE_DURATION.labels("end_to_end").observe(max(lag.total_seconds(), 0.0))
@@ -0,0 +1,21 @@
+"""
+Фоновый пересчёт похожих проектов (project_related).
+
+Задача ставится при создании, удалении и изменении атрибутов проекта;
+пересчитываются только списки, которые правка могла изменить.
+"""
+from uuid import UUID
+
+from app.application.services.jobs import task
+from app.application.services.related_projects import rebuild_related
+
+REFRESH_RELATED = "projects.refresh_related"
+
+# Поля проекта, от которых зависит сходство
+RELATED_FIELDS = ("category", "tools", "client", "year")
+
+
+@task(REFRESH_RELATED, max_attempts=3, timeout=300)
+async def refresh_related(payload: dict) -> None:
+    project_id = payload.get("project_id")
+    await rebuild_related(UUID(project_id) if project_id else None)
@@ -18,6 +18,57 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 720
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+
+    # Хеширование паролей (bcrypt в отдельном пуле)
+    # Одна на все процессы; подобрать под железо: python -m benchmarks.bcrypt_throughput --target-ms 250
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+
+    # Кеш пользователей для аутентифицированных запросов
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_SIZE: int = 10000
+
+    # Кеш проверенных JWT (до exp) и отклонённых токенов
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_NEGATIVE_CACHE_TTL_SECONDS: int = 60
+
+    # Кеш множества курсов пользователя (пакетная проверка доступа, ссылки на видео уроков)
+    ENROLLMENT_CACHE_TTL_SECONDS: int = 60
+    ENROLLMENT_CACHE_SIZE: int = 10000
+
+    # Подписанные ссылки на видео уроков (пусто — подпись от JWT_SECRET)
+    MEDIA_URL_SECRET: str = ""
+    MEDIA_URL_TTL_SECONDS: int = 3600
+    # Внутренний location nginx с файлами uploads; пусто — файл отдаёт приложение
+    MEDIA_ACCEL_REDIRECT_PREFIX: str = ""
+    # Кеш «файл /uploads — видео урока» (такие файлы публично не отдаются)
+    LESSON_MEDIA_CACHE_TTL_SECONDS: int = 60
+    LESSON_MEDIA_CACHE_SIZE: int = 10000
+
+    # Перекодирование загруженных видео в HLS (фоновая задача, локальный ffmpeg)
+    HLS_TRANSCODE_ENABLED: bool = True
+    HLS_TRANSCODE_CONCURRENCY: int = 0  # 0 — по числу ядер (больше числа ядер не бывает)
+    HLS_TRANSCODE_TIMEOUT_SECONDS: int = 3600
+    HLS_SEGMENT_SECONDS: int = 4
+    FFMPEG_BINARY: str = "ffmpeg"
+    FFPROBE_BINARY: str = "ffprobe"
+
+    # Плейсхолдеры изображений (размеры, цвет, LQIP) — фоновая задача после загрузки
+    IMAGE_META_ENABLED: bool = True
+    IMAGE_META_WORKERS: int = 0  # процессов декодирования; 0 — по числу ядер
+    IMAGE_PLACEHOLDER_SIZE: int = 16  # большая сторона LQIP в пикселях
+
+    # Полнотекстовый поиск: сколько совпадений каждой таблицы ранжировать (широкие запросы)
+    SEARCH_RANK_CANDIDATES: int = 2000
+
+    # Индекс подсказок в памяти процесса (/api/suggest)
+    SUGGEST_MAX_ENTRIES: int = 50000
+    SUGGEST_REBUILD_SECONDS: int = 300  # подтягивает изменения из других воркеров; 0 — только при старте
+    SUGGEST_MIN_SIMILARITY: float = 0.5  # доля триграмм запроса для нечёткого совпадения
+
+    # Похожие проекты: сколько соседей хранить на проект (project_related)
+    RELATED_PROJECTS_K: int = 6
     
     # OAuth Google
     GOOGLE_CLIENT_ID: str = ""
@@ -35,6 +86,55 @@ class Settings(BaseSettings):
     # Email
     RESEND_API_KEY: str = ""
     ADMIN_EMAIL: str = "savage.movie@yandex.ru"
+
+    # Email outbox (фоновая отправка писем)
+    EMAIL_OUTBOX_ENABLED: bool = True
+    EMAIL_OUTBOX_BATCH_SIZE: int = 20
+    EMAIL_OUTBOX_CONCURRENCY: int = 4
+    EMAIL_OUTBOX_POLL_SECONDS: float = 5.0
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 8
+    EMAIL_OUTBOX_LEASE_SECONDS: int = 120
+    EMAIL_OUTBOX_MAX_BACKOFF_SECONDS: int = 3600
+
+    # Буфер прогресса обучения (POST /api/enrollments/{id}/progress)
+    PROGRESS_FLUSH_SECONDS: float = 2.0
+    PROGRESS_FLUSH_MAX_PENDING: int = 500  # сброс раньше таймера при стольких записях
+
+    # Счётчики просмотров проектов и статей (POST /api/views) — агрегаты в content_views
+    VIEWS_FLUSH_SECONDS: float = 30.0
+    VIEWS_FLUSH_MAX_PENDING: int = 5000  # материалов (за день) в буфере до досрочного сброса
+    VIEWS_FLUSH_MAX_ATTEMPTS: int = 10  # неудачных записей, после которых просмотры отбрасываются
+
+    # Выгрузки заявок и записей (GET /api/exports/*): строк на пачку серверного курсора
+    EXPORT_BATCH_SIZE: int = 2000
+
+    # Хранилище загрузок: local — каталог UPLOAD_DIR, s3 — S3-совместимое (AWS, MinIO, Yandex Object Storage)
+    STORAGE_DRIVER: str = "local"
+    S3_ENDPOINT_URL: str = ""  # пусто — https://s3.<S3_REGION>.amazonaws.com
+    S3_REGION: str = "us-east-1"
+    S3_BUCKET: str = ""
+    S3_ACCESS_KEY_ID: str = ""
+    S3_SECRET_ACCESS_KEY: str = ""
+    S3_PREFIX: str = ""  # префикс ключей внутри бакета
+    S3_PART_SIZE_MB: int = 8  # часть multipart (не меньше 5)
+    S3_CONCURRENCY: int = 4  # одновременных частей на файл
+
+    # Бэкапы (python -m app.tools.backup): пусто — каталог backups рядом с uploads
+    BACKUP_DIR: str = ""
+    BACKUP_WORKERS: int = 4  # потоков копирования файлов uploads
+    BACKUP_DB_JOBS: int = 2  # pg_dump/pg_restore -j
+    PG_DUMP_BINARY: str = "pg_dump"
+    PG_RESTORE_BINARY: str = "pg_restore"
+
+    # Фоновые задачи (python -m app.worker)
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_POLL_SECONDS: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_TIMEOUT_SECONDS: int = 300  # по умолчанию; задача может задать свой
+    JOB_LEASE_GRACE_SECONDS: int = 60  # запас аренды сверх таймаута задачи
+    JOB_BACKOFF_BASE_SECONDS: float = 10.0
+    JOB_MAX_BACKOFF_SECONDS: int = 3600
+    JOB_RETENTION_DAYS: int = 7  # сколько хранить выполненные задачи
     
     # Dev helpers (НЕ включать в production)
     # Если SEED_ADMIN=true, то при старте backend будет создан/обновлён админ-пользователь.
@@ -43,12 +143,22 @@ class Settings(BaseSettings):
     SEED_ADMIN_PASSWORD: str = ""
     SEED_ADMIN_FORCE_PASSWORD: bool = False
 
+    # Outbound HTTP (общие клиенты интеграций)
+    OUTBOUND_HTTP2: bool = False  # требует пакет h2 (pip install httpx[http2])
+    OUTBOUND_KEEPALIVE_SECONDS: float = 30.0
+    # Подмена базовых URL, например "resend=http://127.0.0.1:9000,yookassa=http://127.0.0.1:9001"
+    OUTBOUND_BASE_URL_OVERRIDES: str = ""
+
     # Payments (YooKassa)
     YOOKASSA_SHOP_ID: str = ""
     YOOKASSA_SECRET_KEY: str = ""
 
     # App URL
     APP_URL: str = "http://localhost:3000"
+
+    # Metrics
+    # Каталог для агрегации метрик между воркерами uvicorn (очищать перед стартом)
+    PROMETHEUS_MULTIPROC_DIR: str = ""
     
     @property
     def database_url(self) -> str:
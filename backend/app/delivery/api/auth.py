@@ -9,21 +9,51 @@ from typing import Optional
 from app.infrastructure.db.session import get_db
 from app.infrastructure.db.models.user import User
 from app.infrastructure.db.repositories.users import SqlAlchemyUsersRepository
-from app.interfaces.schemas.user import UserCreate, UserLogin, UserResponse, Token
-from app.application.services.auth_service import create_access_token, create_refresh_token, verify_token
+from app.interfaces.schemas.user import UserCreate, UserLogin, UserResponse, Token, TokenData
+from app.application.services.auth_service import (
+    create_access_token,
+    create_refresh_token,
+    token_claims,
+    verify_token,
+)
+from app.application.services.principal_cache import get_principal, remember_principal
 from app.infrastructure.integrations.oauth_service import (
     get_google_user_info,
     get_yandex_user_info,
     exchange_google_code,
     exchange_yandex_code,
 )
-from app.utils.security import hash_password, verify_password
+from app.utils.security import (
+    PasswordHasherBusy,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+)
 from app.config import settings
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 security = HTTPBearer(auto_error=False)
 
 
+async def resolve_principal(token_data: TokenData, db: AsyncSession) -> Optional[User]:
+    """
+    Пользователь по проверенному токену.
+
+    Обычно берётся из кеша по (user_id, token_version) без обращения к БД;
+    токен с устаревшей версией (роль/пароль изменены) не принимается.
+    """
+    principal = get_principal(token_data.user_id, token_data.token_version)
+    if principal is not None:
+        return principal
+
+    repo = SqlAlchemyUsersRepository(db)
+    user = await repo.get_by_id(token_data.user_id)
+    if user is None or (user.token_version or 0) != token_data.token_version:
+        return None
+
+    return remember_principal(user)
+
+
 async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: AsyncSession = Depends(get_db)
@@ -44,8 +74,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    repo = SqlAlchemyUsersRepository(db)
-    user = await repo.get_by_id(token_data.user_id)
+    user = await resolve_principal(token_data, db)
     
     if user is None:
         raise HTTPException(
@@ -70,7 +99,7 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
         )
     
     # Создаем нового пользователя
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await hash_password_async(user_data.password)
     new_user = await repo.create(
         {
             "email": user_data.email,
@@ -82,10 +111,10 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     
     # Создаем токены
     access_token = create_access_token(
-        data={"sub": str(new_user.id), "email": new_user.email}
+        data=token_claims(new_user)
     )
     refresh_token = create_refresh_token(
-        data={"sub": str(new_user.id), "email": new_user.email}
+        data=token_claims(new_user)
     )
     
     return Token(
@@ -107,18 +136,28 @@ async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
             detail="Неверный email или пароль",
         )
     
-    if not verify_password(credentials.password, user.password_hash):
+    if not await verify_password_async(credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Неверный email или пароль",
         )
     
+    # Пароль известен только сейчас — переводим хеш на текущую стоимость bcrypt
+    if needs_rehash(user.password_hash):
+        try:
+            new_hash = await hash_password_async(credentials.password)
+        except PasswordHasherBusy:
+            # Пул занят — обновим хеш при следующем входе
+            new_hash = None
+        if new_hash:
+            user = await repo.update(user, {"password_hash": new_hash}, revoke_tokens=False)
+    
     # Создаем токены
     access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email}
+        data=token_claims(user)
     )
     refresh_token = create_refresh_token(
-        data={"sub": str(user.id), "email": user.email}
+        data=token_claims(user)
     )
     
     return Token(
@@ -156,12 +195,19 @@ async def refresh_token(
             detail="Пользователь не найден",
         )
     
+    # После смены роли или пароля старые refresh token недействительны
+    if (user.token_version or 0) != token_data.token_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Недействительный refresh token",
+        )
+    
     # Создаем новые токены
     new_access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email}
+        data=token_claims(user)
     )
     new_refresh_token = create_refresh_token(
-        data={"sub": str(user.id), "email": user.email}
+        data=token_claims(user)
     )
     
     return Token(
@@ -242,10 +288,10 @@ async def google_oauth_callback(
     
     # Создаем токены
     jwt_access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email}
+        data=token_claims(user)
     )
     jwt_refresh_token = create_refresh_token(
-        data={"sub": str(user.id), "email": user.email}
+        data=token_claims(user)
     )
     
     # Редиректим на frontend с токенами
@@ -323,10 +369,10 @@ async def yandex_oauth_callback(
     
     # Создаем токены
     jwt_access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email}
+        data=token_claims(user)
     )
     jwt_refresh_token = create_refresh_token(
-        data={"sub": str(user.id), "email": user.email}
+        data=token_claims(user)
     )
     
     # Редиректим на frontend с токенами
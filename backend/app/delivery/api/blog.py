@@ -9,13 +9,16 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.delivery.api.auth import get_current_user
+from app.delivery.api.auth import get_current_user, resolve_principal
+from app.delivery.api.fieldsets import fields_response, projection_params
 from app.infrastructure.db.session import get_db
 from app.infrastructure.db.models.user import User
 from app.infrastructure.db.repositories.blog import SqlAlchemyBlogRepository
-from app.infrastructure.db.repositories.users import SqlAlchemyUsersRepository
-from app.interfaces.schemas.blog import BlogPost as BlogPostSchema, BlogPostCreate, BlogPostUpdate
+from app.interfaces.schemas.blog import BLOG_POST_FIELDS, BlogPost as BlogPostSchema, BlogPostCreate, BlogPostUpdate
+from app.interfaces.schemas.fieldsets import Projection
 from app.application.services.auth_service import verify_token
+from app.application.services.suggest_index import suggest_index
+from app.infrastructure.db.repositories.search import blog_source
 
 router = APIRouter(prefix="/api/blog", tags=["blog"])
 security = HTTPBearer(auto_error=False)
@@ -29,8 +32,7 @@ async def get_optional_user(
     token_data = verify_token(credentials.credentials)
     if token_data is None:
         return None
-    repo = SqlAlchemyUsersRepository(db)
-    return await repo.get_by_id(token_data.user_id)
+    return await resolve_principal(token_data, db)
 
 
 def estimate_reading_time(content: Optional[str]) -> Optional[str]:
@@ -46,10 +48,11 @@ async def get_posts(
     published: Optional[bool] = Query(None),
     limit: int = Query(100, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    projection: Optional[Projection] = Depends(projection_params(BLOG_POST_FIELDS)),
     current_user: Optional[User] = Depends(get_optional_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Получить список статей"""
+    """Получить список статей (?fields=slug,title,excerpt — без текста статей)"""
     if published is None:
         if not current_user or current_user.role != "admin":
             published = True
@@ -61,6 +64,9 @@ async def get_posts(
             )
 
     repo = SqlAlchemyBlogRepository(db)
+    if projection is not None:
+        rows = await repo.list_posts_fields(projection.fields, published, limit, offset)
+        return fields_response(BLOG_POST_FIELDS, projection, rows)
     return await repo.list_posts(published, limit, offset)
 
 
@@ -107,7 +113,9 @@ async def create_post(
     if not is_published:
         payload["published_at"] = None
 
-    return await repo.create(payload)
+    post = await repo.create(payload)
+    suggest_index.upsert(blog_source(post))
+    return post
 
 
 @router.put("/{post_id}", response_model=BlogPostSchema)
@@ -148,7 +156,9 @@ async def update_post(
         else:
             update_data["published_at"] = None
 
-    return await repo.update(post, update_data)
+    post = await repo.update(post, update_data)
+    suggest_index.upsert(blog_source(post))
+    return post
 
 
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -170,4 +180,5 @@ async def delete_post(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Статья не найдена")
 
     await repo.delete(post)
+    suggest_index.remove("blog", post.id)
     return None
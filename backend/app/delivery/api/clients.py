@@ -3,24 +3,32 @@ API роуты для клиентов
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from app.infrastructure.db.session import get_db
 from app.infrastructure.db.models.user import User
 from app.infrastructure.db.repositories.clients import SqlAlchemyClientsRepository
-from app.interfaces.schemas.client import Client as ClientSchema, ClientCreate, ClientUpdate
+from app.interfaces.schemas.client import CLIENT_FIELDS, Client as ClientSchema, ClientCreate, ClientUpdate
+from app.interfaces.schemas.fieldsets import Projection
+from app.application.services.suggest_index import suggest_index
+from app.infrastructure.db.repositories.search import client_source
 from app.delivery.api.auth import get_current_user
+from app.delivery.api.fieldsets import fields_response, projection_params
 
 router = APIRouter(prefix="/api/clients", tags=["clients"])
 
 
 @router.get("", response_model=List[ClientSchema])
 async def get_clients(
+    projection: Optional[Projection] = Depends(projection_params(CLIENT_FIELDS)),
     db: AsyncSession = Depends(get_db)
 ):
-    """Получить список клиентов"""
+    """Получить список клиентов (?fields=name,logo_url,media — только эти поля)"""
     repo = SqlAlchemyClientsRepository(db)
+    if projection is not None:
+        rows = await repo.list_clients_fields(projection.fields)
+        return fields_response(CLIENT_FIELDS, projection, rows)
     return await repo.list_clients()
 
 
@@ -56,7 +64,9 @@ async def create_client(
         )
     
     repo = SqlAlchemyClientsRepository(db)
-    return await repo.create(client_data.model_dump())
+    client = await repo.create(client_data.model_dump())
+    suggest_index.upsert(client_source(client))
+    return client
 
 
 @router.put("/{client_id}", response_model=ClientSchema)
@@ -84,7 +94,9 @@ async def update_client(
     
     # Обновляем поля
     update_data = client_data.model_dump(exclude_unset=True)
-    return await repo.update(client, update_data)
+    client = await repo.update(client, update_data)
+    suggest_index.upsert(client_source(client))
+    return client
 
 
 @router.delete("/{client_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -110,4 +122,5 @@ async def delete_client(
         )
     
     await repo.delete(client)
+    suggest_index.remove("client", client.id)
     return None
@@ -6,7 +6,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.infrastructure.db.session import get_db
 from app.infrastructure.db.models.contact import ContactSubmission
-from app.infrastructure.integrations.email_service import send_contact_form_notification
+from app.application.services.email_outbox import (
+    CONTACT_FORM_NOTIFICATION,
+    email_dispatcher,
+    enqueue_email,
+)
 from app.config import settings
 from app.interfaces.schemas.contact import ContactFormData
 
@@ -28,13 +32,14 @@ async def submit_contact_form(
         budget=form_data.budget
     )
     db.add(new_submission)
-    await db.commit()
-    await db.refresh(new_submission)
     
-    # Отправляем email администратору
-    await send_contact_form_notification(
-        settings.ADMIN_EMAIL,
-        form_data.model_dump()
+    # Письмо администратору — в той же транзакции, отправит фоновый диспетчер
+    enqueue_email(
+        db,
+        CONTACT_FORM_NOTIFICATION,
+        {"admin_email": settings.ADMIN_EMAIL, "submission": form_data.model_dump(mode="json")},
     )
+    await db.commit()
+    email_dispatcher.wake()
     
     return {"success": True, "message": "Заявка успешно отправлена"}
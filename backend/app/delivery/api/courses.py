@@ -9,27 +9,65 @@ from uuid import UUID
 from app.infrastructure.db.session import get_db
 from app.infrastructure.db.models.user import User
 from app.infrastructure.db.repositories.courses import SqlAlchemyCoursesRepository
-from app.interfaces.schemas.course import Course as CourseSchema, CourseCreate, CourseUpdate
+from app.interfaces.schemas.course import (
+    COURSE_FIELDS,
+    Course as CourseSchema,
+    CourseCreate,
+    CourseUpdate,
+    PublicCourse,
+)
+from app.interfaces.schemas.fieldsets import Projection
+from app.application.services.hls import hls_url_for
+from app.application.services.lesson_media import forget_lesson_media
+from app.application.services.suggest_index import suggest_index
+from app.infrastructure.db.repositories.search import course_source
 from app.delivery.api.auth import get_current_user
+from app.delivery.api.fieldsets import fields_response, projection_params
 
 router = APIRouter(prefix="/api/courses", tags=["courses"])
 
 
-@router.get("", response_model=List[CourseSchema])
+@router.get("", response_model=List[PublicCourse])
 async def get_courses(
     category: Optional[str] = Query(None),
     limit: int = Query(100, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    projection: Optional[Projection] = Depends(projection_params(COURSE_FIELDS)),
     db: AsyncSession = Depends(get_db)
 ):
-    """Получить список курсов"""
+    """Получить список курсов (?fields= — только эти поля, без модулей)"""
     repo = SqlAlchemyCoursesRepository(db)
+    if projection is not None:
+        rows = await repo.list_courses_fields(projection.fields, category, limit, offset)
+        return fields_response(COURSE_FIELDS, projection, rows)
     return await repo.list_courses(category, limit, offset)
 
 
-@router.get("/{slug}", response_model=CourseSchema)
+@router.get("/admin/{course_id}", response_model=CourseSchema)
+async def get_course_for_admin(
+    course_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Получить курс по id со ссылками на видео уроков (только для админов)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Только администраторы могут просматривать курс целиком"
+        )
+
+    course = await SqlAlchemyCoursesRepository(db).get_by_id_with_relations(course_id)
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Курс не найден"
+        )
+    return course
+
+
+@router.get("/{slug}", response_model=PublicCourse)
 async def get_course_by_slug(slug: str, db: AsyncSession = Depends(get_db)):
-    """Получить курс по slug с модулями и уроками"""
+    """Получить курс по slug с модулями и уроками (без ссылок на видео)"""
     repo = SqlAlchemyCoursesRepository(db)
     course = await repo.get_by_slug(slug)
     
@@ -75,11 +113,17 @@ async def create_course(
             module_payload = module_data.model_dump(exclude={"lessons"})
             lessons_payload = []
             if module_data.lessons:
-                lessons_payload = [lesson.model_dump() for lesson in module_data.lessons]
+                lessons_payload = [
+                    {**lesson.model_dump(), "video_hls_url": await hls_url_for(lesson.video_url)}
+                    for lesson in module_data.lessons
+                ]
             module_payload["lessons"] = lessons_payload
             modules_data.append(module_payload)
 
-    return await repo.create(course_dict, modules_data or None)
+    course = await repo.create(course_dict, modules_data or None)
+    forget_lesson_media()
+    suggest_index.upsert(course_source(course))
+    return course
 
 
 @router.put("/{course_id}", response_model=CourseSchema)
@@ -107,7 +151,9 @@ async def update_course(
     
     # Обновляем поля
     update_data = course_data.model_dump(exclude_unset=True)
-    return await repo.update(course, update_data)
+    course = await repo.update(course, update_data)
+    suggest_index.upsert(course_source(course))
+    return course
 
 
 @router.post("/reorder", status_code=status.HTTP_200_OK)
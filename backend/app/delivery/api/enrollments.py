@@ -10,7 +10,19 @@ from app.infrastructure.db.session import get_db
 from app.infrastructure.db.models.user import User
 from app.infrastructure.db.repositories.courses import SqlAlchemyCoursesRepository
 from app.infrastructure.db.repositories.enrollments import SqlAlchemyEnrollmentsRepository
-from app.interfaces.schemas.enrollment import Enrollment as EnrollmentSchema, EnrollmentCreate, EnrollmentUpdate
+from app.interfaces.schemas.enrollment import (
+    Enrollment as EnrollmentSchema,
+    EnrollmentCheck,
+    EnrollmentCheckResult,
+    EnrollmentCreate,
+    EnrollmentLessons,
+    EnrollmentProgressReport,
+    EnrollmentUpdate,
+    LessonCompletionUpdate,
+    MyCourse,
+)
+from app.application.services.enrollment_cache import filter_enrolled, invalidate_enrollments
+from app.application.services.progress_buffer import progress_buffer
 from app.delivery.api.auth import get_current_user
 
 router = APIRouter(prefix="/api/enrollments", tags=["enrollments"])
@@ -23,7 +35,44 @@ async def get_enrollments(
 ):
     """Получить список записей пользователя на курсы"""
     repo = SqlAlchemyEnrollmentsRepository(db)
-    return await repo.list_by_user(current_user.id)
+    return [progress_buffer.overlay(enrollment) for enrollment in await repo.list_by_user(current_user.id)]
+
+
+@router.get("/lessons", response_model=List[EnrollmentLessons])
+async def get_lessons_progress(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Карты пройденных уроков по всем курсам пользователя"""
+    repo = SqlAlchemyEnrollmentsRepository(db)
+    return await repo.lesson_progress_by_user(current_user.id)
+
+
+@router.get("/my-courses", response_model=List[MyCourse])
+async def get_my_courses(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Курсы пользователя с карточками и числом уроков (вместо запроса на каждый курс)"""
+    repo = SqlAlchemyEnrollmentsRepository(db)
+    courses = await repo.list_with_courses(current_user.id)
+    for course in courses:
+        pending = progress_buffer.pending_progress(course.id, current_user.id)
+        # Прогресс курса с уроками — из отметок уроков, отчёты плеера к нему не применяются
+        if pending is not None and not course.lessons_count:
+            course.progress = max(course.progress or 0, pending.progress)
+            course.completed_at = course.completed_at or pending.completed_at
+    return courses
+
+
+@router.post("/check", response_model=EnrollmentCheckResult)
+async def check_enrollments(
+    payload: EnrollmentCheck,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Пакетная проверка доступа: на какие из переданных курсов записан пользователь"""
+    return {"enrolled": await filter_enrolled(db, current_user.id, payload.course_ids)}
 
 
 @router.get("/{course_id}", response_model=EnrollmentSchema)
@@ -42,7 +91,7 @@ async def get_enrollment_by_course(
             detail="Вы не записаны на этот курс"
         )
     
-    return enrollment
+    return progress_buffer.overlay(enrollment)
 
 
 @router.post("", response_model=EnrollmentSchema, status_code=status.HTTP_201_CREATED)
@@ -73,11 +122,27 @@ async def create_enrollment(
         )
     
     # Создаем запись
-    return await repo.create(
+    enrollment = await repo.create(
         user_id=current_user.id,
         course_id=enrollment_data.course_id,
         progress=0,
     )
+    invalidate_enrollments(current_user.id)
+    return enrollment
+
+
+@router.post("/{enrollment_id}/progress", status_code=status.HTTP_202_ACCEPTED)
+async def report_enrollment_progress(
+    enrollment_id: UUID,
+    report: EnrollmentProgressReport,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Принять прогресс от плеера без записи в БД в запросе.
+    Обновления объединяются в буфере и пишутся пачкой; прогресс не уменьшается.
+    """
+    progress_buffer.record(enrollment_id, current_user.id, report.progress, report.completed_at)
+    return {"accepted": True}
 
 
 @router.put("/{enrollment_id}/progress", response_model=EnrollmentSchema)
@@ -87,7 +152,10 @@ async def update_enrollment_progress(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Обновить прогресс обучения"""
+    """
+    Обновить прогресс обучения (плеер): как POST — через буфер прогресса,
+    ответ — запись с ещё не сброшенным значением.
+    """
     repo = SqlAlchemyEnrollmentsRepository(db)
     enrollment = await repo.get_by_id_and_user(enrollment_id, current_user.id)
     
@@ -97,6 +165,45 @@ async def update_enrollment_progress(
             detail="Запись на курс не найдена"
         )
     
-    # Обновляем прогресс
-    update_data = enrollment_data.model_dump(exclude_unset=True)
-    return await repo.update(enrollment, update_data)
+    progress_buffer.record(
+        enrollment.id,
+        current_user.id,
+        enrollment_data.progress or 0,
+        enrollment_data.completed_at,
+    )
+    return progress_buffer.overlay(enrollment)
+
+
+@router.post("/{enrollment_id}/lessons", response_model=EnrollmentSchema)
+async def update_lessons_progress(
+    enrollment_id: UUID,
+    payload: LessonCompletionUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Отметить уроки пройденными (или снять отметку).
+    Прогресс пересчитывается из числа пройденных уроков.
+    """
+    repo = SqlAlchemyEnrollmentsRepository(db)
+    enrollment = await repo.get_by_id_and_user(enrollment_id, current_user.id)
+
+    if not enrollment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Запись на курс не найдена"
+        )
+
+    ordinals = await repo.lesson_ordinals(enrollment.course_id, [*payload.completed, *payload.uncompleted])
+    unknown = {*payload.completed, *payload.uncompleted} - ordinals.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Уроки не принадлежат курсу"
+        )
+
+    return await repo.update_lessons(
+        enrollment,
+        completed=[ordinals[lesson_id] for lesson_id in payload.completed],
+        uncompleted=[ordinals[lesson_id] for lesson_id in payload.uncompleted],
+    )
@@ -0,0 +1,68 @@
+"""
+API роуты выгрузок заявок и записей на курсы (только для админов)
+"""
+from datetime import date
+from typing import Literal, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.application.services.exports import ExportQuery, export_filename, stream_export
+from app.delivery.api.auth import get_current_user
+from app.infrastructure.db.models.user import User
+
+router = APIRouter(prefix="/api/exports", tags=["exports"])
+
+
+def _export_response(
+    dataset: str,
+    fmt: str,
+    compress: bool,
+    query: ExportQuery,
+    current_user: User,
+) -> StreamingResponse:
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Выгрузки доступны только администраторам"
+        )
+    if query.since and query.until and query.since > query.until:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Начало периода позже конца"
+        )
+    filename, media_type = export_filename(dataset, fmt, compress, query)
+    return StreamingResponse(
+        stream_export(dataset, fmt, query, compress),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+@router.get("/contacts")
+async def export_contacts(
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    gzip: bool = Query(False),
+    since: Optional[date] = Query(None),
+    until: Optional[date] = Query(None),
+    current_user: User = Depends(get_current_user),
+):
+    """Выгрузить заявки с контактной формы за период (дни UTC включительно)"""
+    return _export_response("contacts", format, gzip, ExportQuery(since, until), current_user)
+
+
+@router.get("/enrollments")
+async def export_enrollments(
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    gzip: bool = Query(False),
+    since: Optional[date] = Query(None),
+    until: Optional[date] = Query(None),
+    course_id: Optional[UUID] = Query(None),
+    current_user: User = Depends(get_current_user),
+):
+    """Выгрузить записи на курсы с пользователем и курсом за период (дни UTC включительно)"""
+    return _export_response("enrollments", format, gzip, ExportQuery(since, until, course_id), current_user)
@@ -0,0 +1,41 @@
+"""
+Параметры ?fields= / ?lang= публичных списков и ответ с выбранными полями.
+"""
+from typing import Any, Callable, Literal, Optional, Sequence
+
+from fastapi import HTTPException, Query, status
+from fastapi.responses import Response
+
+from app.interfaces.schemas.fieldsets import Projection, SparseFields
+
+FIELDS_DESCRIPTION = "Поля через запятую (id добавляется всегда); без параметра — все поля"
+LANG_DESCRIPTION = "Язык title/description (ru|en); варианты *_ru/*_en в ответ не попадают"
+
+
+def _parse(spec: SparseFields, fields: Optional[str], lang: Optional[str]) -> Optional[Projection]:
+    try:
+        return spec.parse(fields, lang)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+def projection_params(spec: SparseFields) -> Callable[..., Optional[Projection]]:
+    """Зависимость роута: None — полный ответ, иначе набор полей (и язык, если у списка есть переводы)"""
+
+    def localized_dependency(
+        fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+        lang: Optional[Literal["ru", "en"]] = Query(None, description=LANG_DESCRIPTION),
+    ) -> Optional[Projection]:
+        return _parse(spec, fields, lang)
+
+    def fields_dependency(
+        fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    ) -> Optional[Projection]:
+        return _parse(spec, fields, None)
+
+    return localized_dependency if spec.localized else fields_dependency
+
+
+def fields_response(spec: SparseFields, projection: Projection, rows: Sequence[Any]) -> Response:
+    """Готовый JSON: response_model роута (полная схема) к нему не применяется"""
+    return Response(spec.dump(projection, rows), media_type="application/json")
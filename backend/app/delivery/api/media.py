@@ -0,0 +1,185 @@
+"""
+API роуты для защищённых видео уроков и раздачи загрузок из хранилища.
+
+Ссылка выдаётся записанному на курс пользователю и подписывается HMAC;
+раздача /media/{token}/{path} проверяет подпись без обращения к БД.
+/uploads/{path} отдаёт публичные файлы, когда их нет на диске фронтенда
+(STORAGE_DRIVER=s3), и все видео — кроме видео уроков.
+"""
+import mimetypes
+import os
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.services.enrollment_cache import filter_enrolled
+from app.application.services.lesson_media import is_lesson_media
+from app.config import settings
+from app.delivery.api.auth import get_current_user
+from app.infrastructure.db.models.user import User
+from app.infrastructure.db.repositories.courses import SqlAlchemyCoursesRepository
+from app.infrastructure.db.session import get_db
+from app.infrastructure.storage import ObjectInfo, is_hidden_key, key_for_url, storage
+from app.interfaces.schemas.course import LessonMediaLink
+from app.utils.media_tokens import (
+    InvalidMediaToken,
+    MediaTokenExpired,
+    issue_media_token,
+    verify_media_token,
+)
+from app.utils.metrics import MEDIA_REQUESTS
+
+router = APIRouter(tags=["media"])
+
+# Имена загрузок уникальны (uuid), содержимое по ключу не меняется
+PUBLIC_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/api/media/lessons/{lesson_id}", response_model=LessonMediaLink)
+async def get_lesson_media_link(
+    lesson_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Выдать подписанную ссылку на видео урока (только записанным на курс)"""
+    access = await SqlAlchemyCoursesRepository(db).get_lesson_access(lesson_id)
+    if not access:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Урок не найден"
+        )
+    course_id, video_url, video_hls_url = access
+
+    if current_user.role != "admin" and not await filter_enrolled(db, current_user.id, [course_id]):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Вы не записаны на этот курс"
+        )
+
+    if not video_url:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="У урока нет видео"
+        )
+
+    # HLS (если уже собран) — токен на каталог: плейлисты качеств и сегменты по относительным путям
+    hls_path = key_for_url(video_hls_url) if video_hls_url else None
+    path = hls_path or key_for_url(video_url)
+    if path is None:
+        return {"url": video_url, "expires_at": None}
+
+    scope = os.path.dirname(path) if hls_path else path
+    token, expires_at = issue_media_token(current_user.id, lesson_id, scope)
+    return {
+        "url": f"/media/{token}/{quote(path)}",
+        "expires_at": datetime.fromtimestamp(expires_at, timezone.utc),
+    }
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Один диапазон `bytes=start-end`; None — заголовок не поддерживается"""
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    start_raw, _, end_raw = spec.strip().partition("-")
+    try:
+        if start_raw:
+            start = int(start_raw)
+            end = int(end_raw) if end_raw else max(start, size - 1)
+        else:
+            # bytes=-N — последние N байт
+            start, end = max(0, size - int(end_raw)), size - 1
+    except ValueError:
+        return None
+    return (start, end) if 0 <= start <= end else None
+
+
+async def _stat(path: str) -> Optional[ObjectInfo]:
+    try:
+        return await storage.stat(path)
+    except ValueError:
+        return None
+
+
+def _file_response(path: str, info: ObjectInfo, request: Request, headers: Dict[str, str]) -> Response:
+    """Файл хранилища целиком или один диапазон (206) — с диска или потоком из S3"""
+    size = info.size
+    media_type = info.content_type or mimetypes.guess_type(path)[0] or "application/octet-stream"
+    headers["Accept-Ranges"] = "bytes"
+    byte_range = _parse_range(request.headers["range"], size) if "range" in request.headers else None
+    if byte_range is None:
+        local = storage.local_path(path)
+        if local is not None:
+            return FileResponse(local, headers=headers, media_type=media_type)
+        headers["Content-Length"] = str(size)
+        if request.method == "HEAD":
+            return Response(headers=headers, media_type=media_type)
+        return StreamingResponse(storage.open(path), headers=headers, media_type=media_type)
+
+    start, end = byte_range
+    if start >= size:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    end = min(end, size - 1)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    if request.method == "HEAD":
+        return Response(status_code=status.HTTP_206_PARTIAL_CONTENT, headers=headers, media_type=media_type)
+    return StreamingResponse(
+        storage.open(path, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        headers=headers,
+        media_type=media_type,
+    )
+
+
+@router.api_route("/media/{token}/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def serve_media(token: str, path: str, request: Request):
+    """Раздать файл по подписанной ссылке — только проверка HMAC, без БД"""
+    try:
+        grant = verify_media_token(token, path)
+    except MediaTokenExpired:
+        MEDIA_REQUESTS.labels("expired").inc()
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Срок действия ссылки истёк") from None
+    except InvalidMediaToken:
+        MEDIA_REQUESTS.labels("invalid").inc()
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Недействительная ссылка") from None
+
+    max_age = max(0, grant.expires_at - int(datetime.now(timezone.utc).timestamp()))
+    headers = {"Cache-Control": f"private, max-age={max_age}"}
+
+    if settings.MEDIA_ACCEL_REDIRECT_PREFIX and storage.name == "local":
+        # Файл отдаёт nginx из internal location — приложение только проверяет подпись
+        MEDIA_REQUESTS.labels("redirect").inc()
+        headers["X-Accel-Redirect"] = settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + quote(path)
+        return Response(headers=headers)
+
+    info = await _stat(path)
+    if info is None:
+        MEDIA_REQUESTS.labels("not_found").inc()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Файл не найден")
+    MEDIA_REQUESTS.labels("ok").inc()
+    return _file_response(path, info, request, headers)
+
+
+@router.api_route("/uploads/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def serve_upload(path: str, request: Request, db: AsyncSession = Depends(get_db)):
+    """Публичный файл из хранилища (то же, что Next.js /api/uploads отдаёт с локального диска)"""
+    if is_hidden_key(path):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Файл не найден")
+    if await is_lesson_media(db, path):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Видео урока доступно только по ссылке из /api/media/lessons"
+        )
+    info = await _stat(path)
+    if info is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Файл не найден")
+    return _file_response(path, info, request, {"Cache-Control": PUBLIC_CACHE_CONTROL})
@@ -2,103 +2,85 @@
 API роуты для платежей (YooKassa webhook)
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.exc import IntegrityError
-from uuid import UUID
-import base64
-import httpx
-from typing import Any, Dict, Optional
 
-from app.config import settings
 from app.infrastructure.db.session import get_db
-from app.infrastructure.integrations.email_service import send_course_enrollment_confirmation
-from app.infrastructure.db.repositories.courses import SqlAlchemyCoursesRepository
-from app.infrastructure.db.repositories.enrollments import SqlAlchemyEnrollmentsRepository
+from app.application.services.jobs import enqueue_job
+from app.application.tasks.payments import FINAL_STATUSES, PROCESS_YOOKASSA_PAYMENT
+from app.infrastructure.db.repositories.jobs import SqlAlchemyJobRepository
+from app.infrastructure.db.repositories.processed_payments import SqlAlchemyProcessedPaymentsRepository
+from app.utils.metrics import PAYMENT_WEBHOOK_EVENTS, PAYMENT_WEBHOOK_STAGE_DURATION
 
 
 router = APIRouter(prefix="/api/payments", tags=["payments"])
 
 
-def _yookassa_auth_header() -> str:
-    if not settings.YOOKASSA_SHOP_ID or not settings.YOOKASSA_SECRET_KEY:
-        raise RuntimeError("YOOKASSA credentials не настроены")
-    token = base64.b64encode(f"{settings.YOOKASSA_SHOP_ID}:{settings.YOOKASSA_SECRET_KEY}".encode("utf-8")).decode(
-        "utf-8"
+def _enqueue(db: AsyncSession, payment_id: str) -> None:
+    enqueue_job(
+        db,
+        PROCESS_YOOKASSA_PAYMENT,
+        {"payment_id": payment_id, "received_at": datetime.now(timezone.utc).isoformat()},
     )
-    return f"Basic {token}"
-
-
-async def _get_payment(payment_id: str) -> Dict[str, Any]:
-    auth = _yookassa_auth_header()
-    async with httpx.AsyncClient(timeout=10) as client:
-        resp = await client.get(
-            f"https://api.yookassa.ru/v3/payments/{payment_id}",
-            headers={"Authorization": auth},
-        )
-        if resp.status_code >= 400:
-            raise HTTPException(status_code=502, detail=f"YooKassa API error: {resp.text}")
-        return resp.json()
 
 
 @router.post("/yookassa/webhook")
 async def yookassa_webhook(payload: Dict[str, Any], db: AsyncSession = Depends(get_db)):
     """
     Webhook от YooKassa.
-    Обрабатывает payment.succeeded, подтверждает статус через YooKassa API,
-    идемпотентно создаёт enrollment и (только при первом создании) отправляет email.
+    Регистрирует payment.succeeded в processed_payments и сразу отвечает 200;
+    подтверждение статуса через API, enrollment и письмо выполняет воркер
+    (задача payments.process_yookassa). Повторные доставки обработанного
+    платежа отсекаются поиском по первичному ключу; если обработка не
+    завершена и задачи в очереди нет (исчерпала попытки), она ставится заново.
     """
+    received = perf_counter()
     event = payload.get("event")
     obj = payload.get("object") or {}
     payment_id = obj.get("id")
 
     # Всегда отвечаем 200 на нерелевантные события, чтобы не было лишних ретраев
     if event != "payment.succeeded" or not payment_id:
+        PAYMENT_WEBHOOK_EVENTS.labels("ignored").inc()
         return JSONResponse({"received": True})
 
-    payment = await _get_payment(str(payment_id))
-    if payment.get("status") != "succeeded":
-        # Не подтверждено через API — считаем неуспешным
-        return JSONResponse({"received": True})
-
-    metadata: Dict[str, Any] = payment.get("metadata") or {}
-    course_id_raw: Optional[str] = metadata.get("courseId")
-    user_id_raw: Optional[str] = metadata.get("userId")
-    user_email: Optional[str] = metadata.get("userEmail")
-
-    if not course_id_raw or not user_id_raw:
-        raise HTTPException(status_code=400, detail="Missing metadata: courseId/userId")
+    payment_id = str(payment_id)
+    repo = SqlAlchemyProcessedPaymentsRepository(db)
 
-    try:
-        course_id = UUID(str(course_id_raw))
-        user_id = UUID(str(user_id_raw))
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid metadata UUIDs")
-
-    course_repo = SqlAlchemyCoursesRepository(db)
-    course = await course_repo.get_by_id(course_id)
-    if not course:
-        raise HTTPException(status_code=404, detail="Course not found")
-
-    # Идемпотентно создаём enrollment (уникальный индекс + пред-проверка)
-    enrollment_repo = SqlAlchemyEnrollmentsRepository(db)
-    existing = await enrollment_repo.get_by_user_and_course(user_id, course_id)
+    started = perf_counter()
+    known = await repo.get_status(payment_id)
+    PAYMENT_WEBHOOK_STAGE_DURATION.labels("dedup").observe(perf_counter() - started)
+    if known in FINAL_STATUSES:
+        PAYMENT_WEBHOOK_EVENTS.labels("duplicate").inc()
+        return JSONResponse({"received": True})
 
-    created = False
-    if not existing:
-        try:
-            await enrollment_repo.create(user_id=user_id, course_id=course_id, progress=0)
-            created = True
-        except IntegrityError:
+    # Событие и задача — в одной транзакции: после ответа 200 обработка не потеряется
+    started = perf_counter()
+    if known is None and await repo.record(payment_id, event):
+        _enqueue(db, payment_id)
+        await db.commit()
+        PAYMENT_WEBHOOK_EVENTS.labels("accepted").inc()
+    else:
+        # Событие уже зарегистрировано (возможно, параллельной доставкой). Блокировка строки
+        # упорядочивает доставки: задача ставится заново, только если обработка не завершена
+        # и в очереди её нет — например, она ушла в dead letter во время сбоя YooKassa
+        status = await repo.get_status(payment_id, lock=True)
+        pending = await SqlAlchemyJobRepository(db).has_pending(
+            PROCESS_YOOKASSA_PAYMENT, {"payment_id": payment_id}
+        )
+        if status in FINAL_STATUSES or pending:
             await db.rollback()
-
-    # Email отправляем только если реально создали enrollment (чтобы ретраи не спамили)
-    if created and user_email:
-        try:
-            await send_course_enrollment_confirmation(user_email, course.title)
-        except Exception:
-            # Email не должен ломать обработку платежа
-            pass
-
+            PAYMENT_WEBHOOK_EVENTS.labels("duplicate").inc()
+        else:
+            _enqueue(db, payment_id)
+            await db.commit()
+            PAYMENT_WEBHOOK_EVENTS.labels("requeued").inc()
+    PAYMENT_WEBHOOK_STAGE_DURATION.labels("persist").observe(perf_counter() - started)
+
+    PAYMENT_WEBHOOK_STAGE_DURATION.labels("ack").observe(perf_counter() - received)
     return JSONResponse({"received": True})
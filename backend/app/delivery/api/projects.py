@@ -8,9 +8,17 @@ from uuid import UUID
 
 from app.infrastructure.db.models.user import User
 from app.infrastructure.db.repositories.projects import SqlAlchemyProjectsRepository
+from app.infrastructure.db.repositories.related_projects import SqlAlchemyRelatedProjectsRepository
 from app.infrastructure.db.session import get_db
-from app.interfaces.schemas.project import Project as ProjectSchema, ProjectCreate, ProjectUpdate
+from app.interfaces.schemas.fieldsets import Projection
+from app.interfaces.schemas.project import PROJECT_FIELDS, Project as ProjectSchema, ProjectCreate, ProjectUpdate
+from app.application.services.hls import hls_url_for
+from app.application.services.jobs import enqueue_job
+from app.application.tasks.projects import REFRESH_RELATED, RELATED_FIELDS
+from app.application.services.suggest_index import suggest_index
+from app.infrastructure.db.repositories.search import project_source
 from app.delivery.api.auth import get_current_user
+from app.delivery.api.fieldsets import fields_response, projection_params
 
 router = APIRouter(prefix="/api/projects", tags=["projects"])
 
@@ -21,10 +29,16 @@ async def get_projects(
     featured: Optional[bool] = Query(None),
     limit: int = Query(100, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    projection: Optional[Projection] = Depends(projection_params(PROJECT_FIELDS)),
     db: AsyncSession = Depends(get_db)
 ):
-    """Получить список проектов"""
+    """Получить список проектов (?fields=slug,title,thumbnail_url&lang=en — только эти поля)"""
     repo = SqlAlchemyProjectsRepository(db)
+    if projection is not None:
+        rows = await repo.list_projects_fields(
+            projection.fields, projection.lang, category, featured, limit, offset
+        )
+        return fields_response(PROJECT_FIELDS, projection, rows)
     return await repo.list_projects(category, featured, limit, offset)
 
 
@@ -54,6 +68,21 @@ async def get_project_by_slug(slug: str, db: AsyncSession = Depends(get_db)):
     return project
 
 
+@router.get("/{slug}/related", response_model=List[ProjectSchema])
+async def get_related_projects(
+    slug: str,
+    limit: int = Query(6, ge=1, le=20),
+    db: AsyncSession = Depends(get_db)
+):
+    """Похожие проекты — готовый список из project_related (пересчитывается в фоне)"""
+    return await SqlAlchemyRelatedProjectsRepository(db).list_related(slug, limit)
+
+
+async def _refresh_related(db: AsyncSession, project_id: UUID) -> None:
+    enqueue_job(db, REFRESH_RELATED, {"project_id": str(project_id)})
+    await db.commit()
+
+
 @router.post("", response_model=ProjectSchema, status_code=status.HTTP_201_CREATED)
 async def create_project(
     project_data: ProjectCreate,
@@ -77,7 +106,13 @@ async def create_project(
             detail="Проект с таким slug уже существует"
         )
     
-    return await repo.create(project_data.model_dump())
+    project_dict = project_data.model_dump()
+    # Видео могло быть перекодировано ещё до сохранения проекта
+    project_dict["video_hls_url"] = await hls_url_for(project_dict.get("video_url"))
+    project = await repo.create(project_dict)
+    suggest_index.upsert(project_source(project))
+    await _refresh_related(db, project.id)
+    return project
 
 
 @router.put("/{project_id}", response_model=ProjectSchema)
@@ -105,7 +140,16 @@ async def update_project(
     
     # Обновляем поля
     update_data = project_data.model_dump(exclude_unset=True)
-    return await repo.update(project, update_data)
+    if "video_url" in update_data and update_data["video_url"] != project.video_url:
+        update_data["video_hls_url"] = await hls_url_for(update_data["video_url"])
+    related_changed = any(
+        field in update_data and update_data[field] != getattr(project, field) for field in RELATED_FIELDS
+    )
+    project = await repo.update(project, update_data)
+    suggest_index.upsert(project_source(project))
+    if related_changed:
+        await _refresh_related(db, project.id)
+    return project
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -131,6 +175,9 @@ async def delete_project(
         )
     
     await repo.delete(project)
+    suggest_index.remove("project", project.id)
+    # Строки project_related удалены каскадом; задача дополнит укоротившиеся списки
+    await _refresh_related(db, project.id)
     return None
 
 
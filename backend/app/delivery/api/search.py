@@ -0,0 +1,38 @@
+"""
+API роуты для полнотекстового поиска
+"""
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db.repositories.search import SEARCH_TYPES, SqlAlchemySearchRepository
+from app.infrastructure.db.session import get_db
+from app.interfaces.schemas.search import SearchResult
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+
+@router.get("", response_model=List[SearchResult])
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=200),
+    types: Optional[List[str]] = Query(None, alias="type"),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=1000),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Поиск по проектам, курсам и опубликованным статьям (русский и английский).
+    X-Search-Truncated: true — совпадений больше, чем ранжируется (SEARCH_RANK_CANDIDATES).
+    """
+    unknown = set(types or ()) - set(SEARCH_TYPES)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Неизвестный тип: {', '.join(sorted(unknown))}"
+        )
+    page = await SqlAlchemySearchRepository(db).search(q.strip(), types, limit=limit, offset=offset)
+    if page.truncated:
+        response.headers["X-Search-Truncated"] = "true"
+    return page.hits
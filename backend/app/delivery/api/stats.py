@@ -0,0 +1,77 @@
+"""
+API роуты статистики админ-панели (только агрегаты stats_*, без сырых таблиц)
+"""
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.delivery.api.auth import get_current_user
+from app.infrastructure.db.models.user import User
+from app.infrastructure.db.repositories.stats import SqlAlchemyStatsRepository
+from app.infrastructure.db.session import get_db
+from app.interfaces.schemas.stats import ContactsWeek, CourseRevenue, EnrollmentsDay
+
+router = APIRouter(prefix="/api/stats", tags=["stats"])
+
+
+def _require_admin(current_user: User) -> None:
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Статистика доступна только администраторам"
+        )
+
+
+def _period(since: Optional[date], until: Optional[date], default_days: int) -> Tuple[date, date]:
+    """Период по UTC включительно; по умолчанию — последние default_days дней"""
+    until = until or datetime.now(timezone.utc).date()
+    since = since or until - timedelta(days=default_days - 1)
+    if since > until:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Начало периода позже конца"
+        )
+    return since, until
+
+
+@router.get("/enrollments", response_model=List[EnrollmentsDay])
+async def get_enrollments_stats(
+    since: Optional[date] = Query(None),
+    until: Optional[date] = Query(None),
+    course_id: Optional[UUID] = Query(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Записи на курсы по дням (только для админов)"""
+    _require_admin(current_user)
+    since, until = _period(since, until, 30)
+    return await SqlAlchemyStatsRepository(db).enrollments_daily(since, until, course_id)
+
+
+@router.get("/contacts", response_model=List[ContactsWeek])
+async def get_contacts_stats(
+    since: Optional[date] = Query(None),
+    until: Optional[date] = Query(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Заявки по неделям (только для админов)"""
+    _require_admin(current_user)
+    since, until = _period(since, until, 12 * 7)
+    return await SqlAlchemyStatsRepository(db).contacts_weekly(since, until)
+
+
+@router.get("/revenue", response_model=List[CourseRevenue])
+async def get_revenue_stats(
+    since: Optional[date] = Query(None),
+    until: Optional[date] = Query(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Выручка по курсам за период (только для админов)"""
+    _require_admin(current_user)
+    since, until = _period(since, until, 30)
+    return await SqlAlchemyStatsRepository(db).revenue_by_course(since, until)
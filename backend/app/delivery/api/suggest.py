@@ -0,0 +1,40 @@
+"""
+API роуты для подсказок (автодополнение поиска и админки)
+"""
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.application.services.suggest_index import suggest_index
+from app.delivery.api.blog import get_optional_user
+from app.infrastructure.db.models.user import User
+from app.interfaces.schemas.suggest import SuggestItem
+
+router = APIRouter(prefix="/api/suggest", tags=["search"])
+
+SUGGEST_TYPES = ("project", "course", "blog", "client")
+
+
+@router.get("", response_model=List[SuggestItem])
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    types: Optional[List[str]] = Query(None, alias="type"),
+    limit: int = Query(8, ge=1, le=20),
+    current_user: Optional[User] = Depends(get_optional_user),
+):
+    """Подсказки по названиям из индекса в памяти (без запроса к БД)"""
+    unknown = set(types or ()) - set(SUGGEST_TYPES)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Неизвестный тип: {', '.join(sorted(unknown))}"
+        )
+    if not suggest_index.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Индекс подсказок ещё строится",
+            headers={"Retry-After": "1"},
+        )
+    # Администратор видит и черновики статей
+    include_hidden = bool(current_user and current_user.role == "admin")
+    return suggest_index.suggest(q, limit=limit, types=types, include_hidden=include_hidden)
@@ -3,37 +3,27 @@ API роуты для загрузки файлов
 """
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from fastapi.responses import JSONResponse
-from pathlib import Path
 import uuid
-from typing import List
+from typing import AsyncIterator, List, Tuple
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.services.jobs import enqueue_job
+from app.application.tasks.media import IMAGE_META, TRANSCODE_HLS
+from app.config import settings
 from app.delivery.api.auth import get_current_user
 from app.infrastructure.db.models.user import User
+from app.infrastructure.db.session import get_db
+from app.infrastructure.storage import storage
 
 router = APIRouter(prefix="/api/upload", tags=["upload"])
 
 # Настройки
-# Определяем путь к uploads автоматически
-# В Docker: /app/backend/uploads (монтируется как volume)
-# Локально: uploads относительно корня backend
-import os
-UPLOAD_BASE = os.getenv("UPLOAD_DIR")
-if UPLOAD_BASE:
-    UPLOAD_DIR = Path(UPLOAD_BASE)
-else:
-    # Автоматическое определение: если мы в Docker (/app), используем /app/backend/uploads
-    # Иначе используем uploads относительно текущего файла
-    BASE_DIR = Path(__file__).resolve().parent.parent.parent
-    UPLOAD_DIR = BASE_DIR / "uploads"
 MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB
 MAX_VIDEO_SIZE = 50 * 1024 * 1024  # 50MB
 ALLOWED_IMAGE_TYPES = ["image/jpeg", "image/png", "image/webp"]
 ALLOWED_VIDEO_TYPES = ["video/mp4", "video/quicktime", "video/x-msvideo"]
-
-# Создаем директорию для загрузок если её нет
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-(UPLOAD_DIR / "images").mkdir(parents=True, exist_ok=True)
-(UPLOAD_DIR / "videos").mkdir(parents=True, exist_ok=True)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 def get_file_extension(content_type: str) -> str:
@@ -49,10 +39,42 @@ def get_file_extension(content_type: str) -> str:
     return mapping.get(content_type, "")
 
 
+async def upload_size(file: UploadFile) -> int:
+    """Размер загрузки без чтения в память (multipart-парсер уже записал файл во временный)"""
+    if file.size is not None:
+        return file.size
+    size = len(await file.read())
+    await file.seek(0)
+    return size
+
+
+async def _chunks(file: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+async def save_upload(file: UploadFile, folder: str) -> Tuple[str, int]:
+    """Сохраняет файл в хранилище (folder/<uuid><расширение>) потоком; (имя файла, размер)"""
+    file_name = f"{uuid.uuid4()}{get_file_extension(file.content_type)}"
+    size = await storage.save(f"{folder}/{file_name}", _chunks(file), file.content_type)
+    return file_name, size
+
+
+async def _queue_image_meta(db: AsyncSession, urls: List[str]) -> bool:
+    """Размеры и плейсхолдеры считаются в фоне; списки подхватят их из media_meta"""
+    if not settings.IMAGE_META_ENABLED or not urls:
+        return False
+    for url in urls:
+        enqueue_job(db, IMAGE_META, {"url": url})
+    await db.commit()
+    return True
+
+
 @router.post("/image")
 async def upload_image(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Загрузить изображение (только для админов)"""
     if current_user.role != "admin":
@@ -68,38 +90,34 @@ async def upload_image(
             detail=f"Неподдерживаемый тип файла. Разрешены: {', '.join(ALLOWED_IMAGE_TYPES)}"
         )
     
-    # Читаем файл для проверки размера
-    contents = await file.read()
-    if len(contents) > MAX_IMAGE_SIZE:
+    # Проверка размера до записи в хранилище
+    if await upload_size(file) > MAX_IMAGE_SIZE:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Файл слишком большой. Максимальный размер: {MAX_IMAGE_SIZE / 1024 / 1024}MB"
         )
     
-    # Генерируем уникальное имя файла
-    file_extension = get_file_extension(file.content_type)
-    file_name = f"{uuid.uuid4()}{file_extension}"
-    file_path = UPLOAD_DIR / "images" / file_name
-    
-    # Сохраняем файл
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    # Сохраняем файл под уникальным именем
+    file_name, size = await save_upload(file, "images")
     
     # Возвращаем URL файла (относительный путь для Next.js API route)
     file_url = f"/uploads/images/{file_name}"
+    meta_queued = await _queue_image_meta(db, [file_url])
     
     return JSONResponse({
         "url": file_url,
         "filename": file_name,
-        "size": len(contents),
-        "content_type": file.content_type
+        "size": size,
+        "content_type": file.content_type,
+        "meta_queued": meta_queued,
     })
 
 
 @router.post("/video")
 async def upload_video(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Загрузить видео (только для админов)"""
     if current_user.role != "admin":
@@ -115,38 +133,38 @@ async def upload_video(
             detail=f"Неподдерживаемый тип файла. Разрешены: {', '.join(ALLOWED_VIDEO_TYPES)}"
         )
     
-    # Читаем файл для проверки размера
-    contents = await file.read()
-    if len(contents) > MAX_VIDEO_SIZE:
+    # Проверка размера до записи в хранилище
+    if await upload_size(file) > MAX_VIDEO_SIZE:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Файл слишком большой. Максимальный размер: {MAX_VIDEO_SIZE / 1024 / 1024}MB"
         )
     
-    # Генерируем уникальное имя файла
-    file_extension = get_file_extension(file.content_type)
-    file_name = f"{uuid.uuid4()}{file_extension}"
-    file_path = UPLOAD_DIR / "videos" / file_name
-    
-    # Сохраняем файл
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    # Сохраняем файл под уникальным именем
+    file_name, size = await save_upload(file, "videos")
     
     # Возвращаем URL файла (относительный путь для Next.js API route)
     file_url = f"/uploads/videos/{file_name}"
-    
+
+    # HLS собирается в фоне; video_hls_url появится у урока/проекта после перекодирования
+    if settings.HLS_TRANSCODE_ENABLED:
+        enqueue_job(db, TRANSCODE_HLS, {"source": file_name})
+        await db.commit()
+
     return JSONResponse({
         "url": file_url,
         "filename": file_name,
-        "size": len(contents),
-        "content_type": file.content_type
+        "size": size,
+        "content_type": file.content_type,
+        "hls_queued": settings.HLS_TRANSCODE_ENABLED,
     })
 
 
 @router.post("/images")
 async def upload_images(
     files: List[UploadFile] = File(...),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Загрузить несколько изображений (только для админов)"""
     if current_user.role != "admin":
@@ -162,26 +180,19 @@ async def upload_images(
         if file.content_type not in ALLOWED_IMAGE_TYPES:
             continue  # Пропускаем неподдерживаемые файлы
         
-        # Читаем файл
-        contents = await file.read()
-        if len(contents) > MAX_IMAGE_SIZE:
+        if await upload_size(file) > MAX_IMAGE_SIZE:
             continue  # Пропускаем слишком большие файлы
         
-        # Генерируем уникальное имя файла
-        file_extension = get_file_extension(file.content_type)
-        file_name = f"{uuid.uuid4()}{file_extension}"
-        file_path = UPLOAD_DIR / "images" / file_name
-        
-        # Сохраняем файл
-        with open(file_path, "wb") as f:
-            f.write(contents)
+        # Сохраняем файл под уникальным именем
+        file_name, size = await save_upload(file, "images")
         
         file_url = f"/uploads/images/{file_name}"
         uploaded_files.append({
             "url": file_url,
             "filename": file_name,
-            "size": len(contents),
+            "size": size,
             "content_type": file.content_type
         })
     
+    await _queue_image_meta(db, [item["url"] for item in uploaded_files])
     return JSONResponse({"files": uploaded_files})
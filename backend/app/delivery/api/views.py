@@ -0,0 +1,70 @@
+"""
+API роуты для просмотров проектов и статей блога
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import List, Literal, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.services.auth_service import verify_token
+from app.application.services.view_counter import view_buffer
+from app.config import settings
+from app.delivery.api.blog import security
+from app.infrastructure.db.repositories.content_views import (
+    PopularContent,
+    SqlAlchemyContentViewsRepository,
+)
+from app.infrastructure.db.session import get_db
+from app.interfaces.schemas.views import PopularItem, ViewEvent
+from app.utils.cache import TTLCache
+
+router = APIRouter(prefix="/api/views", tags=["views"])
+
+# Агрегаты меняются не чаще сброса буфера — чаще перечитывать их незачем
+_popular_cache: TTLCache[Tuple[str, int, int], List[PopularContent]] = TTLCache(
+    "popular_content", maxsize=64, ttl=settings.VIEWS_FLUSH_SECONDS,
+)
+
+
+def _visitor_key(event: ViewEvent, request: Request, credentials: Optional[HTTPAuthorizationCredentials]) -> str:
+    """Пользователь — по id из токена (без БД), аноним — по id с фронтенда или IP + User-Agent"""
+    if credentials:
+        token_data = verify_token(credentials.credentials)
+        if token_data is not None and token_data.user_id:
+            return f"user:{token_data.user_id}"
+    if event.visitor:
+        return f"anon:{event.visitor}"
+    host = request.client.host if request.client else ""
+    fingerprint = f"{host}|{request.headers.get('user-agent', '')}"
+    return "ip:" + hashlib.blake2b(fingerprint.encode(), digest_size=16).hexdigest()
+
+
+@router.post("", status_code=status.HTTP_204_NO_CONTENT)
+async def record_view(
+    event: ViewEvent,
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+):
+    """Учесть просмотр проекта или статьи (в буфер процесса, без записи в БД)"""
+    view_buffer.record(event.type, event.id, _visitor_key(event, request, credentials))
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/popular/{content_type}", response_model=List[PopularItem])
+async def get_popular(
+    content_type: Literal["project", "blog"],
+    days: int = Query(30, ge=1, le=365),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db)
+):
+    """Популярные проекты или статьи за последние days дней (из дневных агрегатов)"""
+    key = (content_type, days, limit)
+    popular = _popular_cache.get(key)
+    if popular is None:
+        since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+        popular = await SqlAlchemyContentViewsRepository(db).popular(content_type, since, limit)
+        _popular_cache.set(key, popular)
+    return popular
@@ -1,5 +1,6 @@
 from app.infrastructure.db.models.user import User
 from app.infrastructure.db.models.project import Project
+from app.infrastructure.db.models.project_related import ProjectRelated
 from app.infrastructure.db.models.course import Course, CourseModule, Lesson
 from app.infrastructure.db.models.enrollment import Enrollment
 from app.infrastructure.db.models.booking import Booking
@@ -8,10 +9,17 @@ from app.infrastructure.db.models.client import Client
 from app.infrastructure.db.models.testimonial import Testimonial
 from app.infrastructure.db.models.setting import Setting
 from app.infrastructure.db.models.blog_post import BlogPost
+from app.infrastructure.db.models.content_view import ContentView
+from app.infrastructure.db.models.email_outbox import EmailOutbox
+from app.infrastructure.db.models.job import Job
+from app.infrastructure.db.models.media_meta import MediaMeta
+from app.infrastructure.db.models.processed_payment import ProcessedPayment
+from app.infrastructure.db.models.stats import StatsContactsWeekly, StatsEnrollmentsDaily, StatsRevenueDaily
 
 __all__ = [
     "User",
     "Project",
+    "ProjectRelated",
     "Course",
     "CourseModule",
     "Lesson",
@@ -22,4 +30,12 @@ __all__ = [
     "Testimonial",
     "Setting",
     "BlogPost",
+    "ContentView",
+    "EmailOutbox",
+    "Job",
+    "MediaMeta",
+    "ProcessedPayment",
+    "StatsEnrollmentsDaily",
+    "StatsContactsWeekly",
+    "StatsRevenueDaily",
 ]
@@ -1,8 +1,9 @@
 """
 Модель статьи блога
 """
-from sqlalchemy import Column, Text, DateTime, Boolean, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Computed, Text, DateTime, Boolean, func
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred
 import uuid
 from app.infrastructure.db.session import Base
 
@@ -22,3 +23,10 @@ class BlogPost(Base):
     published_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Полнотекстовый поиск (GIN); вычисляется PostgreSQL, в обычных выборках не загружается
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('russian', coalesce(excerpt, '')), 'B') || "
+        "setweight(to_tsvector('russian', coalesce(content, '')), 'C')",
+        persisted=True,
+    )))
@@ -3,6 +3,7 @@
 """
 from sqlalchemy import Column, String, Integer, DateTime, Text, func
 from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import query_expression
 import uuid
 
 from app.infrastructure.db.session import Base
@@ -27,3 +28,5 @@ class Client(Base):
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Размеры и плейсхолдер логотипа из media_meta; заполняется with_expression в выборках
+    media = query_expression()
@@ -0,0 +1,22 @@
+"""
+Модель дневных агрегатов просмотров проектов и статей
+"""
+from sqlalchemy import BigInteger, CheckConstraint, Column, Date, Index, LargeBinary, Text
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.infrastructure.db.session import Base
+
+
+class ContentView(Base):
+    __tablename__ = "content_views"
+
+    content_type = Column(Text, primary_key=True)  # project | blog
+    content_id = Column(UUID(as_uuid=True), primary_key=True)
+    day = Column(Date, primary_key=True)
+    views = Column(BigInteger, nullable=False, default=0)
+    visitors = Column(LargeBinary, nullable=True)  # HyperLogLog-скетч уникальных посетителей (app.utils.hll)
+
+    __table_args__ = (
+        CheckConstraint("content_type IN ('project', 'blog')", name="content_views_content_type_check"),
+        Index("idx_content_views_type_day", "content_type", "day", postgresql_include=["content_id", "views"]),
+    )
@@ -1,9 +1,9 @@
 """
 Модели курсов, модулей и уроков
 """
-from sqlalchemy import Column, String, Text, Integer, Numeric, DateTime, func, ARRAY, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, String, Text, Integer, Numeric, DateTime, func, ARRAY, ForeignKey
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 import uuid
 from app.infrastructure.db.session import Base
 
@@ -29,6 +29,12 @@ class Course(Base):
     display_order = Column(Integer, nullable=True, default=0)  # Порядок отображения
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Полнотекстовый поиск (GIN); вычисляется PostgreSQL, в обычных выборках не загружается
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('russian', coalesce(description, '')), 'B')",
+        persisted=True,
+    )))
 
     # Relationships
     modules = relationship("CourseModule", back_populates="course", cascade="all, delete-orphan")
@@ -55,9 +61,18 @@ class Lesson(Base):
     module_id = Column(UUID(as_uuid=True), ForeignKey("course_modules.id", ondelete="CASCADE"), nullable=False, index=True)
     title = Column(Text, nullable=False)
     video_url = Column(Text, nullable=True)
+    video_hls_url = Column(Text, nullable=True)  # master-плейлист HLS, заполняет задача перекодирования
     duration = Column(Integer, nullable=True)
     order = Column(Integer, nullable=False)
+    # Номер бита в Enrollment.lessons_completed: назначается при создании курса и не меняется
+    # при перестановке уроков; уникальность в пределах курса проверяет триггер
+    # lessons_ordinal_unique (курс урока известен только через модуль)
+    ordinal = Column(Integer, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     module = relationship("CourseModule", back_populates="lessons")
+
+    @property
+    def has_video(self) -> bool:
+        return bool(self.video_url)
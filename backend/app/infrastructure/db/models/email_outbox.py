@@ -0,0 +1,31 @@
+"""
+Модель outbox для транзакционных писем
+"""
+import uuid
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from app.infrastructure.db.session import Base
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    template = Column(String, nullable=False)  # Имя шаблона письма (см. email_outbox.TEMPLATES)
+    payload = Column(JSONB, nullable=False)  # Аргументы шаблона
+    status = Column(String, nullable=False, default="pending")  # 'pending', 'sent', 'failed'
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index(
+            "idx_email_outbox_pending",
+            "next_attempt_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
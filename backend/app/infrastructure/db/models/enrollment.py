@@ -1,9 +1,11 @@
 """
 Модель записи на курс
 """
-from sqlalchemy import Column, Integer, DateTime, func, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, DateTime, LargeBinary, exists, func, ForeignKey, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import column_property
 import uuid
+from app.infrastructure.db.models.course import CourseModule, Lesson
 from app.infrastructure.db.session import Base
 
 
@@ -14,8 +16,15 @@ class Enrollment(Base):
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="CASCADE"), nullable=False, index=True)
     progress = Column(Integer, nullable=False, default=0)
-    enrolled_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Битовая карта пройденных уроков: бит Lesson.ordinal (нумерация get_bit/set_bit PostgreSQL)
+    lessons_completed = Column(LargeBinary, nullable=False, default=b"", server_default=text("'\\x'::bytea"))
+    enrolled_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    # У курса есть уроки: progress — доля отмеченных уроков (битовая карта), отчёты плеера
+    # (буфер прогресса) его не меняют
+    tracks_lessons = column_property(
+        exists().where(CourseModule.course_id == course_id, Lesson.module_id == CourseModule.id)
+    )
 
     __table_args__ = (
         UniqueConstraint('user_id', 'course_id', name='unique_user_course'),
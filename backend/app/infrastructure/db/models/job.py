@@ -0,0 +1,43 @@
+"""
+Модель фоновой задачи (очередь на PostgreSQL)
+"""
+import uuid
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from app.infrastructure.db.session import Base
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    task = Column(String, nullable=False)  # Имя задачи из реестра (см. services.jobs)
+    payload = Column(JSONB, nullable=False)
+    priority = Column(Integer, nullable=False, default=0)  # Больше — раньше
+    status = Column(String, nullable=False, default="queued")  # 'queued', 'running', 'done', 'dead'
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    timeout_seconds = Column(Integer, nullable=False, default=300)  # Аренда = таймаут + запас
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    locked_by = Column(String, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index(
+            "idx_jobs_queued",
+            text("priority DESC"),
+            "run_at",
+            postgresql_where=text("status = 'queued'"),
+        ),
+        Index(
+            "idx_jobs_running",
+            "locked_until",
+            postgresql_where=text("status = 'running'"),
+        ),
+    )
@@ -0,0 +1,17 @@
+"""
+Модель метаданных загруженного изображения (размеры и плейсхолдер)
+"""
+from sqlalchemy import Column, DateTime, Integer, String, Text, func
+
+from app.infrastructure.db.session import Base
+
+
+class MediaMeta(Base):
+    __tablename__ = "media_meta"
+
+    url = Column(Text, primary_key=True)  # /uploads/images/<uuid>.jpg — как хранится в проектах и клиентах
+    width = Column(Integer, nullable=False)  # С учётом EXIF-поворота
+    height = Column(Integer, nullable=False)
+    dominant_color = Column(String(7), nullable=False)  # "#rrggbb"
+    placeholder = Column(Text, nullable=False)  # LQIP: data:image/webp;base64,... (~16px по большей стороне)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,21 @@
+"""
+Модель обработанных событий YooKassa (дедупликация webhook)
+"""
+from sqlalchemy import Column, DateTime, Numeric, String, Text, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.infrastructure.db.session import Base
+
+
+class ProcessedPayment(Base):
+    __tablename__ = "processed_payments"
+
+    payment_id = Column(String, primary_key=True)  # id платежа в YooKassa
+    event = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="received")  # 'received', 'enrolled', 'ignored', 'rejected'
+    user_id = Column(UUID(as_uuid=True), nullable=True)
+    course_id = Column(UUID(as_uuid=True), nullable=True)
+    amount = Column(Numeric(12, 2), nullable=True)  # сумма подтверждённого платежа; источник stats_revenue_daily
+    last_error = Column(Text, nullable=True)
+    received_at = Column(DateTime(timezone=True), server_default=func.now())
+    processed_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,8 +1,9 @@
 """
 Модель проекта
 """
-from sqlalchemy import Column, String, Text, Integer, DateTime, func, ARRAY, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Computed, String, Text, Integer, DateTime, func, ARRAY, Boolean
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, query_expression
 import uuid
 from app.infrastructure.db.session import Base
 
@@ -17,6 +18,7 @@ class Project(Base):
     client = Column(Text, nullable=True)
     category = Column(String, nullable=False)
     video_url = Column(Text, nullable=True)
+    video_hls_url = Column(Text, nullable=True)  # master-плейлист HLS, заполняет задача перекодирования
     orientation = Column(String, nullable=True)
     images = Column(ARRAY(Text), nullable=True)
     duration = Column(Integer, nullable=True)
@@ -36,3 +38,14 @@ class Project(Base):
     display_order = Column(Integer, nullable=True, default=0)  # Порядок отображения
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Полнотекстовый поиск (GIN); вычисляется PostgreSQL, в обычных выборках не загружается
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('russian', coalesce(title_ru, '') || ' ' || coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(title_en, '')), 'A') || "
+        "setweight(to_tsvector('russian', coalesce(description_ru, '') || ' ' || coalesce(description, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(description_en, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(client, '')), 'C')",
+        persisted=True,
+    )))
+    # Размеры и плейсхолдеры изображений из media_meta; заполняется with_expression в выборках
+    media = query_expression()
@@ -0,0 +1,20 @@
+"""
+Модель похожих проектов (предрассчитанные top-K соседи)
+"""
+from sqlalchemy import Column, Float, ForeignKey, Index, SmallInteger
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.infrastructure.db.session import Base
+
+
+class ProjectRelated(Base):
+    __tablename__ = "project_related"
+
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    position = Column(SmallInteger, primary_key=True)  # 0 — самый похожий
+    related_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    score = Column(Float(24), nullable=False)
+
+    __table_args__ = (
+        Index("idx_project_related_related", "related_id"),
+    )
@@ -0,0 +1,32 @@
+"""
+Модели агрегатов для админ-панели (поддерживаются триггерами БД)
+"""
+from sqlalchemy import BigInteger, Column, Date, Integer, Numeric
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.infrastructure.db.session import Base
+
+
+class StatsEnrollmentsDaily(Base):
+    __tablename__ = "stats_enrollments_daily"
+
+    course_id = Column(UUID(as_uuid=True), primary_key=True)
+    day = Column(Date, primary_key=True, index=True)  # UTC
+    enrollments = Column(Integer, nullable=False, default=0)
+
+
+class StatsContactsWeekly(Base):
+    __tablename__ = "stats_contacts_weekly"
+
+    week = Column(Date, primary_key=True)  # понедельник недели, UTC
+    submissions = Column(Integer, nullable=False, default=0)
+    budget_total = Column(BigInteger, nullable=False, default=0)
+
+
+class StatsRevenueDaily(Base):
+    __tablename__ = "stats_revenue_daily"
+
+    course_id = Column(UUID(as_uuid=True), primary_key=True)
+    day = Column(Date, primary_key=True, index=True)  # UTC
+    payments = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
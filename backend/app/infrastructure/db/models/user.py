@@ -1,7 +1,7 @@
 """
 Модель пользователя
 """
-from sqlalchemy import Column, String, Text, DateTime, func
+from sqlalchemy import Column, String, Text, Integer, DateTime, func
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from app.infrastructure.db.session import Base
@@ -18,5 +18,6 @@ class User(Base):
     provider = Column(String, nullable=False, default="email")
     provider_id = Column(String, nullable=True)
     role = Column(String, nullable=False, default="user")
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")  # Растёт при смене роли/пароля
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -3,37 +3,51 @@ SQLAlchemy repository for BlogPost.
 """
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from uuid import UUID
 
-from sqlalchemy import select, func
+from sqlalchemy import Row, Select, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.infrastructure.db.models.blog_post import BlogPost
+from app.infrastructure.db.repositories.projection import projected_columns
 
 
 class SqlAlchemyBlogRepository:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
-    async def list_posts(
-        self,
-        published: Optional[bool],
-        limit: int,
-        offset: int,
-    ) -> List[BlogPost]:
-        query = select(BlogPost)
+    @staticmethod
+    def _filter_page(query: Select, published: Optional[bool], limit: int, offset: int) -> Select:
         if published is not None:
             query = query.where(BlogPost.is_published == published)
 
-        query = query.order_by(
+        return query.order_by(
             func.coalesce(BlogPost.published_at, BlogPost.created_at).desc(),
             BlogPost.created_at.desc(),
         ).limit(limit).offset(offset)
 
-        result = await self._session.execute(query)
+    async def list_posts(
+        self,
+        published: Optional[bool],
+        limit: int,
+        offset: int,
+    ) -> List[BlogPost]:
+        result = await self._session.execute(self._filter_page(select(BlogPost), published, limit, offset))
         return result.scalars().all()
 
+    async def list_posts_fields(
+        self,
+        fields: Sequence[str],
+        published: Optional[bool],
+        limit: int,
+        offset: int,
+    ) -> List[Row]:
+        """Без content в fields текст статей не читается из БД"""
+        query = self._filter_page(select(*projected_columns(BlogPost, fields)), published, limit, offset)
+        result = await self._session.execute(query)
+        return list(result.all())
+
     async def get_by_slug(self, slug: str) -> Optional[BlogPost]:
         result = await self._session.execute(select(BlogPost).where(BlogPost.slug == slug))
         return result.scalar_one_or_none()
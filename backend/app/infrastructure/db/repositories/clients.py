@@ -3,13 +3,19 @@ SQLAlchemy repository for Client.
 """
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import with_expression
 
 from app.infrastructure.db.models.client import Client
+from app.infrastructure.db.repositories.media_meta import media_for
+from app.infrastructure.db.repositories.projection import projected_columns
+
+CLIENT_MEDIA = media_for(Client.logo_url)
+WITH_MEDIA = with_expression(Client.media, CLIENT_MEDIA)
 
 
 class SqlAlchemyClientsRepository:
@@ -18,16 +24,23 @@ class SqlAlchemyClientsRepository:
 
     async def list_clients(self) -> List[Client]:
         result = await self._session.execute(
-            select(Client).order_by(Client.order.asc(), Client.created_at.desc())
+            select(Client).options(WITH_MEDIA).order_by(Client.order.asc(), Client.created_at.desc())
         )
         return result.scalars().all()
 
+    async def list_clients_fields(self, fields: Sequence[str]) -> List[Row]:
+        columns = projected_columns(Client, fields, extras={"media": CLIENT_MEDIA})
+        result = await self._session.execute(
+            select(*columns).order_by(Client.order.asc(), Client.created_at.desc())
+        )
+        return list(result.all())
+
     async def get_by_slug(self, slug: str) -> Optional[Client]:
-        result = await self._session.execute(select(Client).where(Client.slug == slug))
+        result = await self._session.execute(select(Client).options(WITH_MEDIA).where(Client.slug == slug))
         return result.scalar_one_or_none()
 
     async def get_by_id(self, client_id: UUID) -> Optional[Client]:
-        result = await self._session.execute(select(Client).where(Client.id == client_id))
+        result = await self._session.execute(select(Client).options(WITH_MEDIA).where(Client.id == client_id))
         return result.scalar_one_or_none()
 
     async def create(self, data: dict) -> Client:
@@ -0,0 +1,159 @@
+"""
+SQLAlchemy repository for ContentView (дневные агрегаты просмотров).
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    LargeBinary,
+    Text,
+    and_,
+    column,
+    exists,
+    func,
+    or_,
+    select,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db.models.blog_post import BlogPost
+from app.infrastructure.db.models.content_view import ContentView
+from app.infrastructure.db.models.project import Project
+from app.utils.hll import union
+
+# (content_type, content_id, day, views, HyperLogLog-скетч посетителей)
+ViewRow = Tuple[str, UUID, date, int, Optional[bytes]]
+
+
+@dataclass
+class PopularContent:
+    type: str
+    id: UUID
+    slug: str
+    title: str
+    views: int
+    visitors: int
+
+
+def _values(rows: Sequence[ViewRow]):
+    return values(
+        column("content_type", Text),
+        column("content_id", PG_UUID(as_uuid=True)),
+        column("day", Date),
+        column("views", BigInteger),
+        column("visitors", LargeBinary),
+        name="v",
+    ).data(list(rows))
+
+
+class SqlAlchemyContentViewsRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def upsert(self, rows: Sequence[ViewRow]) -> int:
+        """
+        Прибавляет просмотры и объединяет скетчи (без commit); возвращает число строк.
+
+        Существующие строки блокируются (в порядке ключа — без взаимоблокировок
+        между воркерами), скетчи объединяются в NumPy и пишутся одним
+        UPDATE ... FROM (VALUES ...). Новые строки — INSERT ... ON CONFLICT:
+        hll_union в БД нужен, только если другой воркер успел вставить ту же строку.
+        Просмотры несуществующих материалов отбрасываются: id приходят от клиента.
+        """
+        keys = [(content_type, content_id, day) for content_type, content_id, day, _, _ in rows]
+        existing_result = await self._session.execute(
+            select(ContentView.content_type, ContentView.content_id, ContentView.day, ContentView.visitors)
+            .where(tuple_(ContentView.content_type, ContentView.content_id, ContentView.day).in_(keys))
+            .order_by(ContentView.content_type, ContentView.content_id, ContentView.day)
+            .with_for_update()
+        )
+        existing = {(t, i, d): sketch for t, i, d, sketch in existing_result.all()}
+
+        updates = [
+            (t, i, d, views, union([existing[(t, i, d)], sketch]).to_bytes())
+            for t, i, d, views, sketch in rows
+            if (t, i, d) in existing
+        ]
+        inserts = [row for row in rows if row[:3] not in existing]
+        written = 0
+        if updates:
+            v = _values(updates)
+            result = await self._session.execute(
+                update(ContentView)
+                .where(
+                    ContentView.content_type == v.c.content_type,
+                    ContentView.content_id == v.c.content_id,
+                    ContentView.day == v.c.day,
+                )
+                .values(views=ContentView.views + v.c.views, visitors=v.c.visitors)
+                .execution_options(synchronize_session=False)
+            )
+            written += result.rowcount
+        if inserts:
+            v = _values(inserts)
+            known = or_(
+                and_(v.c.content_type == "project", exists().where(Project.id == v.c.content_id)),
+                and_(v.c.content_type == "blog", exists().where(BlogPost.id == v.c.content_id)),
+            )
+            statement = insert(ContentView).from_select(
+                ["content_type", "content_id", "day", "views", "visitors"],
+                select(v.c.content_type, v.c.content_id, v.c.day, v.c.views, v.c.visitors).where(known),
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=[ContentView.content_type, ContentView.content_id, ContentView.day],
+                set_={
+                    "views": ContentView.views + statement.excluded.views,
+                    "visitors": func.hll_union(ContentView.visitors, statement.excluded.visitors),
+                },
+            )
+            result = await self._session.execute(statement)
+            written += result.rowcount
+        return written
+
+    async def popular(self, content_type: str, since: date, limit: int) -> List[PopularContent]:
+        """Самые просматриваемые материалы с day >= since; уникальные посетители — объединением скетчей"""
+        totals = (
+            select(ContentView.content_id, func.sum(ContentView.views).label("views"))
+            .where(ContentView.content_type == content_type, ContentView.day >= since)
+            .group_by(ContentView.content_id)
+            .subquery("totals")
+        )
+        if content_type == "project":
+            query = select(Project.id, Project.slug, func.coalesce(Project.title_ru, Project.title), totals.c.views)
+            query = query.join(totals, totals.c.content_id == Project.id)
+        else:
+            query = select(BlogPost.id, BlogPost.slug, BlogPost.title, totals.c.views)
+            query = query.join(totals, totals.c.content_id == BlogPost.id).where(BlogPost.is_published.is_(True))
+        result = await self._session.execute(
+            query.order_by(totals.c.views.desc(), totals.c.content_id).limit(limit)
+        )
+        top = result.all()
+        if not top:
+            return []
+
+        sketches = await self._session.execute(
+            select(ContentView.content_id, ContentView.visitors).where(
+                ContentView.content_type == content_type,
+                ContentView.day >= since,
+                ContentView.content_id.in_([row[0] for row in top]),
+            )
+        )
+        by_id: Dict[UUID, List[bytes]] = defaultdict(list)
+        for content_id, sketch in sketches.all():
+            by_id[content_id].append(sketch)
+        return [
+            PopularContent(content_type, id_, slug, title, int(views), union(by_id[id_]).count())
+            for id_, slug, title, views in top
+        ]
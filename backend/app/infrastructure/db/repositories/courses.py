@@ -3,20 +3,31 @@ SQLAlchemy repository for Course.
 """
 from __future__ import annotations
 
-from typing import Optional, List
+from typing import Optional, List, Sequence, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, func
+from sqlalchemy import Row, Select, exists, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.infrastructure.db.models.course import Course, CourseModule, Lesson
+from app.infrastructure.db.repositories.projection import projected_columns
 
 
 class SqlAlchemyCoursesRepository:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
+    @staticmethod
+    def _filter_page(query: Select, category: Optional[str], limit: int, offset: int) -> Select:
+        if category and category != "all":
+            query = query.where(Course.category == category)
+
+        return query.order_by(
+            func.coalesce(Course.display_order, 0).asc(),
+            Course.created_at.desc(),
+        ).limit(limit).offset(offset)
+
     async def list_courses(
         self,
         category: Optional[str],
@@ -26,17 +37,20 @@ class SqlAlchemyCoursesRepository:
         query = select(Course).options(
             selectinload(Course.modules).selectinload(CourseModule.lessons)
         )
+        result = await self._session.execute(self._filter_page(query, category, limit, offset))
+        return result.scalars().all()
 
-        if category and category != "all":
-            query = query.where(Course.category == category)
-
-        query = query.order_by(
-            func.coalesce(Course.display_order, 0).asc(),
-            Course.created_at.desc(),
-        ).limit(limit).offset(offset)
-
+    async def list_courses_fields(
+        self,
+        fields: Sequence[str],
+        category: Optional[str],
+        limit: int,
+        offset: int,
+    ) -> List[Row]:
+        """Колонки курсов без модулей и уроков: два запроса selectinload не выполняются"""
+        query = self._filter_page(select(*projected_columns(Course, fields)), category, limit, offset)
         result = await self._session.execute(query)
-        return result.scalars().all()
+        return list(result.all())
 
     async def get_by_slug(self, slug: str) -> Optional[Course]:
         query = (
@@ -53,6 +67,35 @@ class SqlAlchemyCoursesRepository:
         result = await self._session.execute(select(Course).where(Course.id == course_id))
         return result.scalar_one_or_none()
 
+    async def get_lesson_access(self, lesson_id: UUID) -> Optional[Tuple[UUID, Optional[str], Optional[str]]]:
+        """(course_id, video_url, video_hls_url) урока — для проверки доступа без загрузки курса"""
+        result = await self._session.execute(
+            select(CourseModule.course_id, Lesson.video_url, Lesson.video_hls_url)
+            .join(CourseModule, CourseModule.id == Lesson.module_id)
+            .where(Lesson.id == lesson_id)
+        )
+        row = result.first()
+        return tuple(row) if row else None
+
+    async def has_lesson_video(
+        self,
+        video_url: Optional[str] = None,
+        video_url_prefix: Optional[str] = None,
+        hls_url_prefix: Optional[str] = None,
+    ) -> bool:
+        """Есть ли урок с таким видео (точный URL или префиксы исходника / HLS-каталога)"""
+        conditions = []
+        if video_url:
+            conditions.append(Lesson.video_url == video_url)
+        if video_url_prefix:
+            conditions.append(Lesson.video_url.startswith(video_url_prefix, autoescape=True))
+        if hls_url_prefix:
+            conditions.append(Lesson.video_hls_url.startswith(hls_url_prefix, autoescape=True))
+        if not conditions:
+            return False
+        result = await self._session.execute(select(exists().where(or_(*conditions))))
+        return bool(result.scalar())
+
     async def get_by_id_with_relations(self, course_id: UUID) -> Optional[Course]:
         query = (
             select(Course)
@@ -70,16 +113,19 @@ class SqlAlchemyCoursesRepository:
         await self._session.flush()
 
         if modules_data:
-            for module_data in modules_data:
+            # Номера битов прогресса — в порядке дерева курса
+            ordinal = 0
+            for module_data in sorted(modules_data, key=lambda m: m.get("order", 0)):
                 module_payload = dict(module_data)
                 lessons_data = module_payload.pop("lessons", []) or []
                 new_module = CourseModule(**module_payload, course_id=new_course.id)
                 self._session.add(new_module)
                 await self._session.flush()
 
-                for lesson_data in lessons_data:
-                    new_lesson = Lesson(**lesson_data, module_id=new_module.id)
+                for lesson_data in sorted(lessons_data, key=lambda lesson: lesson.get("order", 0)):
+                    new_lesson = Lesson(**lesson_data, module_id=new_module.id, ordinal=ordinal)
                     self._session.add(new_lesson)
+                    ordinal += 1
 
         await self._session.commit()
         course = await self.get_by_id_with_relations(new_course.id)
@@ -113,4 +159,4 @@ class SqlAlchemyCoursesRepository:
             return
         course.modules.sort(key=lambda m: m.order)
         for module in course.modules:
-            module.lessons.sort(key=lambda l: l.order)
+            module.lessons.sort(key=lambda lesson: lesson.order)
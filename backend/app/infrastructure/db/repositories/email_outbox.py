@@ -0,0 +1,85 @@
+"""
+SQLAlchemy repository for EmailOutbox.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db.models.email_outbox import EmailOutbox
+
+
+class SqlAlchemyEmailOutboxRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    def enqueue(self, template: str, payload: dict) -> EmailOutbox:
+        """Добавляет письмо в текущую транзакцию (commit делает вызывающий код)"""
+        message = EmailOutbox(template=template, payload=payload, status="pending", attempts=0)
+        self._session.add(message)
+        return message
+
+    async def claim_batch(self, limit: int, lease_seconds: int) -> List[EmailOutbox]:
+        """
+        Забирает пачку готовых к отправке писем.
+
+        SKIP LOCKED позволяет нескольким воркерам разбирать outbox параллельно;
+        next_attempt_at сдвигается на время аренды, поэтому письмо упавшего
+        воркера вернётся в работу само.
+        """
+        ready = (
+            select(EmailOutbox.id)
+            .where(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= func.now())
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self._session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(ready))
+            .values(
+                attempts=EmailOutbox.attempts + 1,
+                next_attempt_at=func.now() + timedelta(seconds=lease_seconds),
+            )
+            .returning(EmailOutbox)
+            .execution_options(synchronize_session=False)
+        )
+        messages = list(result.scalars().all())
+        await self._session.commit()
+        return messages
+
+    async def mark_sent(self, message_ids: List[UUID]) -> None:
+        if not message_ids:
+            return
+        await self._session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(message_ids))
+            .values(status="sent", sent_at=func.now(), last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+        await self._session.commit()
+
+    async def mark_failed(
+        self,
+        message_id: UUID,
+        error: str,
+        retry_at: datetime | None,
+    ) -> None:
+        """Планирует повтор или окончательно помечает письмо как неотправленное"""
+        values: dict = {"last_error": error[:1000]}
+        if retry_at is None:
+            values["status"] = "failed"
+        else:
+            values["next_attempt_at"] = retry_at
+        await self._session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id == message_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await self._session.commit()
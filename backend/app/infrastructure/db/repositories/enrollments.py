@@ -3,15 +3,70 @@ SQLAlchemy repository for Enrollment.
 """
 from __future__ import annotations
 
-from typing import List, Optional
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import LargeBinary, and_, case, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.infrastructure.db.models.course import Course, CourseModule, Lesson
 from app.infrastructure.db.models.enrollment import Enrollment
 
 
+@dataclass
+class LessonProgress:
+    enrollment_id: UUID
+    course_id: UUID
+    progress: int
+    completed_at: Optional[datetime]
+    lessons: Dict[UUID, bool]
+
+
+@dataclass
+class EnrolledCourse:
+    id: UUID
+    course_id: UUID
+    progress: int
+    enrolled_at: datetime
+    completed_at: Optional[datetime]
+    title: str
+    slug: str
+    cover_image: Optional[str]
+    category: str
+    level: Optional[str]
+    format: Optional[str]
+    duration: Optional[int]
+    price: Decimal
+    lessons_count: int
+
+
+def _course_lessons_count(course_id):
+    return (
+        select(func.count(Lesson.id))
+        .join(CourseModule, CourseModule.id == Lesson.module_id)
+        .where(CourseModule.course_id == course_id)
+        .scalar_subquery()
+    )
+
+
+def _with_bits(bits, set_ordinals: Iterable[int], clear_ordinals: Iterable[int]):
+    """
+    Выражение SQL: bytea с установленными/сброшенными битами.
+    Битовая карта дополняется нулевыми байтами до нужной длины, поэтому
+    set_bit не выходит за границы; всё вычисляется в одном UPDATE.
+    """
+    changes = [(ordinal, 1) for ordinal in set_ordinals] + [(ordinal, 0) for ordinal in clear_ordinals]
+    needed_bytes = max(ordinal for ordinal, _ in changes) // 8 + 1
+    padding = func.decode(func.repeat("00", func.greatest(0, needed_bytes - func.length(bits))), "hex")
+    expr = bits.op("||", return_type=LargeBinary)(padding)
+    for ordinal, value in changes:
+        expr = func.set_bit(expr, ordinal, value, type_=LargeBinary)
+    return expr
+
+
 class SqlAlchemyEnrollmentsRepository:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
@@ -24,6 +79,37 @@ class SqlAlchemyEnrollmentsRepository:
         )
         return result.scalars().all()
 
+    async def course_ids_by_user(self, user_id: UUID) -> List[UUID]:
+        result = await self._session.execute(
+            select(Enrollment.course_id).where(Enrollment.user_id == user_id)
+        )
+        return result.scalars().all()
+
+    async def list_with_courses(self, user_id: UUID) -> List[EnrolledCourse]:
+        """Записи пользователя с карточками курсов и числом уроков — одним запросом"""
+        result = await self._session.execute(
+            select(
+                Enrollment.id,
+                Enrollment.course_id,
+                Enrollment.progress,
+                Enrollment.enrolled_at,
+                Enrollment.completed_at,
+                Course.title,
+                Course.slug,
+                Course.cover_image,
+                Course.category,
+                Course.level,
+                Course.format,
+                Course.duration,
+                Course.price,
+                _course_lessons_count(Enrollment.course_id).label("lessons_count"),
+            )
+            .join(Course, Course.id == Enrollment.course_id)
+            .where(Enrollment.user_id == user_id)
+            .order_by(Enrollment.enrolled_at.desc())
+        )
+        return [EnrolledCourse(**row._mapping) for row in result.all()]
+
     async def get_by_user_and_course(self, user_id: UUID, course_id: UUID) -> Optional[Enrollment]:
         result = await self._session.execute(
             select(Enrollment).where(
@@ -55,3 +141,82 @@ class SqlAlchemyEnrollmentsRepository:
         await self._session.commit()
         await self._session.refresh(enrollment)
         return enrollment
+
+    async def lesson_ordinals(self, course_id: UUID, lesson_ids: Iterable[UUID]) -> Dict[UUID, int]:
+        """Номера битов для уроков курса (уроки других курсов не попадут)"""
+        ids = list(lesson_ids)
+        if not ids:
+            return {}
+        result = await self._session.execute(
+            select(Lesson.id, Lesson.ordinal)
+            .join(CourseModule, CourseModule.id == Lesson.module_id)
+            .where(CourseModule.course_id == course_id, Lesson.id.in_(ids))
+        )
+        return dict(result.tuples().all())
+
+    async def update_lessons(
+        self,
+        enrollment: Enrollment,
+        completed: Iterable[int],
+        uncompleted: Iterable[int],
+    ) -> Enrollment:
+        """
+        Атомарно отмечает уроки (по номерам битов) и пересчитывает progress
+        из числа установленных битов (bit_count) — без чтения карты в приложение.
+        """
+        completed, uncompleted = list(completed), list(uncompleted)
+        if not completed and not uncompleted:
+            return enrollment
+
+        bits = _with_bits(Enrollment.lessons_completed, completed, uncompleted)
+        done = func.bit_count(bits)
+        total = _course_lessons_count(Enrollment.course_id)
+        await self._session.execute(
+            update(Enrollment)
+            .where(Enrollment.id == enrollment.id)
+            .values(
+                lessons_completed=bits,
+                progress=case(
+                    (total > 0, func.least(100, done * 100 / total)),
+                    else_=Enrollment.progress,
+                ),
+                completed_at=case(
+                    (and_(total > 0, done >= total), func.coalesce(Enrollment.completed_at, func.now())),
+                    else_=Enrollment.completed_at,
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self._session.commit()
+        await self._session.refresh(enrollment)
+        return enrollment
+
+    async def lesson_progress_by_user(self, user_id: UUID) -> List[LessonProgress]:
+        """Карты пройденных уроков по всем записям пользователя — одним запросом"""
+        bits = Enrollment.lessons_completed
+        is_done = and_(Lesson.ordinal < func.length(bits) * 8, func.get_bit(bits, Lesson.ordinal) == 1)
+        result = await self._session.execute(
+            select(
+                Enrollment.id,
+                Enrollment.course_id,
+                Enrollment.progress,
+                Enrollment.completed_at,
+                func.array_agg(Lesson.id).filter(Lesson.id.is_not(None)),
+                func.array_agg(case((is_done, True), else_=False)).filter(Lesson.id.is_not(None)),
+            )
+            .outerjoin(CourseModule, CourseModule.course_id == Enrollment.course_id)
+            .outerjoin(Lesson, Lesson.module_id == CourseModule.id)
+            .where(Enrollment.user_id == user_id)
+            .group_by(Enrollment.id)
+            .order_by(Enrollment.enrolled_at.desc())
+        )
+        return [
+            LessonProgress(
+                enrollment_id=enrollment_id,
+                course_id=course_id,
+                progress=progress,
+                completed_at=completed_at,
+                lessons=dict(zip(lesson_ids or [], flags or [], strict=True)),
+            )
+            for enrollment_id, course_id, progress, completed_at, lesson_ids, flags in result.all()
+        ]
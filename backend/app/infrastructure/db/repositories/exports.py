@@ -0,0 +1,93 @@
+"""
+SQLAlchemy repository для выгрузок заявок и записей на курсы.
+
+Строки читаются серверным курсором (stream + yield_per) пачками: в памяти
+процесса одновременно не больше одной пачки, сколько бы строк ни было.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import AsyncIterator, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db.models.contact import ContactSubmission
+from app.infrastructure.db.models.course import Course
+from app.infrastructure.db.models.enrollment import Enrollment
+from app.infrastructure.db.models.user import User
+
+CONTACT_COLUMNS: Tuple[str, ...] = ("id", "created_at", "name", "email", "phone", "budget", "message")
+ENROLLMENT_COLUMNS: Tuple[str, ...] = (
+    "id", "enrolled_at", "user_id", "user_email", "user_name",
+    "course_id", "course_title", "progress", "completed_at",
+)
+
+
+def _range(column, since: Optional[date], until: Optional[date]):
+    """Условия по дням UTC включительно — в виде сравнений с колонкой, чтобы работал индекс"""
+    conditions = []
+    if since is not None:
+        conditions.append(column >= datetime.combine(since, time.min, tzinfo=timezone.utc))
+    if until is not None:
+        conditions.append(column < datetime.combine(until + timedelta(days=1), time.min, tzinfo=timezone.utc))
+    return conditions
+
+
+class SqlAlchemyExportsRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def _batches(self, query, batch_size: int) -> AsyncIterator[Sequence[Row]]:
+        result = await self._session.stream(query.execution_options(yield_per=batch_size))
+        async for batch in result.partitions():
+            yield batch
+
+    def contact_batches(
+        self, since: Optional[date], until: Optional[date], batch_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Заявки в порядке created_at (idx_contact_submissions_created_at)"""
+        query = (
+            select(
+                ContactSubmission.id,
+                ContactSubmission.created_at,
+                ContactSubmission.name,
+                ContactSubmission.email,
+                ContactSubmission.phone,
+                ContactSubmission.budget,
+                ContactSubmission.message,
+            )
+            .where(*_range(ContactSubmission.created_at, since, until))
+            .order_by(ContactSubmission.created_at)
+        )
+        return self._batches(query, batch_size)
+
+    def enrollment_batches(
+        self,
+        since: Optional[date],
+        until: Optional[date],
+        batch_size: int,
+        course_id: Optional[UUID] = None,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Записи с пользователем и курсом в порядке enrolled_at (idx_enrollments_enrolled_at)"""
+        query = (
+            select(
+                Enrollment.id,
+                Enrollment.enrolled_at,
+                Enrollment.user_id,
+                User.email,
+                User.full_name,
+                Enrollment.course_id,
+                Course.title,
+                Enrollment.progress,
+                Enrollment.completed_at,
+            )
+            .join(User, User.id == Enrollment.user_id)
+            .join(Course, Course.id == Enrollment.course_id)
+            .where(*_range(Enrollment.enrolled_at, since, until))
+            .order_by(Enrollment.enrolled_at)
+        )
+        if course_id is not None:
+            query = query.where(Enrollment.course_id == course_id)
+        return self._batches(query, batch_size)
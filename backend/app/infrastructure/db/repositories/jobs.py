@@ -0,0 +1,173 @@
+"""
+SQLAlchemy repository for Job.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import Interval, and_, case, delete, func, literal_column, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnClause
+
+from app.infrastructure.db.models.job import Job
+
+ONE_SECOND: ColumnClause[timedelta] = literal_column("interval '1 second'", Interval())
+
+
+class SqlAlchemyJobRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    def enqueue(
+        self,
+        task: str,
+        payload: dict,
+        *,
+        priority: int = 0,
+        run_at: Optional[datetime] = None,
+        max_attempts: int = 5,
+        timeout_seconds: int = 300,
+    ) -> Job:
+        """Добавляет задачу в текущую транзакцию (commit делает вызывающий код)"""
+        job = Job(
+            task=task,
+            payload=payload,
+            priority=priority,
+            status="queued",
+            attempts=0,
+            max_attempts=max_attempts,
+            timeout_seconds=timeout_seconds,
+        )
+        if run_at is not None:
+            job.run_at = run_at
+        self._session.add(job)
+        return job
+
+    async def claim(self, limit: int, worker_id: str, lease_grace_seconds: int) -> List[Job]:
+        """
+        Забирает готовые задачи в работу.
+
+        SKIP LOCKED: параллельные воркеры не ждут друг друга и не получают
+        одну и ту же задачу. Порядок — приоритет, затем время запуска.
+        Аренда — таймаут задачи плюс запас; по её истечении задача вернётся
+        в очередь (recover_stale).
+        """
+        ready = (
+            select(Job.id)
+            .where(Job.status == "queued", Job.run_at <= func.now())
+            .order_by(Job.priority.desc(), Job.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self._session.execute(
+            update(Job)
+            .where(Job.id.in_(ready))
+            .values(
+                status="running",
+                attempts=Job.attempts + 1,
+                locked_at=func.now(),
+                locked_until=func.now() + (Job.timeout_seconds + lease_grace_seconds) * ONE_SECOND,
+                locked_by=worker_id,
+            )
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+        jobs = list(result.scalars().all())
+        await self._session.commit()
+        return jobs
+
+    async def complete(self, job_id: UUID, worker_id: str) -> None:
+        """Отмечает задачу выполненной, если аренда всё ещё у этого воркера"""
+        await self._session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == "running", Job.locked_by == worker_id)
+            .values(status="done", finished_at=func.now(), locked_until=None, locked_by=None, last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+        await self._session.commit()
+
+    async def fail(self, job_id: UUID, worker_id: str, error: str, retry_at: datetime | None) -> None:
+        """Возвращает задачу в очередь на retry_at или переводит в dead letter"""
+        values: dict = {"last_error": error[:2000], "locked_until": None, "locked_by": None}
+        if retry_at is None:
+            values.update(status="dead", finished_at=func.now())
+        else:
+            values.update(status="queued", run_at=retry_at)
+        await self._session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == "running", Job.locked_by == worker_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await self._session.commit()
+
+    async def has_pending(self, task: str, payload: dict) -> bool:
+        """Есть ли задача task в очереди или в работе, чей payload содержит payload (JSONB @>)"""
+        result = await self._session.execute(
+            select(Job.id)
+            .where(Job.task == task, Job.status.in_(("queued", "running")), Job.payload.contains(payload))
+            .limit(1)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def recover_stale(self) -> int:
+        """
+        Возвращает в очередь задачи упавших воркеров (аренда истекла).
+        Задачи без оставшихся попыток уходят в dead letter.
+        """
+        exhausted = Job.attempts >= Job.max_attempts
+        result = await self._session.execute(
+            update(Job)
+            .where(
+                Job.status == "running",
+                Job.locked_until < func.now(),
+            )
+            .values(
+                status=case((exhausted, "dead"), else_="queued"),
+                finished_at=case((exhausted, func.now()), else_=None),
+                run_at=func.now(),
+                locked_until=None,
+                locked_by=None,
+                last_error="Аренда истекла: воркер не завершил задачу",
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self._session.commit()
+        return result.rowcount or 0
+
+    async def purge_finished(self, older_than_days: int) -> int:
+        """Удаляет выполненные задачи старше срока хранения (dead letter не трогаем)"""
+        result = await self._session.execute(
+            delete(Job)
+            .where(
+                and_(
+                    Job.status == "done",
+                    Job.finished_at < func.now() - timedelta(days=older_than_days),
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self._session.commit()
+        return result.rowcount or 0
+
+    async def retry_dead(self, task: Optional[str] = None) -> int:
+        """Возвращает задачи из dead letter в очередь с новым набором попыток"""
+        stmt = update(Job).where(Job.status == "dead")
+        if task is not None:
+            stmt = stmt.where(Job.task == task)
+        result = await self._session.execute(
+            stmt.values(status="queued", attempts=0, run_at=func.now(), finished_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        await self._session.commit()
+        return result.rowcount or 0
+
+    async def stats(self) -> dict[tuple[str, str], int]:
+        """Количество задач по (task, status)"""
+        result = await self._session.execute(
+            select(Job.task, Job.status, func.count()).group_by(Job.task, Job.status)
+        )
+        return {(task, status): count for task, status, count in result.all()}
@@ -0,0 +1,65 @@
+"""
+SQLAlchemy repository for MediaMeta (размеры и плейсхолдеры изображений).
+"""
+from __future__ import annotations
+
+from typing import Iterable, List, Set
+
+from sqlalchemy import any_, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.infrastructure.db.models.media_meta import MediaMeta
+
+
+def media_for(*columns: ColumnElement, arrays: Iterable[ColumnElement] = ()) -> ColumnElement:
+    """
+    Коррелированный подзапрос {url: {width, height, color, placeholder}} для
+    URL-колонок строки (и массивов URL) — встраивается в SELECT списка через
+    with_expression, отдельного запроса нет. NULL, если метаданных ещё нет.
+    """
+    conditions = [MediaMeta.url == column for column in columns]
+    conditions += [MediaMeta.url == any_(array) for array in arrays]
+    return (
+        select(
+            func.jsonb_object_agg(
+                MediaMeta.url,
+                func.jsonb_build_object(
+                    "width", MediaMeta.width,
+                    "height", MediaMeta.height,
+                    "color", MediaMeta.dominant_color,
+                    "placeholder", MediaMeta.placeholder,
+                ),
+            )
+        )
+        .where(or_(*conditions))
+        .scalar_subquery()
+    )
+
+
+class SqlAlchemyMediaMetaRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def known_urls(self) -> Set[str]:
+        result = await self._session.execute(select(MediaMeta.url))
+        return set(result.scalars().all())
+
+    async def upsert_many(self, rows: List[dict]) -> None:
+        """Записывает метаданные (без commit); повторная обработка перезаписывает строку"""
+        if not rows:
+            return
+        statement = insert(MediaMeta).values(rows)
+        await self._session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[MediaMeta.url],
+                set_={
+                    "width": statement.excluded.width,
+                    "height": statement.excluded.height,
+                    "dominant_color": statement.excluded.dominant_color,
+                    "placeholder": statement.excluded.placeholder,
+                    "updated_at": func.now(),
+                },
+            )
+        )
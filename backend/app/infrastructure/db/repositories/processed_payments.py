@@ -0,0 +1,79 @@
+"""
+SQLAlchemy repository for ProcessedPayment.
+"""
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db.models.processed_payment import ProcessedPayment
+
+
+class SqlAlchemyProcessedPaymentsRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get_status(self, payment_id: str, *, lock: bool = False) -> Optional[str]:
+        """
+        Статус события по первичному ключу (None — событие не зарегистрировано).
+        lock — FOR UPDATE до конца транзакции: повторные доставки одного платежа
+        выполняются по очереди.
+        """
+        query = select(ProcessedPayment.status).where(ProcessedPayment.payment_id == payment_id)
+        if lock:
+            query = query.with_for_update()
+        result = await self._session.execute(query)
+        return result.scalar_one_or_none()
+
+    async def record(self, payment_id: str, event: str) -> bool:
+        """
+        Регистрирует событие в текущей транзакции (commit делает вызывающий код).
+        False — событие уже зарегистрировано параллельной доставкой.
+        """
+        result = await self._session.execute(
+            insert(ProcessedPayment)
+            .values(payment_id=payment_id, event=event, status="received")
+            .on_conflict_do_nothing(index_elements=[ProcessedPayment.payment_id])
+            .returning(ProcessedPayment.payment_id)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def get(self, payment_id: str) -> Optional[ProcessedPayment]:
+        result = await self._session.execute(
+            select(ProcessedPayment).where(ProcessedPayment.payment_id == payment_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def mark(
+        self,
+        payment_id: str,
+        status: str,
+        *,
+        user_id: Optional[UUID] = None,
+        course_id: Optional[UUID] = None,
+        amount: Optional[Decimal] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Фиксирует итог обработки в текущей транзакции (без commit).
+
+        Переход в 'enrolled' учитывается триггером в stats_revenue_daily.
+        """
+        await self._session.execute(
+            update(ProcessedPayment)
+            .where(ProcessedPayment.payment_id == payment_id)
+            .values(
+                status=status,
+                user_id=user_id,
+                course_id=course_id,
+                amount=amount,
+                last_error=error[:1000] if error else None,
+                processed_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
@@ -0,0 +1,32 @@
+"""
+Колонки SELECT для выборочных полей списков (?fields=, ?lang=).
+
+Читаются только запрошенные колонки. Поле, у модели которого есть колонка
+<поле>_<lang>, приходит уже на нужном языке (пустой перевод — исходное значение).
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import func
+from sqlalchemy.sql.elements import ColumnElement, Label
+
+
+def projected_columns(
+    model: type,
+    fields: Sequence[str],
+    lang: Optional[str] = None,
+    extras: Optional[Dict[str, ColumnElement]] = None,
+) -> List[Label]:
+    """extras — выражения для полей, которых нет среди колонок (например, media)"""
+    columns = []
+    for name in fields:
+        if extras and name in extras:
+            column = extras[name]
+        elif lang and hasattr(model, f"{name}_{lang}"):
+            translated = getattr(model, f"{name}_{lang}")
+            column = func.coalesce(func.nullif(translated, ""), getattr(model, name))
+        else:
+            column = getattr(model, name)
+        columns.append(column.label(name))
+    return columns
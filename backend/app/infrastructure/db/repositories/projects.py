@@ -3,48 +3,77 @@ SQLAlchemy repository for Project.
 """
 from __future__ import annotations
 
-from typing import Optional, List
+from typing import Optional, List, Sequence
 from uuid import UUID
 
-from sqlalchemy import select, func
+from sqlalchemy import Row, Select, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import with_expression
 
 from app.infrastructure.db.models.project import Project
+from app.infrastructure.db.repositories.media_meta import media_for
+from app.infrastructure.db.repositories.projection import projected_columns
+
+# Обложка, миниатюра и галерея — плейсхолдеры в том же запросе
+PROJECT_MEDIA = media_for(Project.cover_image_url, Project.thumbnail_url, arrays=(Project.images,))
+WITH_MEDIA = with_expression(Project.media, PROJECT_MEDIA)
 
 
 class SqlAlchemyProjectsRepository:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
-    async def list_projects(
-        self,
+    @staticmethod
+    def _filter_page(
+        query: Select,
         category: Optional[str],
         featured: Optional[bool],
         limit: int,
         offset: int,
-    ) -> List[Project]:
-        query = select(Project)
-
+    ) -> Select:
         if category and category != "all":
             query = query.where(Project.category == category)
 
         if featured is not None:
             query = query.where(Project.is_featured == featured)
 
-        query = query.order_by(
+        return query.order_by(
             func.coalesce(Project.display_order, 0).asc(),
             Project.created_at.desc(),
         ).limit(limit).offset(offset)
 
+    async def list_projects(
+        self,
+        category: Optional[str],
+        featured: Optional[bool],
+        limit: int,
+        offset: int,
+    ) -> List[Project]:
+        query = self._filter_page(select(Project).options(WITH_MEDIA), category, featured, limit, offset)
         result = await self._session.execute(query)
         return result.scalars().all()
 
+    async def list_projects_fields(
+        self,
+        fields: Sequence[str],
+        lang: Optional[str],
+        category: Optional[str],
+        featured: Optional[bool],
+        limit: int,
+        offset: int,
+    ) -> List[Row]:
+        """Только запрошенные колонки; title/description — на языке lang"""
+        columns = projected_columns(Project, fields, lang, extras={"media": PROJECT_MEDIA})
+        query = self._filter_page(select(*columns), category, featured, limit, offset)
+        result = await self._session.execute(query)
+        return list(result.all())
+
     async def get_by_slug(self, slug: str) -> Optional[Project]:
-        result = await self._session.execute(select(Project).where(Project.slug == slug))
+        result = await self._session.execute(select(Project).options(WITH_MEDIA).where(Project.slug == slug))
         return result.scalar_one_or_none()
 
     async def get_by_id(self, project_id: UUID) -> Optional[Project]:
-        result = await self._session.execute(select(Project).where(Project.id == project_id))
+        result = await self._session.execute(select(Project).options(WITH_MEDIA).where(Project.id == project_id))
         return result.scalar_one_or_none()
 
     async def create(self, data: dict) -> Project:
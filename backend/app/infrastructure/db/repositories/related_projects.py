@@ -0,0 +1,100 @@
+"""
+SQLAlchemy repository for ProjectRelated (предрассчитанные похожие проекты).
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db.models.project import Project
+from app.infrastructure.db.models.project_related import ProjectRelated
+from app.infrastructure.db.repositories.projects import WITH_MEDIA
+
+# Ключ advisory-блокировки: пересчёты не перетирают друг друга
+REFRESH_LOCK_KEY = 4_202_042
+
+
+@dataclass(frozen=True)
+class ProjectFeatures:
+    id: UUID
+    category: Optional[str]
+    tools: Tuple[str, ...]
+    client: Optional[str]
+    year: Optional[int]
+    created_at: Optional[datetime] = None
+
+
+@dataclass(frozen=True)
+class Neighbour:
+    related_id: UUID
+    score: float
+
+
+class SqlAlchemyRelatedProjectsRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def list_related(self, slug: str, limit: int) -> List[Project]:
+        """Готовый список: одно чтение по первичному ключу project_related"""
+        project_id = select(Project.id).where(Project.slug == slug).scalar_subquery()
+        result = await self._session.execute(
+            select(Project)
+            .options(WITH_MEDIA)
+            .join(ProjectRelated, ProjectRelated.related_id == Project.id)
+            .where(ProjectRelated.project_id == project_id)
+            .order_by(ProjectRelated.position)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def lock(self) -> None:
+        """Сериализует пересчёты до конца транзакции"""
+        await self._session.execute(select(func.pg_advisory_xact_lock(REFRESH_LOCK_KEY)))
+
+    async def load_features(self) -> List[ProjectFeatures]:
+        result = await self._session.execute(
+            select(
+                Project.id, Project.category, Project.tools, Project.client, Project.year, Project.created_at,
+            ).order_by(Project.id)
+        )
+        return [
+            ProjectFeatures(id_, category, tuple(tools or ()), client, year, created_at)
+            for id_, category, tools, client, year, created_at in result.all()
+        ]
+
+    async def load_current(self) -> Dict[UUID, List[Neighbour]]:
+        result = await self._session.execute(
+            select(ProjectRelated.project_id, ProjectRelated.related_id, ProjectRelated.score)
+            .order_by(ProjectRelated.project_id, ProjectRelated.position)
+        )
+        current: Dict[UUID, List[Neighbour]] = defaultdict(list)
+        for project_id, related_id, score in result.all():
+            current[project_id].append(Neighbour(related_id, score))
+        return dict(current)
+
+    async def count(self) -> int:
+        return await self._session.scalar(select(func.count()).select_from(ProjectRelated)) or 0
+
+    async def replace(self, lists: Dict[UUID, List[Neighbour]], clear_all: bool = False) -> int:
+        """Перезаписывает списки переданных проектов (без commit); возвращает число строк"""
+        if clear_all:
+            await self._session.execute(delete(ProjectRelated))
+        elif lists:
+            await self._session.execute(
+                delete(ProjectRelated).where(ProjectRelated.project_id.in_(list(lists)))
+            )
+        rows = [
+            {"project_id": project_id, "position": position, "related_id": n.related_id, "score": n.score}
+            for project_id, neighbours in lists.items()
+            for position, n in enumerate(neighbours)
+        ]
+        for start in range(0, len(rows), 5000):
+            await self._session.execute(insert(ProjectRelated), rows[start:start + 5000])
+        return len(rows)
+
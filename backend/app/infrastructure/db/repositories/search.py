@@ -0,0 +1,200 @@
+"""
+Полнотекстовый поиск по проектам, курсам и статьям блога
+и источники индекса подсказок (названия и имена клиентов).
+"""
+from __future__ import annotations
+
+import html
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, literal, select, true, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.infrastructure.db.models.blog_post import BlogPost
+from app.infrastructure.db.models.client import Client
+from app.infrastructure.db.models.course import Course
+from app.infrastructure.db.models.project import Project
+
+SEARCH_TYPES = ("project", "course", "blog")
+
+# Маркеры подсветки, которых нет в тексте: фрагмент экранируется, затем они заменяются на <mark>
+_START, _STOP = "\x02", "\x03"
+HEADLINE_OPTIONS = f"StartSel={_START}, StopSel={_STOP}, MaxFragments=2, MaxWords=24, MinWords=8, FragmentDelimiter= … "
+
+
+@dataclass
+class SearchHit:
+    type: str
+    id: UUID
+    slug: str
+    title: str
+    rank: float
+    snippet: str
+
+
+@dataclass
+class SearchPage:
+    hits: List[SearchHit]
+    # Совпадений в какой-то таблице больше SEARCH_RANK_CANDIDATES: часть не ранжировалась
+    truncated: bool
+
+
+@dataclass(frozen=True)
+class SuggestSource:
+    """Запись для индекса подсказок: варианты названия и видимость на сайте"""
+    type: str
+    id: UUID
+    slug: Optional[str]
+    title: str
+    variants: Tuple[str, ...]
+    public: bool = True
+
+
+def _variants(*titles: Optional[str]) -> Tuple[str, ...]:
+    return tuple(dict.fromkeys(t for t in titles if t))
+
+
+def project_source(project) -> SuggestSource:
+    return SuggestSource(
+        "project", project.id, project.slug, project.title_ru or project.title,
+        _variants(project.title, project.title_ru, project.title_en),
+    )
+
+
+def course_source(course) -> SuggestSource:
+    return SuggestSource("course", course.id, course.slug, course.title, _variants(course.title))
+
+
+def blog_source(post) -> SuggestSource:
+    return SuggestSource("blog", post.id, post.slug, post.title, _variants(post.title), bool(post.is_published))
+
+
+def client_source(client) -> SuggestSource:
+    return SuggestSource("client", client.id, client.slug, client.name, _variants(client.name))
+
+
+def _query(text: str):
+    """Запрос в обеих конфигурациях: websearch понимает кавычки, OR и минус"""
+    return func.websearch_to_tsquery("russian", text).op("||")(func.websearch_to_tsquery("english", text))
+
+
+def _render_snippet(raw: Optional[str]) -> str:
+    return html.escape(raw or "").replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+class SqlAlchemySearchRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def search(
+        self,
+        text: str,
+        types: Optional[Iterable[str]] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> SearchPage:
+        """
+        Ранжирование ts_rank по GIN-индексам; ts_headline считается только
+        для отобранной страницы — он читает исходный текст и дорог.
+
+        ts_rank читает весь tsvector строки, поэтому из каждой таблицы
+        ранжируется не больше SEARCH_RANK_CANDIDATES совпадений: LIMIT
+        останавливает сканирование, а не сортирует все совпадения. Какие
+        совпадения попадут в кандидаты, не определено — при усечении лучшие
+        по рангу могут не войти, поэтому оно возвращается флагом truncated
+        (из таблицы читается на одну строку больше лимита).
+        """
+        wanted = set(types or SEARCH_TYPES)
+        query = _query(text)
+        candidates = settings.SEARCH_RANK_CANDIDATES
+        scanned = candidates + 1
+        parts = []
+        if "project" in wanted:
+            parts.append(
+                select(
+                    literal("project").label("type"),
+                    Project.id,
+                    Project.slug,
+                    func.coalesce(Project.title_ru, Project.title).label("title"),
+                    func.coalesce(Project.description_ru, Project.description, Project.description_en).label("body"),
+                    func.ts_rank(Project.search_vector, query).label("rank"),
+                ).where(Project.search_vector.op("@@")(query)).limit(scanned)
+            )
+        if "course" in wanted:
+            parts.append(
+                select(
+                    literal("course").label("type"),
+                    Course.id,
+                    Course.slug,
+                    Course.title,
+                    Course.description.label("body"),
+                    func.ts_rank(Course.search_vector, query).label("rank"),
+                ).where(Course.search_vector.op("@@")(query)).limit(scanned)
+            )
+        if "blog" in wanted:
+            parts.append(
+                select(
+                    literal("blog").label("type"),
+                    BlogPost.id,
+                    BlogPost.slug,
+                    BlogPost.title,
+                    func.coalesce(BlogPost.content, BlogPost.excerpt).label("body"),
+                    func.ts_rank(BlogPost.search_vector, query).label("rank"),
+                ).where(BlogPost.is_published.is_(True), BlogPost.search_vector.op("@@")(query)).limit(scanned)
+            )
+        if not parts:
+            return SearchPage([], False)
+
+        hits = union_all(*parts).subquery("hits")
+        # Лишняя строка таблицы (номер > candidates) только отмечает усечение и не ранжируется
+        numbered = select(hits, func.row_number().over(partition_by=hits.c.type).label("n")).cte("numbered")
+        page = (
+            select(numbered)
+            .where(numbered.c.n <= candidates)
+            .order_by(numbered.c.rank.desc(), numbered.c.id)
+            .limit(limit)
+            .offset(offset)
+            .subquery("page")
+        )
+        flag = select(func.bool_or(numbered.c.n > candidates).label("truncated")).subquery("flag")
+        # Строка флага есть всегда, даже если страница пуста (LEFT JOIN)
+        result = await self._session.execute(
+            select(
+                flag.c.truncated,
+                page.c.type,
+                page.c.id,
+                page.c.slug,
+                page.c.title,
+                page.c.rank,
+                func.ts_headline("russian", func.coalesce(page.c.body, ""), query, HEADLINE_OPTIONS),
+            )
+            .select_from(flag.outerjoin(page, true()))
+            .order_by(page.c.rank.desc(), page.c.id)
+        )
+        rows = result.all()
+        return SearchPage(
+            hits=[
+                SearchHit(type=type_, id=id_, slug=slug, title=title, rank=float(rank), snippet=_render_snippet(snippet))
+                for _, type_, id_, slug, title, rank, snippet in rows
+                if id_ is not None
+            ],
+            truncated=bool(rows and rows[0][0]),
+        )
+
+    async def suggest_sources(self) -> List[SuggestSource]:
+        """Все названия для построения индекса подсказок (только нужные колонки)"""
+        projects = await self._session.execute(
+            select(Project.id, Project.slug, Project.title, Project.title_ru, Project.title_en)
+        )
+        courses = await self._session.execute(select(Course.id, Course.slug, Course.title))
+        posts = await self._session.execute(select(BlogPost.id, BlogPost.slug, BlogPost.title, BlogPost.is_published))
+        clients = await self._session.execute(select(Client.id, Client.slug, Client.name))
+        return [
+            *(project_source(row) for row in projects),
+            *(course_source(row) for row in courses),
+            *(blog_source(row) for row in posts),
+            *(client_source(row) for row in clients),
+        ]
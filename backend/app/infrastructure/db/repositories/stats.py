@@ -0,0 +1,203 @@
+"""
+SQLAlchemy repository for dashboard rollups (stats_* tables).
+
+Чтение — только из агрегатов; пересчёт диапазона из сырых таблиц нужен
+для первичного заполнения и исправлений (app.application.services.stats_rollups).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import Date, cast, delete, func, insert, literal, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db.models.contact import ContactSubmission
+from app.infrastructure.db.models.course import Course
+from app.infrastructure.db.models.enrollment import Enrollment
+from app.infrastructure.db.models.processed_payment import ProcessedPayment
+from app.infrastructure.db.models.stats import (
+    StatsContactsWeekly,
+    StatsEnrollmentsDaily,
+    StatsRevenueDaily,
+)
+
+# Сырые таблицы агрегатов: блокируются при пересчёте текущего периода
+RAW_TABLES = ("enrollments", "contact_submissions", "processed_payments")
+
+
+@dataclass
+class EnrollmentsDay:
+    course_id: UUID
+    course_title: Optional[str]
+    day: date
+    enrollments: int
+
+
+@dataclass
+class ContactsWeek:
+    week: date
+    submissions: int
+    budget_total: int
+
+
+@dataclass
+class CourseRevenue:
+    course_id: UUID
+    course_title: Optional[str]
+    payments: int
+    revenue: Decimal
+
+
+def _utc_day(column):
+    return cast(func.timezone("UTC", column), Date)
+
+
+def _bounds(start: date, end: date):
+    """Полуинтервал [start, end) в timestamptz для условий по сырым таблицам"""
+    return (
+        datetime.combine(start, time.min, tzinfo=timezone.utc),
+        datetime.combine(end, time.min, tzinfo=timezone.utc),
+    )
+
+
+class SqlAlchemyStatsRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def enrollments_daily(
+        self, since: date, until: date, course_id: Optional[UUID] = None
+    ) -> List[EnrollmentsDay]:
+        query = (
+            select(StatsEnrollmentsDaily.course_id, Course.title, StatsEnrollmentsDaily.day, StatsEnrollmentsDaily.enrollments)
+            .outerjoin(Course, Course.id == StatsEnrollmentsDaily.course_id)
+            .where(
+                StatsEnrollmentsDaily.day >= since,
+                StatsEnrollmentsDaily.day <= until,
+                StatsEnrollmentsDaily.enrollments != 0,
+            )
+            .order_by(StatsEnrollmentsDaily.day, Course.title)
+        )
+        if course_id is not None:
+            query = query.where(StatsEnrollmentsDaily.course_id == course_id)
+        result = await self._session.execute(query)
+        return [EnrollmentsDay(*row) for row in result.all()]
+
+    async def contacts_weekly(self, since: date, until: date) -> List[ContactsWeek]:
+        result = await self._session.execute(
+            select(StatsContactsWeekly.week, StatsContactsWeekly.submissions, StatsContactsWeekly.budget_total)
+            .where(
+                StatsContactsWeekly.week >= func.date_trunc("week", since).cast(Date),
+                StatsContactsWeekly.week <= until,
+                StatsContactsWeekly.submissions != 0,
+            )
+            .order_by(StatsContactsWeekly.week)
+        )
+        return [ContactsWeek(*row) for row in result.all()]
+
+    async def revenue_by_course(self, since: date, until: date) -> List[CourseRevenue]:
+        totals = (
+            select(
+                StatsRevenueDaily.course_id,
+                func.sum(StatsRevenueDaily.payments).label("payments"),
+                func.sum(StatsRevenueDaily.revenue).label("revenue"),
+            )
+            .where(StatsRevenueDaily.day >= since, StatsRevenueDaily.day <= until)
+            .group_by(StatsRevenueDaily.course_id)
+            .subquery("totals")
+        )
+        result = await self._session.execute(
+            select(totals.c.course_id, Course.title, totals.c.payments, totals.c.revenue)
+            .outerjoin(Course, Course.id == totals.c.course_id)
+            .order_by(totals.c.revenue.desc(), totals.c.course_id)
+        )
+        return [CourseRevenue(course_id, title, int(payments), revenue) for course_id, title, payments, revenue in result.all()]
+
+    async def lock_raw_tables(self) -> None:
+        """SHARE-блокировка сырых таблиц до конца транзакции: вставки ждут, чтение идёт"""
+        await self._session.execute(text(f"LOCK TABLE {', '.join(RAW_TABLES)} IN SHARE MODE"))
+
+    async def rebuild(self, start: date, end: date) -> int:
+        """
+        Пересчитывает агрегаты дней [start, end) из сырых таблиц (без commit).
+
+        Границы — понедельники, чтобы недели заявок не делились между диапазонами.
+        Возвращает число прочитанных сырых строк.
+        """
+        start_at, end_at = _bounds(start, end)
+
+        await self._session.execute(
+            delete(StatsEnrollmentsDaily).where(StatsEnrollmentsDaily.day >= start, StatsEnrollmentsDaily.day < end)
+        )
+        enrolled_day = _utc_day(Enrollment.enrolled_at)
+        await self._session.execute(
+            insert(StatsEnrollmentsDaily).from_select(
+                ["course_id", "day", "enrollments"],
+                select(Enrollment.course_id, enrolled_day, func.count())
+                .where(Enrollment.enrolled_at >= start_at, Enrollment.enrolled_at < end_at)
+                .group_by(Enrollment.course_id, enrolled_day),
+            )
+        )
+
+        await self._session.execute(
+            delete(StatsContactsWeekly).where(StatsContactsWeekly.week >= start, StatsContactsWeekly.week < end)
+        )
+        week = cast(func.date_trunc("week", func.timezone("UTC", ContactSubmission.created_at)), Date)
+        await self._session.execute(
+            insert(StatsContactsWeekly).from_select(
+                ["week", "submissions", "budget_total"],
+                select(week, func.count(), func.coalesce(func.sum(ContactSubmission.budget), 0))
+                .where(ContactSubmission.created_at >= start_at, ContactSubmission.created_at < end_at)
+                .group_by(week),
+            )
+        )
+
+        await self._session.execute(
+            delete(StatsRevenueDaily).where(StatsRevenueDaily.day >= start, StatsRevenueDaily.day < end)
+        )
+        paid_day = _utc_day(ProcessedPayment.processed_at)
+        await self._session.execute(
+            insert(StatsRevenueDaily).from_select(
+                ["course_id", "day", "payments", "revenue"],
+                select(
+                    ProcessedPayment.course_id,
+                    paid_day,
+                    func.count(),
+                    func.coalesce(func.sum(ProcessedPayment.amount), literal(0)),
+                )
+                .where(
+                    ProcessedPayment.status == "enrolled",
+                    ProcessedPayment.course_id.is_not(None),
+                    ProcessedPayment.processed_at >= start_at,
+                    ProcessedPayment.processed_at < end_at,
+                )
+                .group_by(ProcessedPayment.course_id, paid_day),
+            )
+        )
+
+        raw = await self._session.execute(
+            select(
+                select(func.count()).where(Enrollment.enrolled_at >= start_at, Enrollment.enrolled_at < end_at)
+                .scalar_subquery(),
+                select(func.count()).where(ContactSubmission.created_at >= start_at, ContactSubmission.created_at < end_at)
+                .scalar_subquery(),
+            )
+        )
+        return sum(raw.one())
+
+    async def first_event_day(self) -> Optional[date]:
+        """Самый ранний день в сырых таблицах (начало пересчёта)"""
+        result = await self._session.execute(
+            select(
+                func.least(
+                    select(func.min(Enrollment.enrolled_at)).scalar_subquery(),
+                    select(func.min(ContactSubmission.created_at)).scalar_subquery(),
+                    select(func.min(ProcessedPayment.processed_at)).scalar_subquery(),
+                )
+            )
+        )
+        first = result.scalar_one_or_none()
+        return first.astimezone(timezone.utc).date() if first else None
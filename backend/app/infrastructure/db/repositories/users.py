@@ -9,8 +9,12 @@ from uuid import UUID
 from sqlalchemy import select, or_, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.application.services.principal_cache import invalidate_principal
 from app.infrastructure.db.models.user import User
 
+# Изменение этих полей отзывает выданные токены (token_version + 1)
+TOKEN_REVOKING_FIELDS = ("role", "password_hash")
+
 
 class SqlAlchemyUsersRepository:
     def __init__(self, session: AsyncSession) -> None:
@@ -47,9 +51,16 @@ class SqlAlchemyUsersRepository:
         await self._session.refresh(user)
         return user
 
-    async def update(self, user: User, data: dict) -> User:
+    async def update(self, user: User, data: dict, revoke_tokens: bool = True) -> User:
+        revoked = revoke_tokens and any(
+            field in data and data[field] != getattr(user, field) for field in TOKEN_REVOKING_FIELDS
+        )
         for field, value in data.items():
             setattr(user, field, value)
+        if revoked:
+            user.token_version = (user.token_version or 0) + 1
         await self._session.commit()
         await self._session.refresh(user)
+        if revoked:
+            invalidate_principal(user.id)
         return user
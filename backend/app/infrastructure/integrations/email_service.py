@@ -1,10 +1,10 @@
 """
 Сервис для отправки email через Resend
 """
-import httpx
 import html
-from typing import Dict
+from typing import Dict, Optional
 from app.config import settings
+from app.infrastructure.integrations.http_clients import outbound
 
 
 def escape_html(text: str) -> str:
@@ -14,7 +14,31 @@ def escape_html(text: str) -> str:
     return html.escape(str(text))
 
 
-async def send_contact_form_notification(admin_email: str, submission_data: Dict) -> bool:
+async def _send_email(payload: Dict, idempotency_key: Optional[str] = None) -> bool:
+    """Отправляет письмо через Resend API"""
+    headers = {
+        "Authorization": f"Bearer {settings.RESEND_API_KEY}",
+        "Content-Type": "application/json",
+    }
+    if idempotency_key:
+        # Resend не отправит письмо повторно с тем же ключом — повторы безопасны
+        headers["Idempotency-Key"] = idempotency_key
+    response = await outbound.request(
+        "resend",
+        "POST",
+        "/emails",
+        idempotent=bool(idempotency_key),
+        headers=headers,
+        json=payload,
+    )
+    return response.status_code == 200
+
+
+async def send_contact_form_notification(
+    admin_email: str,
+    submission_data: Dict,
+    idempotency_key: Optional[str] = None,
+) -> bool:
     """Отправляет уведомление администратору о новой заявке"""
     if not settings.RESEND_API_KEY:
         # В production используйте логирование вместо print
@@ -30,35 +54,33 @@ async def send_contact_form_notification(admin_email: str, submission_data: Dict
         message = escape_html(str(submission_data.get('message', '')))
         subject_name = escape_html(str(submission_data.get('name', '')))
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.resend.com/emails",
-                headers={
-                    "Authorization": f"Bearer {settings.RESEND_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "from": settings.ADMIN_EMAIL,
-                    "to": [admin_email],
-                    "subject": f"Новая заявка с сайта: {subject_name}",
-                    "html": f"""
-                    <h2>Новая заявка с контактной формы</h2>
-                    <p><strong>Имя:</strong> {name}</p>
-                    <p><strong>Email:</strong> {email}</p>
-                    <p><strong>Телефон:</strong> {phone}</p>
-                    <p><strong>Бюджет:</strong> {budget_str}</p>
-                    <p><strong>Сообщение:</strong></p>
-                    <p>{message}</p>
-                    """,
-                }
-            )
-            return response.status_code == 200
+        return await _send_email(
+            {
+                "from": settings.ADMIN_EMAIL,
+                "to": [admin_email],
+                "subject": f"Новая заявка с сайта: {subject_name}",
+                "html": f"""
+                <h2>Новая заявка с контактной формы</h2>
+                <p><strong>Имя:</strong> {name}</p>
+                <p><strong>Email:</strong> {email}</p>
+                <p><strong>Телефон:</strong> {phone}</p>
+                <p><strong>Бюджет:</strong> {budget_str}</p>
+                <p><strong>Сообщение:</strong></p>
+                <p>{message}</p>
+                """,
+            },
+            idempotency_key,
+        )
     except Exception as e:
         # В production используйте логирование вместо print
         return False
 
 
-async def send_course_enrollment_confirmation(user_email: str, course_title: str) -> bool:
+async def send_course_enrollment_confirmation(
+    user_email: str,
+    course_title: str,
+    idempotency_key: Optional[str] = None,
+) -> bool:
     """Отправляет подтверждение записи на курс"""
     if not settings.RESEND_API_KEY:
         return False
@@ -68,26 +90,20 @@ async def send_course_enrollment_confirmation(user_email: str, course_title: str
         safe_course_title = escape_html(course_title)
         safe_app_url = escape_html(settings.APP_URL)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.resend.com/emails",
-                headers={
-                    "Authorization": f"Bearer {settings.RESEND_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "from": settings.ADMIN_EMAIL,
-                    "to": [user_email],
-                    "subject": f"Вы записаны на курс: {safe_course_title}",
-                    "html": f"""
-                    <h2>Добро пожаловать на курс!</h2>
-                    <p>Вы успешно записались на курс <strong>{safe_course_title}</strong>.</p>
-                    <p>Теперь вы можете начать обучение в личном кабинете.</p>
-                    <p><a href="{safe_app_url}/dashboard">Перейти в личный кабинет</a></p>
-                    """,
-                }
-            )
-            return response.status_code == 200
+        return await _send_email(
+            {
+                "from": settings.ADMIN_EMAIL,
+                "to": [user_email],
+                "subject": f"Вы записаны на курс: {safe_course_title}",
+                "html": f"""
+                <h2>Добро пожаловать на курс!</h2>
+                <p>Вы успешно записались на курс <strong>{safe_course_title}</strong>.</p>
+                <p>Теперь вы можете начать обучение в личном кабинете.</p>
+                <p><a href="{safe_app_url}/dashboard">Перейти в личный кабинет</a></p>
+                """,
+            },
+            idempotency_key,
+        )
     except Exception:
         # В production используйте логирование вместо print
         return False
@@ -0,0 +1,189 @@
+"""
+Общие HTTP-клиенты для внешних интеграций (OAuth, Resend, YooKassa, S3).
+
+Один httpx.AsyncClient на интеграцию на весь процесс: пул соединений и
+keep-alive переиспользуются между запросами, у каждой интеграции свои
+таймауты и политика повторов. Базовые URL можно подменить через
+OUTBOUND_BASE_URL_OVERRIDES (например, на локальный stub-сервер).
+"""
+import asyncio
+import random
+from dataclasses import dataclass, field, replace
+from time import perf_counter
+from typing import Any, Dict, FrozenSet, Optional
+
+import httpx
+
+from app.config import settings
+from app.utils.metrics import OUTBOUND_ERRORS, OUTBOUND_REQUEST_DURATION, OUTBOUND_RETRIES
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# Ошибки, при которых запрос гарантированно не ушёл на сервер — повтор безопасен для любого метода
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+@dataclass(frozen=True)
+class Upstream:
+    name: str
+    base_url: str
+    timeout: float = 10.0
+    connect_timeout: float = 5.0
+    max_connections: int = 20
+    max_keepalive: int = 10
+    retries: int = 2
+    backoff_base: float = 0.2
+    backoff_max: float = 2.0
+    retry_statuses: FrozenSet[int] = field(default=RETRY_STATUSES)
+
+
+DEFAULT_UPSTREAMS = (
+    Upstream("google_oauth", "https://oauth2.googleapis.com"),
+    Upstream("google_api", "https://www.googleapis.com"),
+    Upstream("yandex_oauth", "https://oauth.yandex.ru"),
+    Upstream("yandex_login", "https://login.yandex.ru"),
+    Upstream("resend", "https://api.resend.com", timeout=15.0, retries=3),
+    Upstream("yookassa", "https://api.yookassa.ru", timeout=10.0, retries=3),
+    # Хранилище загрузок (STORAGE_DRIVER=s3): таймаут — на одну часть multipart
+    Upstream(
+        "s3",
+        (settings.S3_ENDPOINT_URL or f"https://s3.{settings.S3_REGION}.amazonaws.com").rstrip("/"),
+        timeout=60.0,
+        max_connections=32,
+        max_keepalive=16,
+        retries=3,
+    ),
+)
+
+
+def _base_url_overrides() -> Dict[str, str]:
+    overrides = {}
+    for item in settings.OUTBOUND_BASE_URL_OVERRIDES.split(","):
+        name, sep, url = item.partition("=")
+        if sep and name.strip() and url.strip():
+            overrides[name.strip()] = url.strip().rstrip("/")
+    return overrides
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class OutboundClients:
+    """Реестр клиентов по интеграциям с повторами и метриками"""
+
+    def __init__(self, upstreams: tuple[Upstream, ...]) -> None:
+        overrides = _base_url_overrides()
+        self._upstreams: Dict[str, Upstream] = {}
+        for upstream in upstreams:
+            if upstream.name in overrides:
+                upstream = replace(upstream, base_url=overrides[upstream.name])
+            self._upstreams[upstream.name] = upstream
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def _build_client(self, upstream: Upstream) -> httpx.AsyncClient:
+        http2 = settings.OUTBOUND_HTTP2 and _http2_available()
+        return httpx.AsyncClient(
+            base_url=upstream.base_url,
+            http2=http2,
+            timeout=httpx.Timeout(upstream.timeout, connect=upstream.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=upstream.max_connections,
+                max_keepalive_connections=upstream.max_keepalive,
+                keepalive_expiry=settings.OUTBOUND_KEEPALIVE_SECONDS,
+            ),
+        )
+
+    async def start(self) -> None:
+        """Создаёт клиенты при старте приложения"""
+        if settings.OUTBOUND_HTTP2 and not _http2_available():
+            print("⚠️ OUTBOUND_HTTP2 включён, но пакет h2 не установлен — используем HTTP/1.1")
+        for name in self._upstreams:
+            self.client(name)
+
+    def client(self, name: str) -> httpx.AsyncClient:
+        """Клиент интеграции; создаётся лениво (для скриптов и воркеров без startup)"""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._build_client(self._upstreams[name])
+            self._clients[name] = client
+        return client
+
+    async def request(
+        self,
+        name: str,
+        method: str,
+        url: str,
+        *,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Запрос к интеграции с повторами.
+
+        Неидемпотентные запросы (POST) повторяются только если соединение
+        не установилось; идемпотентные — ещё и при 429/5xx и сетевых ошибках.
+        """
+        upstream = self._upstreams[name]
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        client = self.client(name)
+
+        attempt = 0
+        while True:
+            started = perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError as exc:
+                OUTBOUND_REQUEST_DURATION.labels(name, method, "error").observe(perf_counter() - started)
+                OUTBOUND_ERRORS.labels(name, type(exc).__name__).inc()
+                retryable = idempotent or isinstance(exc, NOT_SENT_ERRORS)
+                if not retryable or attempt >= upstream.retries:
+                    raise
+                retry_after = None
+            else:
+                OUTBOUND_REQUEST_DURATION.labels(name, method, str(response.status_code)).observe(
+                    perf_counter() - started
+                )
+                if response.status_code >= 500:
+                    OUTBOUND_ERRORS.labels(name, f"http_{response.status_code}").inc()
+                if (
+                    not idempotent
+                    or response.status_code not in upstream.retry_statuses
+                    or attempt >= upstream.retries
+                ):
+                    return response
+                retry_after = _retry_after_seconds(response)
+
+            attempt += 1
+            OUTBOUND_RETRIES.labels(name).inc()
+            await asyncio.sleep(retry_after if retry_after is not None else _backoff(upstream, attempt))
+
+    async def close(self) -> None:
+        clients, self._clients = self._clients, {}
+        await asyncio.gather(*(client.aclose() for client in clients.values()), return_exceptions=True)
+
+
+def _backoff(upstream: Upstream, attempt: int) -> float:
+    """Экспоненциальная задержка с полным джиттером"""
+    ceiling = min(upstream.backoff_max, upstream.backoff_base * (2 ** (attempt - 1)))
+    return random.uniform(0, ceiling)
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        # Не ждём дольше разумного внутри запроса пользователя
+        return min(max(float(value), 0.0), 5.0)
+    except ValueError:
+        return None
+
+
+outbound = OutboundClients(DEFAULT_UPSTREAMS)
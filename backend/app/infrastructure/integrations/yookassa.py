@@ -0,0 +1,38 @@
+"""
+Клиент API YooKassa
+"""
+import base64
+from typing import Any, Dict
+
+from app.config import settings
+from app.infrastructure.integrations.http_clients import outbound
+
+
+class YooKassaError(Exception):
+    """Ошибка API YooKassa (status_code — HTTP-статус ответа)"""
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(f"YooKassa API error {status_code}: {detail}")
+        self.status_code = status_code
+
+
+def _auth_header() -> str:
+    if not settings.YOOKASSA_SHOP_ID or not settings.YOOKASSA_SECRET_KEY:
+        raise RuntimeError("YOOKASSA credentials не настроены")
+    token = base64.b64encode(f"{settings.YOOKASSA_SHOP_ID}:{settings.YOOKASSA_SECRET_KEY}".encode("utf-8")).decode(
+        "utf-8"
+    )
+    return f"Basic {token}"
+
+
+async def get_payment(payment_id: str) -> Dict[str, Any]:
+    """Актуальное состояние платежа из API (источник истины вместо тела webhook)"""
+    resp = await outbound.request(
+        "yookassa",
+        "GET",
+        f"/v3/payments/{payment_id}",
+        headers={"Authorization": _auth_header()},
+    )
+    if resp.status_code >= 400:
+        raise YooKassaError(resp.status_code, resp.text[:500])
+    return resp.json()
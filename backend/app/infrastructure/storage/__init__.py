@@ -0,0 +1,58 @@
+"""
+Хранилище загруженных файлов: локальный каталог UPLOAD_DIR (по умолчанию)
+или S3-совместимое (STORAGE_DRIVER=s3).
+
+Код приложения работает с ключами ("images/<uuid>.jpg") через storage и не
+знает, где лежат файлы; публичные URL остаются /uploads/<ключ>.
+"""
+import mimetypes
+
+from app.config import settings
+from app.infrastructure.storage.base import (
+    ObjectInfo,
+    Storage,
+    StorageError,
+    is_hidden_key,
+    key_for_url,
+)
+from app.infrastructure.storage.local import LocalStorage
+from app.infrastructure.storage.s3 import S3Storage
+from app.utils.uploads import UPLOAD_DIR
+
+# Системная база mimetypes может не знать HLS (а .ts — считать переводами Qt)
+mimetypes.add_type("application/vnd.apple.mpegurl", ".m3u8")
+mimetypes.add_type("video/mp2t", ".ts")
+
+DRIVERS = ("local", "s3")
+
+
+def build_storage(driver: str) -> Storage:
+    if driver == "local":
+        return LocalStorage(UPLOAD_DIR)
+    if driver == "s3":
+        return S3Storage(
+            bucket=settings.S3_BUCKET,
+            region=settings.S3_REGION,
+            access_key=settings.S3_ACCESS_KEY_ID,
+            secret_key=settings.S3_SECRET_ACCESS_KEY,
+            prefix=settings.S3_PREFIX,
+            part_size=settings.S3_PART_SIZE_MB * 1024 * 1024,
+            concurrency=settings.S3_CONCURRENCY,
+        )
+    raise StorageError(f"Неизвестный STORAGE_DRIVER: {driver} (ожидается {' или '.join(DRIVERS)})")
+
+
+storage = build_storage(settings.STORAGE_DRIVER)
+
+__all__ = [
+    "DRIVERS",
+    "LocalStorage",
+    "ObjectInfo",
+    "S3Storage",
+    "Storage",
+    "StorageError",
+    "build_storage",
+    "is_hidden_key",
+    "key_for_url",
+    "storage",
+]
@@ -0,0 +1,89 @@
+"""
+Общий интерфейс драйверов хранилища загрузок.
+
+Ключ — путь относительно корня uploads через "/" ("images/<uuid>.jpg",
+"hls/<имя>/master.m3u8"); публичный URL файла — /uploads/<ключ>.
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import AsyncIterator, Optional
+
+UPLOADS_URL_PREFIX = "/uploads/"
+READ_CHUNK_SIZE = 256 * 1024
+
+
+class StorageError(RuntimeError):
+    """Хранилище ответило ошибкой (кроме отсутствия файла — это FileNotFoundError)"""
+
+
+@dataclass(frozen=True)
+class ObjectInfo:
+    key: str
+    size: int
+    content_type: Optional[str] = None
+
+
+def check_key(key: str) -> str:
+    """Ключ без выхода за корень: без "..", ведущего "/" и обратных слешей"""
+    parts = PurePosixPath(key).parts
+    if not key or "\\" in key or key.startswith("/") or any(part in ("..", ".") for part in parts):
+        raise ValueError(f"Недопустимый ключ хранилища: {key!r}")
+    return key
+
+
+def is_hidden_key(key: str) -> bool:
+    """Временные файлы и каталоги незавершённой записи (".<имя>.*") — не часть хранилища"""
+    return any(part.startswith(".") for part in key.split("/"))
+
+
+def key_for_url(url: Optional[str]) -> Optional[str]:
+    """Ключ для /uploads/... URL; None — внешний источник"""
+    if not url or not url.startswith(UPLOADS_URL_PREFIX):
+        return None
+    return url[len(UPLOADS_URL_PREFIX):].split("?", 1)[0] or None
+
+
+class Storage(ABC):
+    """Драйвер хранилища; все операции асинхронные и не блокируют цикл событий"""
+
+    name = "base"
+
+    @abstractmethod
+    async def save(self, key: str, chunks: AsyncIterator[bytes], content_type: Optional[str] = None) -> int:
+        """Записывает поток байтов; возвращает размер"""
+
+    @abstractmethod
+    async def save_file(self, key: str, path: Path, content_type: Optional[str] = None) -> int:
+        ...
+
+    @abstractmethod
+    async def download_file(self, key: str, path: Path) -> int:
+        ...
+
+    @abstractmethod
+    def open(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Содержимое кусками; start/end — диапазон байтов включительно"""
+
+    @abstractmethod
+    async def stat(self, key: str) -> Optional[ObjectInfo]:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> int:
+        """Удаляет все файлы "каталога" prefix/; возвращает их число"""
+
+    @abstractmethod
+    def list(self, prefix: str = "") -> AsyncIterator[ObjectInfo]:
+        ...
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """Путь на диске, если файл лежит локально (FileResponse, ffmpeg без скачивания)"""
+        return None
+
+    async def exists(self, key: str) -> bool:
+        return await self.stat(key) is not None
@@ -0,0 +1,131 @@
+"""
+Локальный драйвер: файлы в каталоге UPLOAD_DIR (volume backend/uploads).
+
+Запись — во временный файл рядом и атомарный rename: читатель никогда не
+видит недописанный файл. Дисковые операции — в потоках (asyncio.to_thread).
+"""
+import asyncio
+import mimetypes
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from app.infrastructure.storage.base import (
+    READ_CHUNK_SIZE,
+    ObjectInfo,
+    Storage,
+    check_key,
+    is_hidden_key,
+)
+
+
+class LocalStorage(Storage):
+    name = "local"
+
+    def __init__(self, root: Path) -> None:
+        self._root = Path(root)
+
+    def local_path(self, key: str) -> Path:
+        return self._root / check_key(key)
+
+    def _temp_for(self, path: Path) -> str:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        os.close(fd)
+        return tmp
+
+    async def save(self, key: str, chunks: AsyncIterator[bytes], content_type: Optional[str] = None) -> int:
+        path = self.local_path(key)
+        tmp = await asyncio.to_thread(self._temp_for, path)
+        size = 0
+        try:
+            with open(tmp, "wb") as output:
+                async for chunk in chunks:
+                    await asyncio.to_thread(output.write, chunk)
+                    size += len(chunk)
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        return size
+
+    async def save_file(self, key: str, path: Path, content_type: Optional[str] = None) -> int:
+        target = self.local_path(key)
+
+        def copy() -> int:
+            if Path(path).resolve() == target.resolve():
+                return target.stat().st_size
+            tmp = self._temp_for(target)
+            try:
+                shutil.copyfile(path, tmp)
+                os.chmod(tmp, 0o644)
+                os.replace(tmp, target)
+            finally:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+            return target.stat().st_size
+
+        return await asyncio.to_thread(copy)
+
+    async def download_file(self, key: str, path: Path) -> int:
+        source = self.local_path(key)
+        await asyncio.to_thread(shutil.copyfile, source, path)
+        return source.stat().st_size
+
+    async def open(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        file = await asyncio.to_thread(open, self.local_path(key), "rb")
+        try:
+            file.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                size = READ_CHUNK_SIZE if remaining is None else min(READ_CHUNK_SIZE, remaining)
+                chunk = await asyncio.to_thread(file.read, size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            file.close()
+
+    async def stat(self, key: str) -> Optional[ObjectInfo]:
+        path = self.local_path(key)
+        try:
+            info = await asyncio.to_thread(path.stat)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        if not path.is_file():
+            return None
+        return ObjectInfo(key, info.st_size, mimetypes.guess_type(path.name)[0])
+
+    async def delete(self, key: str) -> None:
+        try:
+            await asyncio.to_thread(os.unlink, self.local_path(key))
+        except FileNotFoundError:
+            pass
+
+    async def delete_prefix(self, prefix: str) -> int:
+        directory = self.local_path(prefix.rstrip("/"))
+        if not directory.is_dir():
+            return 0
+        count = sum(len(files) for _, _, files in os.walk(directory))
+        await asyncio.to_thread(shutil.rmtree, directory, True)
+        return count
+
+    async def list(self, prefix: str = "") -> AsyncIterator[ObjectInfo]:
+        def scan() -> list:
+            found = []
+            for current, _, names in os.walk(self._root):
+                for name in names:
+                    path = Path(current) / name
+                    key = path.relative_to(self._root).as_posix()
+                    if is_hidden_key(key) or not key.startswith(prefix) or not path.is_file():
+                        continue
+                    found.append(ObjectInfo(key, path.stat().st_size, mimetypes.guess_type(name)[0]))
+            return found
+
+        for info in await asyncio.to_thread(scan):
+            yield info
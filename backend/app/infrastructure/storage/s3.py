@@ -0,0 +1,403 @@
+"""
+S3-совместимый драйвер (AWS S3, MinIO, Yandex Object Storage) поверх общего
+httpx-клиента интеграции "s3" — без SDK, запросы подписываются SigV4.
+
+Файлы больше S3_PART_SIZE_MB загружаются multipart-ом: части уходят
+параллельно (не больше S3_CONCURRENCY одновременно), в памяти — не больше
+S3_CONCURRENCY + 1 частей. Локальный файл режется по смещениям, и каждая часть
+читается в своей задаче. Скачивание файла целиком — параллельными Range-запросами
+с записью по смещениям; раздача (open) — потоком одного запроса.
+Адресация — path-style (<endpoint>/<bucket>/<ключ>): её понимают и AWS, и MinIO.
+"""
+import asyncio
+import functools
+import hashlib
+import hmac
+import mimetypes
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import quote
+from xml.etree import ElementTree
+
+import httpx
+
+from app.infrastructure.integrations.http_clients import outbound
+from app.infrastructure.storage.base import ObjectInfo, Storage, StorageError, check_key
+from app.utils.metrics import OUTBOUND_ERRORS, STORAGE_BYTES
+
+UPSTREAM = "s3"
+EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+# Минимальная часть multipart в S3 — 5 МБ (кроме последней)
+MIN_PART_SIZE = 5 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+LIST_PAGE_SIZE = 1000
+
+PartLoader = Callable[[], Awaitable[bytes]]
+
+
+def _quote(value: str) -> str:
+    return quote(value, safe="-_.~")
+
+
+def _hmac(key: bytes, message: str) -> bytes:
+    return hmac.new(key, message.encode(), hashlib.sha256).digest()
+
+
+def sign_v4(
+    method: str,
+    host: str,
+    path: str,
+    query: Mapping[str, str],
+    headers: Mapping[str, str],
+    payload_sha256: str,
+    access_key: str,
+    secret_key: str,
+    region: str,
+    now: Optional[datetime] = None,
+    service: str = "s3",
+) -> Dict[str, str]:
+    """
+    Заголовки запроса с подписью AWS Signature Version 4.
+
+    path — уже закодированный путь; подписываются host, x-amz-* и все
+    переданные заголовки.
+    """
+    now = now or datetime.now(timezone.utc)
+    amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+    day = amz_date[:8]
+    signed = {key.lower(): str(value).strip() for key, value in headers.items()}
+    signed.update({"host": host, "x-amz-content-sha256": payload_sha256, "x-amz-date": amz_date})
+    names = sorted(signed)
+    canonical_query = "&".join(f"{_quote(key)}={_quote(value)}" for key, value in sorted(query.items()))
+    canonical_request = "\n".join([
+        method,
+        path,
+        canonical_query,
+        "".join(f"{name}:{signed[name]}\n" for name in names),
+        ";".join(names),
+        payload_sha256,
+    ])
+    scope = f"{day}/{region}/{service}/aws4_request"
+    string_to_sign = "\n".join([
+        "AWS4-HMAC-SHA256",
+        amz_date,
+        scope,
+        hashlib.sha256(canonical_request.encode()).hexdigest(),
+    ])
+    key = _hmac(_hmac(_hmac(_hmac(f"AWS4{secret_key}".encode(), day), region), service), "aws4_request")
+    signature = hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+    signed["authorization"] = (
+        f"AWS4-HMAC-SHA256 Credential={access_key}/{scope}, "
+        f"SignedHeaders={';'.join(names)}, Signature={signature}"
+    )
+    del signed["host"]
+    return signed
+
+
+def _xml_text(body: bytes, tag: str) -> Optional[str]:
+    """Текст первого элемента tag (без учёта пространства имён S3)"""
+    for element in ElementTree.fromstring(body).iter():
+        if element.tag.rsplit("}", 1)[-1] == tag:
+            return element.text
+    return None
+
+
+class S3Storage(Storage):
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        region: str,
+        access_key: str,
+        secret_key: str,
+        prefix: str = "",
+        part_size: int = 8 * 1024 * 1024,
+        concurrency: int = 4,
+    ) -> None:
+        if not bucket:
+            raise StorageError("STORAGE_DRIVER=s3 требует S3_BUCKET")
+        self._bucket = bucket
+        self._region = region
+        self._access_key = access_key
+        self._secret_key = secret_key
+        self._prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self._part_size = max(part_size, MIN_PART_SIZE)
+        self._concurrency = max(1, concurrency)
+
+    # --- запросы ---
+
+    def _path(self, key: Optional[str] = None) -> str:
+        if key is None:
+            return f"/{_quote(self._bucket)}"
+        return f"/{_quote(self._bucket)}/{quote(self._prefix + check_key(key), safe='/-_.~')}"
+
+    def _signed(
+        self, method: str, path: str, query: Mapping[str, str], headers: Mapping[str, str], payload_sha256: str
+    ) -> Tuple[str, Dict[str, str]]:
+        client = outbound.client(UPSTREAM)
+        signed = sign_v4(
+            method, client.base_url.netloc.decode(), path, query, headers, payload_sha256,
+            self._access_key, self._secret_key, self._region,
+        )
+        url = path
+        if query:
+            url += "?" + "&".join(f"{_quote(key)}={_quote(value)}" for key, value in sorted(query.items()))
+        return url, signed
+
+    async def _request(
+        self,
+        method: str,
+        key: Optional[str] = None,
+        query: Optional[Mapping[str, str]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        body: bytes = b"",
+        expected: Tuple[int, ...] = (200,),
+    ) -> httpx.Response:
+        payload_sha256 = await asyncio.to_thread(_sha256, body) if len(body) > 64 * 1024 else _sha256(body)
+        url, signed = self._signed(method, self._path(key), query or {}, headers or {}, payload_sha256)
+        # POST (Create/CompleteMultipartUpload) не повторяется: повтор Create оставит
+        # лишнюю загрузку, а повтор удавшегося Complete получит 404 NoSuchUpload
+        response = await outbound.request(
+            UPSTREAM, method, url, headers=signed, content=body or None, idempotent=method != "POST"
+        )
+        if response.status_code == 404 and 404 not in expected:
+            raise FileNotFoundError(key or self._bucket)
+        if response.status_code not in expected:
+            raise StorageError(f"S3 {method} {key or self._bucket}: {response.status_code} {response.text[:500]}")
+        return response
+
+    # --- чтение ---
+
+    async def stat(self, key: str) -> Optional[ObjectInfo]:
+        response = await self._request("HEAD", key, expected=(200, 404))
+        if response.status_code == 404:
+            return None
+        return ObjectInfo(key, int(response.headers.get("content-length", 0)), response.headers.get("content-type"))
+
+    async def open(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        headers = {}
+        if start or end is not None:
+            headers["range"] = f"bytes={start}-{'' if end is None else end}"
+        url, signed = self._signed("GET", self._path(key), {}, headers, EMPTY_SHA256)
+        async with outbound.client(UPSTREAM).stream("GET", url, headers=signed) as response:
+            if response.status_code == 404:
+                raise FileNotFoundError(key)
+            if response.status_code not in (200, 206):
+                await response.aread()
+                raise StorageError(f"S3 GET {key}: {response.status_code} {response.text[:500]}")
+            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                STORAGE_BYTES.labels(self.name, "download").inc(len(chunk))
+                yield chunk
+
+    async def download_file(self, key: str, path: Path) -> int:
+        info = await self.stat(key)
+        if info is None:
+            raise FileNotFoundError(key)
+        ranges = [
+            (start, min(start + self._part_size, info.size) - 1) for start in range(0, info.size, self._part_size)
+        ]
+        slots = asyncio.Semaphore(self._concurrency)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, info.size)
+
+            async def fetch(start: int, end: int) -> None:
+                async with slots:
+                    offset = start
+                    async for chunk in self.open(key, start, end):
+                        await asyncio.to_thread(os.pwrite, fd, chunk, offset)
+                        offset += len(chunk)
+                    if offset != end + 1:
+                        raise StorageError(f"S3 GET {key}: диапазон {start}-{end} оборвался на {offset}")
+
+            await _gather_or_cancel([fetch(start, end) for start, end in ranges])
+        finally:
+            os.close(fd)
+        return info.size
+
+    async def list(self, prefix: str = "") -> AsyncIterator[ObjectInfo]:
+        token = None
+        while True:
+            query = {"list-type": "2", "prefix": self._prefix + prefix, "max-keys": str(LIST_PAGE_SIZE)}
+            if token:
+                query["continuation-token"] = token
+            response = await self._request("GET", query=query)
+            root = ElementTree.fromstring(response.content)
+            for element in root:
+                if element.tag.rsplit("}", 1)[-1] != "Contents":
+                    continue
+                fields = {child.tag.rsplit("}", 1)[-1]: child.text or "" for child in element}
+                yield ObjectInfo(fields["Key"][len(self._prefix):], int(fields["Size"] or 0))
+            if _xml_text(response.content, "IsTruncated") != "true":
+                return
+            token = _xml_text(response.content, "NextContinuationToken")
+
+    # --- запись ---
+
+    async def _put(self, key: str, body: bytes, content_type: Optional[str]) -> int:
+        headers = {"content-type": content_type or _guess_type(key)}
+        await self._request("PUT", key, headers=headers, body=body)
+        STORAGE_BYTES.labels(self.name, "upload").inc(len(body))
+        return len(body)
+
+    async def _multipart(self, key: str, content_type: Optional[str], parts: AsyncIterator[Tuple[int, PartLoader]]) -> int:
+        """Параллельная загрузка частей; при ошибке загрузка отменяется (AbortMultipartUpload)"""
+        response = await self._request(
+            "POST", key, query={"uploads": ""}, headers={"content-type": content_type or _guess_type(key)}
+        )
+        upload_id = _xml_text(response.content, "UploadId")
+        if not upload_id:
+            raise StorageError(f"S3 не вернул UploadId для {key}")
+        slots = asyncio.Semaphore(self._concurrency)
+        etags: Dict[int, str] = {}
+        sizes: Dict[int, int] = {}
+        tasks: List[asyncio.Task] = []
+
+        async def send(number: int, load: PartLoader) -> None:
+            try:
+                data = await load()
+                response = await self._request(
+                    "PUT", key, query={"partNumber": str(number), "uploadId": upload_id}, body=data
+                )
+                etags[number] = response.headers["etag"]
+                sizes[number] = len(data)
+                STORAGE_BYTES.labels(self.name, "upload").inc(len(data))
+            finally:
+                slots.release()
+
+        try:
+            async for number, load in parts:
+                await slots.acquire()
+                error = next((task.exception() for task in tasks if task.done() and task.exception()), None)
+                if error is not None:
+                    slots.release()
+                    raise error
+                tasks.append(asyncio.create_task(send(number, load)))
+            await asyncio.gather(*tasks)
+            manifest = "".join(
+                f"<Part><PartNumber>{number}</PartNumber><ETag>{etags[number]}</ETag></Part>" for number in sorted(etags)
+            )
+            response = await self._request(
+                "POST", key, query={"uploadId": upload_id},
+                body=f"<CompleteMultipartUpload>{manifest}</CompleteMultipartUpload>".encode(),
+            )
+            # Ошибка сборки приходит телом ответа со статусом 200
+            if b"<Error>" in response.content:
+                raise StorageError(f"S3 CompleteMultipartUpload {key}: {response.text[:500]}")
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            try:
+                await asyncio.shield(self._request("DELETE", key, query={"uploadId": upload_id}, expected=(204, 200, 404)))
+            except Exception:
+                OUTBOUND_ERRORS.labels(UPSTREAM, "abort_multipart").inc()
+            raise
+        return sum(sizes.values())
+
+    async def save(self, key: str, chunks: AsyncIterator[bytes], content_type: Optional[str] = None) -> int:
+        buffer = bytearray()
+        iterator = chunks.__aiter__()
+        exhausted = False
+        # Первая часть решает: поток короче части — один PUT
+        while len(buffer) <= self._part_size:
+            try:
+                buffer += await iterator.__anext__()
+            except StopAsyncIteration:
+                exhausted = True
+                break
+        if exhausted and len(buffer) <= self._part_size:
+            return await self._put(key, bytes(buffer), content_type)
+
+        async def parts() -> AsyncIterator[Tuple[int, PartLoader]]:
+            nonlocal buffer
+            number = 0
+            done = exhausted
+            while buffer or not done:
+                while not done and len(buffer) < self._part_size:
+                    try:
+                        buffer += await iterator.__anext__()
+                    except StopAsyncIteration:
+                        done = True
+                if not buffer:
+                    return
+                data = bytes(buffer[: self._part_size])
+                del buffer[: self._part_size]
+                number += 1
+                yield number, _ready(data)
+
+        return await self._multipart(key, content_type, parts())
+
+    async def save_file(self, key: str, path: Path, content_type: Optional[str] = None) -> int:
+        size = os.path.getsize(path)
+        if size <= self._part_size:
+            return await self._put(key, await asyncio.to_thread(Path(path).read_bytes), content_type)
+
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            async def parts() -> AsyncIterator[Tuple[int, PartLoader]]:
+                for number, offset in enumerate(range(0, size, self._part_size), start=1):
+                    length = min(self._part_size, size - offset)
+                    # Часть читается в своей задаче — чтение с диска идёт параллельно отправке
+                    yield number, functools.partial(asyncio.to_thread, os.pread, fd, length, offset)
+
+            return await self._multipart(key, content_type, parts())
+        finally:
+            os.close(fd)
+
+    async def delete(self, key: str) -> None:
+        await self._request("DELETE", key, expected=(204, 200, 404))
+
+    async def delete_prefix(self, prefix: str) -> int:
+        keys = [info.key async for info in self.list(prefix.rstrip("/") + "/")]
+        slots = asyncio.Semaphore(self._concurrency * 4)
+
+        async def remove(key: str) -> None:
+            async with slots:
+                await self.delete(key)
+
+        await _gather_or_cancel([remove(key) for key in keys])
+        return len(keys)
+
+    async def head_bucket(self) -> bool:
+        response = await self._request("HEAD", expected=(200, 404))
+        return response.status_code == 200
+
+    async def create_bucket(self) -> None:
+        body = b""
+        if self._region != "us-east-1":
+            body = (
+                "<CreateBucketConfiguration><LocationConstraint>"
+                f"{self._region}</LocationConstraint></CreateBucketConfiguration>"
+            ).encode()
+        await self._request("PUT", body=body)
+
+
+def _sha256(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def _ready(data: bytes) -> PartLoader:
+    async def load() -> bytes:
+        return data
+
+    return load
+
+
+def _guess_type(key: str) -> str:
+    return mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+
+async def _gather_or_cancel(coroutines: list) -> None:
+    """gather, который при первой ошибке отменяет остальные задачи"""
+    tasks = [asyncio.create_task(coroutine) for coroutine in coroutines]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
@@ -1,6 +1,6 @@
 from app.interfaces.schemas.user import User, UserCreate, UserLogin, UserResponse
 from app.interfaces.schemas.project import Project, ProjectCreate, ProjectUpdate
-from app.interfaces.schemas.course import Course, CourseCreate, CourseUpdate, CourseModule, Lesson
+from app.interfaces.schemas.course import Course, CourseCreate, CourseUpdate, CourseModule, Lesson, PublicCourse, PublicLesson
 from app.interfaces.schemas.enrollment import Enrollment, EnrollmentCreate, EnrollmentUpdate
 from app.interfaces.schemas.contact import ContactFormData
 
@@ -17,6 +17,8 @@ __all__ = [
     "CourseUpdate",
     "CourseModule",
     "Lesson",
+    "PublicCourse",
+    "PublicLesson",
     "Enrollment",
     "EnrollmentCreate",
     "EnrollmentUpdate",
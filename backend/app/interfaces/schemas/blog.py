@@ -6,6 +6,8 @@ from typing import Optional
 from datetime import datetime
 from uuid import UUID
 
+from app.interfaces.schemas.fieldsets import SparseFields
+
 
 class BlogPostBase(BaseModel):
     title: str
@@ -42,3 +44,6 @@ class BlogPost(BlogPostBase):
 
     class Config:
         from_attributes = True
+
+
+BLOG_POST_FIELDS = SparseFields(BlogPost)
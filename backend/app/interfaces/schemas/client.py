@@ -6,6 +6,9 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
 
+from app.interfaces.schemas.fieldsets import SparseFields
+from app.interfaces.schemas.media import ImageMeta
+
 
 class ClientBase(BaseModel):
     name: str
@@ -41,8 +44,13 @@ class ClientUpdate(BaseModel):
 
 class Client(ClientBase):
     id: UUID
+    # Размеры и плейсхолдер логотипа: {logo_url: {...}}
+    media: Optional[Dict[str, ImageMeta]] = None
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes = True
+
+
+CLIENT_FIELDS = SparseFields(Client)
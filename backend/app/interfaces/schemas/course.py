@@ -7,6 +7,8 @@ from datetime import datetime
 from uuid import UUID
 from decimal import Decimal
 
+from app.interfaces.schemas.fieldsets import SparseFields
+
 
 class LessonBase(BaseModel):
     title: str
@@ -22,6 +24,21 @@ class LessonCreate(LessonBase):
 class Lesson(LessonBase):
     id: UUID
     module_id: UUID
+    video_hls_url: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class PublicLesson(BaseModel):
+    """Урок в публичных ответах: без ссылок на видео — их выдаёт /api/media/lessons/{id}"""
+    id: UUID
+    module_id: UUID
+    title: str
+    duration: Optional[int] = None
+    order: int
+    has_video: bool = False
     created_at: datetime
 
     class Config:
@@ -47,6 +64,16 @@ class CourseModule(CourseModuleBase):
         from_attributes = True
 
 
+class PublicCourseModule(CourseModuleBase):
+    id: UUID
+    course_id: UUID
+    lessons: List[PublicLesson] = []
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class CourseBase(BaseModel):
     title: str
     slug: str
@@ -96,3 +123,24 @@ class Course(CourseBase):
 
     class Config:
         from_attributes = True
+
+
+class PublicCourse(CourseBase):
+    """Курс для каталога и страницы курса; полный Course (с видео уроков) — только админам"""
+    id: UUID
+    instructor_id: Optional[UUID] = None
+    modules: List[PublicCourseModule] = []
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+# ?fields= списка: модули с уроками загружаются только в полном ответе
+COURSE_FIELDS = SparseFields(PublicCourse, exclude=("modules",))
+
+
+class LessonMediaLink(BaseModel):
+    url: str
+    expires_at: Optional[datetime] = None  # None — внешняя ссылка (Mux и т.п.), не подписывается
@@ -1,9 +1,10 @@
 """
 Pydantic схемы для записей на курсы
 """
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 from datetime import datetime
+from decimal import Decimal
 from uuid import UUID
 
 
@@ -16,10 +17,60 @@ class EnrollmentCreate(BaseModel):
 
 
 class EnrollmentUpdate(BaseModel):
-    progress: Optional[int] = None
+    progress: Optional[int] = Field(None, ge=0, le=100)
     completed_at: Optional[datetime] = None
 
 
+class EnrollmentProgressReport(BaseModel):
+    progress: int = Field(ge=0, le=100)
+    completed_at: Optional[datetime] = None
+
+
+class LessonCompletionUpdate(BaseModel):
+    completed: List[UUID] = Field(default_factory=list, max_length=1000)
+    uncompleted: List[UUID] = Field(default_factory=list, max_length=1000)
+
+
+class EnrollmentLessons(BaseModel):
+    enrollment_id: UUID
+    course_id: UUID
+    progress: int
+    completed_at: Optional[datetime] = None
+    lessons: Dict[UUID, bool]  # lesson_id -> пройден ли урок
+
+    class Config:
+        from_attributes = True
+
+
+class EnrollmentCheck(BaseModel):
+    course_ids: List[UUID] = Field(max_length=500)
+
+
+class EnrollmentCheckResult(BaseModel):
+    enrolled: List[UUID]  # подмножество запрошенных course_ids
+
+
+class MyCourse(BaseModel):
+    """Запись на курс с данными для карточки в личном кабинете"""
+    id: UUID
+    course_id: UUID
+    progress: int
+    enrolled_at: datetime
+    completed_at: Optional[datetime] = None
+    title: str
+    slug: str
+    cover_image: Optional[str] = None
+    category: str
+    level: Optional[str] = None
+    format: Optional[str] = None
+    duration: Optional[int] = None
+    price: Decimal
+    lessons_count: int
+
+    class Config:
+        from_attributes = True
+
+
 class Enrollment(EnrollmentBase):
     id: UUID
     user_id: UUID
@@ -0,0 +1,78 @@
+"""
+Выборочные поля списков (?fields=) и проекция локали (?lang=).
+
+Набор полей разбирается по схеме ответа; для каждого набора один раз
+собирается урезанная модель и TypeAdapter — дальше ответы того же набора
+сериализуются готовым адаптером.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from types import GenericAlias
+from typing import Any, Dict, Optional, Sequence, Tuple, Type, cast
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+
+LANGS = ("ru", "en")
+ALWAYS_INCLUDED = ("id",)
+
+
+@dataclass(frozen=True)
+class Projection:
+    fields: Tuple[str, ...]  # В порядке полей схемы
+    lang: Optional[str] = None
+
+
+class SparseFields:
+    """Допустимые поля списка; localized — поля с вариантами <поле>_ru / <поле>_en"""
+
+    def __init__(
+        self,
+        schema: Type[BaseModel],
+        localized: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+    ) -> None:
+        self.schema = schema
+        self.localized = tuple(localized)
+        self._variants = {f"{name}_{lang}" for name in self.localized for lang in LANGS}
+        self._order = tuple(name for name in schema.model_fields if name not in exclude)
+
+    def available(self, lang: Optional[str] = None) -> Tuple[str, ...]:
+        """С локалью варианты (<поле>_ru/_en) не отдаются: поле уже на нужном языке"""
+        if lang is None:
+            return self._order
+        return tuple(name for name in self._order if name not in self._variants)
+
+    def parse(self, fields: Optional[str], lang: Optional[str] = None) -> Optional[Projection]:
+        """None — полный ответ без проекции; ValueError — неизвестное поле или язык"""
+        if fields is None and lang is None:
+            return None
+        if lang is not None and (lang not in LANGS or not self.localized):
+            raise ValueError(f"Неподдерживаемый язык: {lang}")
+        available = self.available(lang)
+        if fields is None:
+            return Projection(available, lang)
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested.difference(available)
+        if unknown:
+            raise ValueError(
+                f"Неизвестные поля: {', '.join(sorted(unknown))}. Доступны: {', '.join(available)}"
+            )
+        chosen = requested.union(ALWAYS_INCLUDED)
+        return Projection(tuple(name for name in available if name in chosen), lang)
+
+    def dump(self, projection: Projection, rows: Sequence[Any]) -> bytes:
+        """JSON-массив строк выборки (атрибуты по именам полей)"""
+        adapter = _list_adapter(self.schema, projection.fields)
+        return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+@lru_cache(maxsize=256)
+def _list_adapter(schema: Type[BaseModel], fields: Tuple[str, ...]) -> TypeAdapter[list[BaseModel]]:
+    definitions: Dict[str, Any] = {
+        name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields
+    }
+    model: Type[BaseModel] = create_model(
+        f"{schema.__name__}Fields", __config__=ConfigDict(from_attributes=True), **definitions
+    )
+    # Модель собирается во время выполнения — list[model] строится как GenericAlias
+    return TypeAdapter(cast(type[list[BaseModel]], GenericAlias(list, (model,))))
@@ -0,0 +1,11 @@
+"""
+Pydantic схемы метаданных изображений (плейсхолдеры в списках)
+"""
+from pydantic import BaseModel
+
+
+class ImageMeta(BaseModel):
+    width: int
+    height: int
+    color: str  # Доминирующий цвет, "#rrggbb" — фон до загрузки
+    placeholder: str  # LQIP: data:image/webp;base64,... для blurDataURL
@@ -2,10 +2,13 @@
 Pydantic схемы для проектов
 """
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from uuid import UUID
 
+from app.interfaces.schemas.fieldsets import SparseFields
+from app.interfaces.schemas.media import ImageMeta
+
 
 class ProjectBase(BaseModel):
     title: str
@@ -64,8 +67,15 @@ class ProjectUpdate(BaseModel):
 
 class Project(ProjectBase):
     id: UUID
+    video_hls_url: Optional[str] = None
+    # Размеры и плейсхолдеры по URL изображения (обложка, миниатюра, images); нет — ещё не посчитаны
+    media: Optional[Dict[str, ImageMeta]] = None
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes = True
+
+
+# ?fields= и ?lang= списка: title/description с переводами в title_ru/_en, description_ru/_en
+PROJECT_FIELDS = SparseFields(Project, localized=("title", "description"))
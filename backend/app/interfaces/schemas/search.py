@@ -0,0 +1,17 @@
+"""
+Pydantic схемы для поиска
+"""
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    type: Literal["project", "course", "blog"]
+    id: UUID
+    slug: str
+    title: str
+    # HTML: текст экранирован, совпадения обёрнуты в <mark>
+    snippet: str
+    rank: float
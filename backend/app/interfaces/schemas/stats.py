@@ -0,0 +1,29 @@
+"""
+Pydantic схемы статистики админ-панели
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class EnrollmentsDay(BaseModel):
+    course_id: UUID
+    course_title: Optional[str] = None  # None — курс удалён
+    day: date
+    enrollments: int
+
+
+class ContactsWeek(BaseModel):
+    week: date  # понедельник недели
+    submissions: int
+    budget_total: int
+
+
+class CourseRevenue(BaseModel):
+    course_id: UUID
+    course_title: Optional[str] = None
+    payments: int
+    revenue: Decimal
@@ -0,0 +1,14 @@
+"""
+Pydantic схемы для подсказок
+"""
+from typing import Literal, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class SuggestItem(BaseModel):
+    type: Literal["project", "course", "blog", "client"]
+    id: UUID
+    slug: Optional[str] = None
+    title: str
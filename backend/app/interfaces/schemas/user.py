@@ -47,3 +47,5 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     user_id: Optional[UUID] = None
     email: Optional[str] = None
+    role: Optional[str] = None
+    token_version: int = 0
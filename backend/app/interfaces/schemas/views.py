@@ -0,0 +1,23 @@
+"""
+Pydantic схемы для просмотров и популярных материалов
+"""
+from typing import Literal, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class ViewEvent(BaseModel):
+    type: Literal["project", "blog"]
+    id: UUID
+    # Анонимный id посетителя (генерирует фронтенд и хранит в localStorage)
+    visitor: Optional[str] = Field(None, max_length=64)
+
+
+class PopularItem(BaseModel):
+    type: Literal["project", "blog"]
+    id: UUID
+    slug: str
+    title: str
+    views: int
+    visitors: int  # оценка HyperLogLog, погрешность ~2%
@@ -1,15 +1,28 @@
 """
 Главный файл FastAPI приложения
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.config import settings
-from app.delivery.api import auth, projects, courses, enrollments, contact, sitemap, upload, clients, testimonials, settings as settings_api, payments, blog
+from app.delivery.api import auth, projects, courses, enrollments, contact, sitemap, upload, clients, testimonials, settings as settings_api, payments, blog, media, search, suggest, views, stats, exports
 
 from sqlalchemy import select
 from app.infrastructure.db.session import AsyncSessionLocal
 from app.infrastructure.db.models.user import User
-from app.utils.security import hash_password
+from app.utils.security import (
+    PasswordHasherBusy,
+    hash_password_async,
+    password_hasher,
+)
+from app.application import tasks as _tasks  # noqa: F401  (регистрация фоновых задач для enqueue_job)
+from app.application.services.email_outbox import email_dispatcher
+from app.application.services.progress_buffer import progress_buffer
+from app.application.services.suggest_index import suggest_index
+from app.application.services.view_counter import view_buffer
+from app.infrastructure.integrations.http_clients import outbound
+from app.middleware.metrics import MetricsMiddleware
+from app.utils.metrics import mark_process_dead, render_metrics
 
 app = FastAPI(
     title="SAVAGE MOVIE API",
@@ -24,8 +37,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Search-Truncated"],
 )
 
+# Метрики запросов (внешний слой — учитывает и CORS preflight)
+app.add_middleware(MetricsMiddleware)
+
 # Подключаем роутеры
 app.include_router(auth.router)
 app.include_router(projects.router)
@@ -39,6 +56,94 @@ app.include_router(testimonials.router)
 app.include_router(settings_api.router)
 app.include_router(payments.router)
 app.include_router(blog.router)
+app.include_router(media.router)
+app.include_router(search.router)
+app.include_router(suggest.router)
+app.include_router(views.router)
+app.include_router(stats.router)
+app.include_router(exports.router)
+
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy) -> JSONResponse:
+    """Пул хеширования перегружен — просим клиента повторить позже"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Сервис перегружен, попробуйте ещё раз"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.on_event("startup")
+async def start_email_dispatcher() -> None:
+    """Запускает фоновую отправку писем из outbox"""
+    if not settings.EMAIL_OUTBOX_ENABLED:
+        return
+    if not settings.RESEND_API_KEY:
+        # Письма копятся в outbox и уйдут, когда ключ будет настроен
+        print("⚠️ RESEND_API_KEY не задан — email outbox не разбирается")
+        return
+    email_dispatcher.start()
+
+
+@app.on_event("shutdown")
+async def stop_email_dispatcher() -> None:
+    """Останавливает диспетчер, дожидаясь текущей пачки"""
+    await email_dispatcher.stop()
+
+
+@app.on_event("startup")
+async def start_progress_buffer() -> None:
+    """Запускает периодический сброс буфера прогресса"""
+    progress_buffer.start()
+
+
+@app.on_event("shutdown")
+async def flush_progress_buffer() -> None:
+    """Записывает накопленный прогресс до закрытия приложения"""
+    try:
+        await progress_buffer.stop()
+    except Exception as exc:
+        print(f"⚠️ progress buffer: не удалось записать прогресс при остановке: {exc}")
+
+
+@app.on_event("startup")
+async def start_view_buffer() -> None:
+    """Запускает периодический сброс счётчиков просмотров"""
+    view_buffer.start()
+
+
+@app.on_event("shutdown")
+async def flush_view_buffer() -> None:
+    """Записывает накопленные просмотры до закрытия приложения"""
+    try:
+        await view_buffer.stop()
+    except Exception as exc:
+        print(f"⚠️ view buffer: не удалось записать просмотры при остановке: {exc}")
+
+
+@app.on_event("startup")
+async def start_suggest_index() -> None:
+    """Строит индекс подсказок в фоне и периодически перестраивает его"""
+    suggest_index.start()
+
+
+@app.on_event("shutdown")
+async def stop_suggest_index() -> None:
+    """Останавливает периодическое перестроение индекса"""
+    await suggest_index.stop()
+
+
+@app.on_event("startup")
+async def start_outbound_clients() -> None:
+    """Создаёт общие HTTP-клиенты внешних интеграций"""
+    await outbound.start()
+
+
+@app.on_event("shutdown")
+async def close_outbound_clients() -> None:
+    """Закрывает пулы соединений внешних интеграций"""
+    await outbound.close()
 
 
 @app.on_event("startup")
@@ -62,7 +167,7 @@ async def seed_admin_user() -> None:
         result = await db.execute(select(User).where(User.email == email))
         user = result.scalar_one_or_none()
 
-        password_hash = hash_password(password)
+        password_hash = await hash_password_async(password)
 
         if user is None:
             user = User(
@@ -76,9 +181,15 @@ async def seed_admin_user() -> None:
             action = "created"
         else:
             # Гарантируем админскую роль, и при необходимости обновляем пароль.
+            revoked = user.role != "admin"
             user.role = "admin"
             if settings.SEED_ADMIN_FORCE_PASSWORD or not user.password_hash:
                 user.password_hash = password_hash
+                revoked = True
+
+            # Смена роли/пароля отзывает ранее выданные токены
+            if revoked:
+                user.token_version = (user.token_version or 0) + 1
 
             # На всякий случай — если по каким-то причинам provider пустой
             if not user.provider:
@@ -89,6 +200,18 @@ async def seed_admin_user() -> None:
         print(f"✅ SEED_ADMIN: {action} admin user: {email}")
 
 
+@app.on_event("shutdown")
+async def release_metrics() -> None:
+    """Снимает live-гейджи воркера при остановке (multiprocess режим)"""
+    mark_process_dead()
+
+
+@app.on_event("shutdown")
+async def shutdown_password_hasher() -> None:
+    """Останавливает пул хеширования паролей"""
+    password_hasher.shutdown()
+
+
 @app.get("/")
 async def root():
     """Корневой эндпоинт"""
@@ -103,3 +226,10 @@ async def root():
 async def health_check():
     """Проверка здоровья API"""
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Метрики в формате Prometheus"""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
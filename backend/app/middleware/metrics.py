@@ -0,0 +1,67 @@
+"""
+ASGI middleware для сбора метрик HTTP-запросов.
+
+Чистый ASGI (без BaseHTTPMiddleware), чтобы не добавлять лишнюю задачу и
+копирование тела ответа на каждый запрос.
+"""
+from time import perf_counter
+from typing import Optional, Set
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT, refresh_db_pool_gauges
+
+# Служебные эндпоинты не учитываем, чтобы scrape не искажал статистику
+EXCLUDED_PATHS = {"/metrics", "/health"}
+KNOWN_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"}
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._routers: Optional[Set[str]] = None
+
+    def _router_label(self, scope: Scope) -> str:
+        """Имя роутера по префиксу пути: /api/projects/... -> projects"""
+        if self._routers is None:
+            routers = set()
+            for route in getattr(scope.get("app"), "routes", []):
+                parts = getattr(route, "path", "").split("/")
+                if len(parts) > 2 and parts[1] == "api":
+                    routers.add(parts[2])
+            self._routers = routers
+
+        parts = scope["path"].split("/", 3)
+        if len(parts) > 2 and parts[1] == "api" and parts[2] in self._routers:
+            return parts[2]
+        return "other"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        router = self._router_label(scope)
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(router)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight.inc()
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = perf_counter() - start
+            in_flight.dec()
+
+            # Шаблон маршрута (/api/projects/{slug}) вместо реального пути — ограниченная кардинальность
+            route = scope.get("route")
+            route_label = getattr(route, "path", None) or "unmatched"
+            method = scope["method"] if scope["method"] in KNOWN_METHODS else "OTHER"
+            HTTP_REQUEST_DURATION.labels(method, route_label, str(status_code)).observe(duration)
+            refresh_db_pool_gauges()
@@ -0,0 +1,19 @@
+"""
+Служебные утилиты командной строки (python -m app.tools.<имя>).
+"""
+from typing import Optional
+
+import asyncpg
+
+from app.config import settings
+
+
+async def connect(database: Optional[str] = None) -> asyncpg.Connection:
+    """Отдельное соединение asyncpg (COPY и долгие транзакции — мимо пула приложения)"""
+    return await asyncpg.connect(
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        database=database or settings.DB_NAME,
+    )
@@ -0,0 +1,561 @@
+"""
+Инкрементальный бэкап загрузок (UPLOAD_DIR) и базы, параллельное восстановление.
+
+    python -m app.tools.backup backup [--workers 8] [--db-jobs 4]
+    python -m app.tools.backup list
+    python -m app.tools.backup restore [<снимок>] [--workers 8] [--db-jobs 4]
+    python -m app.tools.backup prune --keep 7
+
+Хранилище (BACKUP_DIR):
+
+    objects/ab/<sha256>     — файлы uploads по содержимому, общие для всех снимков
+    snapshots/<время UTC>/
+        db/                 — pg_dump -Fd (каталог, пишется в -j потоков)
+        manifest.json       — путь → sha256, размер, mtime; ревизия схемы; итоги
+
+Файл читается, только если его размер или mtime изменились с прошлого снимка;
+sha256 считается в том же проходе, что и копирование, а объект с уже известным
+хешем второй раз не пишется (переименования и дубликаты ничего не стоят).
+Копируют потоки пула: чтение, запись и hashlib отпускают GIL.
+
+Согласованность: бэкап открывает транзакцию REPEATABLE READ, экспортирует её
+снимок (pg_export_snapshot) и отдаёт его pg_dump --snapshot; обход uploads
+начинается сразу после этого и идёт параллельно с дампом. Загрузки только
+добавляются, поэтому все файлы, на которые ссылается дамп, попадают в снимок.
+Снимок собирается в каталоге <время>.partial и переименовывается после записи
+manifest.json — незавершённый бэкап не виден ни восстановлению, ни следующему
+бэкапу как база для сравнения.
+"""
+import argparse
+import asyncio
+import fcntl
+import hashlib
+import json
+import os
+import re
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from time import monotonic, perf_counter
+from typing import Any, Awaitable, Dict, Iterator, List, Optional, Set, Tuple
+
+from app.config import settings
+from app.tools import connect
+from app.utils.uploads import UPLOAD_DIR
+
+FORMAT = "savage-movie-backup"
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+PARTIAL_SUFFIX = ".partial"
+CHUNK_SIZE = 1 << 20
+PROGRESS_SECONDS = 2.0
+
+
+class BackupError(Exception):
+    """Бэкап или восстановление невозможны (нет снимка, ошибка pg_dump, повреждённый объект)"""
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    sha256: str
+    size: int
+    mtime_ns: int
+
+
+def backup_root() -> Path:
+    return Path(settings.BACKUP_DIR) if settings.BACKUP_DIR else UPLOAD_DIR.parent / "backups"
+
+
+def _mb(size: float) -> str:
+    return f"{size / 2**20:.1f} МБ"
+
+
+def _rate(size: int, elapsed: float) -> str:
+    return f"{_mb(size)} за {elapsed:.1f}s ({size / 2**20 / max(elapsed, 1e-9):.1f} МБ/с)"
+
+
+class _Progress:
+    """Счётчики пула копирования (общие для потоков); строка прогресса не чаще раза в PROGRESS_SECONDS"""
+
+    def __init__(self, label: str, files: int, size: int) -> None:
+        self._label = label
+        self._lock = threading.Lock()
+        self._started = perf_counter()
+        self._printed = monotonic()
+        self.total_files = files
+        self.total_size = size
+        self.files = 0
+        self.size = 0
+        self.written = 0
+
+    def add(self, size: int, written: int) -> None:
+        with self._lock:
+            self.files += 1
+            self.size += size
+            self.written += written
+            now = monotonic()
+            if now - self._printed < PROGRESS_SECONDS:
+                return
+            self._printed = now
+        self.report()
+
+    def report(self) -> None:
+        elapsed = perf_counter() - self._started
+        print(
+            f"  {self._label}: {self.files}/{self.total_files} файлов, "
+            f"{_mb(self.size)} из {_mb(self.total_size)}, {self.size / 2**20 / max(elapsed, 1e-9):.1f} МБ/с"
+        )
+
+
+class ObjectStore:
+    """Файлы по sha256 содержимого; запись — во временный файл и атомарный rename"""
+
+    def __init__(self, root: Path) -> None:
+        self._objects = root / "objects"
+        self._tmp = root / "tmp"
+        self._tmp.mkdir(parents=True, exist_ok=True)
+
+    def path(self, digest: str) -> Path:
+        return self._objects / digest[:2] / digest
+
+    def has(self, digest: str) -> bool:
+        return self.path(digest).is_file()
+
+    def put(self, source: Path) -> Tuple[str, int, int]:
+        """Копирует файл, считая sha256 на лету; (хеш, размер, сколько байт записано в хранилище)"""
+        fd, tmp = tempfile.mkstemp(dir=self._tmp)
+        try:
+            with open(source, "rb") as src, os.fdopen(fd, "wb") as dst:
+                digest, size = _copy(src, dst)
+                dst.flush()
+                os.fsync(dst.fileno())
+            target = self.path(digest)
+            if target.is_file():
+                return digest, size, 0
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, target)
+            return digest, size, size
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+    def digests(self) -> Iterator[Path]:
+        if self._objects.is_dir():
+            yield from (path for path in self._objects.glob("*/*") if path.is_file())
+
+    def clear_tmp(self) -> None:
+        for path in self._tmp.iterdir():
+            path.unlink()
+
+
+def _copy(src, dst) -> Tuple[str, int]:
+    """Поток src → dst с подсчётом sha256 в том же проходе"""
+    digest = hashlib.sha256()
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    size = 0
+    while True:
+        read = src.readinto(buffer)
+        if not read:
+            return digest.hexdigest(), size
+        digest.update(view[:read])
+        dst.write(view[:read])
+        size += read
+
+
+@contextmanager
+def _locked(root: Path) -> Iterator[None]:
+    """Один бэкап, восстановление или чистка хранилища за раз"""
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / ".lock", "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise BackupError(f"Хранилище {root} занято другим процессом") from None
+        yield
+
+
+def _snapshots(root: Path) -> List[Path]:
+    """Завершённые снимки, от старых к новым"""
+    directory = root / "snapshots"
+    if not directory.is_dir():
+        return []
+    return sorted(path for path in directory.iterdir() if (path / MANIFEST).is_file())
+
+
+def _read_manifest(snapshot: Path) -> Dict[str, Any]:
+    manifest: Dict[str, Any] = json.loads((snapshot / MANIFEST).read_text())
+    if manifest.get("format") != FORMAT:
+        raise BackupError(f"{snapshot} не является снимком бэкапа")
+    if manifest["version"] > FORMAT_VERSION:
+        raise BackupError(f"Версия снимка {manifest['version']} новее поддерживаемой ({FORMAT_VERSION})")
+    return manifest
+
+
+def _entries(manifest: Dict[str, Any]) -> Dict[str, FileEntry]:
+    return {path: FileEntry(*values) for path, values in manifest["files"].items()}
+
+
+def _scan(directory: Path) -> Dict[str, os.stat_result]:
+    """Обычные файлы каталога (симлинки и спецфайлы пропускаются) — путь относительно корня"""
+    found = {}
+    for current, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(current, name)
+            info = os.lstat(path)
+            if stat.S_ISREG(info.st_mode):
+                found[Path(path).relative_to(directory).as_posix()] = info
+    return found
+
+
+def backup_uploads(
+    store: ObjectStore, directory: Optional[Path], previous: Dict[str, FileEntry], workers: int, verify: bool = False
+) -> Tuple[Dict[str, FileEntry], _Progress]:
+    """Новые и изменённые файлы — в хранилище пулом потоков; неизменённые берутся из прошлого манифеста"""
+    if directory is None:
+        return {}, _Progress("uploads", 0, 0)
+    files = _scan(directory) if directory.is_dir() else {}
+    entries: Dict[str, FileEntry] = {}
+    changed = []
+    for path, info in files.items():
+        known = previous.get(path)
+        if (
+            not verify
+            and known is not None
+            and known.size == info.st_size
+            and known.mtime_ns == info.st_mtime_ns
+            and store.has(known.sha256)
+        ):
+            entries[path] = known
+        else:
+            changed.append((path, info))
+
+    progress = _Progress("uploads", len(changed), sum(info.st_size for _, info in changed))
+    print(f"  uploads: {len(files)} файлов, без изменений {len(entries)}, к копированию {len(changed)} ({_mb(progress.total_size)})")
+
+    def copy(path: str, info: os.stat_result) -> Tuple[str, Optional[FileEntry]]:
+        # mtime — до чтения: файл, изменённый во время копирования, перечитается в следующий раз
+        try:
+            digest, size, written = store.put(directory / path)
+        except FileNotFoundError:
+            if (directory / path).exists():
+                raise
+            return path, None  # удалён после обхода каталога
+        progress.add(size, written)
+        return path, FileEntry(digest, size, info.st_mtime_ns)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(copy, path, info) for path, info in changed]
+        for future in as_completed(futures):
+            path, entry = future.result()
+            if entry is not None:
+                entries[path] = entry
+    if changed:
+        progress.report()
+    return dict(sorted(entries.items())), progress
+
+
+def restore_uploads(
+    store: ObjectStore, directory: Path, entries: Dict[str, FileEntry], workers: int, verify: bool = False
+) -> _Progress:
+    """Файлы снимка из хранилища с проверкой sha256; совпадающие по размеру и mtime не трогаются"""
+    pending = []
+    for path, entry in entries.items():
+        target = directory / path
+        if not verify and target.is_file():
+            info = target.stat()
+            if info.st_size == entry.size and info.st_mtime_ns == entry.mtime_ns:
+                continue
+        pending.append((path, entry))
+
+    progress = _Progress("uploads", len(pending), sum(entry.size for _, entry in pending))
+    print(f"  uploads: {len(entries)} файлов в снимке, к восстановлению {len(pending)} ({_mb(progress.total_size)})")
+
+    def restore(path: str, entry: FileEntry) -> None:
+        source = store.path(entry.sha256)
+        if not source.is_file():
+            raise BackupError(f"{path}: нет объекта {entry.sha256} в хранилище")
+        target = directory / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+        try:
+            with open(source, "rb") as src, os.fdopen(fd, "wb") as dst:
+                digest, size = _copy(src, dst)
+            if digest != entry.sha256:
+                raise BackupError(f"{path}: объект {entry.sha256} повреждён (sha256 {digest})")
+            os.chmod(tmp, 0o644)
+            os.utime(tmp, ns=(entry.mtime_ns, entry.mtime_ns))
+            os.replace(tmp, target)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        progress.add(size, size)
+
+    errors = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in as_completed([pool.submit(restore, path, entry) for path, entry in pending]):
+            try:
+                future.result()
+            except BackupError as exc:
+                errors.append(str(exc))
+    if pending:
+        progress.report()
+    if errors:
+        raise BackupError(f"Не восстановлено файлов: {len(errors)}\n  " + "\n  ".join(errors[:20]))
+    return progress
+
+
+def _major_version(binary: str) -> int:
+    try:
+        output = subprocess.run([binary, "--version"], capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError) as exc:
+        raise BackupError(f"{binary} недоступен: {exc}") from None
+    match = re.search(r"(\d+)(?:\.\d+)?", output)
+    if match is None:
+        raise BackupError(f"Не удалось определить версию {binary}: {output.strip()}")
+    return int(match.group(1))
+
+
+def _pg_args() -> List[str]:
+    return ["-h", settings.DB_HOST, "-p", str(settings.DB_PORT), "-U", settings.DB_USER]
+
+
+async def _run(*command: str) -> None:
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+        env={**os.environ, "PGPASSWORD": settings.DB_PASSWORD},
+    )
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise BackupError(f"{Path(command[0]).name} завершился с кодом {process.returncode}:\n{stderr.decode().strip()}")
+
+
+def _directory_size(directory: Path) -> int:
+    return sum(path.stat().st_size for path in directory.rglob("*") if path.is_file())
+
+
+async def backup(workers: int, db_jobs: int, skip_db: bool = False, verify: bool = False) -> Path:
+    root = backup_root()
+    with _locked(root):
+        store = ObjectStore(root)
+        store.clear_tmp()
+        for stale in (root / "snapshots").glob(f"*{PARTIAL_SUFFIX}"):
+            shutil.rmtree(stale)
+        snapshots = _snapshots(root)
+        previous = _entries(_read_manifest(snapshots[-1])) if snapshots else {}
+
+        started_at = datetime.now(timezone.utc)
+        name = started_at.strftime("%Y%m%dT%H%M%SZ")
+        work = root / "snapshots" / (name + PARTIAL_SUFFIX)
+        work.mkdir(parents=True)
+        started = perf_counter()
+        loop = asyncio.get_running_loop()
+        database = None
+        uploads: Optional[Path] = UPLOAD_DIR
+        if settings.STORAGE_DRIVER != "local":
+            print(f"⚠️ STORAGE_DRIVER={settings.STORAGE_DRIVER}: загрузки не на диске и в снимок не входят "
+                  "(используйте версионирование бакета)")
+            uploads = None
+
+        if skip_db:
+            entries, progress = await loop.run_in_executor(
+                None, backup_uploads, store, uploads, previous, workers, verify
+            )
+        else:
+            conn = await connect()
+            try:
+                server = conn.get_server_version().major
+                client = _major_version(settings.PG_DUMP_BINARY)
+                if client < server:
+                    raise BackupError(f"pg_dump {client} старше сервера PostgreSQL {server} — нужен клиент {server}+")
+                transaction = conn.transaction(isolation="repeatable_read", readonly=True)
+                await transaction.start()
+                snapshot_id = await conn.fetchval("SELECT pg_export_snapshot()")
+                revision = await conn.fetchval("SELECT version_num FROM alembic_version")
+                db_size = await conn.fetchval("SELECT pg_database_size(current_database())")
+
+                # Снимок БД уже зафиксирован — uploads копируются одновременно с дампом
+                dump_started = perf_counter()
+                dump = asyncio.create_task(
+                    _run(
+                        settings.PG_DUMP_BINARY, "-Fd", "-j", str(db_jobs), "--snapshot", snapshot_id,
+                        "-f", str(work / "db"), *_pg_args(), settings.DB_NAME,
+                    )
+                )
+                try:
+                    entries, progress = await loop.run_in_executor(
+                        None, backup_uploads, store, uploads, previous, workers, verify
+                    )
+                finally:
+                    await dump
+                dump_size = _directory_size(work / "db")
+                print(f"  база: {_mb(db_size)} → дамп {_rate(dump_size, perf_counter() - dump_started)}")
+                await transaction.rollback()
+            finally:
+                await conn.close()
+            database = {"dir": "db", "format": "directory", "schema_revision": revision, "size": dump_size}
+
+        manifest: Dict[str, Any] = {
+            "format": FORMAT,
+            "version": FORMAT_VERSION,
+            "created_at": started_at.isoformat(),
+            "database": database,
+            "uploads": {"files": len(entries), "size": sum(entry.size for entry in entries.values())},
+            "files": {path: [entry.sha256, entry.size, entry.mtime_ns] for path, entry in entries.items()},
+        }
+        with open(work / MANIFEST, "w") as output:
+            json.dump(manifest, output, separators=(",", ":"))
+            output.flush()
+            os.fsync(output.fileno())
+        target = root / "snapshots" / name
+        os.replace(work, target)
+
+    print(
+        f"✅ Снимок {name}: {len(entries)} файлов ({_mb(manifest['uploads']['size'])}), "
+        f"записано в хранилище {_mb(progress.written)}, за {perf_counter() - started:.1f}s"
+    )
+    return target
+
+
+def _find_snapshot(root: Path, name: Optional[str]) -> Path:
+    snapshots = _snapshots(root)
+    if not snapshots:
+        raise BackupError(f"В {root} нет снимков")
+    if name is None:
+        return snapshots[-1]
+    for snapshot in snapshots:
+        if snapshot.name == name:
+            return snapshot
+    raise BackupError(f"Снимок {name} не найден (python -m app.tools.backup list)")
+
+
+async def _recreate_database() -> None:
+    """Как scripts/restore.sh: отключить сессии, пересоздать базу"""
+    conn = await connect("postgres")
+    try:
+        await conn.execute(
+            "SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE datname = $1 AND pid <> pg_backend_pid()",
+            settings.DB_NAME,
+        )
+        name = '"' + settings.DB_NAME.replace('"', '""') + '"'
+        owner = '"' + settings.DB_USER.replace('"', '""') + '"'
+        await conn.execute(f"DROP DATABASE IF EXISTS {name}")
+        await conn.execute(f"CREATE DATABASE {name} OWNER {owner}")
+    finally:
+        await conn.close()
+
+
+async def restore(
+    name: Optional[str], workers: int, db_jobs: int, skip_db: bool = False, skip_uploads: bool = False,
+    verify: bool = False,
+) -> None:
+    root = backup_root()
+    with _locked(root):
+        snapshot = _find_snapshot(root, name)
+        manifest = _read_manifest(snapshot)
+        print(f"Восстановление снимка {snapshot.name} (создан {manifest['created_at']})")
+        started = perf_counter()
+        tasks: List[Awaitable[Any]] = []
+        if not skip_uploads:
+            store = ObjectStore(root)
+            loop = asyncio.get_running_loop()
+            tasks.append(
+                loop.run_in_executor(None, restore_uploads, store, UPLOAD_DIR, _entries(manifest), workers, verify)
+            )
+        database = manifest["database"]
+        if skip_db or database is None:
+            if not skip_db:
+                print("⚠️ Снимок без базы — восстанавливаются только uploads")
+        else:
+            tasks.append(_restore_database(snapshot / database["dir"], database["size"], db_jobs))
+        # База и файлы независимы — восстанавливаются одновременно
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+    print(f"✅ Снимок {snapshot.name} восстановлен за {perf_counter() - started:.1f}s")
+
+
+async def _restore_database(dump: Path, dump_size: int, db_jobs: int) -> None:
+    _major_version(settings.PG_RESTORE_BINARY)
+    await _recreate_database()
+    started = perf_counter()
+    await _run(
+        settings.PG_RESTORE_BINARY, "-j", str(db_jobs), "--exit-on-error", "--no-owner",
+        *_pg_args(), "-d", settings.DB_NAME, str(dump),
+    )
+    print(f"  база: дамп {_rate(dump_size, perf_counter() - started)}")
+
+
+def list_snapshots() -> None:
+    root = backup_root()
+    snapshots = _snapshots(root)
+    if not snapshots:
+        print(f"В {root} нет снимков")
+    for snapshot in snapshots:
+        manifest = _read_manifest(snapshot)
+        database = manifest["database"]
+        db = f"база {database['schema_revision']}, {_mb(database['size'])}" if database else "без базы"
+        print(f"  {snapshot.name}: {manifest['uploads']['files']} файлов ({_mb(manifest['uploads']['size'])}), {db}")
+
+
+def prune(keep: int) -> None:
+    """Удаляет снимки кроме keep последних и объекты, на которые они больше не ссылаются"""
+    if keep < 1:
+        raise BackupError("--keep должен быть не меньше 1")
+    root = backup_root()
+    with _locked(root):
+        snapshots = _snapshots(root)
+        for snapshot in snapshots[:-keep]:
+            shutil.rmtree(snapshot)
+        for stale in (root / "snapshots").glob(f"*{PARTIAL_SUFFIX}"):
+            shutil.rmtree(stale)
+        referenced: Set[str] = set()
+        for snapshot in snapshots[-keep:]:
+            referenced.update(values[0] for values in _read_manifest(snapshot)["files"].values())
+        store = ObjectStore(root)
+        store.clear_tmp()
+        freed = 0
+        for path in store.digests():
+            if path.name not in referenced:
+                freed += path.stat().st_size
+                path.unlink()
+    print(f"✅ Удалено снимков: {max(len(snapshots) - keep, 0)}, освобождено объектов {_mb(freed)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Инкрементальный бэкап uploads и базы")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for command in ("backup", "restore"):
+        sub = commands.add_parser(command)
+        sub.add_argument("--workers", type=int, default=settings.BACKUP_WORKERS, help="потоков копирования файлов")
+        sub.add_argument("--db-jobs", type=int, default=settings.BACKUP_DB_JOBS, help="заданий pg_dump/pg_restore -j")
+        sub.add_argument("--skip-db", action="store_true", help="только uploads")
+        sub.add_argument("--verify", action="store_true", help="перечитать и сверить все файлы, а не только изменённые")
+    commands.choices["restore"].add_argument("snapshot", nargs="?", help="имя снимка; по умолчанию последний")
+    commands.choices["restore"].add_argument("--skip-uploads", action="store_true", help="только база")
+    commands.add_parser("list")
+    commands.add_parser("prune").add_argument("--keep", type=int, required=True, help="сколько последних снимков оставить")
+    args = parser.parse_args()
+    try:
+        if args.command == "backup":
+            asyncio.run(backup(args.workers, args.db_jobs, args.skip_db, args.verify))
+        elif args.command == "restore":
+            asyncio.run(restore(args.snapshot, args.workers, args.db_jobs, args.skip_db, args.skip_uploads, args.verify))
+        elif args.command == "list":
+            list_snapshots()
+        else:
+            prune(args.keep)
+    except BackupError as exc:
+        print(f"⚠️ {exc}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,440 @@
+"""
+Перенос каталога между окружениями: проекты, курсы (с модулями и уроками),
+клиенты, отзывы, статьи блога и настройки.
+
+    python -m app.tools.catalog export catalog.ndjson.gz
+    python -m app.tools.catalog import catalog.ndjson.gz [--tables courses blog_posts] [--skip-existing]
+
+Формат — NDJSON (с .gz — сжатый): строка-заголовок с версией формата и
+ревизией схемы, затем по каждой таблице строка-описание (колонки, число строк)
+и сами строки объектами JSON. Выгрузка — COPY (SELECT row_to_json ...) TO STDOUT
+в одном снимке REPEATABLE READ. Загрузка — пачками: проверка Pydantic-схемой
+API, COPY во временную таблицу, затем INSERT ... ON CONFLICT в целевую, всё
+в одной транзакции.
+
+Строки сопоставляются по естественному ключу (slug, key настройки): при
+совпадении строка получает id из целевой базы, и внешние ключи дочерних
+строк (модули, уроки) переназначаются через таблицу соответствия id. Без
+совпадения сохраняется id из файла. Модули и уроки загруженных курсов, которых
+нет в файле, удаляются. Преподаватель курса сохраняется, только если такой
+пользователь есть в целевой базе.
+
+Lesson.ordinal — номер бита в enrollments.lessons_completed и копируется из
+файла как есть. Если замена дерева курса удаляет урок или меняет его номер,
+а в записях на этот курс урок отмечен пройденным, загрузка отменяется:
+отметки указывали бы на другие уроки.
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from time import perf_counter
+from types import GenericAlias
+from typing import IO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type, cast
+from uuid import UUID
+
+import asyncpg
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from app.application.services.jobs import enqueue_job
+from app.application.tasks.projects import REFRESH_RELATED
+from app.infrastructure.db.session import AsyncSessionLocal, engine
+from app.interfaces.schemas.blog import BlogPostBase
+from app.interfaces.schemas.client import ClientBase
+from app.interfaces.schemas.course import CourseBase, CourseModuleBase, LessonBase
+from app.interfaces.schemas.project import ProjectBase
+from app.interfaces.schemas.setting import SettingBase
+from app.interfaces.schemas.testimonial import TestimonialBase
+from app.tools import connect
+
+FORMAT = "savage-movie-catalog"
+FORMAT_VERSION = 1
+BATCH_SIZE = 1000
+
+
+class CatalogError(Exception):
+    """Файл не подходит для загрузки (формат, версия, невалидные строки)"""
+
+
+@dataclass(frozen=True)
+class CatalogTable:
+    name: str
+    schema: Type[BaseModel]
+    group: str
+    key: Optional[str] = None  # уникальный естественный ключ для сопоставления строк
+    parent: Optional[Tuple[str, str]] = None  # (колонка, таблица) — переназначаемый внешний ключ
+    optional_refs: Tuple[Tuple[str, str], ...] = ()  # ссылки вне каталога: NULL, если строки нет
+
+
+# Родители раньше детей — в этом порядке таблицы пишутся в файл и загружаются
+TABLES: Tuple[CatalogTable, ...] = (
+    CatalogTable("settings", SettingBase, "settings", key="key"),
+    CatalogTable("clients", ClientBase, "clients", key="slug"),
+    CatalogTable("testimonials", TestimonialBase, "testimonials"),
+    CatalogTable("projects", ProjectBase, "projects", key="slug"),
+    CatalogTable("blog_posts", BlogPostBase, "blog_posts", key="slug"),
+    CatalogTable("courses", CourseBase, "courses", key="slug", optional_refs=(("instructor_id", "users"),)),
+    CatalogTable("course_modules", CourseModuleBase, "courses", parent=("course_id", "courses")),
+    CatalogTable("lessons", LessonBase, "courses", parent=("module_id", "course_modules")),
+)
+TABLES_BY_NAME = {table.name: table for table in TABLES}
+GROUPS = tuple(dict.fromkeys(table.group for table in TABLES))
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+async def _columns(conn: asyncpg.Connection, table: str) -> Dict[str, str]:
+    """Хранимые (не generated) колонки таблицы и их типы, в порядке объявления"""
+    rows = await conn.fetch(
+        """
+        SELECT a.attname, format_type(a.atttypid, a.atttypmod) AS type
+        FROM pg_attribute a
+        WHERE a.attrelid = $1::regclass AND a.attnum > 0 AND NOT a.attisdropped AND a.attgenerated = ''
+        ORDER BY a.attnum
+        """,
+        table,
+    )
+    return {row["attname"]: row["type"] for row in rows}
+
+
+def _open(path: str, mode: str) -> IO[bytes]:
+    if path.endswith(".gz"):
+        return cast(IO[bytes], gzip.open(path, mode + "b", compresslevel=6))
+    return cast(IO[bytes], open(path, mode + "b"))
+
+
+def _rate(rows: int, seconds: float) -> str:
+    return f"{rows} строк за {seconds:.2f}s ({rows / seconds if seconds else 0:.0f} строк/с)"
+
+
+# --- Выгрузка ---------------------------------------------------------------
+
+
+class _CopyLines:
+    """
+    Приёмник COPY ... TO STDOUT (text): пишет в файл целые строки.
+
+    row_to_json не содержит управляющих символов (JSON их экранирует), поэтому
+    из экранирования формата text встречается только удвоенный обратный слеш.
+    """
+
+    def __init__(self, out: IO[bytes]) -> None:
+        self._out = out
+        self._tail = b""
+
+    async def __call__(self, chunk: bytes) -> None:
+        data = self._tail + chunk
+        end = data.rfind(b"\n") + 1
+        self._tail = data[end:]
+        if end:
+            self._out.write(data[:end].replace(b"\\\\", b"\\"))
+
+    def close(self) -> None:
+        if self._tail:
+            raise CatalogError("COPY оборвался посреди строки")
+
+
+async def export_catalog(path: str, groups: Sequence[str]) -> None:
+    tables = [table for table in TABLES if table.group in groups]
+    started = perf_counter()
+    total = 0
+    conn = await connect()
+    try:
+        # Один снимок на все таблицы: курсы и их уроки согласованы
+        async with conn.transaction(isolation="repeatable_read", readonly=True):
+            revision = await conn.fetchval("SELECT version_num FROM alembic_version")
+            sections = []
+            for table in tables:
+                columns = list(await _columns(conn, table.name))
+                rows = await conn.fetchval(f"SELECT count(*) FROM {_quote(table.name)}")
+                sections.append((table, columns, rows))
+
+            with _open(path, "w") as out:
+                header = {
+                    "format": FORMAT,
+                    "version": FORMAT_VERSION,
+                    "schema_revision": revision,
+                    "exported_at": datetime.now(timezone.utc).isoformat(),
+                    "tables": {table.name: rows for table, _, rows in sections},
+                }
+                out.write(json.dumps(header, ensure_ascii=False).encode() + b"\n")
+                for table, columns, rows in sections:
+                    table_started = perf_counter()
+                    section = {"table": table.name, "columns": columns, "rows": rows}
+                    out.write(json.dumps(section).encode() + b"\n")
+                    sink = _CopyLines(out)
+                    select_list = ", ".join(_quote(column) for column in columns)
+                    await conn.copy_from_query(
+                        f"SELECT row_to_json(t) FROM (SELECT {select_list} FROM {_quote(table.name)} ORDER BY id) t",
+                        output=sink,
+                    )
+                    sink.close()
+                    total += rows
+                    print(f"  {table.name}: {_rate(rows, perf_counter() - table_started)}")
+    finally:
+        await conn.close()
+    print(f"✅ Каталог выгружен в {path}: {_rate(total, perf_counter() - started)}")
+
+
+# --- Загрузка ---------------------------------------------------------------
+
+
+def _converter(pg_type: str) -> Optional[Callable]:
+    """JSON-значение → значение для бинарного COPY asyncpg; None — подходит как есть"""
+    if pg_type == "uuid":
+        return UUID
+    if pg_type.startswith("timestamp"):
+        return datetime.fromisoformat
+    if pg_type == "date":
+        return date.fromisoformat
+    if pg_type.startswith("numeric"):
+        # repr float точен для NUMERIC каталога (цены — до 10 знаков)
+        return lambda value: Decimal(str(value))
+    if pg_type in ("json", "jsonb"):
+        return json.dumps
+    if pg_type == "uuid[]":
+        return lambda value: [UUID(item) for item in value]
+    return None
+
+
+def _read_header(lines: Iterator[bytes]) -> dict:
+    try:
+        header: dict = json.loads(next(lines))
+    except (StopIteration, ValueError) as exc:
+        raise CatalogError("Пустой файл или не JSON") from exc
+    if header.get("format") != FORMAT:
+        raise CatalogError("Файл не является выгрузкой каталога")
+    if header.get("version", 0) > FORMAT_VERSION:
+        raise CatalogError(f"Версия формата {header['version']} новее поддерживаемой ({FORMAT_VERSION})")
+    return header
+
+
+def _batches(lines: Iterator[bytes], rows: int, size: int) -> Iterator[Tuple[int, List[dict]]]:
+    """Пачки строк секции: (номер первой строки секции, строки)"""
+    for offset in range(0, rows, size):
+        batch = []
+        for _ in range(min(size, rows - offset)):
+            line = next(lines, None)
+            if line is None:
+                raise CatalogError("Файл обрывается раньше заявленного числа строк")
+            batch.append(json.loads(line))
+        yield offset, batch
+
+
+def _records(columns: Sequence[str], converters: Sequence[Optional[Callable]], batch: List[dict]) -> List[list]:
+    converted = [(index, convert) for index, convert in enumerate(converters) if convert is not None]
+    records = []
+    for row in batch:
+        values = [row.get(column) for column in columns]
+        for index, convert in converted:
+            if values[index] is not None:
+                values[index] = convert(values[index])
+        records.append(values)
+    return records
+
+
+def _rows_adapter(schema: Type[BaseModel]) -> TypeAdapter[list[BaseModel]]:
+    """Проверка пачки строк по схеме таблицы (схема известна только во время выполнения)"""
+    return TypeAdapter(cast(type[list[BaseModel]], GenericAlias(list, (schema,))))
+
+
+def _validate(table: CatalogTable, adapter: TypeAdapter[list[BaseModel]], offset: int, batch: List[dict]) -> None:
+    try:
+        adapter.validate_python(batch)
+    except ValidationError as exc:
+        problems = [
+            f"{table.name} #{offset + int(error['loc'][0]) + 1} {'.'.join(map(str, error['loc'][1:]))}: {error['msg']}"
+            for error in exc.errors()[:10]
+        ]
+        raise CatalogError("Строки не прошли проверку:\n  " + "\n  ".join(problems)) from exc
+
+
+async def _merge(conn: asyncpg.Connection, table: CatalogTable, columns: List[str], skip_existing: bool) -> int:
+    """Из stage-таблицы в целевую с переназначением id; возвращает число записанных строк"""
+    name, stage, id_map = _quote(table.name), f"stage_{table.name}", f"map_{table.name}"
+    if table.key:
+        # Совпадение ключа — id целевой строки; id из файла занят строкой, чей ключ
+        # заберёт другая строка файла, — новый id; иначе id из файла
+        key = _quote(table.key)
+        new_id = (
+            f"CASE WHEN k.id IS NOT NULL THEN k.id "
+            f"WHEN EXISTS (SELECT 1 FROM {name} t JOIN {stage} o ON o.{key} = t.{key} WHERE t.id = s.id) "
+            f"THEN gen_random_uuid() ELSE s.id END"
+        )
+        key_join = f"LEFT JOIN {name} k ON k.{key} = s.{key}"
+    else:
+        new_id, key_join = "s.id", ""
+    await conn.execute(
+        f"CREATE TEMP TABLE {id_map} ON COMMIT DROP AS "
+        f"SELECT s.id AS old_id, {new_id} AS new_id FROM {stage} s {key_join}"
+    )
+    await conn.execute(f"CREATE UNIQUE INDEX ON {id_map} (old_id)")
+
+    values = {column: f"s.{_quote(column)}" for column in columns}
+    values["id"] = "m.new_id"
+    joins = [f"JOIN {id_map} m ON m.old_id = s.id"]
+    if table.parent:
+        column, parent = table.parent
+        values[column] = "p.new_id"
+        joins.append(f"JOIN map_{parent} p ON p.old_id = s.{_quote(column)}")
+        if not skip_existing:
+            # Дерево курса заменяется целиком: лишние модули/уроки целевой базы удаляются
+            await conn.execute(
+                f"DELETE FROM {name} t USING map_{parent} p "
+                f"WHERE t.{_quote(column)} = p.new_id AND NOT EXISTS (SELECT 1 FROM {id_map} m WHERE m.new_id = t.id)"
+            )
+    for column, referenced in table.optional_refs:
+        if column in values:
+            values[column] = (
+                f"CASE WHEN EXISTS (SELECT 1 FROM {_quote(referenced)} r WHERE r.id = s.{_quote(column)}) "
+                f"THEN s.{_quote(column)} END"
+            )
+
+    target = ", ".join(_quote(column) for column in values)
+    if skip_existing:
+        conflict = "DO NOTHING"
+    else:
+        updates = ", ".join(
+            f"{_quote(column)} = EXCLUDED.{_quote(column)}" for column in values if column not in ("id", "created_at")
+        )
+        conflict = f"DO UPDATE SET {updates}"
+    status = await conn.execute(
+        f"INSERT INTO {name} ({target}) SELECT {', '.join(values.values())} FROM {stage} s {' '.join(joins)} "
+        f"ON CONFLICT (id) {conflict}"
+    )
+    return int(status.rsplit(" ", 1)[-1])
+
+
+async def _snapshot_lesson_ordinals(conn: asyncpg.Connection) -> None:
+    """Номера уроков загружаемых курсов до замены их дерева (удаление модулей удаляет и уроки)"""
+    await conn.execute(
+        "CREATE TEMP TABLE lesson_ordinals_before ON COMMIT DROP AS "
+        "SELECT m.course_id, l.id, l.ordinal FROM lessons l JOIN course_modules m ON m.id = l.module_id "
+        "WHERE m.course_id IN (SELECT new_id FROM map_courses)"
+    )
+
+
+async def _check_lesson_ordinals(conn: asyncpg.Connection) -> None:
+    """Отметки пройденных уроков должны указывать на те же уроки, что и до загрузки"""
+    courses = await conn.fetch(
+        "SELECT DISTINCT c.slug FROM lesson_ordinals_before b JOIN courses c ON c.id = b.course_id "
+        "WHERE NOT EXISTS ("
+        "  SELECT 1 FROM lessons l JOIN course_modules m ON m.id = l.module_id"
+        "  WHERE l.id = b.id AND l.ordinal = b.ordinal AND m.course_id = b.course_id"
+        ") AND EXISTS ("
+        "  SELECT 1 FROM enrollments e WHERE e.course_id = b.course_id"
+        "  AND b.ordinal < length(e.lessons_completed) * 8 AND get_bit(e.lessons_completed, b.ordinal) = 1"
+        ") ORDER BY c.slug"
+    )
+    if courses:
+        raise CatalogError(
+            "Загрузка удаляет или перенумеровывает уроки, отмеченные пройденными в записях на курсы "
+            f"({', '.join(row['slug'] for row in courses)}): номер урока — бит в enrollments.lessons_completed. "
+            "Сохраните в файле id и ordinal этих уроков или исключите курсы из загрузки (--tables)"
+        )
+
+
+async def import_catalog(
+    path: str, groups: Sequence[str], skip_existing: bool = False, batch_size: int = BATCH_SIZE
+) -> None:
+    started = perf_counter()
+    total = 0
+    imported = set()
+    check_ordinals = False
+    conn = await connect()
+    try:
+        with _open(path, "r") as source:
+            lines = iter(source)
+            header = _read_header(lines)
+            revision = await conn.fetchval("SELECT version_num FROM alembic_version")
+            if header.get("schema_revision") != revision:
+                print(f"⚠️ Выгрузка из схемы {header.get('schema_revision')}, текущая — {revision}: "
+                      "переносятся только общие колонки")
+
+            async with conn.transaction():
+                for section_line in lines:
+                    section = json.loads(section_line)
+                    table = TABLES_BY_NAME.get(section.get("table"))
+                    if table is None:
+                        raise CatalogError(f"Неизвестная таблица в файле: {section.get('table')}")
+                    if table.group not in groups:
+                        for _ in range(section["rows"]):
+                            next(lines)
+                        continue
+                    if table.parent and table.parent[1] not in imported:
+                        raise CatalogError(f"{table.name} загружается только вместе с {table.parent[1]}")
+
+                    table_started = perf_counter()
+                    target_columns = await _columns(conn, table.name)
+                    columns = [column for column in section["columns"] if column in target_columns]
+                    dropped = [column for column in section["columns"] if column not in target_columns]
+                    if dropped:
+                        print(f"⚠️ {table.name}: в целевой схеме нет колонок {', '.join(dropped)} — пропущены")
+                    if "id" not in columns:
+                        raise CatalogError(f"{table.name}: в выгрузке нет колонки id")
+                    converters = [_converter(target_columns[column]) for column in columns]
+                    adapter = _rows_adapter(table.schema)
+                    stage = f"stage_{table.name}"
+
+                    await conn.execute(
+                        f"CREATE TEMP TABLE {stage} (LIKE {_quote(table.name)} INCLUDING DEFAULTS) ON COMMIT DROP"
+                    )
+                    for offset, batch in _batches(lines, section["rows"], batch_size):
+                        _validate(table, adapter, offset, batch)
+                        await conn.copy_records_to_table(
+                            stage, records=_records(columns, converters, batch), columns=columns
+                        )
+                    if table.name == "course_modules" and not skip_existing:
+                        await _snapshot_lesson_ordinals(conn)
+                        check_ordinals = True
+                    written = await _merge(conn, table, columns, skip_existing)
+                    if written < section["rows"] and not skip_existing:
+                        print(f"⚠️ {table.name}: записано {written} из {section['rows']} — строки без родителя в файле пропущены")
+                    imported.add(table.name)
+                    total += section["rows"]
+                    print(
+                        f"  {table.name}: {_rate(section['rows'], perf_counter() - table_started)}, "
+                        f"записано {written}"
+                    )
+                if check_ordinals:
+                    await _check_lesson_ordinals(conn)
+    finally:
+        await conn.close()
+
+    if "projects" in imported:
+        # Похожие проекты зависят от всего каталога — полный пересчёт воркером
+        async with AsyncSessionLocal() as db:
+            enqueue_job(db, REFRESH_RELATED, {})
+            await db.commit()
+    print(f"✅ Каталог загружен из {path}: {_rate(total, perf_counter() - started)}")
+
+
+async def _main(args: argparse.Namespace) -> None:
+    groups = args.tables or GROUPS
+    try:
+        if args.command == "export":
+            await export_catalog(args.path, groups)
+        else:
+            await import_catalog(args.path, groups, args.skip_existing, args.batch_size)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Выгрузка и загрузка каталога (COPY, NDJSON)")
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("path", help="файл .ndjson или .ndjson.gz")
+    parser.add_argument("--tables", nargs="+", choices=GROUPS, help="по умолчанию — все; courses включает модули и уроки")
+    parser.add_argument("--skip-existing", action="store_true", help="не обновлять уже существующие строки")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="строк на проверку и COPY")
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except CatalogError as exc:
+        print(f"⚠️ {exc}\nНичего не изменено", file=sys.stderr)
+        sys.exit(1)
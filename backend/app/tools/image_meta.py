@@ -0,0 +1,103 @@
+"""
+Плейсхолдеры для уже загруженных изображений (media_meta).
+
+    python -m app.tools.image_meta [--force] [--workers 4] [--prefix images/]
+
+Новые загрузки обрабатывает задача media.image_meta; этот инструмент —
+первичное заполнение и пересчёт (--force, например после смены
+IMAGE_PLACEHOLDER_SIZE). Декодирование идёт в пуле из --workers процессов,
+чтение следующих файлов — параллельно с ним; строки пишутся пачками.
+"""
+import argparse
+import asyncio
+import sys
+from time import monotonic, perf_counter
+
+from app.application.services import image_meta
+from app.application.services.image_meta import IMAGE_EXTENSIONS, ImageMetaError, describe_image
+from app.config import settings
+from app.infrastructure.db.repositories.media_meta import SqlAlchemyMediaMetaRepository
+from app.infrastructure.db.session import AsyncSessionLocal, engine
+from app.infrastructure.integrations.http_clients import outbound
+from app.infrastructure.storage import StorageError, storage
+
+PROGRESS_SECONDS = 2.0
+BATCH_SIZE = 200
+
+
+async def _save(rows: list) -> None:
+    async with AsyncSessionLocal() as db:
+        await SqlAlchemyMediaMetaRepository(db).upsert_many(rows)
+        await db.commit()
+
+
+async def backfill(prefix: str, force: bool) -> None:
+    started = perf_counter()
+    urls = [
+        f"/uploads/{info.key}"
+        async for info in storage.list(prefix)
+        if info.key.lower().endswith(IMAGE_EXTENSIONS)
+    ]
+    if not force:
+        async with AsyncSessionLocal() as db:
+            known = await SqlAlchemyMediaMetaRepository(db).known_urls()
+        skipped = sum(url in known for url in urls)
+        urls = [url for url in urls if url not in known]
+    else:
+        skipped = 0
+    workers = image_meta.image_meta_workers()
+    print(f"изображений к обработке: {len(urls)} (уже описаны: {skipped}), процессов: {workers}")
+
+    rows: list = []
+    failures = []
+    done = 0
+    printed = monotonic()
+    # Вдвое больше задач, чем процессов: пока одни декодируются, другие читаются из хранилища
+    slots = asyncio.Semaphore(workers * 2)
+
+    async def process(url: str) -> None:
+        nonlocal done, printed
+        async with slots:
+            try:
+                rows.append(await describe_image(url))
+            except (OSError, ImageMetaError, StorageError) as exc:
+                failures.append(f"{url}: {exc}")
+        done += 1
+        if len(rows) >= BATCH_SIZE:
+            batch = rows[:]
+            rows.clear()
+            await _save(batch)
+        now = monotonic()
+        if now - printed >= PROGRESS_SECONDS:
+            printed = now
+            print(f"  {done}/{len(urls)}, {done / (perf_counter() - started):.1f} изобр./с")
+
+    await asyncio.gather(*(process(url) for url in urls))
+    await _save(rows)
+    elapsed = perf_counter() - started
+    print(
+        f"✅ Описано {len(urls) - len(failures)} изображений за {elapsed:.1f}s "
+        f"({len(urls) / max(elapsed, 1e-9):.1f} изобр./с)"
+    )
+    if failures:
+        print(f"⚠️ Не прочитано: {len(failures)}\n  " + "\n  ".join(failures[:20]), file=sys.stderr)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    try:
+        await backfill(args.prefix, args.force)
+    finally:
+        image_meta.shutdown()
+        await outbound.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Плейсхолдеры для загруженных изображений")
+    parser.add_argument("--prefix", default="images/", help="ключи хранилища с этим префиксом")
+    parser.add_argument("--force", action="store_true", help="пересчитать и уже описанные")
+    parser.add_argument("--workers", type=int, default=0, help="процессов декодирования (0 — IMAGE_META_WORKERS)")
+    args = parser.parse_args()
+    if args.workers:
+        settings.IMAGE_META_WORKERS = args.workers
+    asyncio.run(_main(args))
@@ -0,0 +1,112 @@
+"""
+Перенос загрузок между хранилищами (локальный каталог ↔ S3).
+
+    python -m app.tools.storage migrate --from local --to s3 [--workers 8] [--prefix images/]
+
+Файлы копируются параллельно (--workers файлов одновременно, большие — ещё и
+multipart-частями по S3_CONCURRENCY). Файл, который уже есть в целевом
+хранилище с тем же размером, пропускается, поэтому прерванный перенос можно
+просто запустить заново. Исходное хранилище не меняется: после переноса
+переключите STORAGE_DRIVER и перезапустите backend и worker.
+"""
+import argparse
+import asyncio
+import sys
+from time import monotonic, perf_counter
+
+from app.infrastructure.integrations.http_clients import outbound
+from app.infrastructure.storage import (
+    DRIVERS,
+    ObjectInfo,
+    S3Storage,
+    Storage,
+    StorageError,
+    build_storage,
+)
+
+PROGRESS_SECONDS = 2.0
+
+
+async def _copy(source: Storage, target: Storage, info: ObjectInfo) -> int:
+    path = source.local_path(info.key)
+    if path is not None:
+        return await target.save_file(info.key, path, info.content_type)
+    return await target.save(info.key, source.open(info.key), info.content_type)
+
+
+async def migrate(source: Storage, target: Storage, prefix: str, workers: int, overwrite: bool = False) -> None:
+    started = perf_counter()
+    objects = [info async for info in source.list(prefix)]
+    total = sum(info.size for info in objects)
+    print(f"{source.name} → {target.name}: {len(objects)} файлов, {total / 2**20:.1f} МБ")
+
+    copied = skipped = 0
+    done_bytes = 0
+    failures = []
+    printed = monotonic()
+    slots = asyncio.Semaphore(workers)
+
+    async def transfer(info: ObjectInfo) -> None:
+        nonlocal copied, skipped, done_bytes, printed
+        async with slots:
+            existing = None if overwrite else await target.stat(info.key)
+            if existing is not None and existing.size == info.size:
+                skipped += 1
+            else:
+                try:
+                    await _copy(source, target, info)
+                except (OSError, StorageError) as exc:
+                    failures.append(f"{info.key}: {exc}")
+                    return
+                copied += 1
+            done_bytes += info.size
+        now = monotonic()
+        if now - printed >= PROGRESS_SECONDS:
+            printed = now
+            elapsed = perf_counter() - started
+            print(
+                f"  {copied + skipped}/{len(objects)} файлов, {done_bytes / 2**20:.1f} из {total / 2**20:.1f} МБ, "
+                f"{done_bytes / 2**20 / elapsed:.1f} МБ/с"
+            )
+
+    await asyncio.gather(*(transfer(info) for info in objects))
+    elapsed = perf_counter() - started
+    if failures:
+        raise StorageError(f"Не перенесено файлов: {len(failures)}\n  " + "\n  ".join(failures[:20]))
+    print(
+        f"✅ Перенесено {copied}, уже были {skipped}; {done_bytes / 2**20:.1f} МБ за {elapsed:.1f}s "
+        f"({done_bytes / 2**20 / max(elapsed, 1e-9):.1f} МБ/с)"
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    if args.source == args.target:
+        raise StorageError("Исходное и целевое хранилища совпадают")
+    source = build_storage(args.source)
+    target = build_storage(args.target)
+    try:
+        if isinstance(target, S3Storage) and not await target.head_bucket():
+            if not args.create_bucket:
+                raise StorageError("Бакет S3_BUCKET не существует (--create-bucket создаст его)")
+            await target.create_bucket()
+            print("✅ Бакет создан")
+        await migrate(source, target, args.prefix, args.workers, args.overwrite)
+    finally:
+        await outbound.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Перенос загрузок между хранилищами")
+    commands = parser.add_subparsers(dest="command", required=True)
+    sub = commands.add_parser("migrate")
+    sub.add_argument("--from", dest="source", choices=DRIVERS, required=True)
+    sub.add_argument("--to", dest="target", choices=DRIVERS, required=True)
+    sub.add_argument("--prefix", default="", help="только ключи с этим префиксом, например images/")
+    sub.add_argument("--workers", type=int, default=8, help="файлов одновременно")
+    sub.add_argument("--overwrite", action="store_true", help="копировать и совпадающие по размеру")
+    sub.add_argument("--create-bucket", action="store_true", help="создать бакет, если его нет")
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except StorageError as exc:
+        print(f"⚠️ {exc}", file=sys.stderr)
+        sys.exit(1)
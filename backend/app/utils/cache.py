@@ -0,0 +1,72 @@
+"""
+Внутрипроцессный LRU-кеш с TTL.
+
+Используется только из event loop, поэтому без блокировок. У каждого воркера
+uvicorn свой экземпляр — TTL ограничивает расхождение между процессами.
+"""
+from collections import OrderedDict
+from time import monotonic
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+from app.utils.metrics import CACHE_ENTRIES, CACHE_LOOKUPS
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    def __init__(self, name: str, maxsize: int, ttl: float) -> None:
+        self._maxsize = max(1, maxsize)
+        self._ttl = ttl
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self._hits = CACHE_LOOKUPS.labels(name, "hit")
+        self._misses = CACHE_LOOKUPS.labels(name, "miss")
+        self._entries = CACHE_ENTRIES.labels(name)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> Optional[V]:
+        item = self._data.get(key)
+        if item is None:
+            self._misses.inc()
+            return None
+
+        expires_at, value = item
+        if expires_at <= monotonic():
+            del self._data[key]
+            self._entries.set(len(self._data))
+            self._misses.inc()
+            return None
+
+        self._data.move_to_end(key)
+        self._hits.inc()
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """Сохраняет значение; ttl переопределяет время жизни по умолчанию"""
+        lifetime = self._ttl if ttl is None else ttl
+        if lifetime <= 0:
+            return
+        self._data[key] = (monotonic() + lifetime, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+        self._entries.set(len(self._data))
+
+    def pop(self, key: K) -> Optional[V]:
+        item = self._data.pop(key, None)
+        self._entries.set(len(self._data))
+        return item[1] if item else None
+
+    def discard_where(self, predicate: Callable[[K], bool]) -> int:
+        """Удаляет записи, ключи которых подходят под условие"""
+        keys = [key for key in self._data if predicate(key)]
+        for key in keys:
+            del self._data[key]
+        self._entries.set(len(self._data))
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._entries.set(0)
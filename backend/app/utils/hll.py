@@ -0,0 +1,74 @@
+"""
+HyperLogLog: оценка числа уникальных значений в фиксированной памяти.
+
+2^p регистров по байту (p=11 — 2 КБ, стандартная ошибка ≈ 2.3%). Скетчи
+объединяются поэлементным максимумом; та же операция в БД — SQL-функция
+hll_union (миграция content_views).
+"""
+import hashlib
+import math
+from typing import Iterable, Optional
+
+import numpy as np
+
+DEFAULT_PRECISION = 11
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    __slots__ = ("precision", "registers")
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: Optional[bytes] = None) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError("precision должен быть от 4 до 16")
+        self.precision = precision
+        size = 1 << precision
+        if registers is not None and len(registers) != size:
+            raise ValueError(f"ожидалось {size} регистров, получено {len(registers)}")
+        self.registers = bytearray(registers) if registers is not None else bytearray(size)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        return cls(len(data).bit_length() - 1, data)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
+
+    def add(self, value: str) -> None:
+        h = _hash64(value)
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        # Позиция первой единицы в оставшихся битах (1 — старший бит)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("нельзя объединить скетчи разной точности")
+        merged = np.maximum(np.frombuffer(self.registers, np.uint8), np.frombuffer(other.registers, np.uint8))
+        self.registers = bytearray(merged.tobytes())
+        return self
+
+    def count(self) -> int:
+        registers = np.frombuffer(self.registers, np.uint8)
+        m = len(registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / float(np.ldexp(1.0, -registers.astype(np.int32)).sum())
+        zeros = int(np.count_nonzero(registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Малые значения: линейный подсчёт по пустым регистрам точнее
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+def union(sketches: Iterable[Optional[bytes]], precision: int = DEFAULT_PRECISION) -> HyperLogLog:
+    """Объединение сохранённых скетчей (например, по дням периода); None и чужой размер пропускаются"""
+    registers = np.zeros(1 << precision, dtype=np.uint8)
+    for data in sketches:
+        if data is not None and len(data) == len(registers):
+            np.maximum(registers, np.frombuffer(data, np.uint8), out=registers)
+    return HyperLogLog(precision, registers.tobytes())
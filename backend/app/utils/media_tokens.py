@@ -0,0 +1,99 @@
+"""
+Подписанные ссылки на медиафайлы уроков.
+
+Токен — HMAC-SHA256 над (user_id, lesson_id, exp, scope), где scope — путь
+файла в uploads или каталог (HLS: плейлист и сегменты). Проверка — только
+вычисления, без БД: доступ к уроку проверяется один раз при выдаче ссылки.
+
+Формат: base64url(user_id | lesson_id | exp | len(scope)) "." base64url(hmac)
+"""
+import base64
+import hashlib
+import hmac
+import struct
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+from uuid import UUID
+
+from app.config import settings
+
+_PAYLOAD = struct.Struct(">16s16sIH")
+
+
+class InvalidMediaToken(ValueError):
+    """Подпись не сходится или путь вне scope токена"""
+
+
+class MediaTokenExpired(InvalidMediaToken):
+    pass
+
+
+@dataclass(frozen=True)
+class MediaGrant:
+    user_id: UUID
+    lesson_id: UUID
+    expires_at: int
+    scope: str
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+@lru_cache(maxsize=4)
+def _derive_key(secret: str) -> bytes:
+    # Отдельный ключ, чтобы подпись ссылки нельзя было использовать как что-то иное
+    return hmac.new(secret.encode(), b"media-url", hashlib.sha256).digest()
+
+
+def _sign(payload: bytes, scope: bytes) -> bytes:
+    secret = settings.MEDIA_URL_SECRET or settings.JWT_SECRET
+    if not secret:
+        raise RuntimeError("MEDIA_URL_SECRET (или JWT_SECRET) не задан")
+    return hmac.new(_derive_key(secret), payload + scope, hashlib.sha256).digest()
+
+
+def issue_media_token(
+    user_id: UUID,
+    lesson_id: UUID,
+    scope: str,
+    ttl: Optional[int] = None,
+) -> Tuple[str, int]:
+    """Возвращает токен и время истечения (unix time)"""
+    scope_bytes = scope.strip("/").encode()
+    if not scope_bytes:
+        raise ValueError("Пустой scope открыл бы доступ ко всем файлам")
+    expires_at = int(time.time()) + (ttl if ttl is not None else settings.MEDIA_URL_TTL_SECONDS)
+    payload = _PAYLOAD.pack(user_id.bytes, lesson_id.bytes, expires_at, len(scope_bytes))
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload, scope_bytes))}", expires_at
+
+
+def verify_media_token(token: str, path: str, now: Optional[float] = None) -> MediaGrant:
+    """Проверяет, что токен действует для пути `path` (относительно uploads)"""
+    try:
+        payload_b64, signature_b64 = token.split(".", 1)
+        payload = _b64decode(payload_b64)
+        signature = _b64decode(signature_b64)
+        user_bytes, lesson_bytes, expires_at, scope_len = _PAYLOAD.unpack(payload)
+    except (ValueError, struct.error) as exc:
+        raise InvalidMediaToken("Некорректный токен") from exc
+
+    raw_path = path.strip("/").encode()
+    if any(part in (b"", b".", b"..") for part in raw_path.split(b"/")):
+        raise InvalidMediaToken("Некорректный путь")
+    scope_bytes = raw_path[:scope_len]
+    if len(scope_bytes) != scope_len or (len(raw_path) > scope_len and raw_path[scope_len:scope_len + 1] != b"/"):
+        raise InvalidMediaToken("Путь вне области токена")
+
+    if not hmac.compare_digest(signature, _sign(payload, scope_bytes)):
+        raise InvalidMediaToken("Неверная подпись")
+    if expires_at < (now if now is not None else time.time()):
+        raise MediaTokenExpired("Срок действия ссылки истёк")
+
+    return MediaGrant(UUID(bytes=user_bytes), UUID(bytes=lesson_bytes), expires_at, scope_bytes.decode())
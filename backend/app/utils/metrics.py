@@ -0,0 +1,359 @@
+"""
+Метрики приложения в формате Prometheus.
+
+Все метрики объявляются здесь, чтобы остальной код импортировал готовые объекты
+и не создавал дубликаты в реестре.
+
+Несколько воркеров uvicorn: задайте PROMETHEUS_MULTIPROC_DIR (пустой каталог,
+очищаемый перед стартом) — каждый процесс пишет значения в свои mmap-файлы,
+а /metrics агрегирует их через MultiProcessCollector.
+"""
+import os
+
+from app.config import settings
+
+# Режим multiprocess выбирается prometheus_client при импорте — до создания метрик.
+if settings.PROMETHEUS_MULTIPROC_DIR:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.PROMETHEUS_MULTIPROC_DIR)
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Границы бакетов латентности HTTP (секунды)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Длительность обработки HTTP-запроса",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Количество HTTP-запросов в обработке",
+    ["router"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Размер пула соединений с БД",
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Соединения с БД, выданные из пула",
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Соединения с БД сверх размера пула",
+    multiprocess_mode="livesum",
+)
+
+CACHE_ENTRIES = Gauge(
+    "cache_entries",
+    "Количество записей во внутрипроцессных кешах",
+    ["cache"],
+    multiprocess_mode="livesum",
+)
+
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Обращения к внутрипроцессным кешам",
+    ["cache", "result"],
+)
+
+PASSWORD_HASH_QUEUE_WAIT = Histogram(
+    "password_hash_queue_wait_seconds",
+    "Ожидание свободного воркера хеширования паролей",
+    ["op"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+PASSWORD_HASH_COMPUTE = Histogram(
+    "password_hash_compute_seconds",
+    "Время вычисления bcrypt",
+    ["op"],
+    buckets=(0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.4, 0.5, 0.75, 1.0, 2.0),
+)
+
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "Операции хеширования в очереди и в работе",
+    multiprocess_mode="livesum",
+)
+
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "Операции хеширования, отклонённые из-за переполнения очереди",
+    ["op"],
+)
+
+OUTBOUND_REQUEST_DURATION = Histogram(
+    "outbound_request_duration_seconds",
+    "Длительность запросов к внешним интеграциям",
+    ["upstream", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+OUTBOUND_ERRORS = Counter(
+    "outbound_errors_total",
+    "Ошибки запросов к внешним интеграциям",
+    ["upstream", "error"],
+)
+
+OUTBOUND_RETRIES = Counter(
+    "outbound_retries_total",
+    "Повторные запросы к внешним интеграциям",
+    ["upstream"],
+)
+
+EMAIL_OUTBOX_RESULTS = Counter(
+    "email_outbox_results_total",
+    "Результаты отправки писем из outbox",
+    ["template", "result"],
+)
+
+EMAIL_OUTBOX_DISPATCH_ERRORS = Counter(
+    "email_outbox_dispatch_errors_total",
+    "Ошибки цикла диспетчера outbox (пачка не разобрана)",
+    ["error"],
+)
+
+EMAIL_OUTBOX_DELIVERY_LAG = Histogram(
+    "email_outbox_delivery_lag_seconds",
+    "Время от записи письма в outbox до отправки",
+    ["template"],
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+
+JOBS_PROCESSED = Counter(
+    "jobs_processed_total",
+    "Результаты выполнения фоновых задач",
+    ["task", "result"],
+)
+
+JOB_WORKER_ERRORS = Counter(
+    "job_worker_errors_total",
+    "Ошибки циклов воркера задач (вне обработчиков задач)",
+    ["loop"],
+)
+
+JOB_DURATION = Histogram(
+    "job_duration_seconds",
+    "Время выполнения фоновой задачи",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 1800.0),
+)
+
+JOB_QUEUE_LAG = Histogram(
+    "job_queue_lag_seconds",
+    "Задержка от запланированного времени запуска задачи до начала выполнения",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+)
+
+JOBS_IN_PROGRESS = Gauge(
+    "jobs_in_progress",
+    "Фоновые задачи в работе",
+    multiprocess_mode="livesum",
+)
+
+PAYMENT_WEBHOOK_EVENTS = Counter(
+    "payment_webhook_events_total",
+    "События webhook YooKassa по результату приёма",
+    ["result"],
+)
+
+PAYMENT_WEBHOOK_STAGE_DURATION = Histogram(
+    "payment_webhook_stage_duration_seconds",
+    "Длительность этапов обработки платежа: dedup, persist, ack (webhook); verify, enroll, end_to_end (воркер)",
+    ["stage"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+
+PROGRESS_UPDATES = Counter(
+    "progress_updates_total",
+    "Обновления прогресса, принятые в буфер",
+)
+
+PROGRESS_BUFFER_PENDING = Gauge(
+    "progress_buffer_pending",
+    "Записи на курсы с несброшенным прогрессом",
+    multiprocess_mode="livesum",
+)
+
+PROGRESS_FLUSH_DURATION = Histogram(
+    "progress_flush_duration_seconds",
+    "Длительность пакетной записи прогресса",
+    ["trigger"],
+    buckets=LATENCY_BUCKETS,
+)
+
+PROGRESS_FLUSH_FAILURES = Counter(
+    "progress_flush_failures_total",
+    "Неудачные пакетные записи прогресса (пачка возвращается в буфер)",
+    ["trigger"],
+)
+
+PROGRESS_FLUSH_ROWS = Histogram(
+    "progress_flush_rows",
+    "Строк в одной пакетной записи прогресса",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+
+
+CONTENT_VIEWS = Counter(
+    "content_views_total",
+    "Просмотры проектов и статей, принятые в буфер",
+    ["type"],
+)
+
+VIEWS_BUFFER_PENDING = Gauge(
+    "views_buffer_pending",
+    "Материалы (за день) с несброшенными просмотрами",
+    multiprocess_mode="livesum",
+)
+
+VIEWS_FLUSH_DURATION = Histogram(
+    "views_flush_duration_seconds",
+    "Длительность пакетной записи просмотров в content_views",
+    ["trigger"],
+    buckets=LATENCY_BUCKETS,
+)
+
+VIEWS_FLUSH_ROWS = Histogram(
+    "views_flush_rows",
+    "Строк в одной пакетной записи просмотров",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+
+VIEWS_FLUSH_FAILURES = Counter(
+    "views_flush_failures_total",
+    "Неудачные пакетные записи просмотров (пачка возвращается в буфер)",
+    ["trigger"],
+)
+
+VIEWS_DROPPED = Counter(
+    "views_dropped_total",
+    "Просмотры, отброшенные после VIEWS_FLUSH_MAX_ATTEMPTS неудачных записей",
+    ["type"],
+)
+
+
+EXPORT_ROWS = Counter(
+    "export_rows_total",
+    "Строки, выгруженные через /api/exports",
+    ["dataset", "format"],
+)
+
+MEDIA_REQUESTS = Counter(
+    "media_requests_total",
+    "Запросы к защищённым медиафайлам по результату проверки ссылки",
+    ["result"],
+)
+
+STORAGE_BYTES = Counter(
+    "storage_transfer_bytes_total",
+    "Байты, переданные в хранилище загрузок и из него",
+    ["driver", "direction"],
+)
+
+
+HLS_TRANSCODE_SECONDS = Histogram(
+    "hls_transcode_seconds",
+    "Длительность перекодирования видео в HLS",
+    buckets=(5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600),
+)
+
+HLS_TRANSCODE_SPEED = Histogram(
+    "hls_transcode_speed_ratio",
+    "Скорость перекодирования относительно реального времени (секунд видео за секунду)",
+    buckets=(0.25, 0.5, 1.0, 1.5, 2.0, 3.0, 5.0, 8.0, 12.0, 20.0),
+)
+
+IMAGE_META_SECONDS = Histogram(
+    "image_meta_seconds",
+    "Расчёт размеров, цвета и плейсхолдера изображения в пуле процессов",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+SUGGEST_INDEX_SIZE = Gauge(
+    "suggest_index_size",
+    "Размер индекса подсказок: записи, слова, триграммы",
+    ["structure"],
+    multiprocess_mode="livemax",
+)
+
+SUGGEST_INDEX_BYTES = Gauge(
+    "suggest_index_bytes",
+    "Оценка памяти индекса подсказок (на момент последнего перестроения)",
+    multiprocess_mode="livemax",
+)
+
+SUGGEST_INDEX_BUILD_SECONDS = Histogram(
+    "suggest_index_build_seconds",
+    "Время построения индекса подсказок (загрузка из БД и сборка)",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+SUGGEST_INDEX_BUILD_FAILURES = Counter(
+    "suggest_index_build_failures_total",
+    "Неудачные построения индекса подсказок (остаётся прежний индекс)",
+)
+
+SUGGEST_LOOKUP_SECONDS = Histogram(
+    "suggest_lookup_seconds",
+    "Время поиска подсказок в индексе (без HTTP)",
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025),
+)
+
+
+def is_multiprocess() -> bool:
+    return "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+
+def refresh_db_pool_gauges() -> None:
+    """Снимает текущее состояние пула соединений SQLAlchemy"""
+    from sqlalchemy.pool import QueuePool
+
+    from app.infrastructure.db.session import engine
+
+    pool = engine.pool
+    # Размер и переполнение есть только у QueuePool (у async-движка — AsyncAdaptedQueuePool)
+    if not isinstance(pool, QueuePool):
+        return
+    DB_POOL_SIZE.set(pool.size())
+    DB_POOL_CHECKED_OUT.set(pool.checkedout())
+    DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Возвращает метрики в текстовом формате Prometheus и content-type"""
+    refresh_db_pool_gauges()
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Убирает live-гейджи завершившегося воркера из агрегата"""
+    if is_multiprocess():
+        multiprocess.mark_process_dead(os.getpid())
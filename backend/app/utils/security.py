@@ -1,41 +1,180 @@
 """
 Утилиты для безопасности: хеширование паролей
 """
-from passlib.context import CryptContext
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Any, Callable, Optional, Tuple, TypeVar
+
 import bcrypt
 
-# Создаем контекст с явной настройкой для совместимости
-pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__ident="2b", bcrypt__rounds=12)
+from app.config import settings
+from app.utils.metrics import (
+    PASSWORD_HASH_COMPUTE,
+    PASSWORD_HASH_QUEUE_DEPTH,
+    PASSWORD_HASH_QUEUE_WAIT,
+    PASSWORD_HASH_REJECTED,
+)
+
+T = TypeVar("T")
+
+# bcrypt учитывает только первые 72 байта пароля
+BCRYPT_MAX_PASSWORD_BYTES = 72
+BCRYPT_IDENT = "2b"
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
+# Варианты префикса, которые понимает bcrypt.checkpw (в т.ч. старые хеши passlib)
+BCRYPT_IDENTS = {"2a", "2b", "2y"}
+
+def _password_bytes(password: str) -> bytes:
+    return password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
+
 
+def parse_bcrypt_hash(hashed_password: str) -> Optional[Tuple[str, int]]:
+    """Возвращает (ident, rounds) из хеша вида $2b$12$..., либо None"""
+    parts = hashed_password.split("$")
+    if len(parts) != 4 or parts[0] or parts[1] not in BCRYPT_IDENTS:
+        return None
+    if not parts[2].isdigit() or len(parts[3]) != 53:
+        return None
+    return parts[1], int(parts[2])
 
-def hash_password(password: str) -> str:
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
     """Хеширует пароль"""
-    # Ограничиваем длину пароля для bcrypt (максимум 72 байта)
-    password_bytes = password.encode('utf-8')
-    if len(password_bytes) > 72:
-        password_bytes = password_bytes[:72]
-    
-    # Используем прямой bcrypt вместо passlib для избежания проблем с версиями
-    try:
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password_bytes, salt)
-        return hashed.decode('utf-8')
-    except Exception:
-        # Fallback на passlib если прямой bcrypt не работает
-        return pwd_context.hash(password_bytes.decode('utf-8'))
+    salt = bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS, prefix=BCRYPT_IDENT.encode("ascii"))
+    return bcrypt.hashpw(_password_bytes(password), salt).decode("utf-8")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Проверяет пароль"""
-    # Сначала пробуем прямой bcrypt (приоритет, так как hash_password теперь использует его)
+    # Параметры (ident, cost) берутся из самого хеша — один путь для старых и новых хешей
+    if parse_bcrypt_hash(hashed_password) is None:
+        return False
     try:
-        password_bytes = plain_password.encode('utf-8')
-        if len(password_bytes) > 72:
-            password_bytes = password_bytes[:72]
-        return bcrypt.checkpw(password_bytes, hashed_password.encode('utf-8'))
-    except:
-        # Fallback на passlib для старых хешей
+        return bcrypt.checkpw(_password_bytes(plain_password), hashed_password.encode("utf-8"))
+    except ValueError:
+        return False
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Хеш слабее текущей стоимости или с устаревшим префиксом (более дорогой не понижаем)"""
+    parsed = parse_bcrypt_hash(hashed_password)
+    if parsed is None:
+        return False
+    ident, rounds = parsed
+    return ident != BCRYPT_IDENT or rounds < settings.BCRYPT_ROUNDS
+
+
+def measure_hash_seconds(rounds: int, samples: int = 3) -> float:
+    """Лучшее время одного bcrypt-хеша при заданной стоимости"""
+    password = _password_bytes("calibration-password")
+    salt = bcrypt.gensalt(rounds=rounds, prefix=BCRYPT_IDENT.encode("ascii"))
+    best = float("inf")
+    for _ in range(samples):
+        started = perf_counter()
+        bcrypt.hashpw(password, salt)
+        best = min(best, perf_counter() - started)
+    return best
+
+
+def calibrate_bcrypt_rounds(
+    target_ms: float,
+    min_rounds: int = BCRYPT_MIN_ROUNDS,
+    max_rounds: int = BCRYPT_MAX_ROUNDS,
+) -> int:
+    """
+    Подбирает максимальную стоимость, при которой хеш укладывается в target_ms.
+
+    Запускается вручную (benchmarks.bcrypt_throughput --target-ms), результат
+    записывается в BCRYPT_ROUNDS: стоимость одна на все воркеры, иначе они
+    перехешировали бы пароли друг за другом.
+
+    Каждый +1 к стоимости удваивает работу, поэтому достаточно одного замера
+    на минимальной стоимости, а дальше — проверка ближайшего кандидата.
+    """
+    target = target_ms / 1000
+    rounds = min_rounds
+    predicted = measure_hash_seconds(min_rounds)
+    while rounds < max_rounds and predicted * 2 <= target:
+        rounds += 1
+        predicted *= 2
+
+    # Прогноз может ошибаться на малых стоимостях — уточняем замером
+    if rounds > min_rounds and measure_hash_seconds(rounds, samples=1) > target * 1.25:
+        rounds -= 1
+    return rounds
+
+
+class PasswordHasherBusy(Exception):
+    """Очередь хеширования паролей переполнена — запрос нужно повторить позже"""
+
+
+class PasswordHasherPool:
+    """
+    Ограниченный пул для bcrypt вне event loop.
+
+    bcrypt отпускает GIL на время вычисления, поэтому достаточно потоков.
+    Ёмкость = воркеры + очередь; сверх неё операции сразу отклоняются,
+    чтобы всплеск логинов не копил ожидание во всех запросах воркера.
+    """
+
+    def __init__(self, workers: int, max_queue: int) -> None:
+        self._workers = max(1, workers)
+        self._capacity = self._workers + max(0, max_queue)
+        self._pending = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._workers, thread_name_prefix="password-hasher"
+            )
+        return self._executor
+
+    async def run(self, op: str, func: Callable[..., T], *args: Any) -> T:
+        # Счётчик меняется только из event loop — блокировка не нужна
+        if self._pending >= self._capacity:
+            PASSWORD_HASH_REJECTED.labels(op).inc()
+            raise PasswordHasherBusy()
+
+        self._pending += 1
+        PASSWORD_HASH_QUEUE_DEPTH.inc()
+        enqueued = perf_counter()
+
+        def job() -> Tuple[T, float, float]:
+            started = perf_counter()
+            result = func(*args)
+            return result, started - enqueued, perf_counter() - started
+
         try:
-            return pwd_context.verify(plain_password, hashed_password)
-        except:
-            return False
+            loop = asyncio.get_running_loop()
+            result, waited, computed = await loop.run_in_executor(self._get_executor(), job)
+        finally:
+            self._pending -= 1
+            PASSWORD_HASH_QUEUE_DEPTH.dec()
+
+        PASSWORD_HASH_QUEUE_WAIT.labels(op).observe(waited)
+        PASSWORD_HASH_COMPUTE.labels(op).observe(computed)
+        return result
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasherPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """Хеширует пароль в пуле, не блокируя event loop"""
+    return await password_hasher.run("hash", hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Проверяет пароль в пуле, не блокируя event loop"""
+    return await password_hasher.run("verify", verify_password, plain_password, hashed_password)
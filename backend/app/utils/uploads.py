@@ -0,0 +1,15 @@
+"""
+Каталог загруженных файлов (общий для API, раздачи медиа и фоновых задач).
+
+В Docker: /app/backend/uploads (монтируется как volume, задаётся UPLOAD_DIR);
+локально: uploads рядом с пакетом app.
+"""
+import os
+from pathlib import Path
+
+UPLOAD_BASE = os.getenv("UPLOAD_DIR")
+if UPLOAD_BASE:
+    UPLOAD_DIR = Path(UPLOAD_BASE)
+else:
+    BASE_DIR = Path(__file__).resolve().parent.parent
+    UPLOAD_DIR = BASE_DIR / "uploads"
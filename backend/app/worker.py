@@ -0,0 +1,86 @@
+"""
+Воркер фоновых задач.
+
+    python -m app.worker --concurrency 8
+    python -m app.worker retry-dead [--task payments.process_yookassa]
+
+Можно запускать несколько процессов (и на разных машинах) против одной БД:
+задачи разбираются через SKIP LOCKED. SIGTERM/SIGINT — мягкая остановка:
+новые задачи не берутся, начатые доводятся до конца.
+
+retry-dead возвращает задачи из dead letter в очередь с новым набором попыток
+(например, после долгого сбоя внешнего сервиса).
+"""
+import argparse
+import asyncio
+import signal
+from typing import Optional
+
+from app.application import tasks as _tasks  # noqa: F401  (регистрация задач)
+from app.application.services.jobs import TASKS, JobWorker
+from app.config import settings
+from app.infrastructure.db.repositories.jobs import SqlAlchemyJobRepository
+from app.infrastructure.db.session import AsyncSessionLocal, engine
+from app.infrastructure.integrations.http_clients import outbound
+from app.utils.metrics import is_multiprocess, mark_process_dead
+
+
+async def run(concurrency: int, poll_interval: float) -> None:
+    worker = JobWorker(
+        concurrency=concurrency,
+        poll_interval=poll_interval,
+        lease_grace_seconds=settings.JOB_LEASE_GRACE_SECONDS,
+    )
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    print(f"jobs: воркер запущен, потребителей: {concurrency}, задачи: {', '.join(sorted(TASKS)) or '—'}")
+    try:
+        await worker.run()
+    finally:
+        await outbound.close()
+        await engine.dispose()
+        print("jobs: воркер остановлен")
+
+
+async def retry_dead(task: Optional[str]) -> None:
+    try:
+        async with AsyncSessionLocal() as db:
+            count = await SqlAlchemyJobRepository(db).retry_dead(task)
+    finally:
+        await engine.dispose()
+    print(f"jobs: возвращено в очередь задач из dead letter: {count}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY)
+    parser.add_argument("--poll-interval", type=float, default=settings.JOB_POLL_SECONDS)
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=0,
+        help="отдавать /metrics воркера на этом порту (без PROMETHEUS_MULTIPROC_DIR)",
+    )
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("retry-dead", help="вернуть задачи из dead letter в очередь").add_argument(
+        "--task", help="только задачи с этим именем"
+    )
+    args = parser.parse_args()
+
+    if args.command == "retry-dead":
+        asyncio.run(retry_dead(args.task))
+        return
+    if args.metrics_port and not is_multiprocess():
+        from prometheus_client import start_http_server
+
+        start_http_server(args.metrics_port)
+    try:
+        asyncio.run(run(args.concurrency, args.poll_interval))
+    finally:
+        mark_process_dead()
+
+
+if __name__ == "__main__":
+    main()
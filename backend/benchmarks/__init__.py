@@ -0,0 +1,5 @@
+"""
+Нагрузочные замеры backend.
+
+Запуск из каталога backend: python -m benchmarks.<module> --help
+"""
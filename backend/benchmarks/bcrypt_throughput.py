@@ -0,0 +1,54 @@
+"""
+Пропускная способность bcrypt: хешей/с на ядро для разных стоимостей.
+
+    python -m benchmarks.bcrypt_throughput --rounds 10 11 12 13 --seconds 3
+    python -m benchmarks.bcrypt_throughput --target-ms 250
+"""
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from app.utils.security import calibrate_bcrypt_rounds, hash_password, measure_hash_seconds
+
+
+def _hash_for(rounds: int, deadline: float) -> int:
+    count = 0
+    while perf_counter() < deadline:
+        hash_password("benchmark-password", rounds=rounds)
+        count += 1
+    return count
+
+
+def run(rounds: int, seconds: float, threads: int) -> float:
+    """Хешей/с при заданном числе потоков (bcrypt отпускает GIL)"""
+    started = perf_counter()
+    deadline = started + seconds
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        total = sum(pool.map(lambda _: _hash_for(rounds, deadline), range(threads)))
+    return total / (perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--target-ms", type=float, default=0, help="подобрать стоимость под задержку")
+    args = parser.parse_args()
+
+    cores = args.threads
+    print(f"cores={cores}")
+    print(f"{'rounds':>6} {'latency ms':>11} {'hashes/s':>10} {'hashes/s/core':>14}")
+    for rounds in args.rounds:
+        latency = measure_hash_seconds(rounds) * 1000
+        rate = run(rounds, args.seconds, cores)
+        print(f"{rounds:>6} {latency:>11.1f} {rate:>10.1f} {rate / cores:>14.2f}")
+
+    if args.target_ms > 0:
+        chosen = calibrate_bcrypt_rounds(args.target_ms)
+        print(f"target {args.target_ms:.0f} ms -> BCRYPT_ROUNDS={chosen}")
+
+
+if __name__ == "__main__":
+    main()
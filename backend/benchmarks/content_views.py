@@ -0,0 +1,95 @@
+"""
+Буфер просмотров: стоимость record(), размер и длительность сброса при росте трафика.
+
+Нужна база с применёнными миграциями; статьи бенчмарка (slug с префиксом
+bench-views-) и их агрегаты создаются перед замером и удаляются после.
+Число строк в сбросе равно числу материалов, а не просмотров.
+
+    python -m benchmarks.content_views --posts 200 --views 10000 100000 1000000 --visitors 50000
+"""
+import argparse
+import asyncio
+import random
+from datetime import date, timedelta
+from time import perf_counter
+
+from sqlalchemy import delete, insert, select
+
+from app.application.services.view_counter import ViewBuffer
+from app.infrastructure.db.models.blog_post import BlogPost
+from app.infrastructure.db.models.content_view import ContentView
+from app.infrastructure.db.repositories.content_views import SqlAlchemyContentViewsRepository
+from app.infrastructure.db.session import AsyncSessionLocal, engine
+
+SLUG_PREFIX = "bench-views-"
+
+
+async def _cleanup() -> None:
+    async with AsyncSessionLocal() as db:
+        ids = select(BlogPost.id).where(BlogPost.slug.startswith(SLUG_PREFIX))
+        await db.execute(delete(ContentView).where(ContentView.content_id.in_(ids)))
+        await db.execute(delete(BlogPost).where(BlogPost.slug.startswith(SLUG_PREFIX)))
+        await db.commit()
+
+
+async def _seed(posts: int) -> list:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            insert(BlogPost).returning(BlogPost.id),
+            [{"title": f"Bench {n}", "slug": f"{SLUG_PREFIX}{n}", "is_published": True} for n in range(posts)],
+        )
+        ids = list(result.scalars())
+        await db.commit()
+    return ids
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    await _cleanup()
+    try:
+        ids = await _seed(args.posts)
+        rng = random.Random(5)
+        # Популярность статей по Ципфу: немногие собирают большую часть просмотров
+        weights = [1 / rank for rank in range(1, len(ids) + 1)]
+        for total in args.views:
+            buffer = ViewBuffer(flush_interval=3600, max_pending=len(ids) + 1, max_attempts=1)
+            targets = rng.choices(ids, weights=weights, k=total)
+            visitors = [f"v{rng.randrange(args.visitors)}" for _ in range(total)]
+
+            started = perf_counter()
+            for content_id, visitor in zip(targets, visitors, strict=True):
+                buffer.record("blog", content_id, visitor)
+            record_us = (perf_counter() - started) / total * 1e6
+
+            started = perf_counter()
+            rows = await buffer.flush("manual")
+            flush_ms = (perf_counter() - started) * 1000
+
+            print(
+                f"просмотров {total:>9}: record {record_us:>5.2f} µs, "
+                f"сброс {rows:>4} строк за {flush_ms:>7.1f} ms ({rows / total:.5f} строк на просмотр)"
+            )
+
+        async with AsyncSessionLocal() as db:
+            started = perf_counter()
+            popular = await SqlAlchemyContentViewsRepository(db).popular("blog", date.today() - timedelta(days=1), 10)
+            print(f"популярное (top-10) за {(perf_counter() - started) * 1000:.1f} ms")
+        top = popular[0]
+        print(f"самая популярная: {top.views} просмотров, ~{top.visitors} уникальных (пул посетителей {args.visitors})")
+    finally:
+        if not args.keep:
+            await _cleanup()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--views", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--visitors", type=int, default=50000)
+    parser.add_argument("--keep", action="store_true", help="оставить статьи и агрегаты")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Статистика админ-панели: агрегаты stats_* против GROUP BY по сырым таблицам.
+
+Нужна база с применёнными миграциями. Курсы, пользователи и заявки бенчмарка
+(slug и email с префиксом bench-stats-) создаются ступенями до заданных размеров
+и удаляются после; агрегаты при вставке ведут триггеры. Время панели по агрегатам
+не должно зависеть от числа сырых строк.
+
+    python -m benchmarks.dashboard_stats --enrollments 100000 1000000 3000000 --backfill-workers 1 4
+"""
+import argparse
+import asyncio
+import statistics
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+
+from sqlalchemy import delete, text
+
+from app.application.services.stats_rollups import backfill
+from app.infrastructure.db.models.contact import ContactSubmission
+from app.infrastructure.db.models.course import Course
+from app.infrastructure.db.models.stats import StatsEnrollmentsDaily
+from app.infrastructure.db.models.user import User
+from app.infrastructure.db.repositories.stats import SqlAlchemyStatsRepository
+from app.infrastructure.db.session import AsyncSessionLocal, engine
+
+PREFIX = "bench-stats-"
+HISTORY_DAYS = 730
+
+# Те же выборки, что у /api/stats, но по сырым таблицам
+RAW_QUERIES = (
+    """
+    SELECT e.course_id, c.title, (e.enrolled_at AT TIME ZONE 'UTC')::date AS day, count(*)
+    FROM enrollments e LEFT JOIN courses c ON c.id = e.course_id
+    WHERE e.enrolled_at >= :since GROUP BY 1, 2, 3 ORDER BY 3, 2
+    """,
+    """
+    SELECT date_trunc('week', created_at AT TIME ZONE 'UTC')::date, count(*), coalesce(sum(budget), 0)
+    FROM contact_submissions WHERE created_at >= :since GROUP BY 1 ORDER BY 1
+    """,
+)
+
+
+async def _cleanup() -> None:
+    async with AsyncSessionLocal() as db:
+        course_ids = [row[0] for row in (await db.execute(
+            text("SELECT id FROM courses WHERE slug LIKE :p"), {"p": PREFIX + "%"}
+        )).all()]
+        # Записи удаляются каскадом вместе с курсами (триггер вычитает их из агрегатов)
+        await db.execute(delete(Course).where(Course.id.in_(course_ids)))
+        await db.execute(delete(StatsEnrollmentsDaily).where(StatsEnrollmentsDaily.course_id.in_(course_ids)))
+        await db.execute(delete(User).where(User.email.startswith(PREFIX)))
+        await db.execute(delete(ContactSubmission).where(ContactSubmission.email.startswith(PREFIX)))
+        await db.commit()
+
+
+async def _analyze(*tables: str) -> None:
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for table in tables:
+            await conn.execute(text(f"ANALYZE {table}"))
+
+
+async def _seed_static(courses: int, users: int) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            text(
+                "INSERT INTO courses (title, slug, category, price) "
+                "SELECT 'Bench ' || n, :p || n, 'production', 1000 FROM generate_series(0, :n - 1) n"
+            ),
+            {"p": PREFIX, "n": courses},
+        )
+        await db.execute(
+            text(
+                "INSERT INTO users (email, full_name, provider, role) "
+                "SELECT :p || n || '@example.com', 'Bench ' || n, 'email', 'user' FROM generate_series(0, :n - 1) n"
+            ),
+            {"p": PREFIX, "n": users},
+        )
+        await db.commit()
+    await _analyze("courses", "users")
+
+
+async def _grow(start: int, end: int, courses: int) -> None:
+    """Записи с номерами [start, end): пользователь n // courses, курс n % courses, дата — за 2 года"""
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            text(
+                """
+                WITH c AS (SELECT id, row_number() OVER (ORDER BY slug) - 1 AS n FROM courses WHERE slug LIKE :p || '%'),
+                     u AS (SELECT id, row_number() OVER (ORDER BY email) - 1 AS n FROM users WHERE email LIKE :p || '%')
+                INSERT INTO enrollments (user_id, course_id, enrolled_at)
+                SELECT u.id, c.id, now() - random() * make_interval(days => :days)
+                FROM generate_series(:start, :end - 1) g(i)
+                JOIN u ON u.n = g.i / :courses
+                JOIN c ON c.n = g.i % :courses
+                """
+            ),
+            {"p": PREFIX, "start": start, "end": end, "courses": courses, "days": HISTORY_DAYS},
+        )
+        # Заявок в 10 раз меньше, чем записей
+        await db.execute(
+            text(
+                "INSERT INTO contact_submissions (name, email, message, budget, created_at) "
+                "SELECT 'Bench', :p || g || '@example.com', 'bench', (random() * 500000)::int, "
+                "now() - random() * make_interval(days => :days) FROM generate_series(:start, :end - 1) g"
+            ),
+            {"p": PREFIX, "start": start // 10, "end": end // 10, "days": HISTORY_DAYS},
+        )
+        await db.commit()
+    await _analyze("enrollments", "contact_submissions")
+
+
+async def _rollup_dashboard(days: int) -> None:
+    until = datetime.now(timezone.utc).date()
+    since = until - timedelta(days=days - 1)
+    async with AsyncSessionLocal() as db:
+        repo = SqlAlchemyStatsRepository(db)
+        await repo.enrollments_daily(since, until)
+        await repo.contacts_weekly(since, until)
+        await repo.revenue_by_course(since, until)
+
+
+async def _raw_dashboard(days: int) -> None:
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    async with AsyncSessionLocal() as db:
+        for query in RAW_QUERIES:
+            (await db.execute(text(query), {"since": since})).all()
+
+
+async def _median_ms(fn, days: int, repeat: int) -> float:
+    await fn(days)  # прогрев кэша и пула соединений
+    timings = []
+    for _ in range(repeat):
+        started = perf_counter()
+        await fn(days)
+        timings.append((perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    await _cleanup()
+    try:
+        sizes = sorted(args.enrollments)
+        await _seed_static(args.courses, -(-sizes[-1] // args.courses))
+        seeded = 0
+        for size in sizes:
+            started = perf_counter()
+            await _grow(seeded, size, args.courses)
+            grow_s = perf_counter() - started
+            seeded = size
+
+            rollup_ms = await _median_ms(_rollup_dashboard, args.days, args.repeat)
+            raw_ms = await _median_ms(_raw_dashboard, args.days, args.repeat)
+            print(
+                f"записей {size:>9} (заявок {size // 10:>8}, вставка {grow_s:>5.1f}s): "
+                f"агрегаты {rollup_ms:>7.2f} ms, сырые таблицы {raw_ms:>8.1f} ms"
+            )
+
+        for workers in args.backfill_workers:
+            started = perf_counter()
+            await backfill(workers)
+            print(f"пересчёт агрегатов, {workers} воркеров: {perf_counter() - started:.2f}s")
+    finally:
+        if not args.keep:
+            await _cleanup()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--enrollments", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--courses", type=int, default=50)
+    parser.add_argument("--days", type=int, default=30, help="период панели (как у /api/stats по умолчанию)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backfill-workers", type=int, nargs="*", default=[1, 4])
+    parser.add_argument("--keep", action="store_true", help="оставить сгенерированные данные")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Выгрузки: пиковая память и скорость потоковой выгрузки против загрузки всех строк сразу.
+
+Нужна база с применёнными миграциями; заявки бенчмарка (email с префиксом
+bench-export-) создаются перед замером и удаляются после. Пик памяти
+(tracemalloc) потоковой выгрузки зависит от размера пачки, а не от числа строк.
+
+    python -m benchmarks.exports --rows 100000 1000000 --batch-size 2000
+"""
+import argparse
+import asyncio
+import tracemalloc
+from time import perf_counter
+
+from sqlalchemy import delete, select, text
+
+from app.application.services.exports import ExportQuery, encode_csv, stream_export
+from app.infrastructure.db.models.contact import ContactSubmission
+from app.infrastructure.db.repositories.exports import CONTACT_COLUMNS
+from app.infrastructure.db.session import AsyncSessionLocal, engine
+
+PREFIX = "bench-export-"
+
+
+async def _cleanup() -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(ContactSubmission).where(ContactSubmission.email.startswith(PREFIX)))
+        await db.commit()
+
+
+async def _grow(start: int, end: int) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            text(
+                "INSERT INTO contact_submissions (name, email, phone, message, budget, created_at) "
+                "SELECT 'Клиент ' || g, :p || g || '@example.com', '+7 900 000-00-00', "
+                "'Нужен ролик для запуска продукта, бюджет обсуждаем', (random() * 500000)::int, "
+                "now() - random() * interval '730 days' FROM generate_series(:start, :end - 1) g"
+            ),
+            {"p": PREFIX, "start": start, "end": end},
+        )
+        await db.commit()
+
+
+async def _streamed(fmt: str, compress: bool, batch_size: int) -> int:
+    size = 0
+    async for chunk in stream_export("contacts", fmt, ExportQuery(), compress, batch_size):
+        size += len(chunk)
+    return size
+
+
+async def _loaded_at_once() -> int:
+    """Как скрипты в backend/scripts: все строки в памяти, затем один CSV"""
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(select(*(getattr(ContactSubmission, c) for c in CONTACT_COLUMNS)))).all()
+    return len(encode_csv(CONTACT_COLUMNS, rows, header=True))
+
+
+async def _measure(label: str, rows: int, run) -> None:
+    """Время — отдельным прогоном: tracemalloc замедляет код в разы"""
+    started = perf_counter()
+    size = await run()
+    elapsed = perf_counter() - started
+    tracemalloc.start()
+    await run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"  {label:<22} {elapsed:>6.2f}s ({rows / elapsed:>9.0f} строк/с), "
+        f"{size / 2**20:>7.1f} МБ, пик памяти {peak / 2**20:>7.1f} МБ"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    await _cleanup()
+    try:
+        async with AsyncSessionLocal() as db:
+            existing = (await db.execute(text("SELECT count(*) FROM contact_submissions"))).scalar_one()
+        seeded = 0
+        for size in sorted(args.rows):
+            await _grow(seeded, size)
+            seeded = size
+            total = existing + size
+            print(f"заявок {total}:")
+            await _measure("csv поток", total, lambda: _streamed("csv", False, args.batch_size))
+            await _measure("ndjson поток", total, lambda: _streamed("ndjson", False, args.batch_size))
+            await _measure("csv.gz поток", total, lambda: _streamed("csv", True, args.batch_size))
+            if not args.skip_naive:
+                await _measure("csv целиком в памяти", total, _loaded_at_once)
+    finally:
+        await _cleanup()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--skip-naive", action="store_true", help="не замерять загрузку всех строк")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
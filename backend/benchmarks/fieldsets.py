@@ -0,0 +1,126 @@
+"""
+Выборочные поля списков: размер ответа (и gzip) и время запроса полного
+списка против ?fields= / ?lang= для типичных экранов.
+
+Нужна база с применёнными миграциями; проекты и статьи бенчмарка (slug с
+префиксом bench-fields-) создаются перед замером и удаляются после. Курсы и
+клиенты замеряются на том, что уже есть в базе. Запросы идут в приложение
+в процессе (ASGI), без сети.
+
+    python -m benchmarks.fieldsets --projects 100 --posts 100 --requests 50
+"""
+import argparse
+import asyncio
+import gzip
+from statistics import median
+from time import perf_counter
+from typing import List, Tuple
+
+import httpx
+from sqlalchemy import delete, text
+
+from app.infrastructure.db.models.blog_post import BlogPost
+from app.infrastructure.db.models.project import Project
+from app.infrastructure.db.session import AsyncSessionLocal, engine
+from app.main import app
+
+PREFIX = "bench-fields-"
+
+SCREENS: List[Tuple[str, str]] = [
+    ("проекты: всё", "/api/projects?limit=100"),
+    ("проекты: lang=ru", "/api/projects?limit=100&lang=ru"),
+    ("проекты: карусель", "/api/projects?limit=100&lang=ru&fields=slug,title,thumbnail_url,carousel_gif_url"),
+    ("проекты: сетка", "/api/projects?limit=100&lang=en&fields=slug,title,category,cover_image_url,media"),
+    ("курсы: всё", "/api/courses?limit=100"),
+    ("курсы: карточки", "/api/courses?limit=100&fields=slug,title,price,cover_image,level"),
+    ("клиенты: всё", "/api/clients"),
+    ("клиенты: логотипы", "/api/clients?fields=name,logo_url,media"),
+    ("блог: всё", "/api/blog?limit=100"),
+    ("блог: анонсы", "/api/blog?limit=100&fields=slug,title,excerpt,category,published_at"),
+]
+
+
+async def _cleanup() -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Project).where(Project.slug.startswith(PREFIX)))
+        await db.execute(delete(BlogPost).where(BlogPost.slug.startswith(PREFIX)))
+        await db.commit()
+
+
+async def _seed(projects: int, posts: int) -> None:
+    """Тексты — порядка реальных: описания на двух языках, галерея, статьи на несколько экранов"""
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            text(
+                "INSERT INTO projects (title, title_ru, title_en, slug, category, description, "
+                "description_ru, description_en, client, images, tools, behind_scenes, role, year, "
+                "thumbnail_url, cover_image_url, video_url) "
+                "SELECT 'Проект ' || g, 'Проект ' || g, 'Project ' || g, :p || g, 'commercial', "
+                "repeat('Съёмка рекламного ролика для запуска продукта. ', 12), "
+                "repeat('Съёмка рекламного ролика для запуска продукта. ', 12), "
+                "repeat('Commercial shoot for a product launch campaign. ', 12), 'Клиент ' || (g % 20), "
+                "array(SELECT '/uploads/images/' || md5(g::text || i::text) || '.jpg' FROM generate_series(1, 8) i), "
+                "ARRAY['RED Komodo', 'DaVinci Resolve', 'DJI Ronin'], "
+                "array(SELECT '/uploads/images/' || md5(i::text || g::text) || '.jpg' FROM generate_series(1, 4) i), "
+                "'Режиссёр, оператор', 2015 + g % 11, "
+                "'/uploads/images/' || md5('t' || g) || '.jpg', '/uploads/images/' || md5('c' || g) || '.jpg', "
+                "'/uploads/videos/' || md5('v' || g) || '.mp4' "
+                "FROM generate_series(1, :n) g"
+            ),
+            {"p": PREFIX, "n": projects},
+        )
+        await db.execute(
+            text(
+                "INSERT INTO blog_posts (title, slug, excerpt, category, author, content, is_published, published_at) "
+                "SELECT 'Статья ' || g, :p || g, repeat('Коротко о съёмке. ', 8), 'production', 'Редакция', "
+                "repeat('Подробный разбор съёмочного дня: свет, камера, звук и монтаж. ', 150), true, now() "
+                "FROM generate_series(1, :n) g"
+            ),
+            {"p": PREFIX, "n": posts},
+        )
+        await db.commit()
+
+
+async def _measure(client: httpx.AsyncClient, url: str, requests: int) -> Tuple[int, int, float]:
+    await client.get(url)  # прогрев: сериализатор набора полей собирается при первом запросе
+    timings = []
+    body = b""
+    for _ in range(requests):
+        started = perf_counter()
+        response = await client.get(url)
+        timings.append(perf_counter() - started)
+        response.raise_for_status()
+        body = response.content
+    return len(body), len(gzip.compress(body, 6)), median(timings)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    await _cleanup()
+    try:
+        await _seed(args.projects, args.posts)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print(f"{'экран':<20} {'байт':>9} {'gzip':>8} {'доля':>6} {'мс (медиана)':>13}")
+            baseline = 0
+            for label, url in SCREENS:
+                size, compressed, seconds = await _measure(client, url, args.requests)
+                if label.endswith("всё"):
+                    baseline = size
+                share = f"{size / baseline:>5.0%}" if baseline else "    —"
+                print(f"{label:<20} {size:>9} {compressed:>8} {share:>6} {seconds * 1000:>13.2f}")
+    finally:
+        await _cleanup()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=50, help="запросов на экран (берётся медиана)")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
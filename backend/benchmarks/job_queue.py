@@ -0,0 +1,100 @@
+"""
+Пропускная способность очереди задач (jobs/s) в зависимости от числа потребителей.
+
+Нужна база с применёнными миграциями; задачи бенчмарка удаляются после замера.
+
+    python -m benchmarks.job_queue --jobs 2000 --workers 1 2 4 8 --work-ms 5
+"""
+import argparse
+import asyncio
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Optional
+
+from sqlalchemy import delete, insert
+
+from app.application.services.jobs import JobWorker, task
+from app.config import settings
+from app.infrastructure.db.models.job import Job
+from app.infrastructure.db.session import AsyncSessionLocal, engine
+
+TASK_NAME = "benchmark.noop"
+
+
+@dataclass
+class _State:
+    remaining: int = 0
+    work_seconds: float = 0.0
+    worker: Optional[JobWorker] = None
+
+
+_state = _State()
+
+
+@task(TASK_NAME, max_attempts=1)
+async def _noop(payload: dict) -> None:
+    if _state.work_seconds:
+        await asyncio.sleep(_state.work_seconds)
+    _state.remaining -= 1
+    if _state.remaining <= 0 and _state.worker is not None:
+        _state.worker.stop()
+
+
+async def _reset(jobs: int) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Job).where(Job.task == TASK_NAME))
+        if jobs:
+            await db.execute(
+                insert(Job),
+                [
+                    {"task": TASK_NAME, "payload": {"n": i}, "max_attempts": 1, "timeout_seconds": 60}
+                    for i in range(jobs)
+                ],
+            )
+        await db.commit()
+
+
+async def _measure(jobs: int, workers: int) -> float:
+    await _reset(jobs)
+    worker = JobWorker(
+        concurrency=workers,
+        poll_interval=0.05,
+        lease_grace_seconds=settings.JOB_LEASE_GRACE_SECONDS,
+        maintenance_interval=3600,
+    )
+    _state.remaining = jobs
+    _state.worker = worker
+
+    started = perf_counter()
+    await worker.run()
+    elapsed = perf_counter() - started
+    rate = jobs / elapsed
+    print(f"потребителей {workers:>3}: {rate:>9.0f} jobs/s  ({elapsed:.2f} с на {jobs} задач)")
+    return rate
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    _state.work_seconds = args.work_ms / 1000
+    try:
+        baseline = None
+        for workers in args.workers:
+            rate = await _measure(args.jobs, workers)
+            baseline = baseline or rate
+            if rate != baseline:
+                print(f"{'':>17}x{rate / baseline:.2f} к одному потребителю")
+    finally:
+        await _reset(0)
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--work-ms", type=float, default=0.0, help="имитация I/O внутри задачи")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Проверка доступа к видео: подпись HMAC против запроса записи на курс в БД.
+
+Нужна база с применёнными миграциями (запрос к enrollments; данные не создаются).
+
+    python -m benchmarks.media_access --checks 20000 --concurrency 16
+"""
+import argparse
+import asyncio
+import uuid
+from time import perf_counter
+
+from app.infrastructure.db.repositories.enrollments import SqlAlchemyEnrollmentsRepository
+from app.infrastructure.db.session import AsyncSessionLocal, engine
+from app.utils.media_tokens import issue_media_token, verify_media_token
+
+PATH = "videos/lesson.mp4"
+
+
+def _hmac(checks: int) -> float:
+    token, _ = issue_media_token(uuid.uuid4(), uuid.uuid4(), PATH)
+    started = perf_counter()
+    for _ in range(checks):
+        verify_media_token(token, PATH)
+    return perf_counter() - started
+
+
+async def _database(checks: int, concurrency: int) -> float:
+    """Прежний путь: get_by_user_and_course на каждый запрос сегмента"""
+    user_id, course_id = uuid.uuid4(), uuid.uuid4()
+    remaining = [checks]
+
+    async def consumer() -> None:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            async with AsyncSessionLocal() as db:
+                await SqlAlchemyEnrollmentsRepository(db).get_by_user_and_course(user_id, course_id)
+
+    started = perf_counter()
+    await asyncio.gather(*(consumer() for _ in range(concurrency)))
+    return perf_counter() - started
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    try:
+        elapsed_db = await _database(args.checks, args.concurrency)
+        print(f"запрос в БД:  {args.checks / elapsed_db:>10.0f} проверок/s ({args.concurrency} параллельно)")
+        elapsed_hmac = _hmac(args.checks)
+        print(f"подпись HMAC: {args.checks / elapsed_hmac:>10.0f} проверок/s (одно ядро)")
+        print(f"ускорение: x{elapsed_db / elapsed_hmac:.0f}")
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checks", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=16, help="параллельных запросов к БД")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
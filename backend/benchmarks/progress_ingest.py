@@ -0,0 +1,144 @@
+"""
+Запись прогресса: транзакция на каждое обновление против буфера с пакетным сбросом.
+
+Создаёт временных пользователей, курс и записи, гоняет поток обновлений
+(студенты x тики) и удаляет данные после замера.
+
+    python -m benchmarks.progress_ingest --students 500 --ticks 20 --flush-every 200
+"""
+import argparse
+import asyncio
+import random
+import uuid
+from time import perf_counter
+
+from sqlalchemy import delete, insert, select, update
+
+from app.application.services.progress_buffer import ProgressBuffer
+from app.infrastructure.db.models.course import Course
+from app.infrastructure.db.models.enrollment import Enrollment
+from app.infrastructure.db.models.user import User
+from app.infrastructure.db.session import AsyncSessionLocal, engine
+
+EMAIL_DOMAIN = "progress-bench.invalid"
+
+
+async def _setup(students: int) -> tuple[uuid.UUID, list[tuple[uuid.UUID, uuid.UUID]]]:
+    course_id = uuid.uuid4()
+    users = [uuid.uuid4() for _ in range(students)]
+    enrollments = [(uuid.uuid4(), user_id) for user_id in users]
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            insert(User),
+            [{"id": user_id, "email": f"{user_id}@{EMAIL_DOMAIN}", "provider": "email", "role": "user"} for user_id in users],
+        )
+        await db.execute(
+            insert(Course).values(
+                id=course_id, title="bench", slug=f"bench-{course_id}", price=0, category="editing"
+            )
+        )
+        await db.execute(
+            insert(Enrollment),
+            [
+                {"id": enrollment_id, "user_id": user_id, "course_id": course_id, "progress": 0}
+                for enrollment_id, user_id in enrollments
+            ],
+        )
+        await db.commit()
+    return course_id, enrollments
+
+
+async def _teardown(course_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Course).where(Course.id == course_id))
+        await db.execute(delete(User).where(User.email.like(f"%@{EMAIL_DOMAIN}")))
+        await db.commit()
+
+
+def _stream(enrollments: list, ticks: int) -> list:
+    """Обновления в порядке поступления: каждый студент двигается вперёд, вперемешку"""
+    events = [
+        (enrollment_id, user_id, min(100, tick * 100 // ticks))
+        for tick in range(1, ticks + 1)
+        for enrollment_id, user_id in enrollments
+    ]
+    random.shuffle(events)
+    return events
+
+
+async def _direct(events: list, concurrency: int) -> float:
+    """Прежний путь: выборка, изменение и commit на каждое обновление"""
+    queue = list(events)
+
+    async def consumer() -> None:
+        while queue:
+            enrollment_id, user_id, progress = queue.pop()
+            async with AsyncSessionLocal() as db:
+                enrollment = (
+                    await db.execute(
+                        select(Enrollment).where(Enrollment.id == enrollment_id, Enrollment.user_id == user_id)
+                    )
+                ).scalar_one()
+                enrollment.progress = progress
+                await db.commit()
+                await db.refresh(enrollment)
+
+    started = perf_counter()
+    await asyncio.gather(*(consumer() for _ in range(concurrency)))
+    return perf_counter() - started
+
+
+async def _buffered(events: list, flush_every: int) -> tuple[float, int]:
+    buffer = ProgressBuffer(flush_interval=3600, max_pending=10**9)
+    flushes = 0
+    started = perf_counter()
+    for index, (enrollment_id, user_id, progress) in enumerate(events, 1):
+        buffer.record(enrollment_id, user_id, progress)
+        if index % flush_every == 0:
+            flushes += bool(await buffer.flush("bench"))
+    flushes += bool(await buffer.flush("bench"))
+    return perf_counter() - started, flushes
+
+
+async def _check(enrollments: list) -> int:
+    async with AsyncSessionLocal() as db:
+        rows = (
+            await db.execute(select(Enrollment.progress).where(Enrollment.id.in_([e for e, _ in enrollments])))
+        ).scalars().all()
+    return sum(1 for progress in rows if progress != 100)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    course_id, enrollments = await _setup(args.students)
+    try:
+        events = _stream(enrollments, args.ticks)
+        total = len(events)
+
+        elapsed = await _direct(events, args.concurrency)
+        print(f"транзакция на обновление: {total / elapsed:>9.0f} обновл./s, транзакций: {total}")
+
+        # Сбрасываем прогресс, чтобы второй проход писал те же значения
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(Enrollment).where(Enrollment.course_id == course_id).values(progress=0))
+            await db.commit()
+
+        elapsed_buffered, flushes = await _buffered(events, args.flush_every)
+        print(f"буфер (сброс каждые {args.flush_every}): {total / elapsed_buffered:>9.0f} обновл./s, транзакций: {flushes}")
+        print(f"ускорение: x{elapsed / elapsed_buffered:.1f}; неполный прогресс после сброса: {await _check(enrollments)}")
+    finally:
+        await _teardown(course_id)
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--ticks", type=int, default=20, help="обновлений прогресса на студента")
+    parser.add_argument("--flush-every", type=int, default=200, help="сброс буфера каждые N обновлений")
+    parser.add_argument("--concurrency", type=int, default=8, help="параллельных запросов в прямом режиме")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Похожие проекты: полный пересчёт top-K на NumPy против попарного Python
+и размер инкрементального пересчёта после правки одного проекта.
+
+БД не нужна — проекты генерируются (категории, инструменты и клиенты по Ципфу).
+
+    python -m benchmarks.related_projects --projects 1000 5000 20000 --k 6
+"""
+import argparse
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from statistics import mean
+from time import perf_counter
+from typing import List
+
+from app.application.services import related_projects
+from app.infrastructure.db.repositories.related_projects import ProjectFeatures
+
+CATEGORIES = ("commercial", "ai-content", "music-video", "other")
+TOOLS = [f"tool-{i}" for i in range(120)]
+CLIENTS = [f"client-{i}" for i in range(800)]
+# Попарный Python — O(N²), дольше этого числа проектов не замеряется
+NAIVE_LIMIT = 3000
+
+
+def _zipf(rng: random.Random, items: List[str], k: int = 1) -> List[str]:
+    weights = list(accumulate(1 / rank for rank in range(1, len(items) + 1)))
+    return rng.choices(items, cum_weights=weights, k=k)
+
+
+def _projects(count: int) -> List[ProjectFeatures]:
+    rng = random.Random(11)
+    started = datetime(2015, 1, 1, tzinfo=timezone.utc)
+    return [
+        ProjectFeatures(
+            id=uuid.uuid4(),
+            category=rng.choice(CATEGORIES),
+            tools=tuple(_zipf(rng, TOOLS, rng.randint(1, 5))),
+            client=_zipf(rng, CLIENTS)[0] if rng.random() < 0.8 else None,
+            year=rng.randint(2015, 2026),
+            created_at=started + timedelta(hours=n),
+        )
+        for n in range(count)
+    ]
+
+
+def _naive(projects: List[ProjectFeatures], k: int) -> None:
+    """Прежний способ: сходство каждой пары в Python (Жаккар по атрибутам)"""
+    sets = [
+        {f"c:{p.category}", f"cl:{p.client}", f"y:{p.year}", *(f"t:{t}" for t in p.tools)}
+        for p in projects
+    ]
+    for i, a in enumerate(sets):
+        scores = [(len(a & b) / len(a | b), j) for j, b in enumerate(sets) if j != i]
+        scores.sort(reverse=True)
+        scores[:k]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--k", type=int, default=6)
+    parser.add_argument("--edits", type=int, default=50, help="правок для замера инкрементального пересчёта")
+    args = parser.parse_args()
+
+    for count in args.projects:
+        projects = _projects(count)
+        print(f"проектов: {count}, k={args.k}")
+
+        started = perf_counter()
+        lists = related_projects.compute_all(projects, args.k)
+        full_seconds = perf_counter() - started
+        print(f"  numpy       полный пересчёт {full_seconds * 1000:>9.1f} ms")
+
+        if count <= NAIVE_LIMIT:
+            started = perf_counter()
+            _naive(projects, args.k)
+            print(f"  python      полный пересчёт {(perf_counter() - started) * 1000:>9.1f} ms")
+
+        rng = random.Random(3)
+        affected, seconds = [], []
+        for _ in range(args.edits):
+            row = rng.randrange(count)
+            edited = projects[row]
+            projects[row] = ProjectFeatures(
+                edited.id, rng.choice(CATEGORIES), tuple(_zipf(rng, TOOLS, 3)),
+                edited.client, edited.year, edited.created_at,
+            )
+            started = perf_counter()
+            vectors = related_projects.ProjectVectors(projects)
+            rows = related_projects.affected_rows(projects, vectors, edited.id, lists, args.k)
+            lists.update(related_projects.compute_rows(projects, rows, args.k, vectors))
+            seconds.append(perf_counter() - started)
+            affected.append(len(rows))
+        print(
+            f"  инкремент   {mean(seconds) * 1000:>9.1f} ms на правку, "
+            f"пересчитано списков: {mean(affected):.0f} из {count}"
+        )
+
+
+if __name__ == "__main__":
+    main()
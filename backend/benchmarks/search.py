@@ -0,0 +1,161 @@
+"""
+Латентность /api/search на синтетическом корпусе статей (RU/EN).
+
+Нужна база с применёнными миграциями; статьи бенчмарка (slug с префиксом
+bench-search-) создаются перед замером и удаляются после (--keep — оставить).
+
+    python -m benchmarks.search --documents 100000 --queries 200
+"""
+import argparse
+import asyncio
+import random
+from itertools import accumulate
+from statistics import quantiles
+from time import perf_counter
+from typing import Callable, List
+
+from sqlalchemy import delete, func, insert, or_, select, text
+
+from app.infrastructure.db.models.blog_post import BlogPost
+from app.infrastructure.db.repositories.search import SqlAlchemySearchRepository
+from app.infrastructure.db.session import AsyncSessionLocal, engine
+
+SLUG_PREFIX = "bench-search-"
+CHUNK = 2000
+
+RU_WORDS = (
+    "съёмка клип реклама монтаж цветокоррекция свет камера объектив режиссёр сценарий "
+    "продюсер актёр кадр звук музыка история бренд ролик фестиваль документальный "
+    "оператор постпродакшн раскадровка локация графика анимация дрон студия"
+).split()
+EN_WORDS = (
+    "video production shooting editing color grading lighting camera lens director script "
+    "producer actor frame sound music story brand commercial festival documentary "
+    "cinematographer postproduction storyboard location motion graphics drone studio"
+).split()
+QUERIES = (
+    "клип", "цветокоррекция кадра", "документальный фестиваль", "съёмка -реклама",
+    "\"музыкальный клип\"", "color grading", "drone shooting", "brand story", "director OR producer",
+)
+
+
+RU_SYLLABLES = "ка ло ми ра со ве ну та пе ди жо бу ры ле ха".split()
+EN_SYLLABLES = "ka lo mi ra so ve nu ta pe di jo bu ry le ha".split()
+
+
+class Vocabulary:
+    """Частоты слов по закону Ципфа: предметные термины среди тысяч «обычных» слов"""
+
+    def __init__(self, rng: random.Random, terms: List[str], syllables: List[str], size: int = 5000) -> None:
+        filler = {"".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(size)}
+        words = list(filler - set(terms))
+        rng.shuffle(words)
+        # Термины раскиданы по рангам 20..~600 — встречаются, но не в каждом документе
+        for i, term in enumerate(terms):
+            words.insert(20 + i * 20, term)
+        self.words = words
+        self.cum_weights = list(accumulate(1 / rank for rank in range(1, len(words) + 1)))
+
+    def sentence(self, rng: random.Random, length: int) -> str:
+        return " ".join(rng.choices(self.words, cum_weights=self.cum_weights, k=length)).capitalize() + "."
+
+
+def _document(rng: random.Random, vocabulary: Vocabulary, n: int) -> dict:
+    return {
+        "title": vocabulary.sentence(rng, 5),
+        "slug": f"{SLUG_PREFIX}{n}",
+        "excerpt": vocabulary.sentence(rng, 20),
+        "content": " ".join(vocabulary.sentence(rng, 15) for _ in range(rng.randint(10, 40))),
+        "is_published": True,
+    }
+
+
+async def _cleanup() -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(BlogPost).where(BlogPost.slug.startswith(SLUG_PREFIX)))
+        await db.commit()
+
+
+async def _seed(documents: int) -> None:
+    rng = random.Random(42)
+    ru = Vocabulary(rng, RU_WORDS, RU_SYLLABLES)
+    en = Vocabulary(rng, EN_WORDS, EN_SYLLABLES)
+    started = perf_counter()
+    for offset in range(0, documents, CHUNK):
+        async with AsyncSessionLocal() as db:
+            rows = [
+                _document(rng, ru if rng.random() < 0.7 else en, n)
+                for n in range(offset, min(offset + CHUNK, documents))
+            ]
+            await db.execute(insert(BlogPost), rows)
+            await db.commit()
+    async with engine.connect() as connection:
+        await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.execute(text("ANALYZE blog_posts"))
+    print(f"корпус: {documents} статей за {perf_counter() - started:.1f}s")
+
+
+async def _ilike(db, q: str) -> None:
+    """Прежний способ: подстрока без индекса, без ранжирования"""
+    pattern = f"%{q}%"
+    await db.execute(
+        select(BlogPost.id, BlogPost.slug, BlogPost.title)
+        .where(
+            BlogPost.is_published.is_(True),
+            or_(BlogPost.title.ilike(pattern), BlogPost.excerpt.ilike(pattern), BlogPost.content.ilike(pattern)),
+        )
+        .order_by(BlogPost.created_at.desc())
+        .limit(20)
+    )
+
+
+async def _measure(name: str, queries: int, run: Callable) -> None:
+    latencies = []
+    async with AsyncSessionLocal() as db:
+        for i in range(queries):
+            q = QUERIES[i % len(QUERIES)]
+            started = perf_counter()
+            await run(db, q)
+            latencies.append((perf_counter() - started) * 1000)
+    cuts = quantiles(latencies, n=100)
+    print(f"{name:<12} p50 {cuts[49]:>8.2f} ms   p95 {cuts[94]:>8.2f} ms   p99 {cuts[98]:>8.2f} ms")
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    try:
+        async with AsyncSessionLocal() as db:
+            seeded = await db.scalar(
+                select(func.count()).select_from(BlogPost).where(BlogPost.slug.startswith(SLUG_PREFIX))
+            )
+        if seeded != args.documents:
+            await _cleanup()
+            await _seed(args.documents)
+        async with AsyncSessionLocal() as db:
+            total = await db.scalar(select(func.count()).select_from(BlogPost))
+        print(f"статей в таблице: {total}, запросов на замер: {args.queries}")
+
+        await _measure(
+            "tsvector",
+            args.queries,
+            lambda db, q: SqlAlchemySearchRepository(db).search(q, ["blog"], limit=20),
+        )
+        if not args.skip_ilike:
+            await _measure("ILIKE", max(10, args.queries // 10), _ilike)
+    finally:
+        if not args.keep:
+            await _cleanup()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--keep", action="store_true", help="оставить корпус для повторных запусков")
+    parser.add_argument("--skip-ilike", action="store_true", help="не замерять поиск подстрокой")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Хранилище S3: скорость загрузки и скачивания файла одним запросом против
+параллельного multipart (части по --part-size-mb, --concurrency одновременно).
+
+Нужен S3-совместимый сервер из настроек S3_* (например, MinIO из
+docker compose --profile s3); бакет создаётся, если его нет. Объекты
+бенчмарка (bench-storage/) удаляются после замера.
+
+    python -m benchmarks.storage --size-mb 64 256 --part-size-mb 8 --concurrency 1 4 8
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from app.config import settings
+from app.infrastructure.integrations.http_clients import outbound
+from app.infrastructure.storage import S3Storage
+
+PREFIX = "bench-storage"
+
+
+def _storage(part_size_mb: int, concurrency: int) -> S3Storage:
+    return S3Storage(
+        bucket=settings.S3_BUCKET,
+        region=settings.S3_REGION,
+        access_key=settings.S3_ACCESS_KEY_ID,
+        secret_key=settings.S3_SECRET_ACCESS_KEY,
+        prefix=settings.S3_PREFIX,
+        part_size=part_size_mb * 1024 * 1024,
+        concurrency=concurrency,
+    )
+
+
+async def _measure(label: str, size: int, storage: S3Storage, source: Path, target: Path) -> None:
+    key = f"{PREFIX}/{label.replace(' ', '-')}.bin"
+    started = perf_counter()
+    await storage.save_file(key, source)
+    upload = perf_counter() - started
+    started = perf_counter()
+    await storage.download_file(key, target)
+    download = perf_counter() - started
+    await storage.delete(key)
+    megabytes = size / 2**20
+    print(
+        f"  {label:<18} загрузка {upload:>6.2f}s ({megabytes / upload:>7.1f} МБ/с), "
+        f"скачивание {download:>6.2f}s ({megabytes / download:>7.1f} МБ/с)"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    bucket = _storage(args.part_size_mb, 1)
+    if not await bucket.head_bucket():
+        await bucket.create_bucket()
+    try:
+        with tempfile.TemporaryDirectory() as work:
+            for size_mb in args.size_mb:
+                size = size_mb * 1024 * 1024
+                source = Path(work) / "source.bin"
+                target = Path(work) / "target.bin"
+                with open(source, "wb") as output:
+                    for _ in range(size_mb):
+                        output.write(os.urandom(1024 * 1024))
+                print(f"файл {size_mb} МБ:")
+                # Часть больше файла — один PUT и один GET
+                await _measure("один запрос", size, _storage(size_mb + 1, 1), source, target)
+                for concurrency in args.concurrency:
+                    await _measure(
+                        f"multipart x{concurrency}", size, _storage(args.part_size_mb, concurrency), source, target
+                    )
+    finally:
+        await bucket.delete_prefix(PREFIX)
+        await outbound.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, nargs="+", default=[64, 256])
+    parser.add_argument("--part-size-mb", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Индекс подсказок: время построения, память и латентность поиска.
+
+БД не нужна — названия генерируются (закон Ципфа, как в benchmarks.search).
+
+    python -m benchmarks.suggest --entries 10000 50000 --lookups 2000
+"""
+import argparse
+import asyncio
+import random
+import uuid
+from statistics import quantiles
+from time import perf_counter
+from typing import List
+
+from app.application.services.suggest_index import SuggestIndex
+from app.infrastructure.db.repositories.search import SuggestSource
+from benchmarks.search import EN_SYLLABLES, EN_WORDS, RU_SYLLABLES, RU_WORDS, Vocabulary
+
+TYPES = ("project", "course", "blog", "client")
+
+# Запросы по ступеням поиска: начало названия, слово внутри, транслит, опечатка, мимо
+QUERIES = {
+    "prefix": ("кли", "съём", "docu", "color gr"),
+    "word": ("фестиваль", "музыка клип", "drone"),
+    "translit": ("klip", "montazh", "режисер"),
+    "typo": ("цветокорекция", "festval", "докуменальный"),
+    "miss": ("zzzqqx",),
+}
+
+
+def _sources(count: int) -> List[SuggestSource]:
+    rng = random.Random(7)
+    ru = Vocabulary(rng, RU_WORDS, RU_SYLLABLES)
+    en = Vocabulary(rng, EN_WORDS, EN_SYLLABLES)
+    sources = []
+    for _ in range(count):
+        title = (ru if rng.random() < 0.7 else en).sentence(rng, rng.randint(2, 6)).rstrip(".")
+        sources.append(SuggestSource(rng.choice(TYPES), uuid.uuid4(), None, title, (title,)))
+    return sources
+
+
+def _measure(index: SuggestIndex, lookups: int) -> None:
+    for kind, queries in QUERIES.items():
+        latencies = []
+        for i in range(lookups):
+            started = perf_counter()
+            index.suggest(queries[i % len(queries)], limit=8)
+            latencies.append((perf_counter() - started) * 1e6)
+        cuts = quantiles(latencies, n=100)
+        print(f"  {kind:<9} p50 {cuts[49]:>7.0f} µs   p99 {cuts[98]:>7.0f} µs")
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    for count in args.entries:
+        sources = _sources(count)
+        index = SuggestIndex(max_entries=count, rebuild_interval=0, min_similarity=0.5)
+
+        started = perf_counter()
+        index.load(sources)
+        built = perf_counter() - started
+        print(
+            f"{count} названий: сборка {built * 1000:.0f} мс, "
+            f"~{index.memory_bytes() / 1e6:.1f} МБ, слов в словаре {index.stats()['words']}"
+        )
+
+        started = perf_counter()
+        for source in sources[:200]:
+            index.upsert(source)
+        print(f"  upsert    {(perf_counter() - started) / 200 * 1e6:>7.0f} µs на запись")
+        _measure(index, args.lookups)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--lookups", type=int, default=2000, help="запросов на каждую группу")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
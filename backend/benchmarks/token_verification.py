@@ -0,0 +1,43 @@
+"""
+Пропускная способность проверки JWT: полная проверка подписи против кеша.
+
+    python -m benchmarks.token_verification --tokens 100 --iterations 100000
+"""
+import argparse
+import uuid
+from time import perf_counter
+from typing import Callable, List
+
+from app.application.services.auth_service import create_access_token, decode_token, verify_token
+
+
+def _measure(name: str, check: Callable[[str], object], tokens: List[str], iterations: int) -> float:
+    started = perf_counter()
+    for i in range(iterations):
+        check(tokens[i % len(tokens)])
+    elapsed = perf_counter() - started
+    rate = iterations / elapsed
+    print(f"{name:<28} {rate:>12.0f} ops/s {elapsed / iterations * 1e6:>9.2f} us/op")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=100, help="различных токенов в потоке запросов")
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    tokens = [
+        create_access_token({"sub": str(uuid.uuid4()), "email": f"user{i}@example.com", "role": "user", "ver": 0})
+        for i in range(args.tokens)
+    ]
+    invalid = [token[:-4] + "AAAA" for token in tokens]
+
+    baseline = _measure("decode (без кеша)", decode_token, tokens, args.iterations)
+    cached = _measure("verify_token (кеш)", verify_token, tokens, args.iterations)
+    _measure("verify_token (отклонённые)", verify_token, invalid, args.iterations)
+    print(f"ускорение: x{cached / baseline:.1f}")
+
+
+if __name__ == "__main__":
+    main()
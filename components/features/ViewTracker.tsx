@@ -0,0 +1,20 @@
+/**
+ * Учёт просмотра страницы проекта или статьи (один запрос после монтирования)
+ */
+'use client'
+
+import { useEffect } from 'react'
+import { recordView, type ViewContentType } from '@/lib/api/views'
+
+interface ViewTrackerProps {
+  type: ViewContentType
+  id: string
+}
+
+export function ViewTracker({ type, id }: ViewTrackerProps) {
+  useEffect(() => {
+    void recordView(type, id)
+  }, [type, id])
+
+  return null
+}
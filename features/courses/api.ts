@@ -8,7 +8,10 @@ export interface Lesson {
   module_id: string
   title: string
   description: string | null
-  video_url: string | null
+  // Ссылки на видео приходят только в админском ответе; остальным — has_video и подписанная ссылка
+  video_url?: string | null
+  video_hls_url?: string | null
+  has_video?: boolean
   duration: number | null
   order: number
   created_at: string
@@ -55,10 +58,10 @@ export async function getCourses(category?: string): Promise<Course[]> {
 }
 
 /**
- * Получить курс по ID (client-side)
+ * Получить курс по ID со ссылками на видео уроков (client-side, только для админов)
  */
 export async function getCourseById(id: string): Promise<Course> {
-  return apiGet<Course>(`/api/courses/${id}`)
+  return apiGet<Course>(`/api/courses/admin/${id}`)
 }
 
 /**
@@ -68,6 +71,22 @@ export async function getCourseBySlug(slug: string): Promise<Course> {
   return apiGet<Course>(`/api/courses/${slug}`)
 }
 
+export interface LessonMediaLink {
+  url: string
+  expires_at: string | null
+}
+
+/**
+ * Подписанная ссылка на видео урока (server-side, только для записанных на курс)
+ */
+export async function getLessonMediaLinkServer(
+  lessonId: string,
+  cookies?: { get: (name: string) => { value: string } | undefined }
+): Promise<LessonMediaLink> {
+  const { apiGet: apiGetServer } = await import('@/lib/api/server')
+  return apiGetServer<LessonMediaLink>(`/api/media/lessons/${lessonId}`, cookies)
+}
+
 /**
  * Получить курс по slug (server-side)
  */
@@ -2,6 +2,7 @@
  * API функции для проектов
  */
 import { apiGet, apiPost, apiPut, apiDelete } from '@/lib/api/client'
+import type { ImageMeta } from '@/lib/api/upload'
 import type { ProjectOrientation } from './utils'
 
 export interface Project {
@@ -12,6 +13,7 @@ export interface Project {
   client: string | null
   category: 'commercial' | 'ai-content' | 'music-video' | 'other'
   video_url: string | null
+  video_hls_url?: string | null
   orientation?: ProjectOrientation | null
   images: string[] | null
   duration: number | null
@@ -29,6 +31,7 @@ export interface Project {
   cover_image_url: string | null
   year: number | null
   display_order: number | null
+  media?: Record<string, ImageMeta> | null
   created_at: string
   updated_at: string
 }
@@ -82,6 +85,13 @@ export async function getProjectBySlug(slug: string): Promise<Project> {
   return apiGet<Project>(`/api/projects/${slug}`)
 }
 
+/**
+ * Похожие проекты (предрассчитаны на backend)
+ */
+export async function getRelatedProjects(slug: string, limit = 6): Promise<Project[]> {
+  return apiGet<Project[]>(`/api/projects/${slug}/related?limit=${limit}`)
+}
+
 /**
  * Получить проект по slug (server-side)
  */
@@ -13,6 +13,7 @@ interface FullScreenVideoPlayerProps {
   isOpen: boolean
   onClose: () => void
   videoUrl?: string
+  hlsUrl?: string
   playbackId?: string
   title?: string
 }
@@ -21,6 +22,7 @@ export function FullScreenVideoPlayer({
   isOpen,
   onClose,
   videoUrl,
+  hlsUrl,
   playbackId,
   title,
 }: FullScreenVideoPlayerProps) {
@@ -101,9 +103,10 @@ export function FullScreenVideoPlayer({
             onClick={e => e.stopPropagation()}
           >
             <div className="w-full max-w-7xl aspect-video relative">
-              {playbackId ? (
+              {playbackId || hlsUrl ? (
                 <VideoPlayer
                   playbackId={playbackId}
+                  src={hlsUrl}
                   title={title}
                   controls
                   autoplay
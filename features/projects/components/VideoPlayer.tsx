@@ -1,5 +1,5 @@
 /**
- * Компонент для воспроизведения видео через Mux
+ * Компонент для воспроизведения видео через Mux (или любого HLS-плейлиста по src)
  */
 'use client'
 
@@ -9,7 +9,8 @@ import MuxPlayer from '@mux/mux-player-react'
 type MuxStyle = React.CSSProperties & Record<`--${string}`, string>
 
 interface VideoPlayerProps {
-  playbackId: string
+  playbackId?: string
+  src?: string
   title?: string
   autoplay?: boolean
   muted?: boolean
@@ -22,6 +23,7 @@ interface VideoPlayerProps {
 
 export function VideoPlayer({
   playbackId,
+  src,
   title,
   autoplay = false,
   muted = false,
@@ -41,6 +43,7 @@ export function VideoPlayer({
     <div className={className}>
       <MuxPlayer
         playbackId={playbackId}
+        src={playbackId ? undefined : src}
         streamType="on-demand"
         metadata={{
           video_title: title || 'Video',
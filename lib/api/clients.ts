@@ -2,6 +2,7 @@
  * API функции для клиентов/режиссеров
  */
 import { apiGet, apiPost, apiPut, apiDelete } from './client'
+import type { ImageMeta } from './upload'
 
 export interface PortfolioVideo {
   url?: string
@@ -23,6 +24,7 @@ export interface Client {
   portfolio_videos: PortfolioVideo[] | null
   bio: string | null
   role: string | null
+  media?: Record<string, ImageMeta> | null
   created_at: string
   updated_at: string
 }
@@ -34,6 +34,50 @@ export async function getEnrollmentsServer(cookies?: {
   return apiGetServer<Enrollment[]>('/api/enrollments', cookies)
 }
 
+export interface MyCourse {
+  id: string
+  course_id: string
+  progress: number
+  enrolled_at: string
+  completed_at?: string
+  title: string
+  slug: string
+  cover_image?: string
+  category: string
+  level?: string
+  format?: string
+  duration?: number
+  price: number | string
+  lessons_count: number
+}
+
+/**
+ * Курсы пользователя с карточками и числом уроков (client-side)
+ */
+export async function getMyCourses(): Promise<MyCourse[]> {
+  return apiGet<MyCourse[]>('/api/enrollments/my-courses')
+}
+
+/**
+ * Курсы пользователя с карточками и числом уроков (server-side)
+ */
+export async function getMyCoursesServer(cookies?: {
+  get: (name: string) => { value: string } | undefined
+}): Promise<MyCourse[]> {
+  const { apiGet: apiGetServer } = await import('./server')
+  return apiGetServer<MyCourse[]>('/api/enrollments/my-courses', cookies)
+}
+
+/**
+ * Пакетная проверка доступа: id курсов, на которые записан пользователь
+ */
+export async function checkEnrollments(courseIds: string[]): Promise<Set<string>> {
+  const { enrolled } = await apiPost<{ enrolled: string[] }>('/api/enrollments/check', {
+    course_ids: courseIds,
+  })
+  return new Set(enrolled)
+}
+
 /**
  * Получить запись на конкретный курс (client-side)
  */
@@ -60,7 +104,8 @@ export async function createEnrollment(courseId: string): Promise<Enrollment> {
 }
 
 /**
- * Обновить прогресс обучения
+ * Обновить прогресс обучения (буферизуется на сервере, как reportEnrollmentProgress;
+ * в ответе — запись с учётом ещё не записанного прогресса)
  */
 export async function updateEnrollmentProgress(
   enrollmentId: string,
@@ -68,3 +113,43 @@ export async function updateEnrollmentProgress(
 ): Promise<Enrollment> {
   return apiPut<Enrollment>(`/api/enrollments/${enrollmentId}/progress`, { progress })
 }
+
+/**
+ * Отправить прогресс из плеера (буферизуется на сервере, ответ 202 без тела записи)
+ */
+export async function reportEnrollmentProgress(
+  enrollmentId: string,
+  progress: number,
+  completedAt?: string
+): Promise<{ accepted: boolean }> {
+  return apiPost<{ accepted: boolean }>(`/api/enrollments/${enrollmentId}/progress`, {
+    progress,
+    ...(completedAt ? { completed_at: completedAt } : {}),
+  })
+}
+
+export interface EnrollmentLessons {
+  enrollment_id: string
+  course_id: string
+  progress: number
+  completed_at?: string
+  lessons: Record<string, boolean>
+}
+
+/**
+ * Карты пройденных уроков по всем курсам пользователя
+ */
+export async function getLessonsProgress(): Promise<EnrollmentLessons[]> {
+  return apiGet<EnrollmentLessons[]>('/api/enrollments/lessons')
+}
+
+/**
+ * Отметить уроки пройденными (или снять отметку); прогресс пересчитывается на сервере
+ */
+export async function updateLessonsProgress(
+  enrollmentId: string,
+  completed: string[],
+  uncompleted: string[] = []
+): Promise<Enrollment> {
+  return apiPost<Enrollment>(`/api/enrollments/${enrollmentId}/lessons`, { completed, uncompleted })
+}
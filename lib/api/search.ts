@@ -0,0 +1,56 @@
+/**
+ * API функции для полнотекстового поиска и подсказок
+ */
+import { apiGet } from './client'
+
+export type SearchResultType = 'project' | 'course' | 'blog'
+
+export interface SearchResult {
+  type: SearchResultType
+  id: string
+  slug: string
+  title: string
+  /** HTML: текст экранирован, совпадения обёрнуты в <mark> */
+  snippet: string
+  rank: number
+}
+
+export async function search(
+  q: string,
+  options: { types?: SearchResultType[]; limit?: number; offset?: number } = {}
+): Promise<SearchResult[]> {
+  const params = new URLSearchParams({ q })
+  for (const type of options.types ?? []) {
+    params.append('type', type)
+  }
+  if (options.limit !== undefined) {
+    params.append('limit', options.limit.toString())
+  }
+  if (options.offset !== undefined) {
+    params.append('offset', options.offset.toString())
+  }
+  return apiGet<SearchResult[]>(`/api/search?${params.toString()}`)
+}
+
+export type SuggestType = SearchResultType | 'client'
+
+export interface Suggestion {
+  type: SuggestType
+  id: string
+  slug: string | null
+  title: string
+}
+
+export async function suggest(
+  q: string,
+  options: { types?: SuggestType[]; limit?: number } = {}
+): Promise<Suggestion[]> {
+  const params = new URLSearchParams({ q })
+  for (const type of options.types ?? []) {
+    params.append('type', type)
+  }
+  if (options.limit !== undefined) {
+    params.append('limit', options.limit.toString())
+  }
+  return apiGet<Suggestion[]>(`/api/suggest?${params.toString()}`)
+}
@@ -0,0 +1,56 @@
+/**
+ * API функции статистики админ-панели (агрегаты по дням и неделям, UTC)
+ */
+import { apiGet } from './client'
+
+export interface StatsPeriod {
+  /** YYYY-MM-DD, включительно */
+  since?: string
+  until?: string
+}
+
+export interface EnrollmentsDay {
+  course_id: string
+  /** null — курс удалён */
+  course_title: string | null
+  day: string
+  enrollments: number
+}
+
+export interface ContactsWeek {
+  /** Понедельник недели */
+  week: string
+  submissions: number
+  budget_total: number
+}
+
+export interface CourseRevenue {
+  course_id: string
+  course_title: string | null
+  payments: number
+  /** Decimal приходит строкой */
+  revenue: string
+}
+
+function periodQuery(period: StatsPeriod, extra: Record<string, string | undefined> = {}): string {
+  const params = new URLSearchParams()
+  for (const [key, value] of Object.entries({ ...period, ...extra })) {
+    if (value) {
+      params.append(key, value)
+    }
+  }
+  const query = params.toString()
+  return query ? `?${query}` : ''
+}
+
+export async function getEnrollmentsStats(period: StatsPeriod = {}, courseId?: string): Promise<EnrollmentsDay[]> {
+  return apiGet<EnrollmentsDay[]>(`/api/stats/enrollments${periodQuery(period, { course_id: courseId })}`)
+}
+
+export async function getContactsStats(period: StatsPeriod = {}): Promise<ContactsWeek[]> {
+  return apiGet<ContactsWeek[]>(`/api/stats/contacts${periodQuery(period)}`)
+}
+
+export async function getRevenueStats(period: StatsPeriod = {}): Promise<CourseRevenue[]> {
+  return apiGet<CourseRevenue[]>(`/api/stats/revenue${periodQuery(period)}`)
+}
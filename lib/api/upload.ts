@@ -10,6 +10,14 @@ export interface UploadResponse {
   content_type: string
 }
 
+// Размеры и плейсхолдер изображения (поле media в списках проектов и клиентов)
+export interface ImageMeta {
+  width: number
+  height: number
+  color: string
+  placeholder: string // data:image/webp;base64,... — для blurDataURL в next/image
+}
+
 export interface MultipleUploadResponse {
   files: UploadResponse[]
 }
@@ -0,0 +1,61 @@
+/**
+ * API функции для учёта просмотров и популярных материалов
+ */
+import { apiGet, apiRequest } from './client'
+
+export type ViewContentType = 'project' | 'blog'
+
+export interface PopularItem {
+  type: ViewContentType
+  id: string
+  slug: string
+  title: string
+  views: number
+  /** Оценка числа уникальных посетителей (HyperLogLog, погрешность ~2%) */
+  visitors: number
+}
+
+const VISITOR_KEY = 'visitor_id'
+
+function visitorId(): string | undefined {
+  if (typeof window === 'undefined') {
+    return undefined
+  }
+  let id = localStorage.getItem(VISITOR_KEY)
+  if (!id) {
+    id = crypto.randomUUID()
+    localStorage.setItem(VISITOR_KEY, id)
+  }
+  return id
+}
+
+/**
+ * Учесть просмотр страницы проекта или статьи (ошибки не важны для страницы)
+ */
+export async function recordView(type: ViewContentType, id: string): Promise<void> {
+  try {
+    await apiRequest<null>('/api/views', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ type, id, visitor: visitorId() }),
+      allowNoContent: true,
+    })
+  } catch {
+    // Счётчик просмотров не должен ломать страницу
+  }
+}
+
+export async function getPopular(
+  type: ViewContentType,
+  options: { days?: number; limit?: number } = {}
+): Promise<PopularItem[]> {
+  const params = new URLSearchParams()
+  if (options.days !== undefined) {
+    params.append('days', options.days.toString())
+  }
+  if (options.limit !== undefined) {
+    params.append('limit', options.limit.toString())
+  }
+  const query = params.toString()
+  return apiGet<PopularItem[]>(`/api/views/popular/${type}${query ? `?${query}` : ''}`)
+}
@@ -26,10 +26,26 @@ const nextConfig: NextConfig = {
   },
   // Поддержка статических файлов из uploads через API route
   async rewrites() {
+    const apiUrl = process.env.API_URL || process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8001'
     return [
+      // Видео (и HLS) проверяет backend: файлы уроков публично не отдаются, только по /media
+      {
+        source: '/uploads/videos/:path*',
+        destination: `${apiUrl}/uploads/videos/:path*`,
+      },
+      {
+        source: '/uploads/hls/:path*',
+        destination: `${apiUrl}/uploads/hls/:path*`,
+      },
       {
         source: '/uploads/:path*',
-        destination: '/api/uploads/:path*',
+        // С хранилищем S3 файлов нет на диске фронтенда — их отдаёт backend
+        destination: process.env.STORAGE_DRIVER === 's3' ? `${apiUrl}/uploads/:path*` : '/api/uploads/:path*',
+      },
+      // Видео уроков по подписанным ссылкам раздаёт backend
+      {
+        source: '/media/:path*',
+        destination: `${apiUrl}/media/:path*`,
       },
     ]
   },